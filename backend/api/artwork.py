@@ -0,0 +1,477 @@
+"""
+TSiJUKEBOX - Artwork Router
+===========================
+Cache local de capas e serviço de thumbnails
+
+Capas (`Track.cover_url`, `Playlist.cover_url`, assets de tema) são
+baixadas uma única vez e guardadas por hash do conteúdo. Thumbnails
+WebP/AVIF nos tamanhos usados pela UI são gerados num pool de processos
+e servidos com cache imutável: o kiosk baixa cada imagem uma vez.
+O disco é limitado por orçamento total, com descarte LRU.
+
+Só são baixadas URLs de CDNs de capas conhecidos ou `cover_url` já
+gravados no banco, e nunca de endereços privados, loopback ou link-local
+(verificados após a resolução DNS, a cada redirecionamento). A conexão é
+feita ao endereço verificado, com Host e SNI do nome original, para que
+um DNS rebinding não troque o destino entre a verificação e o download.
+
+@author B0.y_Z4kr14
+@license Public Domain
+"""
+
+import asyncio
+import hashlib
+import ipaddress
+import os
+import re
+import socket
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, RedirectResponse
+from sqlalchemy.orm import Session
+
+from models.database import get_db, Playlist, Track, User
+from api.auth import get_current_active_user
+
+router = APIRouter()
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CONFIGURAÇÃO
+# ═══════════════════════════════════════════════════════════════════════════
+
+ARTWORK_DIR = Path(os.getenv("ARTWORK_CACHE_DIR", "/var/lib/tsijukebox/artwork"))
+ARTWORK_BUDGET_BYTES = int(os.getenv("ARTWORK_CACHE_MB", "512")) * 1024 * 1024
+MAX_SOURCE_BYTES = 15 * 1024 * 1024
+FETCH_TIMEOUT = 15.0
+MAX_REDIRECTS = 5
+
+# CDNs de capas aceitos para qualquer URL (o domínio e seus subdomínios)
+DEFAULT_ARTWORK_HOSTS = (
+    "ytimg.com",               # YouTube / YouTube Music
+    "googleusercontent.com",   # YouTube Music (lh3)
+    "ggpht.com",
+    "scdn.co",                 # Spotify
+    "spotifycdn.com",
+    "mzstatic.com",            # Apple Music
+    "dzcdn.net",               # Deezer
+    "coverartarchive.org",
+)
+ARTWORK_HOSTS = tuple(
+    host.strip().lower()
+    for host in os.getenv("ARTWORK_HOSTS", ",".join(DEFAULT_ARTWORK_HOSTS)).split(",")
+    if host.strip()
+)
+
+# Tamanhos usados pela UI (lista, card, player, tela cheia)
+THUMBNAIL_SIZES = (64, 128, 256, 512)
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+MEDIA_TYPES = {
+    "webp": "image/webp",
+    "avif": "image/avif",
+    "jpeg": "image/jpeg",
+}
+
+# Assinaturas para servir originais (guardados sem extensão)
+MAGIC_TYPES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG", "image/png"),
+    (b"GIF8", "image/gif"),
+)
+
+DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+VARIANT_RE = re.compile(r"^(?:(\d+)\.(webp|avif|jpeg)|original)$")
+
+
+def _supported_formats() -> Tuple[str, ...]:
+    """Formatos de saída disponíveis com o Pillow instalado"""
+    try:
+        from PIL import features
+    except ImportError:
+        return ()
+    formats = ["jpeg"]
+    if features.check("webp"):
+        formats.append("webp")
+    try:
+        import pillow_avif  # noqa: F401  (registra o codec AVIF)
+        formats.append("avif")
+    except ImportError:
+        if features.check("avif"):
+            formats.append("avif")
+    return tuple(formats)
+
+
+SUPPORTED_FORMATS = _supported_formats()
+
+# ═══════════════════════════════════════════════════════════════════════════
+# ORIGENS PERMITIDAS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def is_allowed_host(host: Optional[str]) -> bool:
+    """Host pertence a um dos CDNs de capas configurados"""
+    host = (host or "").lower().rstrip(".")
+    return any(host == allowed or host.endswith(f".{allowed}") for allowed in ARTWORK_HOSTS)
+
+
+def is_public_address(address: str) -> bool:
+    """Endereço roteável na internet (nem privado, loopback, link-local...)"""
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+async def resolve_host(host: str, port: int) -> List[str]:
+    """Endereços IP do host"""
+    infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    return [info[4][0] for info in infos]
+
+
+async def ensure_public_url(url: str) -> str:
+    """Recusa URLs que resolvem para a rede local; devolve o endereço verificado"""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise HTTPException(status_code=400, detail="URL inválida")
+    try:
+        addresses = await resolve_host(parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+    except (OSError, UnicodeError):
+        raise HTTPException(status_code=502, detail="Host da capa não resolvido")
+    if not addresses or not all(is_public_address(address) for address in addresses):
+        raise HTTPException(status_code=403, detail="Endereço da capa não permitido")
+    return addresses[0]
+
+
+def pinned_request(client: httpx.AsyncClient, url: str, address: str) -> httpx.Request:
+    """GET ao endereço já verificado, mantendo Host e SNI (certificado) do nome original"""
+    target = httpx.URL(url)
+    return client.build_request(
+        "GET",
+        target.copy_with(host=address),
+        headers={"Host": target.netloc.decode("ascii")},
+        extensions={"sni_hostname": target.raw_host.decode("ascii")},
+    )
+
+
+def is_known_cover(db: Session, url: str) -> bool:
+    """URL já gravada como capa de uma faixa ou playlist"""
+    return any(
+        db.query(model.id).filter(model.cover_url == url).first() is not None
+        for model in (Track, Playlist)
+    )
+
+# ═══════════════════════════════════════════════════════════════════════════
+# RENDERIZAÇÃO (executa em processo separado)
+# ═══════════════════════════════════════════════════════════════════════════
+
+class UndecodableImage(Exception):
+    """Conteúdo `image/*` que o Pillow não decodifica (SVG, arquivo truncado...)"""
+
+
+def _render_thumbnail(source: str, target: str, size: int, fmt: str) -> int:
+    """Gera thumbnail quadrado e grava de forma atômica. Retorna o tamanho."""
+    from PIL import Image, ImageOps
+
+    if fmt == "avif":
+        try:
+            import pillow_avif  # noqa: F401
+        except ImportError:
+            pass
+
+    try:
+        with Image.open(source) as img:
+            img = ImageOps.exif_transpose(img)
+            img = ImageOps.fit(img.convert("RGB"), (size, size), Image.LANCZOS)
+    except OSError as e:  # inclui PIL.UnidentifiedImageError
+        raise UndecodableImage(str(e)) from None
+
+    tmp = f"{target}.tmp"
+    options = {"quality": 80}
+    if fmt == "webp":
+        options["method"] = 4
+    img.save(tmp, format=fmt.upper(), **options)
+    os.replace(tmp, target)
+    return os.path.getsize(target)
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Grava via arquivo temporário (roda no executor, fora do event loop)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+# ═══════════════════════════════════════════════════════════════════════════
+# STORE
+# ═══════════════════════════════════════════════════════════════════════════
+
+class ArtworkStore:
+    """Originais por SHA-256, thumbnails derivados e descarte LRU"""
+
+    def __init__(self, root: Path, budget_bytes: int):
+        self.root = root
+        self.budget_bytes = budget_bytes
+        self.originals = root / "originals"
+        self.thumbs = root / "thumbs"
+        self.urls = root / "urls"
+        self.total_bytes = 0
+        self._index: "OrderedDict[Path, int]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._load_index()
+
+    def _load_index(self) -> None:
+        for folder in (self.originals, self.thumbs):
+            folder.mkdir(parents=True, exist_ok=True)
+        self.urls.mkdir(parents=True, exist_ok=True)
+        files = [p for folder in (self.originals, self.thumbs, self.urls) for p in folder.rglob("*")
+                 if p.is_file() and not p.name.endswith(".tmp")]
+        for path in sorted(files, key=lambda p: p.stat().st_mtime):
+            size = path.stat().st_size
+            self._index[path] = size
+            self.total_bytes += size
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) - 1))
+        return self._pool
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            # Redirecionamentos seguidos à mão: cada destino passa por ensure_public_url
+            self._client = httpx.AsyncClient(timeout=FETCH_TIMEOUT, follow_redirects=False)
+        return self._client
+
+    # ───────────────────────────────────────────────────────────────────────
+    # Caminhos
+    # ───────────────────────────────────────────────────────────────────────
+
+    def original_path(self, digest: str) -> Path:
+        return self.originals / digest[:2] / digest
+
+    def thumb_path(self, digest: str, size: int, fmt: str) -> Path:
+        return self.thumbs / digest[:2] / f"{digest}-{size}.{fmt}"
+
+    def _url_path(self, url: str) -> Path:
+        return self.urls / hashlib.sha1(url.encode()).hexdigest()
+
+    # ───────────────────────────────────────────────────────────────────────
+    # Orçamento de disco
+    # ───────────────────────────────────────────────────────────────────────
+
+    def _track(self, path: Path, size: int) -> None:
+        self.total_bytes += size - self._index.pop(path, 0)
+        self._index[path] = size
+        while self.total_bytes > self.budget_bytes and len(self._index) > 1:
+            victim, victim_size = self._index.popitem(last=False)
+            self.total_bytes -= victim_size
+            try:
+                victim.unlink()
+            except OSError:
+                pass
+
+    def touch(self, path: Path) -> None:
+        if path in self._index:
+            self._index.move_to_end(path)
+            try:
+                os.utime(path)  # preserva a ordem LRU entre reinícios
+            except OSError:
+                pass
+
+    async def _once(self, key: str, factory):
+        """Une requisições concorrentes para o mesmo recurso"""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    # ───────────────────────────────────────────────────────────────────────
+    # Operações
+    # ───────────────────────────────────────────────────────────────────────
+
+    async def fetch(self, url: str) -> str:
+        """Baixa a imagem (só na primeira vez) e devolve o digest"""
+        url_file = self._url_path(url)
+        if url_file.exists():
+            digest = url_file.read_text().strip()
+            if self.original_path(digest).exists():
+                self.touch(url_file)
+                return digest
+        return await self._once(f"url:{url}", lambda: self._download(url))
+
+    async def _get(self, url: str) -> bytes:
+        """GET com verificação de endereço em cada salto de redirecionamento"""
+        for _ in range(MAX_REDIRECTS + 1):
+            address = await ensure_public_url(url)
+            response = await self.client.send(pinned_request(self.client, url, address), stream=True)
+            try:
+                if response.is_redirect:
+                    url = str(httpx.URL(url).join(response.headers["location"]))
+                    continue
+                if response.status_code != 200:
+                    raise HTTPException(status_code=502, detail=f"Falha ao baixar capa ({response.status_code})")
+                if not response.headers.get("content-type", "").startswith("image/"):
+                    raise HTTPException(status_code=415, detail="URL não aponta para uma imagem")
+                chunks = []
+                received = 0
+                async for chunk in response.aiter_bytes():
+                    received += len(chunk)
+                    if received > MAX_SOURCE_BYTES:
+                        raise HTTPException(status_code=413, detail="Imagem muito grande")
+                    chunks.append(chunk)
+                return b"".join(chunks)
+            finally:
+                await response.aclose()
+        raise HTTPException(status_code=502, detail="Redirecionamentos demais ao baixar capa")
+
+    async def _download(self, url: str) -> str:
+        data = await self._get(url)
+        loop = asyncio.get_running_loop()
+
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.original_path(digest)
+        if not path.exists():
+            await loop.run_in_executor(None, _write_atomic, path, data)
+            self._track(path, len(data))
+        url_file = self._url_path(url)
+        await loop.run_in_executor(None, _write_atomic, url_file, digest.encode())
+        self._track(url_file, len(digest))
+        return digest
+
+    async def thumbnail(self, digest: str, size: int, fmt: str) -> Path:
+        """Caminho do thumbnail, gerando no pool de processos se necessário"""
+        target = self.thumb_path(digest, size, fmt)
+        if target.exists():
+            self.touch(target)
+            return target
+
+        source = self.original_path(digest)
+        if not source.exists():
+            raise HTTPException(status_code=404, detail="Capa não encontrada")
+
+        async def render() -> Path:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            loop = asyncio.get_running_loop()
+            try:
+                written = await loop.run_in_executor(
+                    self.pool, _render_thumbnail, str(source), str(target), size, fmt
+                )
+            except UndecodableImage:
+                raise HTTPException(status_code=415, detail="Formato de capa não suportado")
+            self._track(target, written)
+            return target
+
+        return await self._once(f"thumb:{target}", render)
+
+    async def close(self) -> None:
+        if self._client:
+            await self._client.aclose()
+        if self._pool:
+            self._pool.shutdown(wait=False)
+
+
+_store: Optional[ArtworkStore] = None
+
+
+def get_store() -> ArtworkStore:
+    global _store
+    if _store is None:
+        _store = ArtworkStore(ARTWORK_DIR, ARTWORK_BUDGET_BYTES)
+    return _store
+
+
+def _sniff_media_type(path: Path) -> str:
+    with open(path, "rb") as f:
+        head = f.read(12)
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    for magic, media_type in MAGIC_TYPES:
+        if head.startswith(magic):
+            return media_type
+    return "application/octet-stream"
+
+
+def _snap_size(size: int) -> int:
+    """Limita aos tamanhos conhecidos (evita variações infinitas em disco)"""
+    for candidate in THUMBNAIL_SIZES:
+        if size <= candidate:
+            return candidate
+    return THUMBNAIL_SIZES[-1]
+
+# ═══════════════════════════════════════════════════════════════════════════
+# ENDPOINTS
+# ═══════════════════════════════════════════════════════════════════════════
+
+@router.get("")
+async def artwork_for_url(
+    request: Request,
+    url: str = Query(..., description="URL remota da capa (cover_url)"),
+    size: int = Query(256, ge=16, le=2048),
+    format: str = Query("webp"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """Resolve uma URL remota para o endereço imutável do thumbnail"""
+    if not url.startswith(("http://", "https://")):
+        raise HTTPException(status_code=400, detail="URL inválida")
+    if not is_allowed_host(urlsplit(url).hostname) and not is_known_cover(db, url):
+        raise HTTPException(status_code=403, detail="Origem da capa não permitida")
+
+    store = get_store()
+    digest = await store.fetch(url)
+
+    if format not in SUPPORTED_FORMATS:
+        variant = "original"
+    else:
+        variant = f"{_snap_size(size)}.{format}"
+
+    target = request.url_for("serve_artwork", digest=digest, variant=variant)
+    # O redirecionamento pode mudar (capa nova na mesma URL); o destino não
+    return RedirectResponse(str(target), status_code=307, headers={"Cache-Control": "public, max-age=86400"})
+
+
+@router.get("/stats")
+async def artwork_stats(current_user: User = Depends(get_current_active_user)):
+    """Uso do cache de capas"""
+    store = get_store()
+    return {
+        "files": len(store._index),
+        "total_bytes": store.total_bytes,
+        "budget_bytes": store.budget_bytes,
+        "sizes": THUMBNAIL_SIZES,
+        "formats": SUPPORTED_FORMATS,
+    }
+
+
+@router.get("/{digest}/{variant}", name="serve_artwork")
+async def serve_artwork(digest: str, variant: str):
+    """Serve original ou thumbnail endereçado pelo hash do conteúdo"""
+    match = VARIANT_RE.match(variant)
+    if not DIGEST_RE.match(digest) or not match:
+        raise HTTPException(status_code=404, detail="Capa não encontrada")
+
+    store = get_store()
+    headers = {"Cache-Control": IMMUTABLE_CACHE, "ETag": f'"{digest}-{variant}"'}
+
+    if variant == "original":
+        path = store.original_path(digest)
+        if not path.exists():
+            raise HTTPException(status_code=404, detail="Capa não encontrada")
+        store.touch(path)
+        return FileResponse(path, media_type=_sniff_media_type(path), headers=headers)
+
+    size, fmt = int(match.group(1)), match.group(2)
+    if size not in THUMBNAIL_SIZES or fmt not in SUPPORTED_FORMATS:
+        raise HTTPException(status_code=404, detail="Variante não suportada")
+
+    path = await store.thumbnail(digest, size, fmt)
+    return FileResponse(path, media_type=MEDIA_TYPES[fmt], headers=headers)
@@ -24,11 +24,12 @@ from pydantic import BaseModel
 import jwt
 import bcrypt
 
-from models.database import init_db, get_db, SessionLocal
+from models import database
+from models.database import init_db, get_db
 from models.user import User
 from models.settings import SystemSettings
 from models.track import Track, Playlist
-from api import auth, users, settings, tracks, playlists, system
+from api import auth, users, settings, tracks, playlists, system, artwork
 
 # ═══════════════════════════════════════════════════════════════════════════
 # CONFIGURAÇÃO
@@ -36,6 +37,8 @@ from api import auth, users, settings, tracks, playlists, system
 
 # Configurações do ambiente
 DATABASE_PATH = os.getenv("SQLITE_PATH", "/var/lib/tsijukebox/data.db")
+# URL completa (postgresql://, mysql://) tem prioridade sobre o SQLite local
+DATABASE_URL = os.getenv("DATABASE_URL") or DATABASE_PATH
 SECRET_KEY = os.getenv("SECRET_KEY", "tsijukebox-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 horas
@@ -56,13 +59,13 @@ async def lifespan(app: FastAPI):
     """Gerencia ciclo de vida da aplicação"""
     # Startup
     logger.info("🎵 TSiJUKEBOX Backend iniciando...")
-    logger.info(f"📁 Database: {DATABASE_PATH}")
     
     # Inicializa banco de dados
-    init_db(DATABASE_PATH)
+    db_engine = init_db(DATABASE_URL)
+    logger.info(f"📁 Database: {db_engine.url.render_as_string(hide_password=True)}")
     
     # Cria usuário admin padrão se não existir
-    db = SessionLocal()
+    db = database.SessionLocal()
     try:
         admin = db.query(User).filter(User.username == "admin").first()
         if not admin:
@@ -87,6 +90,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("🛑 TSiJUKEBOX Backend encerrando...")
+    await artwork.get_store().close()
 
 # ═══════════════════════════════════════════════════════════════════════════
 # APLICAÇÃO FASTAPI
@@ -141,6 +145,7 @@ app.include_router(settings.router, prefix="/api/settings", tags=["Configuraçõ
 app.include_router(tracks.router, prefix="/api/tracks", tags=["Músicas"])
 app.include_router(playlists.router, prefix="/api/playlists", tags=["Playlists"])
 app.include_router(system.router, prefix="/api/system", tags=["Sistema"])
+app.include_router(artwork.router, prefix="/api/artwork", tags=["Capas"])
 
 # ═══════════════════════════════════════════════════════════════════════════
 # ENDPOINTS RAIZ
@@ -153,7 +158,7 @@ async def root():
         "name": "TSiJUKEBOX API",
         "version": "6.0.0",
         "status": "online",
-        "database": "SQLite",
+        "database": database.engine.dialect.name if database.engine else None,
         "docs": "/api/docs",
         "access": "https://midiaserver.local/jukebox",
         "message": "🐍 Don't Tread On Me"
@@ -1,7 +1,7 @@
 """
 TSiJUKEBOX - Database Models
 ============================
-Configuração do SQLAlchemy com SQLite
+Configuração do SQLAlchemy (SQLite, PostgreSQL, MariaDB)
 
 @author B0.y_Z4kr14
 @license Public Domain
@@ -9,7 +9,9 @@ Configuração do SQLAlchemy com SQLite
 
 import os
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Float
+from typing import Any, Dict
+from sqlalchemy import create_engine, event, Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Float, Index
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 
@@ -20,20 +22,102 @@ Base = declarative_base()
 engine = None
 SessionLocal = None
 
-def init_db(database_path: str = "/var/lib/tsijukebox/data.db"):
-    """Inicializa o banco de dados SQLite"""
-    global engine, SessionLocal
+DEFAULT_DATABASE_PATH = "/var/lib/tsijukebox/data.db"
+
+# Drivers usados quando a URL não especifica um (ver backend/requirements.txt)
+DEFAULT_DRIVERS = {
+    "postgresql": "postgresql+psycopg2",
+    "postgres": "postgresql+psycopg2",
+    "mysql": "mysql+pymysql",
+    "mariadb": "mariadb+pymysql",
+}
+
+# Ajustes de pool por engine. SQLite tem um único escritor: pool pequeno
+# e WAL; servidores de banco aguentam várias conexões por worker.
+ENGINE_OPTIONS: Dict[str, Dict[str, Any]] = {
+    "sqlite": {
+        "pool_size": 5,
+        "max_overflow": 0,
+        "connect_args": {"check_same_thread": False, "timeout": 30},
+    },
+    "postgresql": {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "query_cache_size": 1200,
+        "connect_args": {"application_name": "tsijukebox"},
+    },
+    "mysql": {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_pre_ping": True,
+        # Abaixo do wait_timeout padrão (8h) e de proxies que derrubam conexões ociosas
+        "pool_recycle": 3600,
+        "query_cache_size": 1200,
+        "connect_args": {"charset": "utf8mb4"},
+    },
+}
+ENGINE_OPTIONS["mariadb"] = ENGINE_OPTIONS["mysql"]
+
+# Uma migração só pode ser registrada uma vez por par de engines
+MIGRATIONS_UNIQUE_INDEX = "uq_migrations_version_engines"
+MIGRATIONS_UNIQUE_COLUMNS = ("version", "source_engine", "target_engine")
+
+# Só valem para SQLite em arquivo (QueuePool)
+SQLITE_FILE_POOL_OPTIONS = ("pool_size", "max_overflow")
+
+def resolve_database_url(database: str) -> str:
+    """
+    Aceita um caminho de arquivo SQLite ou uma URL completa
+    (ex: DATABASE_URL gerado pelo instalador em /etc/tsijukebox/.env.database)
+    """
+    if "://" not in database:
+        return f"sqlite:///{database}"
+    
+    url = make_url(database)
+    if url.drivername in DEFAULT_DRIVERS:
+        url = url.set(drivername=DEFAULT_DRIVERS[url.drivername])
+    return url.render_as_string(hide_password=False)
+
+def _configure_sqlite(db_engine: Engine) -> None:
+    """WAL permite leituras concorrentes enquanto o único escritor grava"""
+    @event.listens_for(db_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+def create_db_engine(database: str, **overrides) -> Engine:
+    """Cria engine com pool ajustado para o backend da URL"""
+    url = make_url(resolve_database_url(database))
+    backend = url.get_backend_name()
     
-    # Cria diretório se não existir
-    os.makedirs(os.path.dirname(database_path), exist_ok=True)
+    options = {key: (dict(value) if isinstance(value, dict) else value)
+               for key, value in ENGINE_OPTIONS.get(backend, {}).items()}
+    options.update(overrides)
+    
+    if backend == "sqlite" and url.database and url.database != ":memory:":
+        # Cria diretório se não existir
+        os.makedirs(os.path.dirname(os.path.abspath(url.database)), exist_ok=True)
+    elif backend == "sqlite":
+        # Em memória o SQLAlchemy usa SingletonThreadPool, que não aceita
+        # pool_size/max_overflow
+        for key in SQLITE_FILE_POOL_OPTIONS:
+            options.pop(key, None)
+    
+    db_engine = create_engine(url, echo=False, **options)
+    if backend == "sqlite":
+        _configure_sqlite(db_engine)
+    return db_engine
+
+def init_db(database: str = DEFAULT_DATABASE_PATH, **engine_overrides):
+    """Inicializa o banco de dados (caminho SQLite ou URL PostgreSQL/MariaDB)"""
+    global engine, SessionLocal
     
     # Cria engine
-    database_url = f"sqlite:///{database_path}"
-    engine = create_engine(
-        database_url,
-        connect_args={"check_same_thread": False},
-        echo=False
-    )
+    engine = create_db_engine(database, **engine_overrides)
     
     # Cria sessão
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -41,6 +125,10 @@ def init_db(database_path: str = "/var/lib/tsijukebox/data.db"):
     # Cria tabelas
     Base.metadata.create_all(bind=engine)
     
+    # Aplica migrações de schema (colunas e índices em tabelas existentes)
+    from models.migrations import run_migrations
+    run_migrations(engine)
+    
     return engine
 
 def get_db():
@@ -166,6 +254,7 @@ class Backup(Base):
 class Migration(Base):
     """Registro de migrações de banco"""
     __tablename__ = "migrations"
+    __table_args__ = (Index(MIGRATIONS_UNIQUE_INDEX, *MIGRATIONS_UNIQUE_COLUMNS, unique=True),)
     
     id = Column(Integer, primary_key=True, index=True)
     version = Column(String(50), nullable=False)
@@ -173,6 +262,7 @@ class Migration(Base):
     source_engine = Column(String(50))  # sqlite, postgresql, mariadb, firebird
     target_engine = Column(String(50))
     status = Column(String(20), default="completed")
+    checksum = Column(String(64))  # SHA-256 da definição (migrações de schema)
     executed_at = Column(DateTime, default=datetime.utcnow)
 
 class MediaLibrary(Base):
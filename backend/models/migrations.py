@@ -0,0 +1,409 @@
+"""
+TSiJUKEBOX - Schema Migrations
+==============================
+Motor de migrações versionadas embutido no backend.
+
+`Base.metadata.create_all` só cria tabelas novas; nunca adiciona colunas
+ou índices a tabelas existentes. Este módulo aplica migrações ordenadas e
+com checksum, registrando cada uma na tabela `migrations`.
+
+- Operações transacionais (colunas, SQL bruto) rodam numa única transação.
+- Índices são criados "online" quando o engine suporta
+  (`CREATE INDEX CONCURRENTLY` no PostgreSQL, `LOCK=NONE` no MariaDB).
+- Backfills rodam em lotes por faixa de chave primária, um commit por
+  lote, para não travar o kiosk em tabelas grandes (`tracks`, `audit_logs`).
+
+Operações não transacionais precisam ser idempotentes: se o processo cair
+no meio, a migração é reaplicada do início na próxima inicialização.
+
+@author B0.y_Z4kr14
+@license Public Domain
+"""
+
+import fcntl
+import hashlib
+import logging
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from models.database import MIGRATIONS_UNIQUE_COLUMNS, MIGRATIONS_UNIQUE_INDEX, Migration
+
+logger = logging.getLogger("tsijukebox.migrations")
+
+# Nome do lock que serializa runners concorrentes (vários workers do uvicorn)
+LOCK_NAME = "tsijukebox.migrations"
+LOCK_TIMEOUT = 300  # segundos (GET_LOCK do MariaDB)
+
+# ═══════════════════════════════════════════════════════════════════════════
+# ERROS
+# ═══════════════════════════════════════════════════════════════════════════
+
+class MigrationError(Exception):
+    """Erro ao aplicar uma migração"""
+
+
+class MigrationChecksumError(MigrationError):
+    """Migração já aplicada foi alterada depois de registrada"""
+
+# ═══════════════════════════════════════════════════════════════════════════
+# OPERAÇÕES
+# ═══════════════════════════════════════════════════════════════════════════
+
+@dataclass(frozen=True)
+class Operation:
+    """Operação de schema. Subclasses definem `apply`."""
+
+    # Operações transacionais compartilham a transação da migração
+    transactional = True
+
+    def apply(self, engine: Engine, conn: Optional[Connection]) -> None:
+        raise NotImplementedError
+
+
+@dataclass(frozen=True)
+class RawSQL(Operation):
+    """SQL arbitrário, executado dentro da transação da migração"""
+    sql: str
+
+    def apply(self, engine: Engine, conn: Optional[Connection]) -> None:
+        conn.execute(text(self.sql))
+
+
+@dataclass(frozen=True)
+class AddColumn(Operation):
+    """Adiciona coluna se ainda não existir"""
+    table: str
+    column: str
+    ddl: str  # Ex: "VARCHAR(255)" ou "INTEGER DEFAULT 0"
+
+    def apply(self, engine: Engine, conn: Optional[Connection]) -> None:
+        existing = {c["name"] for c in inspect(conn).get_columns(self.table)}
+        if self.column in existing:
+            return
+        conn.execute(text(f"ALTER TABLE {self.table} ADD COLUMN {self.column} {self.ddl}"))
+
+
+@dataclass(frozen=True)
+class CreateIndex(Operation):
+    """Cria índice sem bloquear escritas quando o engine permite"""
+    name: str
+    table: str
+    columns: Tuple[str, ...]
+    unique: bool = False
+
+    transactional = False
+
+    def statement(self, dialect: str) -> str:
+        """DDL de criação do índice para o dialeto informado"""
+        unique = "UNIQUE " if self.unique else ""
+        cols = ", ".join(self.columns)
+
+        if dialect == "postgresql":
+            # CONCURRENTLY não pode rodar dentro de transação
+            return f"CREATE {unique}INDEX CONCURRENTLY IF NOT EXISTS {self.name} ON {self.table} ({cols})"
+        if dialect in ("mysql", "mariadb"):
+            return f"CREATE {unique}INDEX {self.name} ON {self.table} ({cols}) ALGORITHM=INPLACE LOCK=NONE"
+        return f"CREATE {unique}INDEX IF NOT EXISTS {self.name} ON {self.table} ({cols})"
+
+    def drop_statement(self, dialect: str) -> str:
+        """DDL para descartar um índice inválido antes de recriá-lo"""
+        if dialect == "postgresql":
+            return f"DROP INDEX CONCURRENTLY IF EXISTS {self.name}"
+        if dialect in ("mysql", "mariadb"):
+            return f"DROP INDEX {self.name} ON {self.table}"
+        return f"DROP INDEX IF EXISTS {self.name}"
+
+    def state(self, conn: Connection) -> Optional[bool]:
+        """None se o índice não existe; senão se ele é válido"""
+        dialect = conn.dialect.name
+        if dialect == "postgresql":
+            # Um CONCURRENTLY que falhou deixa o índice INVALID no catálogo
+            row = conn.execute(
+                text(
+                    "SELECT i.indisvalid FROM pg_index i "
+                    "JOIN pg_class c ON c.oid = i.indexrelid "
+                    "WHERE c.relname = :name AND pg_table_is_visible(c.oid)"
+                ),
+                {"name": self.name},
+            ).first()
+            return None if row is None else bool(row[0])
+        if dialect in ("mysql", "mariadb"):
+            row = conn.execute(
+                text(
+                    "SELECT 1 FROM information_schema.statistics "
+                    "WHERE table_schema = DATABASE() AND table_name = :table AND index_name = :name LIMIT 1"
+                ),
+                {"table": self.table, "name": self.name},
+            ).first()
+            return None if row is None else True
+        existing = {ix["name"] for ix in inspect(conn).get_indexes(self.table)}
+        return True if self.name in existing else None
+
+    def apply(self, engine: Engine, conn: Optional[Connection]) -> None:
+        dialect = engine.dialect.name
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as autocommit:
+            state = self.state(autocommit)
+            if state:
+                return
+            if state is False:
+                logger.warning(f"Índice {self.name} inválido (criação anterior falhou); recriando")
+                autocommit.execute(text(self.drop_statement(dialect)))
+            autocommit.execute(text(self.statement(dialect)))
+
+
+@dataclass(frozen=True)
+class Backfill(Operation):
+    """
+    UPDATE em lotes por faixa de chave primária.
+
+    `where` deve excluir linhas já preenchidas (ex: "col IS NULL") para que
+    a operação seja retomável.
+    """
+    table: str
+    set_sql: str  # Ex: "play_count = 0"
+    where: str = "1 = 1"
+    batch_size: int = 5000
+    pk: str = "id"
+
+    transactional = False
+
+    def apply(self, engine: Engine, conn: Optional[Connection]) -> None:
+        with engine.connect() as probe:
+            lo, hi = probe.execute(
+                text(f"SELECT MIN({self.pk}), MAX({self.pk}) FROM {self.table} WHERE {self.where}")
+            ).one()
+        if lo is None:
+            return
+
+        updated = 0
+        start = lo
+        while start <= hi:
+            end = start + self.batch_size - 1
+            # Um commit por lote mantém os locks curtos
+            with engine.begin() as batch:
+                result = batch.execute(
+                    text(
+                        f"UPDATE {self.table} SET {self.set_sql} "
+                        f"WHERE {self.pk} BETWEEN :lo AND :hi AND ({self.where})"
+                    ),
+                    {"lo": start, "hi": end},
+                )
+                updated += result.rowcount or 0
+            start = end + 1
+
+        logger.info(f"Backfill {self.table}: {updated} linhas atualizadas")
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MIGRAÇÕES
+# ═══════════════════════════════════════════════════════════════════════════
+
+@dataclass(frozen=True)
+class SchemaMigration:
+    """Migração versionada. `version` ordena a aplicação."""
+    version: str
+    description: str
+    operations: Tuple[Operation, ...] = field(default_factory=tuple)
+
+    @property
+    def checksum(self) -> str:
+        """SHA-256 da definição da migração (versão, descrição e operações)"""
+        digest = hashlib.sha256()
+        digest.update(self.version.encode())
+        digest.update(self.description.encode())
+        for op in self.operations:
+            digest.update(repr(op).encode())
+        return digest.hexdigest()
+
+    @property
+    def transactional(self) -> bool:
+        return all(op.transactional for op in self.operations)
+
+
+# Registro ordenado. Nunca edite uma migração já publicada; crie outra.
+MIGRATIONS: List[SchemaMigration] = [
+    SchemaMigration(
+        version="0001",
+        description="Índices de busca da biblioteca e auditoria",
+        operations=(
+            CreateIndex("ix_tracks_artist", "tracks", ("artist",)),
+            CreateIndex("ix_tracks_album", "tracks", ("album",)),
+            CreateIndex("ix_tracks_source", "tracks", ("source", "source_id")),
+            CreateIndex("ix_playlist_tracks_playlist_position", "playlist_tracks", ("playlist_id", "position")),
+            CreateIndex("ix_audit_logs_created_at", "audit_logs", ("created_at",)),
+            CreateIndex("ix_audit_logs_user_id", "audit_logs", ("user_id",)),
+        ),
+    ),
+    SchemaMigration(
+        version="0002",
+        description="Contadores de reprodução nulos passam a zero",
+        operations=(
+            Backfill("tracks", "play_count = 0", where="play_count IS NULL"),
+        ),
+    ),
+]
+
+# ═══════════════════════════════════════════════════════════════════════════
+# RUNNER
+# ═══════════════════════════════════════════════════════════════════════════
+
+class MigrationRunner:
+    """Aplica migrações pendentes e registra em `migrations`"""
+
+    def __init__(self, engine: Engine, migrations: Optional[Sequence[SchemaMigration]] = None):
+        self.engine = engine
+        self.migrations = sorted(migrations if migrations is not None else MIGRATIONS, key=lambda m: m.version)
+        self.dialect = engine.dialect.name
+
+    def _ensure_table(self) -> None:
+        """Garante a tabela `migrations`, a coluna `checksum` e a chave única em bancos antigos"""
+        table = Migration.__tablename__
+        Migration.__table__.create(bind=self.engine, checkfirst=True)
+        columns = {c["name"] for c in inspect(self.engine).get_columns(table)}
+        if "checksum" not in columns:
+            with self.engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN checksum VARCHAR(64)"))
+
+        unique = CreateIndex(MIGRATIONS_UNIQUE_INDEX, table, MIGRATIONS_UNIQUE_COLUMNS, unique=True)
+        with self.engine.connect() as conn:
+            if unique.state(conn):
+                return
+        # Runners concorrentes de versões anteriores podem ter duplicado registros
+        cols = ", ".join(MIGRATIONS_UNIQUE_COLUMNS)
+        with self.engine.begin() as conn:
+            conn.execute(text(
+                f"DELETE FROM {table} WHERE id NOT IN "
+                f"(SELECT keep FROM (SELECT MIN(id) AS keep FROM {table} GROUP BY {cols}) AS kept)"
+            ))
+        unique.apply(self.engine, None)
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """
+        Serializa runners concorrentes: advisory lock no PostgreSQL,
+        GET_LOCK no MariaDB e flock ao lado do arquivo no SQLite.
+        """
+        if self.dialect == "postgresql":
+            key = zlib.crc32(LOCK_NAME.encode())
+            with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": key})
+                try:
+                    yield
+                finally:
+                    conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+        elif self.dialect in ("mysql", "mariadb"):
+            with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                acquired = conn.execute(
+                    text("SELECT GET_LOCK(:name, :timeout)"), {"name": LOCK_NAME, "timeout": LOCK_TIMEOUT}
+                ).scalar()
+                if acquired != 1:
+                    raise MigrationError(f"Não foi possível obter o lock {LOCK_NAME} em {LOCK_TIMEOUT}s")
+                try:
+                    yield
+                finally:
+                    conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": LOCK_NAME})
+        else:
+            database = self.engine.url.database
+            if not database or database == ":memory:":
+                # Banco em memória só é visto por este processo
+                yield
+                return
+            with open(f"{database}.migrations.lock", "a") as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def applied(self) -> dict:
+        """Versões já aplicadas com sucesso → checksum registrado"""
+        self._ensure_table()
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                text(
+                    f"SELECT version, checksum FROM {Migration.__tablename__} "
+                    "WHERE status = 'completed' AND source_engine = target_engine"
+                )
+            ).all()
+        return {version: checksum for version, checksum in rows}
+
+    def pending(self) -> List[SchemaMigration]:
+        """Migrações ainda não aplicadas; valida checksums das aplicadas"""
+        applied = self.applied()
+        pending = []
+        for migration in self.migrations:
+            recorded = applied.get(migration.version)
+            if recorded is None:
+                pending.append(migration)
+            elif recorded and recorded != migration.checksum:
+                raise MigrationChecksumError(
+                    f"Migração {migration.version} foi alterada após ser aplicada "
+                    f"(registrado {recorded[:12]}, atual {migration.checksum[:12]})"
+                )
+        return pending
+
+    def _record(self, conn: Connection, migration: SchemaMigration) -> None:
+        conn.execute(
+            Migration.__table__.insert().values(
+                version=migration.version,
+                description=migration.description,
+                source_engine=self.dialect,
+                target_engine=self.dialect,
+                status="completed",
+                checksum=migration.checksum,
+                executed_at=datetime.utcnow(),
+            )
+        )
+
+    def apply(self, migration: SchemaMigration) -> None:
+        """Aplica uma migração"""
+        logger.info(f"Aplicando migração {migration.version}: {migration.description}")
+
+        if migration.transactional:
+            with self.engine.begin() as conn:
+                for op in migration.operations:
+                    op.apply(self.engine, conn)
+                self._record(conn, migration)
+            return
+
+        # Blocos transacionais consecutivos são agrupados; operações online
+        # (índices, backfills) gerenciam suas próprias conexões
+        ops = list(migration.operations)
+        while ops:
+            if ops[0].transactional:
+                with self.engine.begin() as conn:
+                    while ops and ops[0].transactional:
+                        ops.pop(0).apply(self.engine, conn)
+            else:
+                ops.pop(0).apply(self.engine, None)
+
+        with self.engine.begin() as conn:
+            self._record(conn, migration)
+
+    def upgrade(self) -> List[str]:
+        """Aplica todas as migrações pendentes em ordem. Retorna as versões aplicadas."""
+        applied = []
+        with self.lock():
+            # Pendências lidas sob o lock: quem esperou vê o que o outro aplicou
+            for migration in self.pending():
+                try:
+                    self.apply(migration)
+                except MigrationError:
+                    raise
+                except Exception as e:
+                    raise MigrationError(f"Falha na migração {migration.version}: {e}") from e
+                applied.append(migration.version)
+
+        if applied:
+            logger.info(f"Migrações aplicadas: {', '.join(applied)}")
+        return applied
+
+
+def run_migrations(engine: Engine) -> List[str]:
+    """Aplica migrações pendentes no engine informado"""
+    return MigrationRunner(engine).upgrade()
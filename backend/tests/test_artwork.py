@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+TSiJUKEBOX - Artwork Tests
+==========================
+Testes do ArtworkStore e das rotas de capas (api/artwork.py).
+
+Uso:
+    cd backend && python -m pytest tests/test_artwork.py -v
+"""
+
+import asyncio
+import io
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api import artwork
+from api.artwork import ArtworkStore, is_allowed_host, is_public_address
+from api.auth import get_current_active_user
+from models.database import Base, Track, User, create_db_engine, get_db
+
+CDN_URL = "https://i.ytimg.com/vi/abc/hqdefault.jpg"
+PUBLIC_IP = "142.250.78.14"   # resolve_host é substituído: nenhuma conexão real
+
+
+def _jpeg() -> bytes:
+    from PIL import Image
+    buf = io.BytesIO()
+    Image.new("RGB", (32, 32), (200, 30, 30)).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+JPEG = _jpeg()
+
+
+class FakeCDN:
+    """Transporte httpx que responde sem rede e registra as requisições."""
+
+    def __init__(self, routes=None):
+        self.routes = routes or {}
+        self.requests = []
+        self.connected = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        # A conexão vai ao IP verificado; a URL lógica vem do Host
+        url = str(request.url.copy_with(netloc=request.headers["host"].encode()))
+        self.requests.append(url)
+        self.connected.append((request.url.host, request.extensions.get("sni_hostname")))
+        status, headers, body = self.routes.get(url, (200, {"content-type": "image/jpeg"}, JPEG))
+        return httpx.Response(status, headers=headers, content=body)
+
+
+@pytest.fixture
+def addresses(monkeypatch):
+    """Tabela de DNS falsa: host -> endereços"""
+    table = {}
+
+    async def resolve(host, port):
+        return table.get(host, [PUBLIC_IP])
+
+    monkeypatch.setattr(artwork, "resolve_host", resolve)
+    return table
+
+
+def _store(tmp_path, cdn, budget=10 * 1024 * 1024):
+    store = ArtworkStore(tmp_path / "artwork", budget)
+    store._client = httpx.AsyncClient(transport=httpx.MockTransport(cdn))
+    return store
+
+
+class TestOrigins:
+    """Testes das regras de origem."""
+
+    def test_allowed_hosts(self):
+        """Testa domínios de CDN e subdomínios, sem sufixos parecidos."""
+        assert is_allowed_host("i.ytimg.com")
+        assert is_allowed_host("lh3.googleusercontent.com")
+        assert is_allowed_host("I.SCDN.CO.")
+        assert not is_allowed_host("evilytimg.com")
+        assert not is_allowed_host("localhost")
+        assert not is_allowed_host(None)
+
+    @pytest.mark.parametrize("address", [
+        "127.0.0.1", "10.0.0.5", "192.168.1.1", "172.16.0.1", "169.254.169.254",
+        "100.64.0.1", "0.0.0.0", "::1", "fe80::1%eth0", "fd00::1", "::ffff:127.0.0.1",
+    ])
+    def test_non_public_addresses(self, address):
+        """Testa recusa de endereços privados, loopback e link-local."""
+        assert not is_public_address(address)
+
+    def test_public_addresses(self):
+        """Testa endereços roteáveis."""
+        assert is_public_address("142.250.78.14")
+        assert is_public_address("2607:f8b0:4004:c1b::64")
+
+
+class TestArtworkStore:
+    """Testes para ArtworkStore."""
+
+    def test_fetch_downloads_once(self, tmp_path, addresses):
+        """Testa download único por URL, com o mapeamento contado no orçamento."""
+        cdn = FakeCDN()
+        store = _store(tmp_path, cdn)
+
+        async def scenario():
+            return await store.fetch(CDN_URL), await store.fetch(CDN_URL)
+
+        first, second = asyncio.run(scenario())
+        assert first == second
+        assert cdn.requests == [CDN_URL]
+        assert store.original_path(first).read_bytes() == JPEG
+        assert store.total_bytes == len(JPEG) + len(first)
+
+        reloaded = ArtworkStore(tmp_path / "artwork", store.budget_bytes)
+        assert reloaded.total_bytes == store.total_bytes
+
+    def test_url_mappings_are_evicted(self, tmp_path, addresses):
+        """Testa que os arquivos de urls/ também respeitam o orçamento."""
+        store = _store(tmp_path, FakeCDN(), budget=len(JPEG) + 100)
+
+        async def scenario():
+            for i in range(3):
+                await store.fetch(f"{CDN_URL}?v={i}")
+
+        asyncio.run(scenario())
+        files = [p for p in (tmp_path / "artwork").rglob("*") if p.is_file()]
+        assert store.total_bytes <= store.budget_bytes
+        assert sum(p.stat().st_size for p in files) == store.total_bytes
+
+    def test_connects_to_checked_address(self, tmp_path, addresses):
+        """Testa que a conexão usa o IP verificado, com Host e SNI originais."""
+        cdn = FakeCDN()
+        asyncio.run(_store(tmp_path, cdn).fetch(CDN_URL))
+        assert cdn.requests == [CDN_URL]
+        assert cdn.connected == [(PUBLIC_IP, "i.ytimg.com")]
+
+    def test_private_address_refused(self, tmp_path, addresses):
+        """Testa recusa quando o host resolve para a rede local."""
+        addresses["i.ytimg.com"] = [PUBLIC_IP, "10.0.0.7"]
+        cdn = FakeCDN()
+        store = _store(tmp_path, cdn)
+
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(store.fetch(CDN_URL))
+        assert exc.value.status_code == 403
+        assert cdn.requests == []
+
+    def test_redirect_to_private_address_refused(self, tmp_path, addresses):
+        """Testa que cada salto de redirecionamento é verificado."""
+        addresses["metadata.internal"] = ["169.254.169.254"]
+        cdn = FakeCDN({CDN_URL: (302, {"location": "http://metadata.internal/latest"}, b"")})
+        store = _store(tmp_path, cdn)
+
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(store.fetch(CDN_URL))
+        assert exc.value.status_code == 403
+        assert cdn.requests == [CDN_URL]
+
+    def test_non_image_refused(self, tmp_path, addresses):
+        """Testa recusa de respostas que não são imagens."""
+        cdn = FakeCDN({CDN_URL: (200, {"content-type": "text/html"}, b"<html>")})
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(_store(tmp_path, cdn).fetch(CDN_URL))
+        assert exc.value.status_code == 415
+
+
+class TestArtworkRoutes:
+    """Testes das rotas /api/artwork."""
+
+    @pytest.fixture
+    def client(self, tmp_path, addresses, monkeypatch):
+        engine = create_db_engine(str(tmp_path / "data.db"))
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        with Session() as session:
+            session.add(Track(title="Faixa", cover_url="https://covers.example.net/a.jpg"))
+            session.commit()
+
+        def db():
+            session = Session()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        self.cdn = FakeCDN()
+        monkeypatch.setattr(artwork, "_store", _store(tmp_path, self.cdn))
+        app = FastAPI()
+        app.include_router(artwork.router, prefix="/api/artwork")
+        app.dependency_overrides[get_db] = db
+        app.dependency_overrides[get_current_active_user] = lambda: User(username="ana", is_active=True)
+        yield TestClient(app)
+        engine.dispose()
+
+    def test_requires_authentication(self, client):
+        """Testa que a resolução de URL exige usuário autenticado."""
+        client.app.dependency_overrides.pop(get_current_active_user)
+        response = client.get("/api/artwork", params={"url": CDN_URL})
+        assert response.status_code == 401
+        assert self.cdn.requests == []
+
+    def test_unknown_host_refused(self, client):
+        """Testa recusa de hosts fora da lista e ausentes do banco."""
+        response = client.get("/api/artwork", params={"url": "http://127.0.0.1:8000/api/users"},
+                              follow_redirects=False)
+        assert response.status_code == 403
+        assert self.cdn.requests == []
+
+    @pytest.mark.parametrize("url", [CDN_URL, "https://covers.example.net/a.jpg"])
+    def test_redirects_to_immutable_variant(self, client, url):
+        """Testa CDN permitido e cover_url já gravado no banco."""
+        response = client.get("/api/artwork", params={"url": url, "size": 100, "format": "jpeg"},
+                              follow_redirects=False)
+        assert response.status_code == 307
+        assert response.headers["location"].endswith("/128.jpeg")
+
+        served = client.get(response.headers["location"])
+        assert served.status_code == 200
+        assert served.headers["content-type"] == "image/jpeg"
+        assert "immutable" in served.headers["cache-control"]
+
+    def test_serve_original(self, client):
+        """Testa o original servido com o tipo detectado pelo conteúdo."""
+        digest = asyncio.run(artwork._store.fetch(CDN_URL))
+        response = client.get(f"/api/artwork/{digest}/original")
+        assert response.status_code == 200
+        assert response.content == JPEG
+        assert response.headers["content-type"] == "image/jpeg"
+
+    def test_undecodable_image_refused(self, client):
+        """Testa 415 (e não 500) para image/* que o Pillow não decodifica."""
+        svg = b'<svg xmlns="http://www.w3.org/2000/svg" width="8" height="8"/>'
+        self.cdn.routes[CDN_URL] = (200, {"content-type": "image/svg+xml"}, svg)
+        response = client.get("/api/artwork", params={"url": CDN_URL, "format": "jpeg"})
+        assert response.status_code == 415
+
+    def test_serve_unknown_variant(self, client):
+        """Testa 404 para digest ou variante inválidos."""
+        assert client.get("/api/artwork/xyz/original").status_code == 404
+        assert client.get(f"/api/artwork/{'0' * 64}/100.jpeg").status_code == 404
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+TSiJUKEBOX - Database Engine Tests
+==================================
+Testes de create_db_engine/init_db (models/database.py) sobre SQLite.
+
+Uso:
+    cd backend && python -m pytest tests/test_database.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.pool import QueuePool
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models import database
+from models.database import create_db_engine, init_db
+
+
+class TestCreateDbEngine:
+    """Testes para create_db_engine e init_db."""
+
+    @pytest.mark.parametrize("url", ["sqlite://", "sqlite:///:memory:"])
+    def test_in_memory_sqlite(self, url):
+        """Testa init_db em memória, sem opções de pool de SQLite em arquivo."""
+        engine = init_db(url)
+        try:
+            assert "tracks" in inspect(engine).get_table_names()
+            assert not isinstance(engine.pool, QueuePool)
+            with database.SessionLocal() as session:
+                session.add(database.Track(title="Faixa"))
+                session.commit()
+                assert session.query(database.Track).count() == 1
+        finally:
+            engine.dispose()
+
+    def test_in_memory_ignores_pool_overrides(self):
+        """Testa que pool_size passado pelo chamador não quebra o engine em memória."""
+        engine = create_db_engine("sqlite://", pool_size=3)
+        engine.dispose()
+
+    def test_file_sqlite_keeps_pool_size(self, tmp_path):
+        """Testa que SQLite em arquivo mantém o QueuePool configurado."""
+        engine = create_db_engine(str(tmp_path / "data.db"), pool_size=3)
+        try:
+            assert isinstance(engine.pool, QueuePool)
+            assert engine.pool.size() == 3
+        finally:
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+TSiJUKEBOX - Engine Migration Tests
+===================================
+Testes do EngineMigrator (models/engine_migration.py) de SQLite para SQLite.
+
+Uso:
+    cd backend && python -m pytest tests/test_engine_migration.py -v
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models.database import Base, Playlist, PlaylistTrack, Track, User, create_db_engine
+from models.engine_migration import Checkpoint, EngineMigrator, migration_key
+
+
+@pytest.fixture
+def source_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'source.db'}"
+    engine = create_db_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add(User(id=1, username="ana", hashed_password="x"))
+        session.add_all(Track(id=i, title=f"Faixa {i}") for i in range(1, 8))
+        session.add(Playlist(id=1, name="Favoritas", owner_id=1))
+        session.add_all(PlaylistTrack(playlist_id=1, track_id=i, position=i) for i in range(1, 4))
+        session.commit()
+    engine.dispose()
+    return url
+
+
+def _migrator(source_url, target_url, checkpoint):
+    return EngineMigrator(source_url, target_url, workers=2, batch_size=2, checkpoint_path=checkpoint)
+
+
+class TestEngineMigrator:
+    """Testes para EngineMigrator."""
+
+    def test_interrupted_migration_resumes_and_verifies(self, source_url, tmp_path):
+        """Testa retomada após falha no meio de uma tabela e remoção do checkpoint."""
+        target_url = f"sqlite:///{tmp_path / 'target.db'}"
+        checkpoint = tmp_path / "checkpoint.json"
+
+        first = _migrator(source_url, target_url, checkpoint)
+        load = first.load
+        batches = []
+
+        def failing_load(conn, table, rows):
+            if table.name == "tracks":
+                batches.append(rows)
+                if len(batches) == 2:
+                    raise RuntimeError("conexão perdida")
+            load(conn, table, rows)
+
+        first.load = failing_load
+        with pytest.raises(RuntimeError):
+            first.run()
+        completed = json.loads(checkpoint.read_text())["completed"]
+        assert "users" in completed and "tracks" not in completed
+
+        second = _migrator(source_url, target_url, checkpoint)
+        copied = {}
+        original_copy = second.copy_table
+
+        def record_copy(table):
+            result = original_copy(table)
+            copied[table.name] = result.copied
+            return result
+
+        second.copy_table = record_copy
+        results = second.run()
+
+        assert all(r.verified for r in results)
+        assert {r.table: r.target_rows for r in results}["tracks"] == 7
+        assert copied["users"] == 0          # pulada pelo checkpoint
+        assert copied["tracks"] == 5         # retomada após o id 2
+        assert not checkpoint.exists()
+
+    def test_checkpoint_of_other_target_is_ignored(self, source_url, tmp_path):
+        """Testa que o checkpoint de uma migração para outro destino não pula tabelas."""
+        checkpoint = tmp_path / "checkpoint.json"
+        first_target = f"sqlite:///{tmp_path / 'first.db'}"
+        other = Checkpoint(path=checkpoint, key=migration_key(source_url, first_target))
+        for table in ("users", "tracks", "playlists", "playlist_tracks", "migrations"):
+            other.mark_done(table, 1)
+
+        second_target = f"sqlite:///{tmp_path / 'second.db'}"
+        migrator = _migrator(source_url, second_target, checkpoint)
+        assert migrator.checkpoint.completed == {}
+
+        results = migrator.run()
+        assert all(r.verified for r in results)
+        assert {r.table: r.target_rows for r in results}["tracks"] == 7
+
+    def test_checkpoint_kept_without_verification(self, source_url, tmp_path):
+        """Testa que --no-verify mantém o checkpoint para uma retomada."""
+        checkpoint = tmp_path / "checkpoint.json"
+        _migrator(source_url, f"sqlite:///{tmp_path / 'target.db'}", checkpoint).run(verify=False)
+        assert "tracks" in json.loads(checkpoint.read_text())["completed"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+TSiJUKEBOX - Schema Migrations Tests
+====================================
+Testes do MigrationRunner (models/migrations.py) sobre SQLite.
+
+Uso:
+    cd backend && python -m pytest tests/test_migrations.py -v
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, inspect, text
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models.database import Base, create_db_engine
+from models.migrations import (
+    MIGRATIONS, Backfill, CreateIndex, MigrationChecksumError, MigrationRunner,
+    RawSQL, SchemaMigration,
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    db_engine = create_db_engine(str(tmp_path / "data.db"))
+    Base.metadata.create_all(bind=db_engine)
+    yield db_engine
+    db_engine.dispose()
+
+
+def _indexes(engine, table):
+    return {ix["name"] for ix in inspect(engine).get_indexes(table)}
+
+
+class TestMigrationRunner:
+    """Testes para MigrationRunner."""
+
+    def test_fresh_database(self, engine):
+        """Testa que um banco novo recebe todas as migrações registradas."""
+        runner = MigrationRunner(engine)
+        assert runner.upgrade() == [m.version for m in MIGRATIONS]
+        assert {"ix_tracks_artist", "ix_tracks_source"} <= _indexes(engine, "tracks")
+        assert "ix_audit_logs_created_at" in _indexes(engine, "audit_logs")
+
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT version, checksum FROM migrations ORDER BY version")).all()
+        assert rows == [(m.version, m.checksum) for m in MIGRATIONS]
+
+    def test_already_applied_database(self, engine):
+        """Testa que migrações aplicadas não rodam de novo."""
+        MigrationRunner(engine).upgrade()
+        runner = MigrationRunner(engine)
+        assert runner.pending() == []
+        assert runner.upgrade() == []
+
+        with engine.connect() as conn:
+            count = conn.execute(text("SELECT COUNT(*) FROM migrations")).scalar()
+        assert count == len(MIGRATIONS)
+
+    def test_changed_checksum_is_refused(self, engine):
+        """Testa que uma migração alterada depois de aplicada é recusada."""
+        original = SchemaMigration("9001", "Tabela auxiliar", (RawSQL("CREATE TABLE aux (id INTEGER)"),))
+        MigrationRunner(engine, [original]).upgrade()
+
+        edited = SchemaMigration("9001", "Tabela auxiliar", (RawSQL("CREATE TABLE aux (id BIGINT)"),))
+        with pytest.raises(MigrationChecksumError):
+            MigrationRunner(engine, [edited]).upgrade()
+
+    def test_backfill_spans_several_batches(self, engine):
+        """Testa backfill em lotes: um UPDATE por faixa de chave primária."""
+        with engine.begin() as conn:
+            for i in range(1, 8):
+                conn.execute(
+                    text("INSERT INTO tracks (id, title, play_count) VALUES (:id, :title, :count)"),
+                    {"id": i, "title": f"Faixa {i}", "count": None if i != 4 else 9},
+                )
+
+        updates = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("UPDATE tracks"):
+                updates.append(parameters)
+
+        migration = SchemaMigration("9002", "Backfill em lotes", (
+            Backfill("tracks", "play_count = 0", where="play_count IS NULL", batch_size=3),
+        ))
+        assert MigrationRunner(engine, [migration]).upgrade() == ["9002"]
+        assert len(updates) == 3  # ids 1-3, 4-6, 7
+
+        with engine.connect() as conn:
+            counts = conn.execute(text("SELECT id, play_count FROM tracks ORDER BY id")).all()
+        assert counts == [(i, 9 if i == 4 else 0) for i in range(1, 8)]
+
+    def test_concurrent_runners_apply_once(self, engine):
+        """Testa que runners simultâneos (vários workers) não duplicam migrações."""
+        calls = []
+
+        class Counting(RawSQL):
+            def apply(self, engine, conn):
+                calls.append(self.sql)
+                super().apply(engine, conn)
+
+        migration = SchemaMigration("9003", "Tabela única", (Counting("CREATE TABLE once (id INTEGER)"),))
+        barrier = threading.Barrier(4)
+        errors = []
+
+        def worker():
+            barrier.wait()
+            try:
+                MigrationRunner(engine, [migration]).upgrade()
+            except Exception as e:  # pragma: no cover - falha do teste
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert len(calls) == 1
+        with engine.connect() as conn:
+            count = conn.execute(text("SELECT COUNT(*) FROM migrations WHERE version = '9003'")).scalar()
+        assert count == 1
+
+    def test_legacy_table_gets_unique_key(self, tmp_path):
+        """Testa que bancos antigos têm duplicatas removidas e ganham a chave única."""
+        db_engine = create_db_engine(str(tmp_path / "legacy.db"))
+        with db_engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE migrations (id INTEGER PRIMARY KEY, version VARCHAR(50), "
+                "description VARCHAR(255), source_engine VARCHAR(50), target_engine VARCHAR(50), "
+                "status VARCHAR(20), executed_at DATETIME)"
+            ))
+            for _ in range(2):
+                conn.execute(text(
+                    "INSERT INTO migrations (version, source_engine, target_engine, status) "
+                    "VALUES ('9004', 'sqlite', 'sqlite', 'completed')"
+                ))
+
+        MigrationRunner(db_engine, []).upgrade()
+        assert "uq_migrations_version_engines" in _indexes(db_engine, "migrations")
+        with db_engine.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM migrations")).scalar() == 1
+        db_engine.dispose()
+
+
+class TestCreateIndex:
+    """Testes para CreateIndex."""
+
+    def test_statement_per_dialect(self):
+        """Testa a DDL online de cada engine."""
+        index = CreateIndex("ix_t_a", "t", ("a", "b"), unique=True)
+        assert index.statement("postgresql") == \
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_t_a ON t (a, b)"
+        assert index.statement("mariadb") == \
+            "CREATE UNIQUE INDEX ix_t_a ON t (a, b) ALGORITHM=INPLACE LOCK=NONE"
+        assert index.statement("mysql") == index.statement("mariadb")
+        assert index.statement("sqlite") == "CREATE UNIQUE INDEX IF NOT EXISTS ix_t_a ON t (a, b)"
+
+    def test_drop_statement_per_dialect(self):
+        """Testa a DDL usada para descartar um índice inválido."""
+        index = CreateIndex("ix_t_a", "t", ("a",))
+        assert index.drop_statement("postgresql") == "DROP INDEX CONCURRENTLY IF EXISTS ix_t_a"
+        assert index.drop_statement("mariadb") == "DROP INDEX ix_t_a ON t"
+        assert index.drop_statement("sqlite") == "DROP INDEX IF EXISTS ix_t_a"
+
+    def test_apply_is_idempotent(self, engine):
+        """Testa que recriar um índice existente não falha."""
+        index = CreateIndex("ix_tracks_title", "tracks", ("title",))
+        index.apply(engine, None)
+        index.apply(engine, None)
+        assert "ix_tracks_title" in _indexes(engine, "tracks")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Motor de Regras de Acessibilidade
+=================================
+
+Registro de regras para os scripts de auditoria (formulários, ARIA,
+falsos positivos, botões de ícone). Cada regra declara o que precisa:
+
+- Regras de elemento: tags e atributos obrigatórios. O motor percorre os
+  elementos do jsx_scanner uma vez e despacha cada um, por um índice de
+  tags, só para as regras interessadas.
+- Regras de linha: uma regex. As regexes de todas as regras ativas são
+  unidas numa única alternação; linhas em que ela não casa são puladas
+  sem rodar nenhuma regra, então adicionar regras não adiciona passadas
+  sobre o arquivo.
+
+Regras são agrupadas em conjuntos (rulesets) que podem ser ligados ou
+desligados por execução (--rules / --skip-rules).
+
+Uso:
+    from a11y_rules import RuleRegistry
+
+    RULES = RuleRegistry('forms')
+
+    @RULES.element('img-alt', 'images', tags=('img',))
+    def img_alt(ctx, element):
+        if not element.has('alt'):
+            yield (element.line, 'img sem alt')
+
+    engine = RULES.compile(disabled=['images'])
+    issues = engine.run(content, 'src/App.tsx')
+
+Autor: TSiJUKEBOX Team
+Versão: 1.0.0
+"""
+
+import argparse
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Pattern, Sequence, Tuple, Union
+
+from jsx_scanner import JSXElement, ScannedFile, scan
+
+
+# Flags de regex que podem ser aplicadas só a um trecho da alternação
+_SCOPED_FLAGS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'), (re.VERBOSE, 'x'))
+
+
+# =============================================================================
+# ESTRUTURAS
+# =============================================================================
+
+@dataclass
+class Rule:
+    """
+    Regra registrada.
+
+    Attributes:
+        id: Identificador único ('input-label')
+        ruleset: Conjunto ao qual pertence ('labels')
+        description: Primeira linha da docstring da função
+        check: Função da regra
+        tags: Tags de interesse (vazio = todos os elementos); só regras de elemento
+        ignore_case: Comparar tags sem diferenciar maiúsculas
+        attrs: Atributos que o elemento precisa ter para a regra rodar
+        pattern: Regex da linha; só regras de linha
+        finalize: Chamada no fim do arquivo (regras que agregam estado)
+    """
+    id: str
+    ruleset: str
+    description: str
+    check: Callable
+    tags: Tuple[str, ...] = ()
+    ignore_case: bool = False
+    attrs: Tuple[str, ...] = ()
+    pattern: Optional[Pattern] = None
+    finalize: Optional[Callable] = None
+
+    @property
+    def kind(self) -> str:
+        return 'line' if self.pattern is not None else 'element'
+
+
+class RuleContext:
+    """
+    Estado de uma execução sobre um arquivo.
+
+    A tokenização JSX só acontece se alguma regra usar `scanned`; regras
+    de linha sozinhas leem apenas as linhas.
+    """
+
+    def __init__(self, content: str, filepath: str = ''):
+        self.content = content
+        self.filepath = filepath
+        # Estado livre das regras (ex.: grupos coletados para o finalize)
+        self.state: Dict[str, Any] = {}
+        self._scanned: Optional[ScannedFile] = None
+        self._lines: Optional[List[str]] = None
+
+    @property
+    def scanned(self) -> ScannedFile:
+        if self._scanned is None:
+            self._scanned = scan(self.content)
+        return self._scanned
+
+    @property
+    def lines(self) -> List[str]:
+        if self._lines is None:
+            self._lines = self._scanned.lines if self._scanned is not None else self.content.split('\n')
+        return self._lines
+
+
+# =============================================================================
+# MOTOR COMPILADO
+# =============================================================================
+
+class RuleEngine:
+    """Conjunto de regras ativas pronto para rodar."""
+
+    def __init__(self, rules: Sequence[Rule]):
+        self.rules = list(rules)
+
+        # Índice tag → regras (exata, minúscula e sem filtro)
+        self._by_tag: Dict[str, List[int]] = {}
+        self._by_lower_tag: Dict[str, List[int]] = {}
+        self._any_tag: List[int] = []
+        self._line_rules: List[int] = []
+
+        for index, rule in enumerate(self.rules):
+            if rule.kind == 'line':
+                self._line_rules.append(index)
+            elif not rule.tags:
+                self._any_tag.append(index)
+            else:
+                target = self._by_lower_tag if rule.ignore_case else self._by_tag
+                for tag in rule.tags:
+                    target.setdefault(tag.lower() if rule.ignore_case else tag, []).append(index)
+
+        self._prefilter = _combine(self.rules[i].pattern for i in self._line_rules)
+        self._finalizers = [i for i, rule in enumerate(self.rules) if rule.finalize]
+
+    @property
+    def ids(self) -> List[str]:
+        return [rule.id for rule in self.rules]
+
+    def _element_rules(self, element: JSXElement) -> List[int]:
+        matched = self._by_tag.get(element.tag, [])
+        if self._by_lower_tag:
+            matched = matched + self._by_lower_tag.get(element.tag.lower(), [])
+        if self._any_tag:
+            matched = matched + self._any_tag
+        return matched
+
+    def run(self, content: str, filepath: str = '') -> List[Any]:
+        """
+        Roda as regras ativas sobre o conteúdo de um arquivo.
+
+        Os resultados saem agrupados por regra, na ordem de registro, e
+        dentro de cada regra na ordem do arquivo.
+        """
+        ctx = RuleContext(content, filepath)
+        results: List[List[Any]] = [[] for _ in self.rules]
+        rules = self.rules
+
+        if self._by_tag or self._by_lower_tag or self._any_tag:
+            for element in ctx.scanned.elements:
+                for index in self._element_rules(element):
+                    rule = rules[index]
+                    if rule.attrs and not all(element.has(name) for name in rule.attrs):
+                        continue
+                    found = rule.check(ctx, element)
+                    if found:
+                        results[index].extend(found)
+
+        if self._prefilter is not None:
+            prefilter = self._prefilter.search
+            for number, line in enumerate(ctx.lines, 1):
+                if not prefilter(line):
+                    continue
+                for index in self._line_rules:
+                    rule = rules[index]
+                    match = rule.pattern.search(line)
+                    if match:
+                        found = rule.check(ctx, number, line, match)
+                        if found:
+                            results[index].extend(found)
+
+        for index in self._finalizers:
+            found = rules[index].finalize(ctx)
+            if found:
+                results[index].extend(found)
+
+        return [item for found in results for item in found]
+
+
+def _combine(patterns: Iterable[Pattern]) -> Optional[Pattern]:
+    """Une as regexes das regras de linha numa única alternação."""
+    parts = []
+    for pattern in patterns:
+        flags = ''.join(letter for flag, letter in _SCOPED_FLAGS if pattern.flags & flag)
+        parts.append(f'(?{flags}:{pattern.pattern})' if flags else f'(?:{pattern.pattern})')
+    if not parts:
+        return None
+    return re.compile('|'.join(parts))
+
+
+# =============================================================================
+# REGISTRO
+# =============================================================================
+
+class RuleRegistry:
+    """Regras de um script, registradas por decorators."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rules: List[Rule] = []
+        self._compiled: Dict[Tuple[frozenset, frozenset], RuleEngine] = {}
+
+    def _register(self, rule: Rule) -> None:
+        if any(existing.id == rule.id for existing in self.rules):
+            raise ValueError(f"Regra duplicada: {rule.id}")
+        self.rules.append(rule)
+        self._compiled.clear()
+
+    def element(
+        self,
+        rule_id: str,
+        ruleset: str,
+        tags: Sequence[str] = (),
+        ignore_case: bool = False,
+        attrs: Sequence[str] = (),
+        finalize: Optional[Callable[[RuleContext], Iterable[Any]]] = None
+    ) -> Callable:
+        """Registra check(ctx, element) → resultados."""
+        def decorator(check: Callable) -> Callable:
+            self._register(Rule(rule_id, ruleset, _summary(check), check, tuple(tags),
+                                ignore_case, tuple(attrs), finalize=finalize))
+            return check
+        return decorator
+
+    def line(
+        self,
+        rule_id: str,
+        ruleset: str,
+        pattern: Union[str, Pattern],
+        flags: int = 0
+    ) -> Callable:
+        """Registra check(ctx, número, linha, match) → resultados."""
+        def decorator(check: Callable) -> Callable:
+            self._register(Rule(rule_id, ruleset, _summary(check), check,
+                                pattern=re.compile(pattern, flags)))
+            return check
+        return decorator
+
+    @property
+    def rulesets(self) -> List[str]:
+        return list(dict.fromkeys(rule.ruleset for rule in self.rules))
+
+    def _expand(self, names: Iterable[str]) -> set:
+        """IDs das regras para nomes de regra ou de conjunto."""
+        ids = set()
+        for name in names:
+            matched = {rule.id for rule in self.rules if name in (rule.id, rule.ruleset)}
+            if not matched:
+                raise ValueError(f"Regra ou conjunto desconhecido: {name}")
+            ids |= matched
+        return ids
+
+    def compile(
+        self,
+        enabled: Optional[Iterable[str]] = None,
+        disabled: Optional[Iterable[str]] = None
+    ) -> RuleEngine:
+        """
+        Monta o motor com as regras selecionadas.
+
+        Args:
+            enabled: Regras/conjuntos a usar (None = todos)
+            disabled: Regras/conjuntos a remover
+
+        Raises:
+            ValueError: Nome desconhecido
+        """
+        key = (frozenset(enabled) if enabled is not None else None, frozenset(disabled or ()))
+        engine = self._compiled.get(key)
+        if engine is None:
+            selected = self._expand(key[0]) if key[0] is not None else {r.id for r in self.rules}
+            selected -= self._expand(key[1])
+            engine = RuleEngine([rule for rule in self.rules if rule.id in selected])
+            self._compiled[key] = engine
+        return engine
+
+    def describe(self) -> str:
+        """Lista de regras por conjunto para --list-rules."""
+        lines = [f"Regras de {self.name}:"]
+        for ruleset in self.rulesets:
+            lines.append(f"  {ruleset}")
+            for rule in self.rules:
+                if rule.ruleset == ruleset:
+                    lines.append(f"    {rule.id:<24} {rule.description}")
+        return '\n'.join(lines)
+
+
+def _summary(check: Callable) -> str:
+    doc = (check.__doc__ or '').strip()
+    return doc.splitlines()[0].rstrip('.') if doc else check.__name__
+
+
+# =============================================================================
+# LINHA DE COMANDO
+# =============================================================================
+
+def add_rule_arguments(parser: argparse.ArgumentParser) -> None:
+    """Adiciona --rules, --skip-rules e --list-rules."""
+    parser.add_argument('--rules', type=str,
+                        help='Regras ou conjuntos a usar, separados por vírgula')
+    parser.add_argument('--skip-rules', type=str,
+                        help='Regras ou conjuntos a ignorar, separados por vírgula')
+    parser.add_argument('--list-rules', action='store_true',
+                        help='Listar regras disponíveis e sair')
+
+
+def engine_from_args(
+    registry: RuleRegistry,
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace
+) -> RuleEngine:
+    """Motor selecionado pela linha de comando; --list-rules imprime e encerra."""
+    if args.list_rules:
+        print(registry.describe())
+        parser.exit()
+
+    def split(value: Optional[str]) -> Optional[List[str]]:
+        if value is None:
+            return None
+        return [name.strip() for name in value.split(',') if name.strip()]
+
+    try:
+        return registry.compile(split(args.rules), split(args.skip_rules))
+    except ValueError as e:
+        parser.error(str(e))
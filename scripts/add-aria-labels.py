@@ -12,6 +12,9 @@ Uso:
     python3 scripts/add-aria-labels.py --report      # Gerar relatório
     python3 scripts/add-aria-labels.py --apply       # Aplicar alterações
     python3 scripts/add-aria-labels.py --file FILE   # Processar arquivo específico
+    python3 scripts/add-aria-labels.py --skip-rules icons  # Ignorar um conjunto de regras
+    python3 scripts/add-aria-labels.py --list-rules  # Listar regras
+    python3 scripts/add-aria-labels.py --watch       # Reanalisar a cada salvamento
 
 Autor: B0yZ4kr14 + Manus AI
 Versão: 1.0.0
@@ -23,16 +26,21 @@ import sys
 import json
 import argparse
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Tuple, Optional
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
 
+from a11y_rules import RuleContext, RuleEngine, RuleRegistry, add_rule_arguments, engine_from_args
+from file_watcher import WatchSession, add_watch_arguments
+from jsx_scanner import read_source, scan, scan_file
+
 # =============================================================================
 # CONFIGURAÇÃO
 # =============================================================================
 
 SRC_DIR = Path("src/components")
 REPORT_FILE = Path("docs/accessibility/ARIA_AUDIT_REPORT.md")
+WATCH_FILE = Path(".cache/aria-watch.json")
 
 # Padrões de inferência de aria-label baseados no contexto
 ARIA_INFERENCE_PATTERNS = {
@@ -134,6 +142,9 @@ ICON_ARIA_LABELS = {
     'SortDesc': 'Ordenar decrescente',
 }
 
+# Componentes de ícone por convenção de nome (PlayIcon, ChevronDownIcon)
+ICON_TAG_PATTERN = re.compile(r'[A-Z][a-zA-Z]+Icon$')
+
 # =============================================================================
 # CLASSES DE DADOS
 # =============================================================================
@@ -166,132 +177,117 @@ class AuditResult:
     fixes: List[AriaFix] = field(default_factory=list)
     already_accessible: int = 0
 
+# =============================================================================
+# REGRAS DE ANÁLISE
+# =============================================================================
+
+ARIA_RULES = RuleRegistry('add-aria-labels')
+
+@ARIA_RULES.element('button-label', 'buttons', tags=('button',))
+def button_without_aria(ctx: RuleContext, element) -> Iterator[AriaIssue]:
+    """Botão sem aria-label ou sem type."""
+    attrs = element.attrs
+    
+    # Verificar se já tem aria-label
+    if 'aria-label' not in attrs:
+        # Tentar inferir aria-label
+        suggestion = infer_aria_label(attrs, element.context)
+        
+        yield AriaIssue(
+            file=ctx.filepath,
+            line=element.line,
+            element='button',
+            issue_type='missing_aria_label',
+            suggestion=suggestion,
+            severity='error'
+        )
+    
+    # Verificar se tem type
+    if 'type=' not in attrs:
+        yield AriaIssue(
+            file=ctx.filepath,
+            line=element.line,
+            element='button',
+            issue_type='missing_type',
+            suggestion='type="button"',
+            severity='warning'
+        )
+
+@ARIA_RULES.element('clickable-div', 'clickable', tags=('div',), attrs=('onClick',))
+def clickable_div(ctx: RuleContext, element) -> Iterator[AriaIssue]:
+    """Div clicável sem role ou aria-label."""
+    attrs = element.attrs
+    
+    if 'role=' not in attrs:
+        yield AriaIssue(
+            file=ctx.filepath,
+            line=element.line,
+            element='div',
+            issue_type='clickable_without_role',
+            suggestion='role="button" tabIndex={0}',
+            severity='error'
+        )
+    
+    if 'aria-label' not in attrs:
+        yield AriaIssue(
+            file=ctx.filepath,
+            line=element.line,
+            element='div',
+            issue_type='missing_aria_label',
+            suggestion='aria-label="PREENCHER"',
+            severity='error'
+        )
+
+@ARIA_RULES.element('img-alt', 'images', tags=('img',))
+def image_without_alt(ctx: RuleContext, element) -> Iterator[AriaIssue]:
+    """Imagem sem alt."""
+    if 'alt=' not in element.attrs:
+        yield AriaIssue(
+            file=ctx.filepath,
+            line=element.line,
+            element='img',
+            issue_type='missing_alt',
+            suggestion='alt="Descrição da imagem"',
+            severity='error'
+        )
+
+@ARIA_RULES.element('icon-hidden', 'icons')
+def icon_without_aria_hidden(ctx: RuleContext, element) -> Iterator[AriaIssue]:
+    """Ícone sem aria-hidden."""
+    # Ícones comuns (Lucide, etc)
+    if element.tag not in ICON_ARIA_LABELS and not ICON_TAG_PATTERN.match(element.tag):
+        return
+    
+    # Se o ícone está dentro de um botão com aria-label, deve ter aria-hidden
+    if 'aria-hidden' not in element.attrs:
+        yield AriaIssue(
+            file=ctx.filepath,
+            line=element.line,
+            element=element.tag,
+            issue_type='icon_without_aria_hidden',
+            suggestion='aria-hidden="true"',
+            severity='info'
+        )
+
 # =============================================================================
 # FUNÇÕES DE ANÁLISE
 # =============================================================================
 
 def find_buttons_without_aria(content: str, filepath: str) -> List[AriaIssue]:
     """Encontra botões sem aria-label."""
-    issues = []
-    lines = content.split('\n')
-    
-    # Padrão para encontrar botões
-    button_pattern = re.compile(r'<button([^>]*)>', re.DOTALL)
-    
-    for i, line in enumerate(lines, 1):
-        for match in button_pattern.finditer(line):
-            attrs = match.group(1)
-            
-            # Verificar se já tem aria-label
-            if 'aria-label' not in attrs:
-                # Tentar inferir aria-label
-                suggestion = infer_aria_label(attrs, line)
-                
-                issues.append(AriaIssue(
-                    file=filepath,
-                    line=i,
-                    element='button',
-                    issue_type='missing_aria_label',
-                    suggestion=suggestion,
-                    severity='error'
-                ))
-            
-            # Verificar se tem type
-            if 'type=' not in attrs:
-                issues.append(AriaIssue(
-                    file=filepath,
-                    line=i,
-                    element='button',
-                    issue_type='missing_type',
-                    suggestion='type="button"',
-                    severity='warning'
-                ))
-    
-    return issues
+    return ARIA_RULES.compile(['button-label']).run(content, filepath)
 
 def find_clickable_divs(content: str, filepath: str) -> List[AriaIssue]:
     """Encontra divs clicáveis sem role e aria-label."""
-    issues = []
-    lines = content.split('\n')
-    
-    # Padrão para divs com onClick
-    div_pattern = re.compile(r'<div([^>]*onClick[^>]*)>', re.DOTALL)
-    
-    for i, line in enumerate(lines, 1):
-        for match in div_pattern.finditer(line):
-            attrs = match.group(1)
-            
-            if 'role=' not in attrs:
-                issues.append(AriaIssue(
-                    file=filepath,
-                    line=i,
-                    element='div',
-                    issue_type='clickable_without_role',
-                    suggestion='role="button" tabIndex={0}',
-                    severity='error'
-                ))
-            
-            if 'aria-label' not in attrs:
-                issues.append(AriaIssue(
-                    file=filepath,
-                    line=i,
-                    element='div',
-                    issue_type='missing_aria_label',
-                    suggestion='aria-label="PREENCHER"',
-                    severity='error'
-                ))
-    
-    return issues
+    return ARIA_RULES.compile(['clickable-div']).run(content, filepath)
 
 def find_images_without_alt(content: str, filepath: str) -> List[AriaIssue]:
     """Encontra imagens sem alt text."""
-    issues = []
-    lines = content.split('\n')
-    
-    # Padrão para imagens
-    img_pattern = re.compile(r'<img([^>]*)/?>', re.DOTALL)
-    
-    for i, line in enumerate(lines, 1):
-        for match in img_pattern.finditer(line):
-            attrs = match.group(1)
-            
-            if 'alt=' not in attrs:
-                issues.append(AriaIssue(
-                    file=filepath,
-                    line=i,
-                    element='img',
-                    issue_type='missing_alt',
-                    suggestion='alt="Descrição da imagem"',
-                    severity='error'
-                ))
-    
-    return issues
+    return ARIA_RULES.compile(['img-alt']).run(content, filepath)
 
 def find_icons_without_aria_hidden(content: str, filepath: str) -> List[AriaIssue]:
     """Encontra ícones que deveriam ter aria-hidden."""
-    issues = []
-    lines = content.split('\n')
-    
-    # Padrão para ícones comuns (Lucide, etc)
-    icon_pattern = re.compile(r'<([A-Z][a-zA-Z]+Icon|' + '|'.join(ICON_ARIA_LABELS.keys()) + r')([^>]*)/?>')
-    
-    for i, line in enumerate(lines, 1):
-        for match in icon_pattern.finditer(line):
-            icon_name = match.group(1)
-            attrs = match.group(2)
-            
-            # Se o ícone está dentro de um botão com aria-label, deve ter aria-hidden
-            if 'aria-hidden' not in attrs:
-                issues.append(AriaIssue(
-                    file=filepath,
-                    line=i,
-                    element=icon_name,
-                    issue_type='icon_without_aria_hidden',
-                    suggestion='aria-hidden="true"',
-                    severity='info'
-                ))
-    
-    return issues
+    return ARIA_RULES.compile(['icon-hidden']).run(content, filepath)
 
 def infer_aria_label(attrs: str, context: str) -> str:
     """Tenta inferir o aria-label baseado no contexto."""
@@ -320,7 +316,7 @@ def infer_aria_label(attrs: str, context: str) -> str:
 
 def generate_fix(issue: AriaIssue, content: str) -> Optional[AriaFix]:
     """Gera uma correção para um problema de ARIA."""
-    lines = content.split('\n')
+    lines = scan(content).lines
     if issue.line > len(lines):
         return None
     
@@ -394,7 +390,7 @@ def apply_fixes(fixes: List[AriaFix], dry_run: bool = True) -> int:
         # Ordenar por linha (decrescente para não afetar índices)
         file_fixes.sort(key=lambda f: f.line, reverse=True)
         
-        content = Path(filepath).read_text()
+        content = read_source(filepath)
         lines = content.split('\n')
         
         for fix in file_fixes:
@@ -486,29 +482,53 @@ def generate_report(result: AuditResult) -> str:
 # FUNÇÃO PRINCIPAL
 # =============================================================================
 
-def audit_file(filepath: Path) -> Tuple[List[AriaIssue], int, int]:
+def audit_file(filepath: Path, engine: Optional[RuleEngine] = None) -> Tuple[List[AriaIssue], int, int]:
     """Audita um arquivo TSX."""
-    content = filepath.read_text()
-    issues = []
+    scanned = scan_file(filepath)
+    content = scanned.content
     
     # Contar elementos
-    buttons = len(re.findall(r'<button', content))
-    divs_clickable = len(re.findall(r'<div[^>]*onClick', content))
-    images = len(re.findall(r'<img', content))
+    buttons = sum(1 for _ in scanned.by_tag('button'))
+    divs_clickable = sum(1 for e in scanned.by_tag('div') if e.has('onClick'))
+    images = sum(1 for _ in scanned.by_tag('img'))
     total = buttons + divs_clickable + images
     
-    # Encontrar problemas
-    issues.extend(find_buttons_without_aria(content, str(filepath)))
-    issues.extend(find_clickable_divs(content, str(filepath)))
-    issues.extend(find_images_without_alt(content, str(filepath)))
-    issues.extend(find_icons_without_aria_hidden(content, str(filepath)))
+    # Encontrar problemas (uma passada com as regras ativas)
+    if engine is None:
+        engine = ARIA_RULES.compile()
+    issues = engine.run(content, str(filepath))
     
     # Contar elementos já acessíveis
-    accessible = len(re.findall(r'aria-label=', content))
+    accessible = content.count('aria-label=')
     
     return issues, total, accessible
 
-def main():
+def watch(roots: List[Path], engine: RuleEngine, json_path: Path) -> int:
+    """Modo --watch: reaudita só os arquivos alterados."""
+    cwd = Path.cwd()
+    
+    def analyze(filepath: Path) -> Tuple[List[AriaIssue], int, int]:
+        # Mesmos caminhos relativos da auditoria completa
+        if cwd in filepath.parents:
+            filepath = filepath.relative_to(cwd)
+        return audit_file(filepath, engine)
+    
+    def report(results: Dict[Path, Tuple[List[AriaIssue], int, int]]) -> Dict:
+        issues = [issue for file_issues, _, _ in results.values() for issue in file_issues]
+        return {
+            'total_elements': sum(total for _, total, _ in results.values()),
+            'already_accessible': sum(accessible for _, _, accessible in results.values()),
+            'issues_found': len(issues),
+            'issues': [asdict(issue) for issue in issues],
+        }
+    
+    def describe(filepath: Path, result: Tuple[List[AriaIssue], int, int]) -> List[str]:
+        return [f"{i.line}: {i.severity} <{i.element}> {i.issue_type} → {i.suggestion}" for i in result[0]]
+    
+    session = WatchSession(analyze, report, describe, json_path, title='Auditoria ARIA')
+    return session.run(roots, extensions=('.tsx',), excluded=('__tests__', 'node_modules'))
+
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(
         description="Auditoria e correção de ARIA labels para TSiJUKEBOX"
     )
@@ -522,8 +542,14 @@ def main():
                         help='Processar arquivo específico')
     parser.add_argument('--verbose', '-v', action='store_true',
                         help='Saída detalhada')
+    add_rule_arguments(parser)
+    add_watch_arguments(parser, WATCH_FILE)
+    
+    args = parser.parse_args(argv)
+    engine = engine_from_args(ARIA_RULES, parser, args)
     
-    args = parser.parse_args()
+    if args.watch:
+        return watch([Path(args.file)] if args.file else [SRC_DIR], engine, Path(args.watch_json))
     
     # Determinar arquivos a processar
     if args.file:
@@ -538,7 +564,7 @@ def main():
     result.total_files = len(files)
     
     for filepath in files:
-        issues, total, accessible = audit_file(filepath)
+        issues, total, accessible = audit_file(filepath, engine)
         result.issues.extend(issues)
         result.total_elements += total
         result.already_accessible += accessible
@@ -548,7 +574,7 @@ def main():
     
     # Gerar correções
     for issue in result.issues:
-        content = Path(issue.file).read_text()
+        content = scan_file(issue.file).content
         fix = generate_fix(issue, content)
         if fix:
             result.fixes.append(fix)
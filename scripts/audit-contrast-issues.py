@@ -17,6 +17,7 @@ Uso:
     python3 scripts/audit-contrast-issues.py --summary    # Apenas resumo
     python3 scripts/audit-contrast-issues.py --export     # Exportar para CSV
     python3 scripts/audit-contrast-issues.py --critical   # Apenas arquivos críticos
+    python3 scripts/audit-contrast-issues.py --watch      # Reanalisar a cada salvamento
 """
 
 import re
@@ -25,13 +26,18 @@ import csv
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from typing import List, Dict, Tuple
 
+from file_watcher import WatchSession, add_watch_arguments
+
 # Diretório base
 BASE_DIR = Path(__file__).parent.parent
 SRC_DIR = BASE_DIR / "src"
 
+# JSON republicado a cada alteração no modo --watch
+DEFAULT_WATCH_FILE = BASE_DIR / ".cache" / "contrast-audit-watch.json"
+
 # Padrões de contraste problemáticos
 CONTRAST_PATTERNS = {
     # Padrão: (regex, descrição, severidade, sugestão)
@@ -352,6 +358,31 @@ def export_to_csv(issues: List[ContrastIssue], output_path: Path):
             ])
 
 
+def watch(roots: List[Path], json_path: Path, critical_only: bool = False) -> int:
+    """Modo --watch: reescaneia só os arquivos alterados."""
+    
+    def analyze(filepath: Path) -> List[ContrastIssue]:
+        issues = scan_file(filepath)
+        return [i for i in issues if i.is_critical] if critical_only else issues
+    
+    def report(results: Dict[Path, List[ContrastIssue]]) -> Dict:
+        issues = [issue for file_issues in results.values() for issue in file_issues]
+        by_severity: Dict[str, int] = defaultdict(int)
+        for issue in issues:
+            by_severity[issue.severity] += 1
+        return {
+            'issues_found': len(issues),
+            'issues_by_severity': dict(by_severity),
+            'issues': [asdict(issue) for issue in issues],
+        }
+    
+    def describe(filepath: Path, issues: List[ContrastIssue]) -> List[str]:
+        return [f"{i.line}:{i.column} {i.severity} {i.pattern} `{i.match}`" for i in issues]
+    
+    session = WatchSession(analyze, report, describe, json_path, title='Auditoria de contraste')
+    return session.run(roots, extensions=('.tsx',))
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Auditoria de problemas de contraste no TSiJUKEBOX'
@@ -364,9 +395,16 @@ def main():
                         help='Mostrar apenas arquivos críticos')
     parser.add_argument('--file', type=str,
                         help='Analisar arquivo específico')
+    add_watch_arguments(parser, DEFAULT_WATCH_FILE.relative_to(BASE_DIR))
     
     args = parser.parse_args()
     
+    if args.watch:
+        watch_json = Path(args.watch_json)
+        return watch([Path(args.file)] if args.file else [SRC_DIR],
+                     watch_json if watch_json.is_absolute() else BASE_DIR / watch_json,
+                     critical_only=args.critical)
+    
     # Coletar arquivos
     if args.file:
         files = [Path(args.file)]
@@ -13,6 +13,15 @@ Formatos suportados:
 - Tailwind CSS: text-gray-500, bg-zinc-800
 - CSS Variables: var(--color-name)
 
+Desempenho:
+- Linearização sRGB em tabela de 256 entradas (sem pow por chamada)
+- COLOR_TABLE: ColorValue internado para cada cor Tailwind
+- parse_color, blend e contraste memoizados (LRU)
+- batch_contrast: blend, luminância, ratio e WCAG para N pares de uma vez
+  (vetorizado com NumPy quando instalado; Python puro caso contrário)
+- suggest_accessible_color: bisseção na luminosidade HSL
+- `python3 color_utils.py --benchmark` mede o custo por chamada
+
 Referências:
 - WCAG 2.1 Luminância Relativa: https://www.w3.org/WAI/GL/wiki/Relative_luminance
 - WCAG 2.1 Ratio de Contraste: https://www.w3.org/WAI/GL/wiki/Contrast_ratio
@@ -23,20 +32,51 @@ Data: 2025-12-25
 """
 
 import re
+import sys
+import time
 import colorsys
 from dataclasses import dataclass
-from typing import Tuple, Optional, Dict, Union
+from functools import lru_cache
+from typing import Tuple, Optional, Dict, Union, Sequence, List
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional; batch_contrast cai para Python puro
+    np = None
+
+
+# Limiares WCAG 2.1 por tamanho de texto
+WCAG_THRESHOLDS = {
+    'normal': {'AA': 4.5, 'AAA': 7.0},
+    'large': {'AA': 3.0, 'AAA': 4.5},
+}
+
+# Precisão da busca de luminosidade (pontos percentuais de L)
+SUGGEST_PRECISION = 0.01
+
+# Tamanhos dos caches LRU
+PARSE_CACHE_SIZE = 4096
+CONTRAST_CACHE_SIZE = 16384
+
+_CLASS_PREFIX_RE = re.compile(r'^(?:text|bg|border|ring|fill|stroke)-')
+_OPACITY_SUFFIX_RE = re.compile(r'/(\d+)$')
+_CSS_VAR_RE = re.compile(r'var\(--([a-zA-Z0-9-]+)\)')
+_RGB_RE = re.compile(r'rgba?\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)(?:\s*,\s*([\d.]+))?\s*\)', re.IGNORECASE)
+_HSL_RE = re.compile(r'hsla?\(\s*([\d.]+)\s*,\s*([\d.]+)%\s*,\s*([\d.]+)%(?:\s*,\s*([\d.]+))?\s*\)', re.IGNORECASE)
 
 
 # =============================================================================
 # ESTRUTURAS DE DADOS
 # =============================================================================
 
-@dataclass
+@dataclass(frozen=True)
 class ColorValue:
     """
     Representa uma cor em múltiplos formatos.
     
+    Imutável: as mesmas instâncias são devolvidas por COLOR_TABLE e pelo
+    cache de parse_color, então alterar uma delas contaminaria as demais.
+    
     Attributes:
         original: Valor original como aparece no código
         hex: Formato hexadecimal normalizado (#RRGGBB)
@@ -448,9 +488,7 @@ def parse_rgb_string(rgb_str: str) -> Tuple[int, int, int, float]:
         >>> parse_rgb_string('rgba(0, 0, 0, 0.5)')
         (0, 0, 0, 0.5)
     """
-    # Regex para capturar valores
-    pattern = r'rgba?\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)(?:\s*,\s*([\d.]+))?\s*\)'
-    match = re.match(pattern, rgb_str.strip(), re.IGNORECASE)
+    match = _RGB_RE.match(rgb_str.strip())
     
     if not match:
         raise ValueError(f"Formato RGB inválido: {rgb_str}")
@@ -479,9 +517,7 @@ def parse_hsl_string(hsl_str: str) -> Tuple[float, float, float, float]:
         >>> parse_hsl_string('hsla(0, 100%, 50%, 0.8)')
         (0.0, 100.0, 50.0, 0.8)
     """
-    # Regex para capturar valores
-    pattern = r'hsla?\(\s*([\d.]+)\s*,\s*([\d.]+)%\s*,\s*([\d.]+)%(?:\s*,\s*([\d.]+))?\s*\)'
-    match = re.match(pattern, hsl_str.strip(), re.IGNORECASE)
+    match = _HSL_RE.match(hsl_str.strip())
     
     if not match:
         raise ValueError(f"Formato HSL inválido: {hsl_str}")
@@ -498,6 +534,18 @@ def parse_hsl_string(hsl_str: str) -> Tuple[float, float, float, float]:
 # CÁLCULO DE LUMINÂNCIA E CONTRASTE
 # =============================================================================
 
+def _linearize(value: float) -> float:
+    """Aplica correção gamma (sRGB para linear)."""
+    v = value / 255
+    if v <= 0.03928:
+        return v / 12.92
+    return ((v + 0.055) / 1.055) ** 2.4
+
+
+# Canal sRGB 0-255 → valor linear, calculado uma única vez
+LINEAR_TABLE: Tuple[float, ...] = tuple(_linearize(v) for v in range(256))
+
+
 def get_relative_luminance(rgb: Tuple[int, int, int]) -> float:
     """
     Calcula a luminância relativa conforme WCAG 2.1.
@@ -529,24 +577,14 @@ def get_relative_luminance(rgb: Tuple[int, int, int]) -> float:
         >>> round(get_relative_luminance((29, 185, 84)), 4)  # Spotify green
         0.3529
     """
-    def linearize(value: int) -> float:
-        """Aplica correção gamma (sRGB para linear)."""
-        v = value / 255
-        if v <= 0.03928:
-            return v / 12.92
-        else:
-            return ((v + 0.055) / 1.055) ** 2.4
-    
     r, g, b = rgb
     
-    r_lin = linearize(r)
-    g_lin = linearize(g)
-    b_lin = linearize(b)
-    
     # Coeficientes de luminância (baseados na sensibilidade do olho humano)
-    luminance = 0.2126 * r_lin + 0.7152 * g_lin + 0.0722 * b_lin
-    
-    return luminance
+    try:
+        return 0.2126 * LINEAR_TABLE[r] + 0.7152 * LINEAR_TABLE[g] + 0.0722 * LINEAR_TABLE[b]
+    except (IndexError, TypeError):
+        # Componentes não inteiros ou fora de 0-255
+        return 0.2126 * _linearize(r) + 0.7152 * _linearize(g) + 0.0722 * _linearize(b)
 
 
 def calculate_contrast_ratio(
@@ -579,20 +617,9 @@ def calculate_contrast_ratio(
         >>> round(calculate_contrast_ratio((119, 119, 119), (255, 255, 255)), 2)
         4.48
     """
-    # Extrair RGB se for ColorValue
-    if isinstance(fg, ColorValue):
-        fg_rgb = fg.rgb
-    else:
-        fg_rgb = fg
-    
-    if isinstance(bg, ColorValue):
-        bg_rgb = bg.rgb
-    else:
-        bg_rgb = bg
-    
-    # Calcular luminâncias
-    l1 = get_relative_luminance(fg_rgb)
-    l2 = get_relative_luminance(bg_rgb)
+    # ColorValue já traz a luminância calculada
+    l1 = fg.luminance if isinstance(fg, ColorValue) else get_relative_luminance(fg)
+    l2 = bg.luminance if isinstance(bg, ColorValue) else get_relative_luminance(bg)
     
     # Garantir que L1 seja a mais clara
     lighter = max(l1, l2)
@@ -634,12 +661,7 @@ def evaluate_contrast(
         >>> evaluate_contrast(3.5, 'large')
         {'ratio': 3.5, 'passes_aa': True, 'passes_aaa': False, ...}
     """
-    thresholds = {
-        'normal': {'AA': 4.5, 'AAA': 7.0},
-        'large': {'AA': 3.0, 'AAA': 4.5},
-    }
-    
-    t = thresholds.get(text_size, thresholds['normal'])
+    t = WCAG_THRESHOLDS.get(text_size, WCAG_THRESHOLDS['normal'])
     
     passes_aa = ratio >= t['AA']
     passes_aaa = ratio >= t['AAA']
@@ -670,6 +692,38 @@ def evaluate_contrast(
     }
 
 
+# =============================================================================
+# TABELA DE CORES INTERNADAS
+# =============================================================================
+
+def _build_color_table() -> Dict[str, ColorValue]:
+    """ColorValue (com luminância já calculada) para cada nome de TAILWIND_COLORS."""
+    table = {}
+    for name, hex_value in TAILWIND_COLORS.items():
+        rgb = hex_to_rgb(hex_value)
+        table[name] = ColorValue(
+            original=name,
+            hex=rgb_to_hex(*rgb),
+            rgb=rgb,
+            rgba=(rgb[0], rgb[1], rgb[2], 1.0),
+            luminance=get_relative_luminance(rgb),
+            source='tailwind'
+        )
+    return table
+
+
+# Construída na importação; alterações posteriores em TAILWIND_COLORS
+# exigem rebuild_color_table()
+COLOR_TABLE: Dict[str, ColorValue] = _build_color_table()
+
+
+def rebuild_color_table() -> None:
+    """Reconstrói COLOR_TABLE e limpa os caches."""
+    COLOR_TABLE.clear()
+    COLOR_TABLE.update(_build_color_table())
+    clear_color_caches()
+
+
 # =============================================================================
 # PARSER UNIVERSAL DE CORES
 # =============================================================================
@@ -701,11 +755,22 @@ def parse_color(color_str: str) -> Optional[ColorValue]:
     """
     if not color_str:
         return None
-    
+    return _parse_color_cached(color_str)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_color_cached(color_str: str) -> Optional[ColorValue]:
+    """parse_color memoizado; o ColorValue retornado é compartilhado."""
+    return _parse_color_uncached(color_str)
+
+
+def _parse_color_uncached(color_str: str) -> Optional[ColorValue]:
+    """Parser sem cache (usado nas faltas do LRU e no benchmark)."""
     color_str = color_str.strip()
     original = color_str
     opacity = 1.0
     source = 'unknown'
+    luminance = None
     
     try:
         # 1. Hex format
@@ -727,40 +792,35 @@ def parse_color(color_str: str) -> Optional[ColorValue]:
         
         # 4. CSS variable
         elif color_str.startswith('var('):
-            var_name = re.search(r'var\(--([a-zA-Z0-9-]+)\)', color_str)
+            var_name = _CSS_VAR_RE.search(color_str)
             if var_name:
-                var_key = var_name.group(1)
-                if var_key in TAILWIND_COLORS:
-                    rgb = hex_to_rgb(TAILWIND_COLORS[var_key])
-                    source = 'css-var'
-                else:
+                base = COLOR_TABLE.get(var_name.group(1))
+                if base is None:
                     return None  # Variável não mapeada
+                rgb, luminance = base.rgb, base.luminance
+                source = 'css-var'
             else:
                 return None
         
         # 5. Tailwind color name
         else:
             # Remover prefixos comuns
-            clean_name = color_str
-            for prefix in ['text-', 'bg-', 'border-', 'ring-', 'fill-', 'stroke-']:
-                if clean_name.startswith(prefix):
-                    clean_name = clean_name[len(prefix):]
-                    break
+            clean_name = _CLASS_PREFIX_RE.sub('', color_str, count=1)
             
             # Remover sufixo de opacidade (/50, /[0.5])
-            opacity_match = re.search(r'/(\d+)$', clean_name)
+            opacity_match = _OPACITY_SUFFIX_RE.search(clean_name)
             if opacity_match:
                 opacity = int(opacity_match.group(1)) / 100
                 clean_name = clean_name[:opacity_match.start()]
             
-            if clean_name in TAILWIND_COLORS:
-                rgb = hex_to_rgb(TAILWIND_COLORS[clean_name])
-                source = 'tailwind'
-            else:
+            base = COLOR_TABLE.get(clean_name)
+            if base is None:
                 return None  # Cor não reconhecida
+            rgb, luminance = base.rgb, base.luminance
+            source = 'tailwind'
         
-        # Calcular luminância
-        luminance = get_relative_luminance(rgb)
+        if luminance is None:
+            luminance = get_relative_luminance(rgb)
         
         return ColorValue(
             original=original,
@@ -776,6 +836,39 @@ def parse_color(color_str: str) -> Optional[ColorValue]:
         return None
 
 
+@lru_cache(maxsize=CONTRAST_CACHE_SIZE)
+def contrast_ratio(fg: str, bg: str, opacity: float = 1.0) -> Optional[float]:
+    """
+    Ratio de contraste entre duas cores em texto, memoizado por (fg, bg, opacity).
+    
+    Args:
+        fg: Cor do primeiro plano em qualquer formato aceito por parse_color
+        bg: Cor do fundo
+        opacity: Opacidade do primeiro plano sobre o fundo
+    
+    Returns:
+        Ratio arredondado como calculate_contrast_ratio, ou None se alguma
+        cor não for reconhecida
+    
+    Examples:
+        >>> contrast_ratio('gray-500', 'white')
+        4.83
+    """
+    fg_color = parse_color(fg)
+    bg_color = parse_color(bg)
+    if fg_color is None or bg_color is None:
+        return None
+    if opacity < 1.0:
+        fg_color = blend_with_background(fg_color, bg_color, opacity)
+    return calculate_contrast_ratio(fg_color, bg_color)
+
+
+def clear_color_caches() -> None:
+    """Limpa os caches de parse e contraste."""
+    _parse_color_cached.cache_clear()
+    contrast_ratio.cache_clear()
+
+
 def blend_with_background(
     fg: ColorValue,
     bg: ColorValue,
@@ -837,6 +930,32 @@ def get_tailwind_color(name: str) -> Optional[ColorValue]:
     return parse_color(name)
 
 
+def _hsl_rgb(h: float, s: float, l: float) -> Tuple[int, int, int]:
+    """
+    HSL (H 0-360, S e L 0-100) para RGB, sem a heurística de escala de
+    hsl_to_rgb e arredondando (L = 100 é sempre branco puro).
+    """
+    r, g, b = colorsys.hls_to_rgb(h / 360, l / 100, s / 100)
+    return (round(r * 255), round(g * 255), round(b * 255))
+
+
+def _bisect_lightness(h: float, s: float, lo: float, hi: float, passes) -> float:
+    """
+    Limite em [lo, hi] onde `passes(luminância)` muda de valor.
+    
+    A luminância de HSL é monótona em L (H e S fixos); `passes` deve ser
+    verdadeiro em `hi` e falso em `lo`. Retorna o L mais próximo de `lo`
+    que passa, com precisão SUGGEST_PRECISION.
+    """
+    while abs(hi - lo) > SUGGEST_PRECISION:
+        mid = (lo + hi) / 2
+        if passes(get_relative_luminance(_hsl_rgb(h, s, mid))):
+            hi = mid
+        else:
+            lo = mid
+    return hi
+
+
 def suggest_accessible_color(
     current: ColorValue,
     background: ColorValue,
@@ -845,7 +964,11 @@ def suggest_accessible_color(
     """
     Sugere uma cor acessível baseada na cor atual.
     
-    Ajusta a luminosidade da cor atual até atingir o ratio desejado.
+    Mantém matiz e saturação e busca por bisseção a luminosidade mais
+    próxima da atual que atinge o ratio desejado, escurecendo ou clareando
+    (o que exigir a menor mudança). Os limites de luminância vêm da fórmula
+    do ratio: L <= (Lb + 0.05) / ratio - 0.05 (mais escura que o fundo) ou
+    L >= ratio * (Lb + 0.05) - 0.05 (mais clara).
     
     Args:
         current: Cor atual
@@ -857,34 +980,186 @@ def suggest_accessible_color(
     """
     h, s, l = rgb_to_hsl(*current.rgb)
     bg_luminance = background.luminance
+    max_dark = (bg_luminance + 0.05) / target_ratio - 0.05
+    min_light = target_ratio * (bg_luminance + 0.05) - 0.05
     
-    # Determinar direção do ajuste
-    if bg_luminance > 0.5:
-        # Fundo claro: escurecer o texto
-        direction = -1
-        l_range = range(int(l), 0, -5)
+    if calculate_contrast_ratio(current.rgb, background) >= target_ratio:
+        # Já atende: mantém a cor
+        new_rgb = current.rgb
     else:
-        # Fundo escuro: clarear o texto
-        direction = 1
-        l_range = range(int(l), 100, 5)
-    
-    for new_l in l_range:
-        new_rgb = hsl_to_rgb(h, s, new_l)
-        new_color = ColorValue(
-            original=f"suggested({current.original})",
-            hex=rgb_to_hex(*new_rgb),
-            rgb=new_rgb,
-            rgba=(*new_rgb, 1.0),
-            luminance=get_relative_luminance(new_rgb),
-            source='suggested',
-            opacity=1.0
-        )
-        
-        ratio = calculate_contrast_ratio(new_color, background)
-        if ratio >= target_ratio:
-            return new_color
+        candidates = []
+        if max_dark >= 0:
+            # L = 0 é preto (luminância 0), sempre dentro do limite
+            candidates.append(_bisect_lightness(h, s, l, 0.0, lambda lum: lum <= max_dark))
+        if min_light <= 1:
+            # L = 100 é branco (luminância 1)
+            candidates.append(_bisect_lightness(h, s, l, 100.0, lambda lum: lum >= min_light))
+        if not candidates:
+            return None
+        new_l = min(candidates, key=lambda candidate: abs(candidate - l))
+        new_rgb = _hsl_rgb(h, s, new_l)
+    return ColorValue(
+        original=f"suggested({current.original})",
+        hex=rgb_to_hex(*new_rgb),
+        rgb=new_rgb,
+        rgba=(*new_rgb, 1.0),
+        luminance=get_relative_luminance(new_rgb),
+        source='suggested',
+        opacity=1.0
+    )
+
+
+# =============================================================================
+# AVALIAÇÃO EM LOTE
+# =============================================================================
+
+def batch_contrast(
+    fg_rgb: Sequence[Tuple[int, int, int]],
+    bg_rgb: Sequence[Tuple[int, int, int]],
+    opacity: Union[float, Sequence[float]] = 1.0,
+    text_size: str = 'normal'
+) -> Dict[str, List]:
+    """
+    Avalia N pares de cores de uma vez.
+    
+    Equivale a blend_with_background + calculate_contrast_ratio +
+    evaluate_contrast por par, num único passe vetorizado quando o NumPy
+    está disponível.
+    
+    Args:
+        fg_rgb: Cores do primeiro plano, (N, 3) com valores 0-255
+        bg_rgb: Cores de fundo, (N, 3)
+        opacity: Opacidade do primeiro plano (escalar ou N valores)
+        text_size: 'normal' ou 'large'
+    
+    Returns:
+        Dicionário de listas com N itens: 'blended', 'fg_luminance',
+        'bg_luminance', 'ratio', 'passes_aa', 'passes_aaa'
     
-    return None
+    Examples:
+        >>> batch_contrast([(0, 0, 0), (255, 255, 255)], [(255, 255, 255)] * 2)['ratio']
+        [21.0, 1.0]
+    """
+    t = WCAG_THRESHOLDS.get(text_size, WCAG_THRESHOLDS['normal'])
+    if not len(fg_rgb):
+        return {key: [] for key in ('blended', 'fg_luminance', 'bg_luminance',
+                                    'ratio', 'passes_aa', 'passes_aaa')}
+    if np is None:
+        return _batch_contrast_python(fg_rgb, bg_rgb, opacity, t)
+    
+    fg = np.asarray(fg_rgb, dtype=np.float64)
+    bg = np.asarray(bg_rgb, dtype=np.float64)
+    alpha = np.broadcast_to(np.asarray(opacity, dtype=np.float64), fg.shape[:1])[:, None]
+    blended = np.where(alpha < 1.0, np.floor(fg * alpha + bg * (1 - alpha)), fg).astype(np.intp)
+    
+    table = np.asarray(LINEAR_TABLE)
+    weights = np.array([0.2126, 0.7152, 0.0722])
+    fg_lum = (table[blended] * weights).sum(axis=1)
+    bg_lum = (table[bg.astype(np.intp)] * weights).sum(axis=1)
+    ratio = np.round((np.maximum(fg_lum, bg_lum) + 0.05) / (np.minimum(fg_lum, bg_lum) + 0.05), 2)
+    
+    return {
+        'blended': [tuple(row) for row in blended.tolist()],
+        'fg_luminance': fg_lum.tolist(),
+        'bg_luminance': bg_lum.tolist(),
+        'ratio': ratio.tolist(),
+        'passes_aa': (ratio >= t['AA']).tolist(),
+        'passes_aaa': (ratio >= t['AAA']).tolist(),
+    }
+
+
+def _batch_contrast_python(fg_rgb, bg_rgb, opacity, t) -> Dict[str, List]:
+    """batch_contrast sem NumPy (mesmos resultados, laço em Python)."""
+    opacities = [opacity] * len(fg_rgb) if isinstance(opacity, (int, float)) else list(opacity)
+    result = {key: [] for key in ('blended', 'fg_luminance', 'bg_luminance',
+                                  'ratio', 'passes_aa', 'passes_aaa')}
+    for fg, bg, alpha in zip(fg_rgb, bg_rgb, opacities):
+        if alpha < 1.0:
+            fg = tuple(int(f * alpha + b * (1 - alpha)) for f, b in zip(fg, bg))
+        fg_lum = get_relative_luminance(tuple(fg))
+        bg_lum = get_relative_luminance(tuple(bg))
+        ratio = round((max(fg_lum, bg_lum) + 0.05) / (min(fg_lum, bg_lum) + 0.05), 2)
+        result['blended'].append(tuple(fg))
+        result['fg_luminance'].append(fg_lum)
+        result['bg_luminance'].append(bg_lum)
+        result['ratio'].append(ratio)
+        result['passes_aa'].append(ratio >= t['AA'])
+        result['passes_aaa'].append(ratio >= t['AAA'])
+    return result
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+BENCHMARK_SAMPLES = [
+    'text-gray-500', 'bg-zinc-900', 'text-white/70', 'muted-foreground',
+    '#1DB954', '#fff', 'rgb(255, 128, 0)', 'hsl(142, 71%, 42%)', 'var(--primary)',
+]
+BENCHMARK_PAIRS = [
+    ('text-gray-500', 'bg-white', 1.0), ('text-zinc-400', 'bg-zinc-900', 1.0),
+    ('text-white', 'bg-zinc-950', 0.7), ('#1DB954', 'black', 1.0),
+]
+
+BENCHMARK_BATCH = 5000
+
+
+def _time_per_call(func, args_list, iterations: int) -> float:
+    """Custo médio por chamada em nanossegundos."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for args in args_list:
+            func(*args)
+    return (time.perf_counter() - started) * 1e9 / (iterations * len(args_list))
+
+
+def run_benchmark(iterations: int = 20000) -> Dict[str, Tuple[float, float]]:
+    """
+    Mede o custo por chamada antes (sem tabela/cache) e depois.
+    
+    Returns:
+        {operação: (ns antes, ns depois)}
+    """
+    def luminance_formula(rgb):
+        r, g, b = rgb
+        return 0.2126 * _linearize(r) + 0.7152 * _linearize(g) + 0.0722 * _linearize(b)
+    
+    def contrast_uncached(fg, bg, opacity):
+        fg_color = _parse_color_uncached(fg)
+        bg_color = _parse_color_uncached(bg)
+        if opacity < 1.0:
+            fg_color = blend_with_background(fg_color, bg_color, opacity)
+        l1 = luminance_formula(fg_color.rgb)
+        l2 = luminance_formula(bg_color.rgb)
+        return round((max(l1, l2) + 0.05) / (min(l1, l2) + 0.05), 2)
+    
+    samples = [(sample,) for sample in BENCHMARK_SAMPLES]
+    rgbs = [(parse_color(sample).rgb,) for sample in BENCHMARK_SAMPLES]
+    results = {
+        'luminance': (_time_per_call(luminance_formula, rgbs, iterations),
+                      _time_per_call(get_relative_luminance, rgbs, iterations)),
+        'parse_color': (_time_per_call(_parse_color_uncached, samples, iterations),
+                        _time_per_call(parse_color, samples, iterations)),
+        'contrast': (_time_per_call(contrast_uncached, BENCHMARK_PAIRS, iterations),
+                     _time_per_call(contrast_ratio, BENCHMARK_PAIRS, iterations)),
+    }
+    
+    # Lote: custo por par avaliando BENCHMARK_BATCH pares por chamada
+    fg = [(v * 7 % 256, v * 13 % 256, v * 29 % 256) for v in range(BENCHMARK_BATCH)]
+    bg = [(255 - r, 255 - g, 255 - b) for r, g, b in fg]
+    thresholds = WCAG_THRESHOLDS['normal']
+    rounds = max(1, iterations // 1000)
+    results['batch'] = (
+        _time_per_call(_batch_contrast_python, [(fg, bg, 0.8, thresholds)], rounds) / BENCHMARK_BATCH,
+        _time_per_call(batch_contrast, [(fg, bg, 0.8)], rounds) / BENCHMARK_BATCH,
+    )
+    
+    print(f"⏱️  color_utils benchmark ({iterations} iterações)")
+    print("-" * 50)
+    print(f"  {'operação':<14}{'antes (ns)':>12}{'depois (ns)':>13}{'ganho':>9}")
+    for name, (before, after) in results.items():
+        print(f"  {name:<14}{before:>12.0f}{after:>13.0f}{before / after:>8.1f}x")
+    return results
 
 
 # =============================================================================
@@ -949,6 +1224,35 @@ def run_tests():
     gray500 = parse_color('gray-500')
     test("gray-500 existe", gray500 is not None)
     test("gray-500 hex correto", gray500.hex == '#6b7280' if gray500 else False)
+    test("text-white/50 opacidade", parse_color('text-white/50').opacity == 0.5)
+    
+    # Testes de tabela e cache
+    print("\n📝 Testes de tabela e cache:")
+    test("tabela linear = fórmula", all(LINEAR_TABLE[v] == _linearize(v) for v in range(256)))
+    test("parse_color memoizado", parse_color('bg-zinc-800') is parse_color('bg-zinc-800'))
+    test("contrast_ratio = calculate_contrast_ratio",
+         contrast_ratio('gray-500', 'white') == calculate_contrast_ratio(gray500, parse_color('white')))
+    test("contrast_ratio com opacidade",
+         contrast_ratio('white', 'black', 0.5) == calculate_contrast_ratio((127, 127, 127), (0, 0, 0)))
+    test("contrast_ratio cor inválida", contrast_ratio('invalid', 'white') is None)
+    
+    # Testes de lote e sugestão
+    print("\n📝 Testes de lote e sugestão:")
+    pairs = [((119, 119, 119), (255, 255, 255), 1.0), ((255, 255, 255), (0, 0, 0), 0.5),
+             ((29, 185, 84), (9, 9, 11), 0.7)]
+    batch = batch_contrast([p[0] for p in pairs], [p[1] for p in pairs], [p[2] for p in pairs])
+    scalar = [contrast_ratio(rgb_to_hex(*fg), rgb_to_hex(*bg), alpha) for fg, bg, alpha in pairs]
+    test("batch_contrast = contrast_ratio", batch['ratio'] == scalar)
+    test("batch_contrast sem NumPy = com NumPy",
+         _batch_contrast_python([p[0] for p in pairs], [p[1] for p in pairs], [p[2] for p in pairs],
+                                WCAG_THRESHOLDS['normal']) == batch)
+    test("batch_contrast passes_aa", batch['passes_aa'] == [False, True, False])
+    gray, white = parse_color('#777777'), parse_color('white')
+    suggested = suggest_accessible_color(gray, white)
+    test("sugestão atinge 4.5:1", calculate_contrast_ratio(suggested, white) >= 4.5)
+    test("sugestão é a mais próxima", suggested.hex == '#767676')
+    test("sugestão mantém cor que já passa",
+         suggest_accessible_color(parse_color('black'), white).hex == '#000000')
     
     # Resumo
     print("\n" + "=" * 50)
@@ -959,4 +1263,7 @@ def run_tests():
 
 
 if __name__ == '__main__':
-    run_tests()
+    if '--benchmark' in sys.argv:
+        run_benchmark()
+    else:
+        sys.exit(0 if run_tests() else 1)
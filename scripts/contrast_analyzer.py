@@ -11,22 +11,30 @@ Funcionalidades:
 - Calcula ratios de contraste WCAG
 - Identifica padrões de baixo contraste
 - Gera relatórios detalhados
+- Análise paralela e incremental: cache por arquivo (hash do conteúdo +
+  versão do analisador/configuração); só arquivos alterados são reanalisados
+- Modo --watch: reanalisa cada arquivo salvo e atualiza terminal e JSON
 
 Uso:
     python3 contrast_analyzer.py --analyze src/
     python3 contrast_analyzer.py --analyze src/ --theme dark
     python3 contrast_analyzer.py --analyze src/ --level aaa
+    python3 contrast_analyzer.py --analyze src/ --jobs 4 --no-cache
+    python3 contrast_analyzer.py --analyze src/ --watch
 
 Autor: TSiJUKEBOX Team
-Versão: 1.0.0
+Versão: 1.1.0
 Data: 2025-12-25
 """
 
 import os
 import re
+import json
+import hashlib
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from typing import List, Dict, Optional, Tuple, Set
 from datetime import datetime
 
@@ -34,13 +42,15 @@ from datetime import datetime
 from color_utils import (
     ColorValue,
     parse_color,
-    calculate_contrast_ratio,
     evaluate_contrast,
     blend_with_background,
+    batch_contrast,
     get_relative_luminance,
     TAILWIND_COLORS,
     TAILWIND_OPACITY
 )
+from file_watcher import WatchSession, add_watch_arguments
+from jsx_scanner import scan
 
 
 # =============================================================================
@@ -49,6 +59,21 @@ from color_utils import (
 
 BASE_DIR = Path(__file__).parent.parent
 
+# Versão da lógica de análise; mudar invalida o cache de resultados
+ANALYZER_VERSION = '1.1.0'
+
+# Cache de resultados por arquivo (CLI)
+DEFAULT_CACHE_FILE = BASE_DIR / '.cache' / 'contrast-analyzer.json'
+
+# JSON republicado a cada alteração no modo --watch
+DEFAULT_WATCH_FILE = BASE_DIR / '.cache' / 'contrast-watch.json'
+
+# Abaixo disso o custo de subir o pool supera o ganho
+PARALLEL_MIN_FILES = 16
+
+# Chaves de config que não mudam o resultado por arquivo
+NON_ANALYSIS_CONFIG_KEYS = {'min_severity', 'jobs', 'cache'}
+
 # Cores de marca que não devem gerar alertas
 BRAND_COLORS_WHITELIST = {
     '#1db954', '#1DB954',  # Spotify Green
@@ -96,6 +121,21 @@ DEFAULT_BACKGROUNDS = {
     'dark': parse_color('#09090b'),  # zinc-950
 }
 
+# Cores hardcoded no código
+HARDCODED_COLOR_PATTERNS = [
+    # Hex em strings
+    (re.compile(r'["\']#([0-9a-fA-F]{3,8})["\']', re.IGNORECASE), 'hex'),
+    # Hex em style
+    (re.compile(r'color:\s*#([0-9a-fA-F]{3,8})', re.IGNORECASE), 'hex-style'),
+    (re.compile(r'background(?:-color)?:\s*#([0-9a-fA-F]{3,8})', re.IGNORECASE), 'hex-bg'),
+    # RGB/RGBA
+    (re.compile(r'(rgba?\(\s*\d+\s*,\s*\d+\s*,\s*\d+(?:\s*,\s*[\d.]+)?\s*\))', re.IGNORECASE), 'rgb'),
+    # HSL/HSLA
+    (re.compile(r'(hsla?\(\s*\d+\s*,\s*\d+%\s*,\s*\d+%(?:\s*,\s*[\d.]+)?\s*\))', re.IGNORECASE), 'hsl'),
+]
+_COLOR_HINT_RE = re.compile(r'#|rgb|hsl', re.IGNORECASE)
+_DECORATIVE_RE = re.compile('|'.join(DECORATIVE_PATTERNS))
+
 
 # =============================================================================
 # ESTRUTURAS DE DADOS
@@ -236,23 +276,13 @@ def detect_hardcoded_colors(content: str) -> List[Dict]:
         Lista de dicionários com informações das cores encontradas
     """
     colors_found = []
-    lines = content.split('\n')
-    
-    patterns = [
-        # Hex em strings
-        (r'["\']#([0-9a-fA-F]{3,8})["\']', 'hex'),
-        # Hex em style
-        (r'color:\s*#([0-9a-fA-F]{3,8})', 'hex-style'),
-        (r'background(?:-color)?:\s*#([0-9a-fA-F]{3,8})', 'hex-bg'),
-        # RGB/RGBA
-        (r'(rgba?\(\s*\d+\s*,\s*\d+\s*,\s*\d+(?:\s*,\s*[\d.]+)?\s*\))', 'rgb'),
-        # HSL/HSLA
-        (r'(hsla?\(\s*\d+\s*,\s*\d+%\s*,\s*\d+%(?:\s*,\s*[\d.]+)?\s*\))', 'hsl'),
-    ]
     
-    for line_num, line in enumerate(lines, 1):
-        for pattern, color_type in patterns:
-            for match in re.finditer(pattern, line, re.IGNORECASE):
+    for line_num, line in enumerate(scan(content).lines, 1):
+        # Linhas sem '#', 'rgb' ou 'hsl' não têm cor
+        if not _COLOR_HINT_RE.search(line):
+            continue
+        for pattern, color_type in HARDCODED_COLOR_PATTERNS:
+            for match in pattern.finditer(line):
                 color_str = match.group(1) if match.lastindex else match.group(0)
                 
                 # Adicionar # para hex se necessário
@@ -383,61 +413,56 @@ def find_color_combinations(content: str, filepath: str) -> List[Tuple[ColorValu
         Lista de (foreground, background, line_number, context, is_likely_false_positive)
     """
     combinations = []
-    lines = content.split('\n')
-    
-    # Regex para encontrar elementos com className
-    element_pattern = r'<(\w+)[^>]*className\s*=\s*["\{]([^"\}]+)["\}][^>]*>'
     
     # Determinar tema padrão do arquivo
     is_dark_theme = 'dark' in filepath.lower() or 'dark:' in content
     default_bg = DEFAULT_BACKGROUNDS['dark' if is_dark_theme else 'light']
     
-    for line_num, line in enumerate(lines, 1):
+    # Elementos com classes, já tokenizados
+    for element in scan(content).with_classes():
+        context = element.context
+        
         # Verificar se é elemento decorativo
-        is_decorative = any(re.search(p, line) for p in DECORATIVE_PATTERNS)
-        if is_decorative:
+        if _DECORATIVE_RE.search(context):
             continue
         
-        # Encontrar elementos com classes
-        for match in re.finditer(element_pattern, line):
-            element_tag = match.group(1)
-            class_string = match.group(2)
-            
-            # Verificar se é elemento não-texto
-            is_non_text = is_likely_non_text_element(line, class_string)
-            
-            # Extrair cores
-            colors = extract_tailwind_colors_from_class(class_string)
-            
-            fg_color, fg_opacity = colors['text']
-            bg_color, bg_opacity = colors['bg']
-            
-            # Se não tem cor de texto, pular
-            if not fg_color:
-                continue
-            
-            # Usar fundo padrão se não especificado
-            if not bg_color:
-                bg_color = default_bg
-                bg_opacity = 1.0
-            
-            # Aplicar opacidade se necessário
-            if fg_opacity < 1.0:
-                fg_color = blend_with_background(fg_color, bg_color, fg_opacity)
-            
-            # Verificar se mesma cor é intencional
-            is_intentional = is_same_color_intentional(fg_color, bg_color, line)
-            
-            # Marcar como provável falso positivo
-            is_false_positive = is_non_text or is_intentional
-            
-            combinations.append((
-                fg_color,
-                bg_color,
-                line_num,
-                line.strip()[:100],
-                is_false_positive
-            ))
+        class_string = element.class_string
+        
+        # Verificar se é elemento não-texto
+        is_non_text = is_likely_non_text_element(context, class_string)
+        
+        # Extrair cores
+        colors = extract_tailwind_colors_from_class(class_string)
+        
+        fg_color, fg_opacity = colors['text']
+        bg_color, bg_opacity = colors['bg']
+        
+        # Se não tem cor de texto, pular
+        if not fg_color:
+            continue
+        
+        # Usar fundo padrão se não especificado
+        if not bg_color:
+            bg_color = default_bg
+            bg_opacity = 1.0
+        
+        # Aplicar opacidade se necessário
+        if fg_opacity < 1.0:
+            fg_color = blend_with_background(fg_color, bg_color, fg_opacity)
+        
+        # Verificar se mesma cor é intencional
+        is_intentional = is_same_color_intentional(fg_color, bg_color, context)
+        
+        # Marcar como provável falso positivo
+        is_false_positive = is_non_text or is_intentional
+        
+        combinations.append((
+            fg_color,
+            bg_color,
+            element.line,
+            context[:100],
+            is_false_positive
+        ))
     
     return combinations
 
@@ -509,7 +534,8 @@ def analyze_file(
     combinations = find_color_combinations(content, str(filepath))
     total_combinations += len(combinations)
     
-    # Avaliar cada combinação
+    # Filtrar combinações a avaliar
+    candidates = []
     for fg, bg, line_num, context, is_false_positive in combinations:
         # Pular falsos positivos identificados
         if is_false_positive and config.get('skip_false_positives', True):
@@ -520,10 +546,13 @@ def analyze_file(
                 continue
             if bg.hex.lower() in BRAND_COLORS_WHITELIST:
                 continue
-        
-        # Calcular contraste
-        ratio = calculate_contrast_ratio(fg, bg)
-        
+        candidates.append((fg, bg, line_num, context))
+    
+    # Calcular todos os contrastes do arquivo de uma vez
+    ratios = batch_contrast([c[0].rgb for c in candidates], [c[1].rgb for c in candidates])['ratio']
+    
+    # Avaliar cada combinação
+    for (fg, bg, line_num, context), ratio in zip(candidates, ratios):
         # Determinar tamanho do texto
         text_size = 'large' if 'text-lg' in context or 'text-xl' in context or 'text-2xl' in context else 'normal'
         
@@ -555,15 +584,13 @@ def analyze_file(
             ))
     
     # Analisar cores hardcoded problemáticas
-    for hc in hardcoded:
-        if hc['is_brand']:
-            continue
-        
-        # Assumir fundo padrão
-        theme = 'dark' if 'dark' in str(filepath).lower() else config.get('theme', 'dark')
-        bg = DEFAULT_BACKGROUNDS.get(theme)
-        
-        ratio = calculate_contrast_ratio(hc['color'], bg)
+    # Assumir fundo padrão
+    theme = 'dark' if 'dark' in str(filepath).lower() else config.get('theme', 'dark')
+    bg = DEFAULT_BACKGROUNDS.get(theme)
+    hardcoded = [hc for hc in hardcoded if not hc['is_brand']]
+    ratios = batch_contrast([hc['color'].rgb for hc in hardcoded], [bg.rgb] * len(hardcoded) if hardcoded else [])['ratio']
+    
+    for hc, ratio in zip(hardcoded, ratios):
         evaluation = evaluate_contrast(ratio)
         
         if evaluation['severity'] in ['CRITICAL', 'HIGH']:
@@ -583,27 +610,126 @@ def analyze_file(
     return issues, total_colors, total_combinations
 
 
-def analyze_color_contrast(
-    files: List[str],
-    config: Dict = None
-) -> ContrastMetrics:
+# =============================================================================
+# CACHE E PARALELISMO
+# =============================================================================
+
+def config_fingerprint(config: Dict) -> str:
     """
-    Função principal de análise de contraste.
+    Identifica versão do analisador + configuração de análise.
     
-    Args:
-        files: Lista de arquivos para analisar
-        config: Configurações opcionais
-            - ignore_brand: bool (default: True)
-            - level: str ('aa' ou 'aaa', default: 'aa')
-            - theme: str ('light', 'dark', 'both', default: 'dark')
-            - min_severity: str (default: 'LOW')
+    Inclui o código de contrast_analyzer.py, color_utils.py e
+    jsx_scanner.py, então editar regras, tabelas de cor ou o tokenizador
+    invalida o cache sem precisar mudar a versão.
+    """
+    digest = hashlib.sha256(ANALYZER_VERSION.encode())
+    here = Path(__file__)
+    for module in (here, here.with_name('color_utils.py'), here.with_name('jsx_scanner.py')):
+        try:
+            digest.update(module.read_bytes())
+        except OSError:
+            pass
+    relevant = {k: v for k, v in config.items() if k not in NON_ANALYSIS_CONFIG_KEYS}
+    digest.update(json.dumps(relevant, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def _issue_to_dict(issue: ContrastIssue) -> Dict:
+    return asdict(issue)
+
+
+def _issue_from_dict(data: Dict) -> ContrastIssue:
+    def color(d: Dict) -> ColorValue:
+        return ColorValue(**{k: tuple(v) if isinstance(v, list) else v for k, v in d.items()})
+    
+    data = dict(data)
+    data['foreground'] = color(data['foreground'])
+    data['background'] = color(data['background'])
+    return ContrastIssue(**data)
+
+
+class ResultCache:
+    """
+    Resultados de analyze_file em JSON, por caminho relativo.
     
-    Returns:
-        ContrastMetrics com todos os issues encontrados
+    Uma entrada vale enquanto o SHA-256 do conteúdo bater; o arquivo todo é
+    descartado quando o fingerprint (versão + config) muda.
     """
-    config = config or {}
-    metrics = ContrastMetrics()
     
+    def __init__(self, path: Path, fingerprint: str):
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.entries: Dict[str, Dict] = {}
+        self.dirty = False
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('fingerprint') == fingerprint:
+            self.entries = data.get('files', {})
+    
+    def get(self, key: str, sha256: str) -> Optional[Tuple[List[ContrastIssue], int, int]]:
+        entry = self.entries.get(key)
+        if not entry or entry.get('sha256') != sha256:
+            return None
+        try:
+            issues = [_issue_from_dict(i) for i in entry['issues']]
+        except (KeyError, TypeError):
+            return None
+        return issues, entry['colors'], entry['combinations']
+    
+    def put(self, key: str, sha256: str, result: Tuple[List[ContrastIssue], int, int]) -> None:
+        issues, colors, combinations = result
+        self.entries[key] = {
+            'sha256': sha256,
+            'colors': colors,
+            'combinations': combinations,
+            'issues': [_issue_to_dict(i) for i in issues],
+        }
+        self.dirty = True
+    
+    def save(self) -> None:
+        """Grava (temporário + rename), descartando arquivos que sumiram."""
+        stale = [k for k in self.entries if not (BASE_DIR / k).exists()]
+        for key in stale:
+            del self.entries[key]
+        if not (self.dirty or stale):
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f'.{self.path.name}.{os.getpid()}')
+            tmp.write_text(json.dumps({'fingerprint': self.fingerprint, 'files': self.entries}),
+                           encoding='utf-8')
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # cache é opcional
+        self.dirty = False
+
+
+def _cache_key(path: Path) -> str:
+    try:
+        return str(path.relative_to(BASE_DIR))
+    except ValueError:
+        return str(path)
+
+
+def _analyze_worker(args: Tuple[Path, Dict]) -> Tuple[List[ContrastIssue], int, int]:
+    """analyze_file num processo do pool."""
+    path, config = args
+    return analyze_file(path, config)
+
+
+def _resolve_jobs(jobs: Optional[int], pending: int) -> int:
+    if jobs is None:
+        return 1
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    return 1 if pending < PARALLEL_MIN_FILES else min(jobs, pending)
+
+
+def collect_paths(files: List[str]) -> List[Path]:
+    """Caminhos absolutos dos arquivos existentes com extensão analisável."""
+    paths = []
     for filepath in files:
         path = Path(filepath) if not isinstance(filepath, Path) else filepath
         
@@ -618,22 +744,86 @@ def analyze_color_contrast(
         if path.suffix not in ['.tsx', '.jsx', '.ts', '.js']:
             continue
         
-        # Analisar arquivo
-        issues, colors, combinations = analyze_file(path, config)
-        
-        metrics.total_color_usages += colors
-        metrics.total_combinations += combinations
-        metrics.issues.extend(issues)
+        paths.append(path)
+    return paths
+
+
+def analyze_paths(
+    paths: List[Path],
+    config: Dict = None
+) -> List[Tuple[List[ContrastIssue], int, int]]:
+    """
+    Resultado de analyze_file para cada caminho, na mesma ordem.
     
-    # Filtrar por severidade mínima
-    min_severity = config.get('min_severity', 'LOW')
+    Usa o cache de resultados (config['cache']) e processos paralelos
+    (config['jobs']) como analyze_color_contrast.
+    """
+    config = config or {}
+    analysis_config = {k: v for k, v in config.items() if k not in ('jobs', 'cache')}
+    cache = ResultCache(config['cache'], config_fingerprint(config)) if config.get('cache') else None
+    
+    # Resultados em cache e arquivos a (re)analisar
+    results: List[Optional[Tuple[List[ContrastIssue], int, int]]] = [None] * len(paths)
+    hashes: List[str] = [''] * len(paths)
+    pending = []
+    for index, path in enumerate(paths):
+        if cache is not None:
+            try:
+                hashes[index] = hashlib.sha256(path.read_bytes()).hexdigest()
+            except OSError:
+                pass
+            results[index] = cache.get(_cache_key(path), hashes[index])
+        if results[index] is None:
+            pending.append(index)
+    
+    # Analisar arquivos
+    jobs = _resolve_jobs(config.get('jobs'), len(pending))
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            work = [(paths[i], analysis_config) for i in pending]
+            chunksize = max(1, len(work) // (jobs * 4))
+            for index, result in zip(pending, pool.map(_analyze_worker, work, chunksize=chunksize)):
+                results[index] = result
+    else:
+        for index in pending:
+            results[index] = analyze_file(paths[index], analysis_config)
+    
+    if cache is not None:
+        for index in pending:
+            if hashes[index]:
+                cache.put(_cache_key(paths[index]), hashes[index], results[index])
+        cache.save()
+    
+    return results
+
+
+def filter_severity(issues: List[ContrastIssue], min_severity: str = 'LOW') -> List[ContrastIssue]:
+    """Issues com severidade >= min_severity."""
     severity_order = ['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']
     min_index = severity_order.index(min_severity) if min_severity in severity_order else 0
     
-    metrics.issues = [
-        i for i in metrics.issues 
+    return [
+        i for i in issues 
         if severity_order.index(i.severity) >= min_index
     ]
+
+
+def merge_results(
+    results: List[Tuple[List[ContrastIssue], int, int]],
+    config: Dict = None
+) -> ContrastMetrics:
+    """Junta resultados por arquivo em ContrastMetrics (filtro e agregados)."""
+    config = config or {}
+    metrics = ContrastMetrics()
+    
+    # Mesclar na ordem dos arquivos
+    for issues, colors, combinations in results:
+        metrics.total_color_usages += colors
+        metrics.total_combinations += combinations
+        metrics.issues.extend(issues)
+    
+    # Filtrar por severidade mínima
+    metrics.issues = filter_severity(metrics.issues, config.get('min_severity', 'LOW'))
     
     metrics.issues_found = len(metrics.issues)
     metrics.calculate_aggregates()
@@ -641,6 +831,67 @@ def analyze_color_contrast(
     return metrics
 
 
+def analyze_color_contrast(
+    files: List[str],
+    config: Dict = None
+) -> ContrastMetrics:
+    """
+    Função principal de análise de contraste.
+    
+    Args:
+        files: Lista de arquivos para analisar
+        config: Configurações opcionais
+            - ignore_brand: bool (default: True)
+            - level: str ('aa' ou 'aaa', default: 'aa')
+            - theme: str ('light', 'dark', 'both', default: 'dark')
+            - min_severity: str (default: 'LOW')
+            - jobs: int (default: 1; 0 = um processo por CPU)
+            - cache: caminho do cache de resultados (default: sem cache)
+    
+    Returns:
+        ContrastMetrics com todos os issues encontrados
+    """
+    config = config or {}
+    return merge_results(analyze_paths(collect_paths(files), config), config)
+
+
+def metrics_to_dict(metrics: ContrastMetrics) -> Dict:
+    """Saída --json (e JSON do modo --watch)."""
+    return {
+        'total_colors': metrics.total_color_usages,
+        'total_combinations': metrics.total_combinations,
+        'issues_found': metrics.issues_found,
+        'issues_by_severity': metrics.issues_by_severity,
+        'pass_rate_aa': metrics.pass_rate_aa,
+        'issues': [i.to_dict() for i in metrics.issues],
+    }
+
+
+def watch(roots: List[Path], config: Dict, json_path: Path) -> int:
+    """
+    Modo --watch: análise completa uma vez e, a cada salvamento, só os
+    arquivos alterados (caches de cor e tokenização ficam em memória).
+    """
+    analysis_config = {k: v for k, v in config.items() if k not in ('jobs', 'cache')}
+    min_severity = config.get('min_severity', 'LOW')
+    
+    def describe(path: Path, result) -> List[str]:
+        return [
+            f"{i.line}: {i.severity} {i.ratio:.2f}:1 {i.foreground.original} / {i.background.original}"
+            for i in filter_severity(result[0], min_severity)
+        ]
+    
+    session = WatchSession(
+        analyze=lambda path: analyze_file(path, analysis_config),
+        report=lambda results: metrics_to_dict(merge_results(list(results.values()), config)),
+        describe=describe,
+        json_path=json_path,
+        title='Analisador de contraste',
+        initial=lambda paths: analyze_paths(paths, config),
+    )
+    return session.run(roots, extensions=('.tsx', '.jsx'))
+
+
 # =============================================================================
 # GERAÇÃO DE RELATÓRIO
 # =============================================================================
@@ -798,6 +1049,24 @@ def main():
         action='store_true',
         help='Saída em formato JSON'
     )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=0,
+        help='Processos paralelos (default: 0 = um por CPU)'
+    )
+    parser.add_argument(
+        '--cache',
+        type=str,
+        default=str(DEFAULT_CACHE_FILE),
+        help=f'Cache de resultados por arquivo (default: {DEFAULT_CACHE_FILE.relative_to(BASE_DIR)})'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Reanalisar todos os arquivos sem usar o cache'
+    )
+    add_watch_arguments(parser, DEFAULT_WATCH_FILE.relative_to(BASE_DIR))
     
     args = parser.parse_args()
     
@@ -817,7 +1086,7 @@ def main():
         elif path.is_dir():
             files.extend(find_files(path))
     
-    if not files:
+    if not files and not args.watch:
         print("❌ Nenhum arquivo encontrado para análise")
         return 1
     
@@ -836,23 +1105,22 @@ def main():
         'theme': args.theme,
         'min_severity': args.min_severity,
         'ignore_brand': not args.include_brand,
+        'jobs': args.jobs,
+        'cache': None if args.no_cache else args.cache,
     }
     
+    if args.watch:
+        roots = [Path(p) if Path(p).is_absolute() else BASE_DIR / p for p in args.analyze]
+        watch_json = Path(args.watch_json)
+        return watch(roots, config, watch_json if watch_json.is_absolute() else BASE_DIR / watch_json)
+    
     # Executar análise
     print("🔍 Analisando arquivos...")
     metrics = analyze_color_contrast([str(f) for f in files], config)
     
     # Gerar relatório
     if args.json:
-        import json
-        output = json.dumps({
-            'total_colors': metrics.total_color_usages,
-            'total_combinations': metrics.total_combinations,
-            'issues_found': metrics.issues_found,
-            'issues_by_severity': metrics.issues_by_severity,
-            'pass_rate_aa': metrics.pass_rate_aa,
-            'issues': [i.to_dict() for i in metrics.issues],
-        }, indent=2)
+        output = json.dumps(metrics_to_dict(metrics), indent=2)
     else:
         output = generate_contrast_report(metrics)
     
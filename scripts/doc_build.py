@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Build Incremental de Documentação
+=================================
+
+Base comum dos geradores de documentação (generate-missing-docs.py e a
+fase de documentação do master-fix.py): cada página declara o template e
+os parâmetros de que depende, e só as páginas cujo hash (template +
+parâmetros) mudou são renderizadas e gravadas. Páginas inalteradas não são
+tocadas: o mtime é preservado, nada dispara rebuild e o git não vê
+alterações.
+
+Funcionalidades:
+- Hash de template + parâmetros por página, guardado num manifesto em
+  .cache/doc-build/<nome>.json junto com o sha256 da saída gravada
+- Parâmetros voláteis (data de geração) entram na renderização mas não
+  no hash
+- Saídas apagadas ou editadas à mão são detectadas pelo sha256; as
+  editadas só são sobrescritas com overwrite=True
+- Páginas alteradas são renderizadas em paralelo; conteúdo idêntico ao
+  do disco não é regravado
+- Gravação via temporário + rename
+
+Uso:
+    from doc_build import DocBuild, DocPage
+
+    build = DocBuild('missing-docs', DOCS_DIR)
+    build.add(DocPage('player/PlayerControls.md', TEMPLATES['player_component'],
+                      params, volatile={'date': DATE_TODAY}))
+    report = build.run()
+    print(report.counts())
+
+Autor: TSiJUKEBOX Team
+Versão: 1.0.0
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from edit_engine import write_atomic
+
+
+# Diretório base do projeto
+BASE_DIR = Path(__file__).parent.parent
+CACHE_DIR = BASE_DIR / '.cache' / 'doc-build'
+
+# Incrementar invalida todos os manifestos (mudança no formato do hash)
+MANIFEST_VERSION = 1
+
+# Páginas processadas em paralelo
+DEFAULT_JOBS = min(8, os.cpu_count() or 1)
+
+
+# =============================================================================
+# ESTRUTURAS
+# =============================================================================
+
+def verbatim(template: str, params: Dict[str, Any]) -> str:
+    """Renderizador para páginas sem parâmetros (conteúdo com chaves literais)."""
+    return template
+
+
+def format_template(template: str, params: Dict[str, Any]) -> str:
+    """Renderizador padrão: str.format com os parâmetros."""
+    return template.format(**params)
+
+
+@dataclass
+class DocPage:
+    """
+    Página gerada.
+
+    Attributes:
+        path: Caminho da saída, relativo à raiz do build
+        template: Texto do template
+        params: Parâmetros que entram no hash
+        volatile: Parâmetros que não entram no hash (ex.: data de geração)
+        render: Função (template, parâmetros) -> conteúdo
+    """
+    path: str
+    template: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    volatile: Dict[str, Any] = field(default_factory=dict)
+    render: Callable[[str, Dict[str, Any]], str] = format_template
+
+    @classmethod
+    def static(cls, path: str, content: str) -> 'DocPage':
+        """Página de conteúdo fixo (o próprio conteúdo é o template)."""
+        return cls(path, content, render=verbatim)
+
+    def key(self) -> str:
+        """Hash do que determina a saída: template, parâmetros e renderizador."""
+        payload = json.dumps(
+            [MANIFEST_VERSION, self.render.__name__, self.template, self.params],
+            sort_keys=True, ensure_ascii=False, default=str,
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def content(self) -> str:
+        """Renderiza a página."""
+        return self.render(self.template, {**self.params, **self.volatile})
+
+
+class PageStatus(Enum):
+    CREATED = "criada"
+    UPDATED = "atualizada"
+    UNCHANGED = "inalterada"
+    PRESERVED = "preservada"   # editada à mão, sem overwrite
+    ERROR = "erro"
+
+
+@dataclass
+class PageResult:
+    """Resultado de uma página no build."""
+    page: DocPage
+    status: PageStatus
+    rendered: bool = False
+    error: str = ""
+
+
+@dataclass
+class BuildReport:
+    """Resultado de um build."""
+    results: List[PageResult] = field(default_factory=list)
+    dry_run: bool = False
+
+    def with_status(self, *statuses: PageStatus) -> List[PageResult]:
+        return [r for r in self.results if r.status in statuses]
+
+    @property
+    def written(self) -> List[PageResult]:
+        """Páginas gravadas (ou que seriam, em dry-run)."""
+        return self.with_status(PageStatus.CREATED, PageStatus.UPDATED)
+
+    @property
+    def skipped(self) -> List[PageResult]:
+        """Páginas não gravadas: inalteradas ou preservadas."""
+        return self.with_status(PageStatus.UNCHANGED, PageStatus.PRESERVED)
+
+    def counts(self) -> Dict[str, int]:
+        counts = {status.value: 0 for status in PageStatus}
+        for result in self.results:
+            counts[result.status.value] += 1
+        return counts
+
+
+def _sha256(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+# =============================================================================
+# BUILD
+# =============================================================================
+
+class DocBuild:
+    """
+    Conjunto de páginas geradas com manifesto próprio.
+
+    Decisão por página:
+    - saída gravada pelo build e intacta, hash igual: pulada sem renderizar
+    - saída ausente, ou gravada pelo build e hash diferente: renderizada
+      e gravada
+    - saída editada à mão (ou de antes do manifesto): sobrescrita só com
+      overwrite=True; sem ele é preservada, a não ser que a renderização
+      seja idêntica (aí só entra no manifesto)
+    - renderização idêntica ao disco nunca é regravada
+    """
+
+    def __init__(self, name: str, root: Path, overwrite: bool = True,
+                 jobs: int = DEFAULT_JOBS, cache_dir: Optional[Path] = None):
+        self.name = name
+        self.root = Path(root)
+        self.overwrite = overwrite
+        self.jobs = max(1, jobs)
+        self.manifest_path = (cache_dir or CACHE_DIR) / f"{name}.json"
+        self.pages: List[DocPage] = []
+
+    def add(self, page: DocPage) -> None:
+        self.pages.append(page)
+
+    def load_manifest(self) -> Dict[str, Dict[str, str]]:
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != MANIFEST_VERSION:
+            return {}
+        return data.get('pages', {})
+
+    def _save_manifest(self, pages: Dict[str, Dict[str, str]]) -> None:
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'version': MANIFEST_VERSION, 'pages': dict(sorted(pages.items()))}
+        write_atomic(self.manifest_path, json.dumps(data, indent=2, ensure_ascii=False) + '\n')
+
+    def _process(
+        self,
+        page: DocPage,
+        entry: Optional[Dict[str, str]],
+        dry_run: bool,
+        before_write: Optional[Callable[[Path], Any]],
+    ) -> Tuple[PageResult, Optional[Dict[str, str]]]:
+        path = self.root / page.path
+        key = page.key()
+
+        current = path.read_text(encoding='utf-8') if path.exists() else None
+        ours = current is not None and entry is not None and entry.get('sha256') == _sha256(current)
+        if ours and entry.get('key') == key:
+            return PageResult(page, PageStatus.UNCHANGED), entry
+
+        content = page.content()
+        fresh = {'key': key, 'sha256': _sha256(content)}
+        if content == current:
+            return PageResult(page, PageStatus.UNCHANGED, rendered=True), fresh
+        if current is not None and not ours and not self.overwrite:
+            return PageResult(page, PageStatus.PRESERVED, rendered=True), entry
+
+        if not dry_run:
+            if before_write is not None and current is not None:
+                before_write(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(path, content)
+        status = PageStatus.CREATED if current is None else PageStatus.UPDATED
+        return PageResult(page, status, rendered=True), fresh
+
+    def run(self, dry_run: bool = False,
+            before_write: Optional[Callable[[Path], Any]] = None) -> BuildReport:
+        """
+        Processa todas as páginas em paralelo e atualiza o manifesto.
+
+        Args:
+            dry_run: Só calcula o que seria gravado
+            before_write: Chamado com o caminho antes de sobrescrever uma
+                saída existente (ex.: backup)
+        """
+        manifest = self.load_manifest()
+
+        def process(page: DocPage):
+            try:
+                return self._process(page, manifest.get(page.path), dry_run, before_write)
+            except Exception as e:
+                return PageResult(page, PageStatus.ERROR, error=str(e)), manifest.get(page.path)
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            outcomes = list(pool.map(process, self.pages))
+
+        updated = dict(manifest)
+        for result, entry in outcomes:
+            if entry is not None:
+                updated[result.page.path] = entry
+        if not dry_run and updated != manifest:
+            self._save_manifest(updated)
+
+        return BuildReport(results=[result for result, _ in outcomes], dry_run=dry_run)
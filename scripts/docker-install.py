@@ -27,11 +27,29 @@ import socket
 import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+# Sonda compartilhada (scripts/installer/system_probe.py). Indisponível quando
+# o instalador é executado via `curl | python`; aí cada dado é lido aqui.
+try:
+    from installer.system_probe import probe_system
+except ImportError:
+    probe_system = None
+
+try:
+    from installer.utils.runner import CommandRunner as StreamingRunner
+except ImportError:
+    StreamingRunner = None
+
+try:
+    from installer.file_plan import FilePlan
+except ImportError:
+    FilePlan = None
+
 # ============================================================================
 # CONFIGURAÇÃO GLOBAL
 # ============================================================================
@@ -208,16 +226,33 @@ class CommandRunner:
         check: bool = True,
         cwd: Optional[Path] = None,
         env: Optional[Dict[str, str]] = None,
-        timeout: Optional[int] = None
+        timeout: Optional[int] = None,
+        tail_lines: Optional[int] = None
     ) -> Tuple[int, str, str]:
         """
         Executa um comando shell.
         
+        Com tail_lines e o runner compartilhado disponível, a saída é lida em
+        streaming (só as últimas linhas ficam em memória) e o timeout encerra
+        o grupo de processos inteiro.
+        
         Returns:
             Tuple[int, str, str]: (código de retorno, stdout, stderr)
         """
         Logger.command(cmd)
         
+        if StreamingRunner is not None and capture and tail_lines:
+            result = StreamingRunner().run(
+                cmd, cwd=cwd, env=env, timeout=timeout, tail_lines=tail_lines,
+                on_line=lambda _, line: Logger.debug(line)
+            )
+            if result.timed_out:
+                Logger.error(f"Command timed out: {' '.join(cmd)}")
+                return -1, "", "Command timed out"
+            if check and result.returncode != 0:
+                Logger.debug(f"Command failed: {result.stderr.strip()}")
+            return result.returncode, result.stdout.strip(), result.stderr.strip()
+        
         merged_env = os.environ.copy()
         if env:
             merged_env.update(env)
@@ -299,29 +334,61 @@ class SystemDetector:
     """Detecta informações do sistema operacional e hardware."""
     
     def detect(self) -> SystemInfo:
-        """Coleta todas as informações do sistema."""
-        return SystemInfo(
-            hostname=self._get_hostname(),
-            distro_name=self._get_distro_name(),
-            distro_id=self._get_distro_id(),
-            distro_version=self._get_distro_version(),
-            is_supported=self._is_supported_distro(),
-            kernel_version=platform.release(),
-            architecture=platform.machine(),
-            cpu_model=self._get_cpu_model(),
-            cpu_cores=os.cpu_count() or 1,
-            ram_total_gb=self._get_ram_total(),
-            ram_available_gb=self._get_ram_available(),
-            disk_total_gb=self._get_disk_total(),
-            disk_available_gb=self._get_disk_available(),
-            is_root=os.geteuid() == 0,
-            current_user=os.environ.get("SUDO_USER", os.environ.get("USER", "unknown")),
-            docker_installed=self._check_docker_installed(),
-            docker_running=self._check_docker_running(),
-            docker_version=self._get_docker_version(),
-            compose_version=self._get_compose_version(),
-            is_virtual_machine=self._is_virtual_machine()
-        )
+        """
+        Coleta todas as informações do sistema.
+        
+        Os comandos do Docker rodam em paralelo com a sondagem de hardware,
+        que vem do snapshot compartilhado quando disponível.
+        """
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            docker_running = pool.submit(self._check_docker_running)
+            docker_version = pool.submit(self._get_docker_version)
+            compose_version = pool.submit(self._get_compose_version)
+            hardware = self._detect_hardware()
+            
+            return SystemInfo(
+                is_supported=self._is_supported_distro(),
+                kernel_version=platform.release(),
+                architecture=platform.machine(),
+                is_root=os.geteuid() == 0,
+                current_user=os.environ.get("SUDO_USER", os.environ.get("USER", "unknown")),
+                docker_installed=self._check_docker_installed(),
+                docker_running=docker_running.result(),
+                docker_version=docker_version.result(),
+                compose_version=compose_version.result(),
+                **hardware
+            )
+    
+    def _detect_hardware(self) -> Dict[str, Any]:
+        """Campos de SO e hardware do SystemInfo."""
+        if probe_system is not None:
+            probe = probe_system()
+            return {
+                "hostname": probe.hostname,
+                "distro_name": probe.distro_name,
+                "distro_id": probe.distro_id,
+                "distro_version": probe.os_release.get("VERSION_ID", "unknown"),
+                "cpu_model": probe.cpu_model or "Unknown CPU",
+                "cpu_cores": os.cpu_count() or 1,
+                "ram_total_gb": round(probe.ram_gb, 2),
+                "ram_available_gb": round(probe.ram_available_gb, 2),
+                "disk_total_gb": round(probe.disk_total_gb, 2),
+                "disk_available_gb": round(probe.disk_free_gb, 2),
+                "is_virtual_machine": probe.is_virtual_machine,
+            }
+        return {
+            "hostname": self._get_hostname(),
+            "distro_name": self._get_distro_name(),
+            "distro_id": self._get_distro_id(),
+            "distro_version": self._get_distro_version(),
+            "cpu_model": self._get_cpu_model(),
+            "cpu_cores": os.cpu_count() or 1,
+            "ram_total_gb": self._get_ram_total(),
+            "ram_available_gb": self._get_ram_available(),
+            "disk_total_gb": self._get_disk_total(),
+            "disk_available_gb": self._get_disk_available(),
+            "is_virtual_machine": self._is_virtual_machine(),
+        }
     
     def _get_hostname(self) -> str:
         return socket.gethostname()
@@ -1501,8 +1568,8 @@ class BackupManager:
                 "-v", f"{volume}:/data",
                 "-v", f"{volumes_backup}:/backup",
                 "alpine",
-                "tar", "cvf", f"/backup/{volume}.tar", "-C", "/data", "."
-            ], check=False, timeout=300)
+                "tar", "cf", f"/backup/{volume}.tar", "-C", "/data", "."
+            ], check=False, timeout=300, tail_lines=50)
             
             if code != 0:
                 Logger.warning(f"Falha ao exportar volume {volume}: {stderr}")
@@ -1573,7 +1640,7 @@ class BackupManager:
                 "-v", f"{volume_name}:/data",
                 "-v", f"{volumes_backup}:/backup",
                 "alpine",
-                "tar", "xvf", f"/backup/{volume_name}.tar", "-C", "/data"
+                "tar", "xf", f"/backup/{volume_name}.tar", "-C", "/data"
             ], check=False, timeout=300)
             
             if code != 0:
@@ -1941,16 +2008,35 @@ StandardError=journal
 SyslogIdentifier=tsijukebox-certbot
 """
     
+    def _write_units(self, units: Dict[Path, str], after: List[List[str]] = ()) -> None:
+        """
+        Grava as unidades e roda os comandos seguintes.
+        
+        Com o FilePlan, só regrava o que mudou e o daemon-reload acontece uma
+        vez e apenas se alguma unidade mudou.
+        """
+        if FilePlan is not None:
+            plan = FilePlan(logger=Logger, run=lambda cmd: CommandRunner.run(cmd, check=False))
+            with plan.transaction():
+                for path, content in units.items():
+                    plan.add(path, content, parents=False, unit=True)
+                for cmd in after:
+                    plan.after(cmd)
+            return
+        
+        for path, content in units.items():
+            path.write_text(content)
+            Logger.debug(f"Criado: {path}")
+        CommandRunner.run(["systemctl", "daemon-reload"], check=False)
+        for cmd in after:
+            CommandRunner.run(cmd, check=False)
+    
     def create_service(self, profiles: List[str] = None) -> bool:
         """Cria o arquivo de serviço."""
         Logger.info("Criando serviço systemd...")
         
         try:
-            self.SERVICE_PATH.write_text(self.generate_service(profiles))
-            Logger.debug(f"Criado: {self.SERVICE_PATH}")
-            
-            # Recarrega daemon
-            CommandRunner.run(["systemctl", "daemon-reload"], check=False)
+            self._write_units({self.SERVICE_PATH: self.generate_service(profiles)})
             
             Logger.success("Serviço systemd criado")
             return True
@@ -1964,20 +2050,14 @@ SyslogIdentifier=tsijukebox-certbot
         Logger.info("Configurando renovação automática de certificados...")
         
         try:
-            # Cria timer
-            self.CERTBOT_TIMER_PATH.write_text(self.generate_certbot_timer())
-            Logger.debug(f"Criado: {self.CERTBOT_TIMER_PATH}")
-            
-            # Cria service
-            self.CERTBOT_SERVICE_PATH.write_text(self.generate_certbot_service())
-            Logger.debug(f"Criado: {self.CERTBOT_SERVICE_PATH}")
-            
-            # Recarrega daemon
-            CommandRunner.run(["systemctl", "daemon-reload"], check=False)
-            
-            # Habilita e inicia timer
-            CommandRunner.run(["systemctl", "enable", "tsijukebox-certbot.timer"], check=False)
-            CommandRunner.run(["systemctl", "start", "tsijukebox-certbot.timer"], check=False)
+            # Cria timer e service, depois habilita e inicia o timer
+            self._write_units(
+                {
+                    self.CERTBOT_TIMER_PATH: self.generate_certbot_timer(),
+                    self.CERTBOT_SERVICE_PATH: self.generate_certbot_service(),
+                },
+                after=[["systemctl", "enable", "--now", "tsijukebox-certbot.timer"]]
+            )
             
             Logger.success("Renovação automática de certificados configurada")
             return True
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Motor de Edições Atômicas para Scripts de Correção
+==================================================
+
+Base comum dos scripts de correção automática (fix-critical-contrast.py,
+false_positive_filter.py, refactor-hardcoded-colors.py,
+migrate-ui-components.py, fix-form-accessibility.py): as correções são
+coletadas como edições (arquivo, início, fim, substituição), aplicadas
+numa única passada por arquivo e gravadas de uma vez, com um snapshot
+compactado dos originais para desfazer tudo com um comando.
+
+Funcionalidades:
+- Edições por intervalo de caracteres, aplicadas da última para a
+  primeira (os intervalos anteriores continuam válidos)
+- Conflitos (intervalos sobrepostos, arquivo alterado por fora) são
+  detectados antes de qualquer gravação
+- Gravação via temporário + rename; se uma gravação falhar, os arquivos
+  já gravados são restaurados
+- Um snapshot .tar.gz por execução com os originais e um manifesto
+- Rollback do último snapshot (ou de um específico)
+
+Uso:
+    from edit_engine import EditSet
+
+    edits = EditSet('fix-critical-contrast')
+    edits.add(path, start, end, 'text-cyan-700', original=content)
+    edits.replace_lines(path, content, {12: novo_texto})
+    snapshot = edits.commit()
+
+    python3 scripts/edit_engine.py --list
+    python3 scripts/edit_engine.py --rollback            # último snapshot
+    python3 scripts/edit_engine.py --rollback <arquivo>  # snapshot específico
+
+Autor: TSiJUKEBOX Team
+Versão: 1.0.0
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import tarfile
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# Diretório base do projeto
+BASE_DIR = Path(__file__).parent.parent
+SNAPSHOT_DIR = BASE_DIR / 'backups' / 'snapshots'
+
+MANIFEST_NAME = 'manifest.json'
+
+# Sufixo dado a um snapshot já restaurado (sai da lista)
+RESTORED_SUFFIX = '.restored'
+
+# Comando mostrado pelos scripts após gravar
+ROLLBACK_COMMAND = 'python3 scripts/edit_engine.py --rollback'
+
+
+class EditConflict(ValueError):
+    """Edições sobrepostas ou arquivo diferente do esperado."""
+
+
+@dataclass(frozen=True)
+class Edit:
+    """Substituição de content[start:end] (índices de caractere)."""
+    start: int
+    end: int
+    replacement: str
+
+
+# =============================================================================
+# APLICAÇÃO
+# =============================================================================
+
+def apply_edits(content: str, edits: Sequence[Edit]) -> str:
+    """
+    Aplica edições numa única passada, da última para a primeira.
+
+    Edições idênticas repetidas são aplicadas uma vez; inserções no mesmo
+    ponto mantêm a ordem de registro.
+
+    Raises:
+        EditConflict: Intervalos sobrepostos ou fora do conteúdo
+    """
+    ordered = sorted(dict.fromkeys(edits), key=lambda e: (e.start, e.end))
+    pieces: List[str] = []
+    cursor = len(content)
+    for edit in reversed(ordered):
+        if not 0 <= edit.start <= edit.end <= len(content):
+            raise EditConflict(f"intervalo inválido {edit.start}:{edit.end}")
+        if edit.end > cursor:
+            raise EditConflict(f"edições sobrepostas em {edit.start}:{edit.end}")
+        pieces.append(content[edit.end:cursor])
+        pieces.append(edit.replacement)
+        cursor = edit.start
+    pieces.append(content[:cursor])
+    return ''.join(reversed(pieces))
+
+
+def line_offsets(content: str) -> List[int]:
+    """Índice inicial de cada linha (separadas por '\\n')."""
+    offsets = [0]
+    find = content.find
+    position = find('\n')
+    while position != -1:
+        offsets.append(position + 1)
+        position = find('\n', position + 1)
+    return offsets
+
+
+def diff_edit(original: str, modified: str) -> Optional[Edit]:
+    """Edição mínima (prefixo/sufixo comuns removidos) que leva a `modified`."""
+    if original == modified:
+        return None
+    limit = min(len(original), len(modified))
+    start = 0
+    while start < limit and original[start] == modified[start]:
+        start += 1
+    end_original, end_modified = len(original), len(modified)
+    while end_original > start and end_modified > start \
+            and original[end_original - 1] == modified[end_modified - 1]:
+        end_original -= 1
+        end_modified -= 1
+    return Edit(start, end_original, modified[start:end_modified])
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def write_atomic(path: Path, content: str) -> None:
+    """Grava via temporário no mesmo diretório + rename (mantém permissões)."""
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        try:
+            os.chmod(tmp, path.stat().st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+# =============================================================================
+# CONJUNTO DE EDIÇÕES
+# =============================================================================
+
+class EditSet:
+    """
+    Edições pendentes de vários arquivos, gravadas juntas por commit().
+
+    Args:
+        tool: Nome do script (vai no nome e no manifesto do snapshot)
+        snapshot_dir: Onde gravar os snapshots
+        root: Caminhos no snapshot são relativos a esta raiz
+    """
+
+    def __init__(self, tool: str, snapshot_dir: Path = SNAPSHOT_DIR, root: Path = BASE_DIR):
+        self.tool = tool
+        self.snapshot_dir = Path(snapshot_dir)
+        self.root = Path(root).resolve()
+        self._edits: Dict[Path, List[Edit]] = {}
+        self._originals: Dict[Path, str] = {}
+
+    def __len__(self) -> int:
+        return sum(len(edits) for edits in self._edits.values())
+
+    @property
+    def files(self) -> List[Path]:
+        return sorted(path for path, edits in self._edits.items() if edits)
+
+    def _register(self, path: Path, original: Optional[str]) -> Path:
+        path = Path(path).resolve()
+        if original is not None:
+            known = self._originals.setdefault(path, original)
+            if known != original:
+                raise EditConflict(f"conteúdo original divergente para {path}")
+        self._edits.setdefault(path, [])
+        return path
+
+    def add(self, path: Path, start: int, end: int, replacement: str,
+            original: Optional[str] = None) -> None:
+        """
+        Registra a substituição de [start, end) em `path`.
+
+        Args:
+            original: Conteúdo em que os índices foram calculados; se
+                informado, commit() recusa o arquivo se ele mudou no disco
+        """
+        path = self._register(path, original)
+        self._edits[path].append(Edit(start, end, replacement))
+
+    def replace_lines(self, path: Path, original: str, lines: Dict[int, str]) -> None:
+        """Substitui linhas inteiras (numeradas a partir de 1) de `original`."""
+        offsets = line_offsets(original)
+        for number, text in lines.items():
+            start = offsets[number - 1]
+            end = offsets[number] - 1 if number < len(offsets) else len(original)
+            if original[start:end] != text:
+                self.add(path, start, end, text, original)
+
+    def set_content(self, path: Path, original: str, modified: str) -> None:
+        """Registra o resultado de uma transformação do arquivo inteiro."""
+        edit = diff_edit(original, modified)
+        if edit is not None:
+            self.add(path, edit.start, edit.end, edit.replacement, original)
+
+    def preview(self) -> Dict[Path, Tuple[str, str]]:
+        """
+        Conteúdo atual e final de cada arquivo, sem gravar nada.
+
+        Raises:
+            EditConflict: Edições sobrepostas ou arquivo alterado no disco
+        """
+        result = {}
+        for path in self.files:
+            current = path.read_text(encoding='utf-8')
+            expected = self._originals.get(path)
+            if expected is not None and current != expected:
+                raise EditConflict(f"{path} foi alterado desde a análise")
+            try:
+                result[path] = (current, apply_edits(current, self._edits[path]))
+            except EditConflict as e:
+                raise EditConflict(f"{path}: {e}") from None
+        return result
+
+    def commit(self, snapshot: bool = True) -> Optional[Path]:
+        """
+        Grava todas as edições.
+
+        Tudo é calculado e validado antes da primeira gravação; se uma
+        gravação falhar, os arquivos já gravados voltam ao original.
+
+        Args:
+            snapshot: Se False, não grava snapshot (sem rollback)
+
+        Returns:
+            Caminho do snapshot, ou None se nada mudou / snapshot=False
+        """
+        changes = {path: contents for path, contents in self.preview().items()
+                   if contents[0] != contents[1]}
+        if not changes:
+            return None
+
+        snapshot_path = self._write_snapshot(changes) if snapshot else None
+
+        written: List[Path] = []
+        try:
+            for path, (_, modified) in changes.items():
+                write_atomic(path, modified)
+                written.append(path)
+        except BaseException:
+            for path in written:
+                write_atomic(path, changes[path][0])
+            raise
+
+        self._edits.clear()
+        self._originals.clear()
+        return snapshot_path
+
+    def _relative(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return path.as_posix().lstrip('/')
+
+    def _write_snapshot(self, changes: Dict[Path, Tuple[str, str]]) -> Path:
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        target = self.snapshot_dir / f"{stamp}-{self.tool}.tar.gz"
+
+        manifest = {
+            'tool': self.tool,
+            'created': datetime.now().isoformat(),
+            'root': str(self.root),
+            'files': [
+                {
+                    'path': str(path),
+                    'member': f"files/{self._relative(path)}",
+                    'sha256_before': _sha256(original),
+                    'sha256_after': _sha256(modified),
+                }
+                for path, (original, modified) in changes.items()
+            ],
+        }
+
+        fd, tmp = tempfile.mkstemp(dir=str(self.snapshot_dir), prefix='.snapshot.')
+        try:
+            with os.fdopen(fd, 'wb') as raw, tarfile.open(fileobj=raw, mode='w:gz') as tar:
+                _add_member(tar, MANIFEST_NAME, json.dumps(manifest, indent=2, ensure_ascii=False))
+                for entry, (original, _) in zip(manifest['files'], changes.values()):
+                    _add_member(tar, entry['member'], original)
+            os.replace(tmp, target)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        return target
+
+
+def _add_member(tar: tarfile.TarFile, name: str, text: str) -> None:
+    data = text.encode('utf-8')
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = int(datetime.now().timestamp())
+    tar.addfile(info, io.BytesIO(data))
+
+
+# =============================================================================
+# SNAPSHOTS E ROLLBACK
+# =============================================================================
+
+def list_snapshots(snapshot_dir: Path = SNAPSHOT_DIR) -> List[Path]:
+    """Snapshots do mais antigo para o mais recente."""
+    if not snapshot_dir.exists():
+        return []
+    return sorted(snapshot_dir.glob('*.tar.gz'))
+
+
+def read_manifest(snapshot: Path) -> Dict:
+    with tarfile.open(snapshot, 'r:gz') as tar:
+        return json.load(tar.extractfile(MANIFEST_NAME))
+
+
+def rollback(snapshot: Path, force: bool = False) -> List[Path]:
+    """
+    Restaura os originais de um snapshot.
+
+    O snapshot é renomeado com RESTORED_SUFFIX, de modo que um novo
+    --rollback desfaz a execução anterior a ele.
+
+    Args:
+        force: Restaurar mesmo arquivos alterados depois do snapshot
+
+    Returns:
+        Arquivos restaurados
+
+    Raises:
+        EditConflict: Algum arquivo mudou desde o snapshot (sem `force`);
+            nesse caso nada é restaurado
+    """
+    with tarfile.open(snapshot, 'r:gz') as tar:
+        manifest = json.load(tar.extractfile(MANIFEST_NAME))
+        originals = {
+            Path(entry['path']): tar.extractfile(entry['member']).read().decode('utf-8')
+            for entry in manifest['files']
+        }
+
+    if not force:
+        changed = []
+        for entry in manifest['files']:
+            path = Path(entry['path'])
+            current = path.read_text(encoding='utf-8') if path.exists() else None
+            if current is None or _sha256(current) not in (entry['sha256_after'], entry['sha256_before']):
+                changed.append(str(path))
+        if changed:
+            raise EditConflict("alterados depois do snapshot: " + ', '.join(changed))
+
+    for path, content in originals.items():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, content)
+    snapshot.rename(snapshot.with_name(snapshot.name + RESTORED_SUFFIX))
+    return list(originals)
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description='Lista e desfaz snapshots dos scripts de correção'
+    )
+    parser.add_argument('--list', '-l', action='store_true',
+                        help='Listar snapshots')
+    parser.add_argument('--rollback', '-r', nargs='?', const='latest', metavar='SNAPSHOT',
+                        help='Restaurar um snapshot (default: o mais recente)')
+    parser.add_argument('--force', action='store_true',
+                        help='Restaurar mesmo arquivos alterados depois do snapshot')
+    parser.add_argument('--dir', type=str, default=str(SNAPSHOT_DIR),
+                        help=f'Diretório dos snapshots (default: {SNAPSHOT_DIR})')
+    args = parser.parse_args()
+
+    snapshot_dir = Path(args.dir)
+    snapshots = list_snapshots(snapshot_dir)
+
+    if args.rollback:
+        if args.rollback == 'latest':
+            if not snapshots:
+                print("❌ Nenhum snapshot encontrado")
+                return 1
+            target = snapshots[-1]
+        else:
+            target = Path(args.rollback)
+            if not target.exists():
+                target = snapshot_dir / args.rollback
+        if not target.exists():
+            print(f"❌ Snapshot não encontrado: {args.rollback}")
+            return 1
+
+        try:
+            restored = rollback(target, force=args.force)
+        except EditConflict as e:
+            print(f"❌ {e}")
+            print("💡 Use --force para restaurar mesmo assim")
+            return 1
+        print(f"↩️ {target.name}: {len(restored)} arquivo(s) restaurado(s)")
+        for path in restored:
+            print(f"   {path}")
+        return 0
+
+    if not snapshots:
+        print("Nenhum snapshot encontrado")
+        return 0
+    for snapshot in snapshots:
+        manifest = read_manifest(snapshot)
+        print(f"{snapshot.name}  {manifest['tool']}  {len(manifest['files'])} arquivo(s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -12,6 +12,7 @@ Uso:
     python3 scripts/false_positive_filter.py --apply      # Aplicar alterações
     python3 scripts/false_positive_filter.py --whitelist  # Gerar whitelist
     python3 scripts/false_positive_filter.py --report     # Gerar relatório
+    python3 scripts/false_positive_filter.py --dry-run --skip-rules decorative-containers
 
 Autor: TSiJUKEBOX Team
 Data: 2025-01-01
@@ -24,9 +25,13 @@ import json
 import argparse
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional, Set
+from typing import Dict, Iterator, List, Tuple, Optional, Set
 from dataclasses import dataclass, field
 
+from a11y_rules import RuleContext, RuleEngine, RuleRegistry, add_rule_arguments, engine_from_args
+from edit_engine import ROLLBACK_COMMAND, EditSet
+from jsx_scanner import read_source
+
 # ============================================================================
 # CONFIGURAÇÃO
 # ============================================================================
@@ -34,7 +39,6 @@ from dataclasses import dataclass, field
 # Diretórios
 PROJECT_ROOT = Path(__file__).parent.parent
 SRC_DIR = PROJECT_ROOT / "src"
-BACKUP_DIR = PROJECT_ROOT / "backups" / "false-positive-filter"
 DOCS_DIR = PROJECT_ROOT / "docs" / "accessibility"
 WHITELIST_FILE = DOCS_DIR / "contrast-whitelist.json"
 
@@ -141,6 +145,83 @@ class FilterStats:
     errors: List[str] = field(default_factory=list)
 
 
+# ============================================================================
+# REGRAS DE ANÁLISE
+# ============================================================================
+
+# Elementos decorativos em previews de tema: (padrão, razão)
+THEME_ELEMENT_RULES = [
+    # Divs com style backgroundColor (swatches de cor)
+    (r'(<div[^>]*)(className="[^"]*"[^>]*style=\{\s*\{\s*backgroundColor)', 
+     'Color swatch decorativo'),
+    
+    # Mocks de player/sidebar
+    (r'(<div[^>]*)(className="[^"]*mock|Mock)', 
+     'Mock de interface decorativo'),
+    
+    # Elementos pequenos decorativos (w-1 a w-6, h-1 a h-6)
+    (r'(<div[^>]*)(className="[^"]*w-[1-6]\s+h-[1-6][^"]*rounded)', 
+     'Elemento decorativo pequeno'),
+    
+    # Círculos de cor (rounded-full com backgroundColor)
+    (r'(<div[^>]*)(className="[^"]*rounded-full[^"]*"[^>]*style=\{[^}]*backgroundColor)', 
+     'Círculo de cor decorativo'),
+    
+    # Barras de progresso decorativas
+    (r'(<div[^>]*)(className="[^"]*h-1[^"]*rounded[^"]*")', 
+     'Barra de progresso decorativa'),
+]
+
+# Containers decorativos: (padrão, razão)
+DECORATIVE_CONTAINER_RULES = [
+    # Container de preview de tema
+    (r'(<div[^>]*className="[^"]*aspect-video[^"]*")', 
+     'Container de preview decorativo'),
+    
+    # Container de mock
+    (r'(<div[^>]*className="[^"]*absolute\s+inset-0[^"]*flex[^"]*")', 
+     'Container de mock decorativo'),
+    
+    # Grid de swatches
+    (r'(<div[^>]*className="[^"]*grid[^"]*gap[^"]*"[^>]*>\s*\{[^}]*map)', 
+     'Grid de swatches decorativo'),
+]
+
+_THEME_ELEMENT_RES = [(re.compile(pattern), reason) for pattern, reason in THEME_ELEMENT_RULES]
+_DECORATIVE_CONTAINER_RES = [(re.compile(pattern), reason) for pattern, reason in DECORATIVE_CONTAINER_RULES]
+
+FILTER_RULES = RuleRegistry('false_positive_filter')
+
+
+def _any_of(rules: List[Tuple[str, str]]) -> str:
+    """Alternação dos padrões de uma regra."""
+    return '|'.join(f'(?:{pattern})' for pattern, _ in rules)
+
+
+@FILTER_RULES.line('theme-preview', 'theme-preview', _any_of(THEME_ELEMENT_RULES))
+def theme_preview_element(ctx: RuleContext, number: int, line: str, match) -> Iterator[Tuple[int, str, str, str]]:
+    """Elemento decorativo de preview de tema sem aria-hidden."""
+    # Verificar se já tem aria-hidden
+    if 'aria-hidden' in line:
+        return
+    for pattern, reason in _THEME_ELEMENT_RES:
+        if pattern.search(line):
+            yield (number, line.strip(), reason, 'aria-hidden')
+            return  # Evitar duplicatas na mesma linha
+
+
+@FILTER_RULES.line('decorative-container', 'decorative-containers', _any_of(DECORATIVE_CONTAINER_RULES))
+def decorative_container(ctx: RuleContext, number: int, line: str, match) -> Iterator[Tuple[int, str, str, str]]:
+    """Container decorativo sem role."""
+    # Verificar se já tem role
+    if 'role=' in line:
+        return
+    for pattern, reason in _DECORATIVE_CONTAINER_RES:
+        if pattern.search(line):
+            yield (number, line.strip(), reason, 'presentation')
+            return
+
+
 # ============================================================================
 # FUNÇÕES DE ANÁLISE
 # ============================================================================
@@ -151,45 +232,8 @@ def find_theme_preview_elements(content: str, filename: str) -> List[Tuple[int,
     
     Retorna lista de (linha, código_original, razão).
     """
-    results = []
-    lines = content.split('\n')
-    
-    # Padrões de elementos decorativos em previews de tema
-    patterns = [
-        # Divs com style backgroundColor (swatches de cor)
-        (r'(<div[^>]*)(className="[^"]*"[^>]*style=\{\s*\{\s*backgroundColor)', 
-         'Color swatch decorativo'),
-        
-        # Mocks de player/sidebar
-        (r'(<div[^>]*)(className="[^"]*mock|Mock)', 
-         'Mock de interface decorativo'),
-        
-        # Elementos pequenos decorativos (w-1 a w-6, h-1 a h-6)
-        (r'(<div[^>]*)(className="[^"]*w-[1-6]\s+h-[1-6][^"]*rounded)', 
-         'Elemento decorativo pequeno'),
-        
-        # Círculos de cor (rounded-full com backgroundColor)
-        (r'(<div[^>]*)(className="[^"]*rounded-full[^"]*"[^>]*style=\{[^}]*backgroundColor)', 
-         'Círculo de cor decorativo'),
-        
-        # Barras de progresso decorativas
-        (r'(<div[^>]*)(className="[^"]*h-1[^"]*rounded[^"]*")', 
-         'Barra de progresso decorativa'),
-    ]
-    
-    # Verificar se é arquivo de preview de tema
-    is_theme_file = any(f in filename for f in THEME_PREVIEW_FILES)
-    
-    for line_num, line in enumerate(lines, 1):
-        for pattern, reason in patterns:
-            matches = re.finditer(pattern, line)
-            for match in matches:
-                # Verificar se já tem aria-hidden
-                if 'aria-hidden' not in line:
-                    results.append((line_num, line.strip(), reason))
-                    break  # Evitar duplicatas na mesma linha
-    
-    return results
+    findings = FILTER_RULES.compile(['theme-preview']).run(content, filename)
+    return [(line_num, original, reason) for line_num, original, reason, _ in findings]
 
 
 def find_decorative_containers(content: str, filename: str) -> List[Tuple[int, str, str]]:
@@ -198,33 +242,8 @@ def find_decorative_containers(content: str, filename: str) -> List[Tuple[int, s
     
     Retorna lista de (linha, código_original, razão).
     """
-    results = []
-    lines = content.split('\n')
-    
-    # Padrões de containers decorativos
-    patterns = [
-        # Container de preview de tema
-        (r'(<div[^>]*className="[^"]*aspect-video[^"]*")', 
-         'Container de preview decorativo'),
-        
-        # Container de mock
-        (r'(<div[^>]*className="[^"]*absolute\s+inset-0[^"]*flex[^"]*")', 
-         'Container de mock decorativo'),
-        
-        # Grid de swatches
-        (r'(<div[^>]*className="[^"]*grid[^"]*gap[^"]*"[^>]*>\s*\{[^}]*map)', 
-         'Grid de swatches decorativo'),
-    ]
-    
-    for line_num, line in enumerate(lines, 1):
-        for pattern, reason in patterns:
-            if re.search(pattern, line):
-                # Verificar se já tem role
-                if 'role=' not in line:
-                    results.append((line_num, line.strip(), reason))
-                    break
-    
-    return results
+    findings = FILTER_RULES.compile(['decorative-container']).run(content, filename)
+    return [(line_num, original, reason) for line_num, original, reason, _ in findings]
 
 
 def analyze_brand_colors(content: str, filename: str) -> List[WhitelistEntry]:
@@ -309,13 +328,22 @@ def add_role_presentation(line: str) -> str:
     return re.sub(pattern, replacer, line, count=1)
 
 
-def process_file(filepath: Path, dry_run: bool = True) -> List[FilterResult]:
+def process_file(
+    filepath: Path,
+    dry_run: bool = True,
+    engine: Optional[RuleEngine] = None,
+    edits: Optional[EditSet] = None
+) -> List[FilterResult]:
     """
     Processa um arquivo e aplica filtros de falsos positivos.
     
     Args:
         filepath: Caminho do arquivo
         dry_run: Se True, apenas simula as alterações
+        engine: Regras ativas (padrão: todas)
+        edits: Se informado, as alterações são acumuladas nele (gravadas
+            pelo chamador com edits.commit()); senão o arquivo é gravado
+            na hora, com snapshot próprio
         
     Returns:
         Lista de FilterResult com as alterações feitas/simuladas
@@ -323,57 +351,42 @@ def process_file(filepath: Path, dry_run: bool = True) -> List[FilterResult]:
     results = []
     
     try:
-        content = filepath.read_text(encoding='utf-8')
+        content = read_source(filepath)
         lines = content.split('\n')
-        modified_lines = lines.copy()
+        modified_lines: Dict[int, str] = {}
         filename = str(filepath.relative_to(PROJECT_ROOT))
         
-        # Encontrar elementos que precisam de aria-hidden
-        theme_elements = find_theme_preview_elements(content, filename)
-        
-        for line_num, original, reason in theme_elements:
-            idx = line_num - 1
-            modified = add_aria_hidden_to_element(modified_lines[idx])
-            
-            if modified != modified_lines[idx]:
-                results.append(FilterResult(
-                    file=filename,
-                    line=line_num,
-                    original=original,
-                    modified=modified.strip(),
-                    filter_type='aria-hidden',
-                    reason=reason
-                ))
-                modified_lines[idx] = modified
-        
-        # Encontrar containers decorativos
-        decorative_containers = find_decorative_containers(content, filename)
+        # Encontrar elementos e containers decorativos (uma passada)
+        if engine is None:
+            engine = FILTER_RULES.compile()
+        modifiers = {
+            'aria-hidden': add_aria_hidden_to_element,
+            'presentation': add_role_presentation,
+        }
         
-        for line_num, original, reason in decorative_containers:
-            idx = line_num - 1
-            modified = add_role_presentation(modified_lines[idx])
+        for line_num, original, reason, filter_type in engine.run(content, filename):
+            current = modified_lines.get(line_num, lines[line_num - 1])
+            modified = modifiers[filter_type](current)
             
-            if modified != modified_lines[idx]:
+            if modified != current:
                 results.append(FilterResult(
                     file=filename,
                     line=line_num,
                     original=original,
                     modified=modified.strip(),
-                    filter_type='presentation',
+                    filter_type=filter_type,
                     reason=reason
                 ))
-                modified_lines[idx] = modified
+                modified_lines[line_num] = modified
         
         # Salvar alterações se não for dry-run
         if not dry_run and results:
-            # Criar backup
-            backup_path = BACKUP_DIR / filepath.relative_to(PROJECT_ROOT)
-            backup_path.parent.mkdir(parents=True, exist_ok=True)
-            backup_path.write_text(content, encoding='utf-8')
-            
-            # Salvar arquivo modificado
-            new_content = '\n'.join(modified_lines)
-            filepath.write_text(new_content, encoding='utf-8')
+            if edits is not None:
+                edits.replace_lines(filepath, content, modified_lines)
+            else:
+                single = EditSet('false-positive-filter')
+                single.replace_lines(filepath, content, modified_lines)
+                single.commit()
     
     except Exception as e:
         print(f"Erro ao processar {filepath}: {e}")
@@ -517,7 +530,7 @@ def generate_report(results: List[FilterResult], stats: FilterStats) -> str:
 # FUNÇÃO PRINCIPAL
 # ============================================================================
 
-def main():
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(
         description='Filtrar falsos positivos de contraste no TSiJUKEBOX'
     )
@@ -531,8 +544,10 @@ def main():
                         help='Gerar relatório detalhado')
     parser.add_argument('--verbose', '-v', action='store_true',
                         help='Saída detalhada')
+    add_rule_arguments(parser)
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    engine = engine_from_args(FILTER_RULES, parser, args)
     
     # Se nenhuma ação especificada, mostrar ajuda
     if not any([args.dry_run, args.apply, args.whitelist, args.report]):
@@ -568,16 +583,15 @@ def main():
         print(f"🔧 Modo: {mode}")
         print()
         
-        # Criar diretório de backup
-        if not dry_run:
-            BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+        # Alterações de todos os arquivos, gravadas juntas no final
+        edits = EditSet('false-positive-filter')
         
         # Processar arquivos de preview de tema
         print("📁 Processando arquivos de preview de tema...")
         for file_pattern in THEME_PREVIEW_FILES:
             filepath = PROJECT_ROOT / file_pattern
             if filepath.exists():
-                results = process_file(filepath, dry_run)
+                results = process_file(filepath, dry_run, engine, edits)
                 all_results.extend(results)
                 stats.files_scanned += 1
                 
@@ -599,7 +613,7 @@ def main():
             if rel_path in THEME_PREVIEW_FILES:
                 continue
             
-            results = process_file(tsx_file, dry_run)
+            results = process_file(tsx_file, dry_run, engine, edits)
             all_results.extend(results)
             stats.files_scanned += 1
             
@@ -613,6 +627,12 @@ def main():
                 print(f"   📄 {rel_path}: {len(results)} alterações")
         
         stats.total_changes = len(all_results)
+        
+        if not dry_run:
+            snapshot = edits.commit()
+            if snapshot:
+                print(f"\n📦 Snapshot: {snapshot}")
+                print(f"↩️ Para desfazer: {ROLLBACK_COMMAND}")
     
     # Gerar relatório
     if args.report or all_results:
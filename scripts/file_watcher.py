@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Observador de Arquivos para Auditorias
+======================================
+
+Modo --watch dos scripts de auditoria (contrast_analyzer.py,
+audit-contrast-issues.py, add-aria-labels.py): analisa a árvore uma vez,
+mantém o resultado de cada arquivo em memória e, a cada salvamento,
+reanalisa só os arquivos tocados e republica a lista de problemas no
+terminal e num arquivo JSON.
+
+Funcionalidades:
+- inotify via ctypes no Linux (sem dependências), recursivo, com
+  diretórios novos observados automaticamente
+- Fallback por polling (mtime/tamanho) em outros sistemas
+- Eventos agrupados por uma janela curta (salvamento atômico de editores
+  gera vários eventos para o mesmo arquivo)
+- JSON gravado atomicamente (temporário + rename)
+
+Uso:
+    from file_watcher import WatchSession, add_watch_arguments
+
+    session = WatchSession(
+        analyze=lambda path: audit(path),
+        report=lambda results: {'issues': [...]},
+        describe=lambda path, result: [f"linha {i.line}: ..." for i in result],
+        json_path=Path('.cache/audit-watch.json'),
+    )
+    session.run([Path('src')], extensions=('.tsx',))
+
+Autor: TSiJUKEBOX Team
+Versão: 1.0.0
+"""
+
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+# Janela para agrupar eventos de um mesmo salvamento (segundos)
+DEBOUNCE_SECONDS = 0.03
+
+# Intervalo do fallback por polling (segundos)
+POLL_INTERVAL = 0.25
+
+# Diretórios nunca observados
+EXCLUDED_DIRS = ('node_modules', 'dist', 'build', '.next', 'coverage', '.git')
+
+# Problemas listados por arquivo alterado no terminal
+MAX_LINES_PER_FILE = 10
+
+# Constantes do inotify (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+_EVENT = struct.Struct('iIII')
+
+
+# =============================================================================
+# OBSERVADOR
+# =============================================================================
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    except OSError:
+        return None
+    return libc if hasattr(libc, 'inotify_init1') else None
+
+
+class FileWatcher:
+    """
+    Observa diretórios (recursivamente) e arquivos avulsos.
+
+    Attributes:
+        backend: 'inotify' ou 'polling'
+    """
+
+    def __init__(
+        self,
+        roots: Sequence[Path],
+        extensions: Sequence[str] = ('.tsx', '.jsx'),
+        excluded: Sequence[str] = EXCLUDED_DIRS,
+        backend: str = 'auto',
+        debounce: float = DEBOUNCE_SECONDS,
+        poll_interval: float = POLL_INTERVAL
+    ):
+        roots = [Path(root).resolve() for root in roots]
+        self.dirs = [root for root in roots if root.is_dir()]
+        self.files = {root for root in roots if not root.is_dir()}
+        self.extensions = tuple(extensions)
+        self.excluded = set(excluded)
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+
+        self._libc = _load_libc() if backend in ('auto', 'inotify') else None
+        if backend == 'inotify' and self._libc is None:
+            raise OSError("inotify indisponível neste sistema")
+        self.backend = 'inotify' if self._libc is not None else 'polling'
+
+        self._fd = -1
+        self._watches: Dict[int, Path] = {}
+        self._snapshot: Dict[Path, Tuple[int, int]] = {}
+        if self.backend == 'inotify':
+            self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if self._fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1 falhou")
+            for directory in self.dirs:
+                self._watch_tree(directory)
+            for parent in {path.parent for path in self.files}:
+                self._add_watch(parent)
+        else:
+            self._snapshot = self._stat_all()
+
+    def __enter__(self) -> 'FileWatcher':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    # ------------------------------------------------------------------
+    # Filtros e listagem
+    # ------------------------------------------------------------------
+
+    def accepts(self, path: Path) -> bool:
+        """True para arquivos observados (extensão, fora de excluídos)."""
+        if path in self.files:
+            return True
+        if path.suffix not in self.extensions:
+            return False
+        for directory in self.dirs:
+            try:
+                relative = path.relative_to(directory)
+            except ValueError:
+                continue
+            return not any(part in self.excluded for part in relative.parts[:-1])
+        return False
+
+    def _walk(self) -> Iterable[Path]:
+        for directory in self.dirs:
+            for root, dirnames, filenames in os.walk(directory):
+                dirnames[:] = [d for d in dirnames if d not in self.excluded]
+                for name in filenames:
+                    if name.endswith(self.extensions):
+                        yield Path(root) / name
+        for path in self.files:
+            if path.exists():
+                yield path
+
+    def list_files(self) -> List[Path]:
+        """Arquivos observados que existem agora, ordenados."""
+        return sorted(set(self._walk()))
+
+    # ------------------------------------------------------------------
+    # inotify
+    # ------------------------------------------------------------------
+
+    def _add_watch(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd >= 0:
+            self._watches[wd] = directory
+
+    def _watch_tree(self, directory: Path) -> List[Path]:
+        """Observa um diretório e subdiretórios; retorna arquivos já presentes."""
+        found = []
+        for root, dirnames, filenames in os.walk(directory):
+            dirnames[:] = [d for d in dirnames if d not in self.excluded]
+            self._add_watch(Path(root))
+            found.extend(Path(root) / name for name in filenames)
+        return found
+
+    def _read_events(self, changed: Set[Path], removed: Set[Path]) -> bool:
+        """Lê eventos pendentes; False se a fila transbordou."""
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return True
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                return False
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / name
+
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and name not in self.excluded:
+                    # Diretório novo (ou movido para cá): observar e analisar o conteúdo
+                    changed.update(p for p in self._watch_tree(path) if self.accepts(p))
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    # Arquivos abaixo dele são descartados por quem consome
+                    removed.add(path)
+                continue
+            if not self.accepts(path):
+                continue
+            if mask & (IN_DELETE | IN_MOVED_FROM):
+                changed.discard(path)
+                removed.add(path)
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                removed.discard(path)
+                changed.add(path)
+        return True
+
+    # ------------------------------------------------------------------
+    # Polling
+    # ------------------------------------------------------------------
+
+    def _stat_all(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        for path in self._walk():
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def _poll(self, changed: Set[Path], removed: Set[Path]) -> None:
+        current = self._stat_all()
+        changed.update(p for p, sig in current.items() if self._snapshot.get(p) != sig)
+        removed.update(p for p in self._snapshot if p not in current)
+        self._snapshot = current
+
+    # ------------------------------------------------------------------
+    # Espera
+    # ------------------------------------------------------------------
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[Tuple[Set[Path], Set[Path]]]:
+        """
+        Espera alterações.
+
+        Returns:
+            (alterados, removidos) já filtrados, ou None se o tempo acabou.
+            Um diretório removido aparece em removidos; os arquivos
+            abaixo dele devem ser descartados pelo chamador.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed: Set[Path] = set()
+        removed: Set[Path] = set()
+
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if self.backend == 'inotify':
+                ready, _, _ = select.select([self._fd], [], [], remaining)
+                if ready and not self._read_events(changed, removed):
+                    # Fila cheia: tratar tudo como alterado
+                    changed.update(self.list_files())
+            else:
+                time.sleep(self.poll_interval if remaining is None else min(self.poll_interval, remaining))
+                self._poll(changed, removed)
+
+            if changed or removed:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+
+        # Agrupar o restante do salvamento (rename + chmod, vários arquivos)
+        if self.backend == 'inotify':
+            while select.select([self._fd], [], [], self.debounce)[0]:
+                if not self._read_events(changed, removed):
+                    changed.update(self.list_files())
+
+        changed = {p for p in changed if p.exists()}
+        removed = {p for p in removed if p not in changed}
+        return changed, removed
+
+
+# =============================================================================
+# SESSÃO DE AUDITORIA
+# =============================================================================
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """Grava JSON via temporário no mesmo diretório + rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class WatchSession:
+    """
+    Resultados por arquivo mantidos em memória e republicados a cada mudança.
+
+    Args:
+        analyze: path → resultado do arquivo
+        report: {path: resultado} → dicionário publicado no JSON; use a
+            chave 'issues_found' para o total mostrado no terminal
+        describe: (path, resultado) → linhas mostradas para arquivos alterados
+        json_path: Arquivo JSON republicado a cada atualização
+        title: Nome mostrado no terminal
+        initial: Opcional; analisa a lista inicial de uma vez (cache, paralelo)
+    """
+
+    def __init__(
+        self,
+        analyze: Callable[[Path], Any],
+        report: Callable[[Dict[Path, Any]], Dict],
+        describe: Callable[[Path, Any], List[str]],
+        json_path: Path,
+        title: str = 'auditoria',
+        initial: Optional[Callable[[List[Path]], List[Any]]] = None,
+        out=None
+    ):
+        self.analyze = analyze
+        self.report = report
+        self.describe = describe
+        self.json_path = Path(json_path)
+        self.title = title
+        self.initial = initial
+        self.out = out or sys.stdout
+        self.results: Dict[Path, Any] = {}
+        self.updates = 0
+
+    def _print(self, text: str = '') -> None:
+        print(text, file=self.out, flush=True)
+
+    def _relative(self, path: Path) -> str:
+        try:
+            return str(path.relative_to(Path.cwd()))
+        except ValueError:
+            return str(path)
+
+    def load(self, files: List[Path]) -> None:
+        """Análise completa inicial."""
+        if self.initial is not None:
+            results = self.initial(files)
+        else:
+            results = [self.analyze(path) for path in files]
+        self.results = dict(zip(files, results))
+
+    def update(self, changed: Set[Path], removed: Set[Path]) -> Dict:
+        """Reanalisa os alterados, descarta os removidos e publica."""
+        started = time.perf_counter()
+        for path in removed:
+            self.results.pop(path, None)
+            for stale in [p for p in self.results if path in p.parents]:
+                del self.results[stale]
+        for path in changed:
+            self.results[path] = self.analyze(path)
+        # Ordem estável (como na análise completa)
+        self.results = dict(sorted(self.results.items()))
+        payload = self.publish()
+        elapsed = (time.perf_counter() - started) * 1000
+
+        self.updates += 1
+        stamp = datetime.now().strftime('%H:%M:%S')
+        self._print(f"[{stamp}] {len(changed)} alterado(s), {len(removed)} removido(s) "
+                    f"em {elapsed:.0f} ms: {payload.get('issues_found', 0)} problema(s) em "
+                    f"{len(self.results)} arquivo(s)")
+        for path in sorted(changed):
+            lines = self.describe(path, self.results[path])
+            self._print(f"  📄 {self._relative(path)}: {len(lines)} problema(s)")
+            for line in lines[:MAX_LINES_PER_FILE]:
+                self._print(f"     {line}")
+            if len(lines) > MAX_LINES_PER_FILE:
+                self._print(f"     ... e mais {len(lines) - MAX_LINES_PER_FILE}")
+        for path in sorted(removed):
+            self._print(f"  🗑️ {self._relative(path)}")
+        return payload
+
+    def publish(self) -> Dict:
+        """Grava o JSON com o estado atual."""
+        payload = {
+            'generated': datetime.now().isoformat(),
+            'files': len(self.results),
+            **self.report(self.results),
+        }
+        write_json_atomic(self.json_path, payload)
+        return payload
+
+    def run(
+        self,
+        roots: Sequence[Path],
+        extensions: Sequence[str] = ('.tsx', '.jsx'),
+        excluded: Sequence[str] = EXCLUDED_DIRS,
+        backend: str = 'auto',
+        stop: Optional[threading.Event] = None
+    ) -> int:
+        """Loop do modo --watch até Ctrl+C (ou `stop`)."""
+        with FileWatcher(roots, extensions, excluded, backend=backend) as watcher:
+            started = time.perf_counter()
+            files = watcher.list_files()
+            self.load(files)
+            payload = self.publish()
+            self._print(f"👀 {self.title}: {len(files)} arquivo(s), "
+                        f"{payload.get('issues_found', 0)} problema(s) "
+                        f"em {time.perf_counter() - started:.1f}s ({watcher.backend})")
+            self._print(f"   JSON: {self._relative(self.json_path)}")
+            self._print("   Aguardando alterações (Ctrl+C para sair)...")
+
+            try:
+                while stop is None or not stop.is_set():
+                    events = watcher.wait(timeout=0.5 if stop is not None else None)
+                    if events is None:
+                        continue
+                    changed, removed = events
+                    if changed or removed:
+                        self.update(changed, removed)
+            except KeyboardInterrupt:
+                self._print("\n👋 Modo watch encerrado")
+        return 0
+
+
+def add_watch_arguments(parser, default_json: Path) -> None:
+    """Adiciona --watch e --watch-json."""
+    parser.add_argument('--watch', action='store_true',
+                        help='Observar src/ e reanalisar só os arquivos alterados')
+    parser.add_argument('--watch-json', type=str, default=str(default_json),
+                        help=f'JSON atualizado a cada mudança no modo --watch (default: {default_json})')
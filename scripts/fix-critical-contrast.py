@@ -25,16 +25,17 @@ import os
 import re
 import sys
 import argparse
-import shutil
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass, field
 from typing import List, Dict, Tuple, Optional, Set
 from collections import defaultdict
 
+from edit_engine import ROLLBACK_COMMAND, EditSet
+from jsx_scanner import read_source
+
 # Diretório base do projeto
 BASE_DIR = Path(__file__).parent.parent
-BACKUP_DIR = BASE_DIR / 'backups' / 'contrast-fixes'
 
 # =============================================================================
 # MAPEAMENTOS DE CORREÇÃO
@@ -649,33 +650,11 @@ def find_contrast_issues(content: str, filepath: str) -> List[ContrastFix]:
     return fixes
 
 
-def apply_fix(content: str, fix: ContrastFix) -> str:
-    """Aplica uma correção ao conteúdo."""
-    lines = content.split('\n')
-    line_idx = fix.line - 1
-    
-    if line_idx < len(lines):
-        # Criar padrão que captura a classe completa
-        pattern = rf'\b{re.escape(fix.original_class)}\b(?!/)'
-        lines[line_idx] = re.sub(pattern, fix.new_class, lines[line_idx])
-    
-    return '\n'.join(lines)
-
-
-# =============================================================================
-# FUNÇÕES DE BACKUP
-# =============================================================================
-
-def create_backup(filepath: Path, content: str) -> Path:
-    """Cria backup do arquivo antes de modificar."""
-    BACKUP_DIR.mkdir(parents=True, exist_ok=True)
-    
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    backup_name = f"{filepath.stem}_{timestamp}{filepath.suffix}"
-    backup_path = BACKUP_DIR / backup_name
-    
-    backup_path.write_text(content, encoding='utf-8')
-    return backup_path
+def apply_fix(line: str, fix: ContrastFix) -> str:
+    """Aplica uma correção à linha da correção."""
+    # Criar padrão que captura a classe completa
+    pattern = rf'\b{re.escape(fix.original_class)}\b(?!/)'
+    return re.sub(pattern, fix.new_class, line)
 
 
 # =============================================================================
@@ -697,8 +676,12 @@ def fix_critical_contrast(
     
     Returns:
         FixResult com estatísticas da execução
+    
+    As correções de todos os arquivos são gravadas juntas no final, com
+    um snapshot para rollback (python3 scripts/edit_engine.py --rollback).
     """
     result = FixResult()
+    edits = EditSet('fix-critical-contrast')
     
     # Coletar arquivos
     files = []
@@ -731,7 +714,7 @@ def fix_critical_contrast(
             continue
         
         try:
-            content = filepath.read_text(encoding='utf-8')
+            content = read_source(filepath)
         except Exception as e:
             print(f"⚠️ Erro ao ler {filepath}: {e}")
             continue
@@ -742,19 +725,21 @@ def fix_critical_contrast(
         if not fixes:
             continue
         
-        # Aplicar correções
-        modified_content = content
+        # Aplicar correções (só nas linhas afetadas)
+        lines = content.split('\n')
+        modified_lines: Dict[int, str] = {}
         file_fixes = 0
         
         for fix in fixes:
             # Verificar se a correção já foi aplicada
-            if fix.new_class in modified_content.split('\n')[fix.line - 1]:
+            line = modified_lines.get(fix.line, lines[fix.line - 1])
+            if fix.new_class in line:
                 result.skipped_reasons['já_corrigido'] = \
                     result.skipped_reasons.get('já_corrigido', 0) + 1
                 continue
             
             if not dry_run:
-                modified_content = apply_fix(modified_content, fix)
+                modified_lines[fix.line] = apply_fix(line, fix)
             
             result.all_fixes.append(fix)
             result.fixes_applied += 1
@@ -775,12 +760,16 @@ def fix_critical_contrast(
             result.fixes_by_file[str(filepath)] = file_fixes
             
             if not dry_run:
-                # Criar backup
-                create_backup(filepath, content)
-                # Salvar arquivo modificado
-                filepath.write_text(modified_content, encoding='utf-8')
+                edits.replace_lines(filepath, content, modified_lines)
                 print(f"✅ {filepath.name}: {file_fixes} correções")
     
+    # Gravar tudo de uma vez
+    if not dry_run:
+        snapshot = edits.commit()
+        if snapshot:
+            print(f"📦 Snapshot: {snapshot}")
+            print(f"↩️ Para desfazer: {ROLLBACK_COMMAND}")
+    
     # Resumo
     print()
     print("=" * 70)
@@ -867,7 +856,7 @@ def generate_report(result: FixResult) -> str:
 # CLI
 # =============================================================================
 
-def main():
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(
         description='Corrige automaticamente issues críticos de contraste'
     )
@@ -904,7 +893,7 @@ def main():
         help='Arquivo de saída para o relatório'
     )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Determinar modo
     if args.apply:
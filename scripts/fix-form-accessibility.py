@@ -19,6 +19,7 @@ Uso:
     python3 scripts/fix-form-accessibility.py --apply        # Aplicar correções
     python3 scripts/fix-form-accessibility.py --report       # Gerar relatório
     python3 scripts/fix-form-accessibility.py --file <path>  # Arquivo específico
+    python3 scripts/fix-form-accessibility.py --rules labels # Só um conjunto de regras
 
 Autor: TSiJUKEBOX Team
 Versão: 1.0.0
@@ -31,10 +32,14 @@ import json
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Iterator, Optional, Tuple
 from enum import Enum
 import subprocess
 
+from a11y_rules import RuleContext, RuleEngine, RuleRegistry, add_rule_arguments, engine_from_args
+from edit_engine import ROLLBACK_COMMAND, EditSet
+from jsx_scanner import read_source, scan
+
 
 # =============================================================================
 # CONFIGURAÇÕES
@@ -43,7 +48,6 @@ import subprocess
 # Diretórios
 BASE_DIR = Path(__file__).parent.parent
 SRC_DIR = BASE_DIR / "src"
-BACKUP_DIR = BASE_DIR / "backups" / "form-a11y-fixes"
 REPORT_DIR = BASE_DIR / "docs" / "accessibility"
 
 # Padrões de arquivo
@@ -201,6 +205,22 @@ FIELD_LABELS_PT = {
     'search': 'Pesquisar',
 }
 
+# Padrões comuns de mensagens de erro
+ERROR_MESSAGE_PATTERN = re.compile('|'.join([
+    r'error\s*&&\s*<(span|p|div)',
+    r'errors?\.[a-zA-Z]+\s*&&',
+    r'<FormError',
+    r'<ErrorMessage',
+    r'className="[^"]*error[^"]*"',
+]), re.IGNORECASE)
+
+# Padrões que indicam estado de erro
+ERROR_STATE_PATTERN = re.compile('|'.join([
+    r'className="[^"]*(?:error|invalid|border-red|ring-red)[^"]*"',
+    r'(?:isInvalid|hasError|error)={true}',
+    r'(?:isInvalid|hasError|error)=\{[^}]+\}',
+]), re.IGNORECASE)
+
 
 # =============================================================================
 # ESTRUTURAS DE DADOS
@@ -254,231 +274,163 @@ class ProcessingStats:
 
 
 # =============================================================================
-# FUNÇÕES DE DETECÇÃO
+# REGRAS DE DETECÇÃO
 # =============================================================================
 
-def detect_input_without_label(content: str, filepath: str) -> List[FormIssue]:
-    """Detecta inputs sem labels associados."""
-    issues = []
-    lines = content.split('\n')
-    
-    # Padrão para inputs
-    input_pattern = re.compile(
-        r'<(Input|input|TextField|TextInput)\s+([^>]*?)(/?>)',
-        re.IGNORECASE | re.DOTALL
-    )
-    
-    for i, line in enumerate(lines):
-        for match in input_pattern.finditer(line):
-            attrs = match.group(2)
-            
-            # Verificar se tem label associado
-            has_label = any([
-                'aria-label=' in attrs,
-                'aria-labelledby=' in attrs,
-                'id=' in attrs and _has_label_for_id(content, attrs),
-            ])
-            
-            # Verificar se é um input escondido ou submit
-            is_hidden = 'type="hidden"' in attrs or 'type="submit"' in attrs
-            
-            if not has_label and not is_hidden:
-                # Extrair nome do campo para sugestão
-                field_name = _extract_field_name(attrs)
-                suggested_label = FIELD_LABELS_PT.get(field_name, field_name.replace('_', ' ').title())
-                
-                issues.append(FormIssue(
-                    file=str(filepath),
-                    line=i + 1,
-                    issue_type=IssueType.MISSING_LABEL,
-                    severity=Severity.CRITICAL,
-                    element=match.group(0)[:80],
-                    context=line.strip()[:100],
-                    suggestion=f'Adicionar aria-label="{suggested_label}" ou associar com <Label htmlFor="...">',
-                    auto_fixable=True
-                ))
-    
-    return issues
+FORM_RULES = RuleRegistry('fix-form-accessibility')
 
 
-def detect_placeholder_as_label(content: str, filepath: str) -> List[FormIssue]:
-    """Detecta inputs que usam placeholder como único identificador."""
-    issues = []
-    lines = content.split('\n')
+@FORM_RULES.element('input-label', 'labels', tags=('input', 'textfield', 'textinput'), ignore_case=True)
+def input_without_label(ctx: RuleContext, element) -> Iterator[FormIssue]:
+    """Input sem label associado."""
+    attrs = element.attrs
     
-    pattern = re.compile(
-        r'<(Input|input)\s+([^>]*placeholder="[^"]+")[^>]*(/?>)',
-        re.IGNORECASE
-    )
+    # Verificar se tem label associado
+    has_label = any([
+        'aria-label=' in attrs,
+        'aria-labelledby=' in attrs,
+        'id=' in attrs and _has_label_for_id(ctx.content, attrs),
+    ])
     
-    for i, line in enumerate(lines):
-        for match in pattern.finditer(line):
-            attrs = match.group(2)
-            
-            # Verificar se tem label além do placeholder
-            has_proper_label = any([
-                'aria-label=' in attrs,
-                'aria-labelledby=' in attrs,
-            ])
-            
-            if not has_proper_label:
-                # Extrair placeholder para usar como sugestão
-                placeholder_match = re.search(r'placeholder="([^"]+)"', attrs)
-                placeholder = placeholder_match.group(1) if placeholder_match else ""
-                
-                issues.append(FormIssue(
-                    file=str(filepath),
-                    line=i + 1,
-                    issue_type=IssueType.PLACEHOLDER_AS_LABEL,
-                    severity=Severity.HIGH,
-                    element=match.group(0)[:80],
-                    context=line.strip()[:100],
-                    suggestion=f'Adicionar aria-label="{placeholder}" (placeholder não é suficiente)',
-                    auto_fixable=True
-                ))
-    
-    return issues
+    # Verificar se é um input escondido ou submit
+    is_hidden = 'type="hidden"' in attrs or 'type="submit"' in attrs
+    
+    if not has_label and not is_hidden:
+        # Extrair nome do campo para sugestão
+        field_name = _extract_field_name(attrs)
+        suggested_label = FIELD_LABELS_PT.get(field_name, field_name.replace('_', ' ').title())
+        
+        yield FormIssue(
+            file=str(ctx.filepath),
+            line=element.line,
+            issue_type=IssueType.MISSING_LABEL,
+            severity=Severity.CRITICAL,
+            element=_element_source(ctx.content, element),
+            context=element.context[:100],
+            suggestion=f'Adicionar aria-label="{suggested_label}" ou associar com <Label htmlFor="...">',
+            auto_fixable=True
+        )
 
 
-def detect_missing_autocomplete(content: str, filepath: str) -> List[FormIssue]:
-    """Detecta inputs que deveriam ter autocomplete."""
-    issues = []
-    lines = content.split('\n')
-    
-    pattern = re.compile(
-        r'<(Input|input)\s+([^>]*(?:name|id)="([^"]+)")[^>]*(/?>)',
-        re.IGNORECASE
-    )
-    
-    for i, line in enumerate(lines):
-        for match in pattern.finditer(line):
-            attrs = match.group(2)
-            field_name = match.group(3).lower()
-            
-            # Verificar se já tem autocomplete
-            has_autocomplete = 'autoComplete=' in attrs or 'autocomplete=' in attrs
-            
-            # Verificar se é um campo que deveria ter autocomplete
-            suggested_autocomplete = None
-            for key, value in AUTOCOMPLETE_MAPPINGS.items():
-                if key.lower() in field_name:
-                    suggested_autocomplete = value
-                    break
-            
-            if suggested_autocomplete and not has_autocomplete:
-                issues.append(FormIssue(
-                    file=str(filepath),
-                    line=i + 1,
-                    issue_type=IssueType.MISSING_AUTOCOMPLETE,
-                    severity=Severity.MEDIUM,
-                    element=match.group(0)[:80],
-                    context=line.strip()[:100],
-                    suggestion=f'Adicionar autoComplete="{suggested_autocomplete}"',
-                    auto_fixable=True
-                ))
-    
-    return issues
+@FORM_RULES.element('placeholder-label', 'labels', tags=('input',), ignore_case=True, attrs=('placeholder',))
+def placeholder_as_label(ctx: RuleContext, element) -> Iterator[FormIssue]:
+    """Placeholder usado como único identificador."""
+    # Extrair placeholder para usar como sugestão
+    placeholder = element.get('placeholder')
+    if not placeholder or not element.raw_attributes['placeholder'].startswith('"'):
+        return
+    attrs = element.attrs
+    
+    # Verificar se tem label além do placeholder
+    has_proper_label = any([
+        'aria-label=' in attrs,
+        'aria-labelledby=' in attrs,
+    ])
+    
+    if not has_proper_label:
+        yield FormIssue(
+            file=str(ctx.filepath),
+            line=element.line,
+            issue_type=IssueType.PLACEHOLDER_AS_LABEL,
+            severity=Severity.HIGH,
+            element=_element_source(ctx.content, element),
+            context=element.context[:100],
+            suggestion=f'Adicionar aria-label="{placeholder}" (placeholder não é suficiente)',
+            auto_fixable=True
+        )
 
 
-def detect_missing_required_indicator(content: str, filepath: str) -> List[FormIssue]:
-    """Detecta campos required sem indicação visual/ARIA."""
-    issues = []
-    lines = content.split('\n')
+@FORM_RULES.element('autocomplete', 'autocomplete', tags=('input',), ignore_case=True)
+def missing_autocomplete(ctx: RuleContext, element) -> Iterator[FormIssue]:
+    """Campo comum (nome, e-mail, senha...) sem autocomplete."""
+    field_name = (element.get('name') or element.get('id') or '').lower()
+    if not field_name:
+        return
+    attrs = element.attrs
     
-    pattern = re.compile(
-        r'<(Input|input|Select|select|Textarea|textarea)\s+([^>]*required[^>]*)(/?>)',
-        re.IGNORECASE
-    )
+    # Verificar se já tem autocomplete
+    has_autocomplete = 'autoComplete=' in attrs or 'autocomplete=' in attrs
     
-    for i, line in enumerate(lines):
-        for match in pattern.finditer(line):
-            attrs = match.group(2)
-            
-            # Verificar se tem indicação ARIA
-            has_aria_required = 'aria-required=' in attrs
-            
-            if not has_aria_required:
-                issues.append(FormIssue(
-                    file=str(filepath),
-                    line=i + 1,
-                    issue_type=IssueType.MISSING_REQUIRED_INDICATOR,
-                    severity=Severity.MEDIUM,
-                    element=match.group(0)[:80],
-                    context=line.strip()[:100],
-                    suggestion='Adicionar aria-required="true" para leitores de tela',
-                    auto_fixable=True
-                ))
+    # Verificar se é um campo que deveria ter autocomplete
+    suggested_autocomplete = None
+    for key, value in AUTOCOMPLETE_MAPPINGS.items():
+        if key.lower() in field_name:
+            suggested_autocomplete = value
+            break
     
-    return issues
+    if suggested_autocomplete and not has_autocomplete:
+        yield FormIssue(
+            file=str(ctx.filepath),
+            line=element.line,
+            issue_type=IssueType.MISSING_AUTOCOMPLETE,
+            severity=Severity.MEDIUM,
+            element=_element_source(ctx.content, element),
+            context=element.context[:100],
+            suggestion=f'Adicionar autoComplete="{suggested_autocomplete}"',
+            auto_fixable=True
+        )
 
 
-def detect_missing_error_association(content: str, filepath: str) -> List[FormIssue]:
-    """Detecta mensagens de erro sem associação com o campo."""
-    issues = []
-    lines = content.split('\n')
-    
-    # Padrões comuns de mensagens de erro
-    error_patterns = [
-        r'error\s*&&\s*<(span|p|div)',
-        r'errors?\.[a-zA-Z]+\s*&&',
-        r'<FormError',
-        r'<ErrorMessage',
-        r'className="[^"]*error[^"]*"',
-    ]
-    
-    for i, line in enumerate(lines):
-        for pattern in error_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                # Verificar se tem aria-describedby ou role="alert"
-                has_association = any([
-                    'aria-describedby=' in line,
-                    'role="alert"' in line,
-                    'aria-live=' in line,
-                ])
-                
-                if not has_association:
-                    issues.append(FormIssue(
-                        file=str(filepath),
-                        line=i + 1,
-                        issue_type=IssueType.MISSING_ERROR_ASSOCIATION,
-                        severity=Severity.HIGH,
-                        element=line.strip()[:80],
-                        context=line.strip()[:100],
-                        suggestion='Adicionar role="alert" ou aria-live="polite" para anunciar erros',
-                        auto_fixable=True
-                    ))
-                break
-    
-    return issues
+@FORM_RULES.element('required-indicator', 'required', tags=('input', 'select', 'textarea'), ignore_case=True)
+def missing_required_indicator(ctx: RuleContext, element) -> Iterator[FormIssue]:
+    """Campo required sem aria-required."""
+    attrs = element.attrs
+    if 'required' not in attrs:
+        return
+    
+    # Verificar se tem indicação ARIA
+    has_aria_required = 'aria-required=' in attrs
+    
+    if not has_aria_required:
+        yield FormIssue(
+            file=str(ctx.filepath),
+            line=element.line,
+            issue_type=IssueType.MISSING_REQUIRED_INDICATOR,
+            severity=Severity.MEDIUM,
+            element=_element_source(ctx.content, element),
+            context=element.context[:100],
+            suggestion='Adicionar aria-required="true" para leitores de tela',
+            auto_fixable=True
+        )
 
 
-def detect_missing_fieldset(content: str, filepath: str) -> List[FormIssue]:
-    """Detecta grupos de radio/checkbox sem fieldset."""
-    issues = []
-    lines = content.split('\n')
-    
-    # Detectar múltiplos radio/checkbox com mesmo name
-    radio_pattern = re.compile(r'type="(radio|checkbox)"[^>]*name="([^"]+)"')
-    
-    radio_groups = {}
-    for i, line in enumerate(lines):
-        for match in radio_pattern.finditer(line):
-            name = match.group(2)
-            if name not in radio_groups:
-                radio_groups[name] = []
-            radio_groups[name].append(i + 1)
+@FORM_RULES.line('error-association', 'errors', ERROR_MESSAGE_PATTERN)
+def missing_error_association(ctx: RuleContext, number: int, line: str, match) -> Iterator[FormIssue]:
+    """Mensagem de erro sem role="alert"/aria-live/aria-describedby."""
+    # Verificar se tem aria-describedby ou role="alert"
+    has_association = any([
+        'aria-describedby=' in line,
+        'role="alert"' in line,
+        'aria-live=' in line,
+    ])
+    
+    if not has_association:
+        yield FormIssue(
+            file=str(ctx.filepath),
+            line=number,
+            issue_type=IssueType.MISSING_ERROR_ASSOCIATION,
+            severity=Severity.HIGH,
+            element=line.strip()[:80],
+            context=line.strip()[:100],
+            suggestion='Adicionar role="alert" ou aria-live="polite" para anunciar erros',
+            auto_fixable=True
+        )
+
+
+def _fieldset_groups(ctx: RuleContext) -> Iterator[FormIssue]:
+    """Emite os grupos de radio/checkbox coletados fora de fieldset."""
+    lines = ctx.lines
     
     # Verificar grupos com mais de 1 elemento
-    for name, line_numbers in radio_groups.items():
+    for name, line_numbers in ctx.state.get('fieldset', {}).items():
         if len(line_numbers) > 1:
             # Verificar se está dentro de fieldset
             start_line = min(line_numbers) - 1
-            end_line = max(line_numbers)
             context_before = '\n'.join(lines[max(0, start_line-5):start_line])
             
             if '<fieldset' not in context_before.lower():
-                issues.append(FormIssue(
-                    file=str(filepath),
+                yield FormIssue(
+                    file=str(ctx.filepath),
                     line=line_numbers[0],
                     issue_type=IssueType.MISSING_FIELDSET,
                     severity=Severity.MEDIUM,
@@ -486,41 +438,73 @@ def detect_missing_fieldset(content: str, filepath: str) -> List[FormIssue]:
                     context=f'Linhas: {line_numbers}',
                     suggestion=f'Envolver grupo "{name}" em <fieldset> com <legend>',
                     auto_fixable=False
-                ))
-    
-    return issues
+                )
+
+
+@FORM_RULES.element('fieldset', 'fieldset', attrs=('type', 'name'), finalize=_fieldset_groups)
+def radio_group(ctx: RuleContext, element) -> None:
+    """Grupo de radio/checkbox sem fieldset/legend."""
+    # Detectar múltiplos radio/checkbox com mesmo name
+    if element.get('type') not in ('radio', 'checkbox'):
+        return
+    name = element.get('name')
+    if name:
+        ctx.state.setdefault('fieldset', {}).setdefault(name, []).append(element.line)
+
+
+@FORM_RULES.line('aria-invalid', 'errors', ERROR_STATE_PATTERN)
+def missing_aria_invalid(ctx: RuleContext, number: int, line: str, match) -> Iterator[FormIssue]:
+    """Campo em estado de erro sem aria-invalid."""
+    if 'aria-invalid=' not in line:
+        yield FormIssue(
+            file=str(ctx.filepath),
+            line=number,
+            issue_type=IssueType.MISSING_ARIA_INVALID,
+            severity=Severity.HIGH,
+            element=line.strip()[:80],
+            context=line.strip()[:100],
+            suggestion='Adicionar aria-invalid={hasError} para indicar estado de erro',
+            auto_fixable=True
+        )
+
+
+# =============================================================================
+# FUNÇÕES DE DETECÇÃO
+# =============================================================================
+
+def detect_input_without_label(content: str, filepath: str) -> List[FormIssue]:
+    """Detecta inputs sem labels associados."""
+    return FORM_RULES.compile(['input-label']).run(content, filepath)
+
+
+def detect_placeholder_as_label(content: str, filepath: str) -> List[FormIssue]:
+    """Detecta inputs que usam placeholder como único identificador."""
+    return FORM_RULES.compile(['placeholder-label']).run(content, filepath)
+
+
+def detect_missing_autocomplete(content: str, filepath: str) -> List[FormIssue]:
+    """Detecta inputs que deveriam ter autocomplete."""
+    return FORM_RULES.compile(['autocomplete']).run(content, filepath)
+
+
+def detect_missing_required_indicator(content: str, filepath: str) -> List[FormIssue]:
+    """Detecta campos required sem indicação visual/ARIA."""
+    return FORM_RULES.compile(['required-indicator']).run(content, filepath)
+
+
+def detect_missing_error_association(content: str, filepath: str) -> List[FormIssue]:
+    """Detecta mensagens de erro sem associação com o campo."""
+    return FORM_RULES.compile(['error-association']).run(content, filepath)
+
+
+def detect_missing_fieldset(content: str, filepath: str) -> List[FormIssue]:
+    """Detecta grupos de radio/checkbox sem fieldset."""
+    return FORM_RULES.compile(['fieldset']).run(content, filepath)
 
 
 def detect_missing_aria_invalid(content: str, filepath: str) -> List[FormIssue]:
     """Detecta campos com erro sem aria-invalid."""
-    issues = []
-    lines = content.split('\n')
-    
-    # Padrões que indicam estado de erro
-    error_state_patterns = [
-        r'className="[^"]*(?:error|invalid|border-red|ring-red)[^"]*"',
-        r'(?:isInvalid|hasError|error)={true}',
-        r'(?:isInvalid|hasError|error)=\{[^}]+\}',
-    ]
-    
-    for i, line in enumerate(lines):
-        for pattern in error_state_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                # Verificar se tem aria-invalid
-                if 'aria-invalid=' not in line:
-                    issues.append(FormIssue(
-                        file=str(filepath),
-                        line=i + 1,
-                        issue_type=IssueType.MISSING_ARIA_INVALID,
-                        severity=Severity.HIGH,
-                        element=line.strip()[:80],
-                        context=line.strip()[:100],
-                        suggestion='Adicionar aria-invalid={hasError} para indicar estado de erro',
-                        auto_fixable=True
-                    ))
-                break
-    
-    return issues
+    return FORM_RULES.compile(['aria-invalid']).run(content, filepath)
 
 
 # =============================================================================
@@ -692,6 +676,11 @@ def _has_label_for_id(content: str, attrs: str) -> bool:
     return f'htmlFor="{input_id}"' in content or f'for="{input_id}"' in content
 
 
+def _element_source(content: str, element) -> str:
+    """Trecho da tag em uma linha (até 80 caracteres) para o relatório."""
+    return ' '.join(content[element.start:element.end].split())[:80]
+
+
 def _extract_field_name(attrs: str) -> str:
     """Extrai o nome do campo dos atributos."""
     for attr in ['name', 'id', 'placeholder']:
@@ -712,16 +701,6 @@ def should_process_file(filepath: Path) -> bool:
     return filepath.suffix in ['.tsx', '.jsx']
 
 
-def create_backup(filepath: Path, content: str) -> Path:
-    """Cria backup do arquivo."""
-    BACKUP_DIR.mkdir(parents=True, exist_ok=True)
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    backup_name = f"{filepath.stem}_{timestamp}{filepath.suffix}"
-    backup_path = BACKUP_DIR / backup_name
-    backup_path.write_text(content, encoding='utf-8')
-    return backup_path
-
-
 def validate_build() -> bool:
     """Executa build para validar alterações."""
     try:
@@ -742,28 +721,33 @@ def validate_build() -> bool:
 # PROCESSAMENTO PRINCIPAL
 # =============================================================================
 
-def process_file(filepath: Path, dry_run: bool = True) -> FileResult:
-    """Processa um arquivo e aplica correções."""
+def process_file(
+    filepath: Path,
+    dry_run: bool = True,
+    engine: Optional[RuleEngine] = None,
+    edits: Optional[EditSet] = None
+) -> FileResult:
+    """
+    Processa um arquivo e aplica correções.
+    
+    Com `edits`, as correções são acumuladas para o chamador gravar todos
+    os arquivos juntos (edits.commit()); senão o arquivo é gravado na hora.
+    """
     result = FileResult(file=str(filepath.relative_to(BASE_DIR)))
     
     try:
-        content = filepath.read_text(encoding='utf-8')
+        content = read_source(filepath)
     except Exception as e:
         print(f"❌ Erro ao ler {filepath}: {e}")
         return result
     
     original_content = content
-    lines = content.split('\n')
-    
-    # Detectar todos os problemas
-    all_issues = []
-    all_issues.extend(detect_input_without_label(content, filepath))
-    all_issues.extend(detect_placeholder_as_label(content, filepath))
-    all_issues.extend(detect_missing_autocomplete(content, filepath))
-    all_issues.extend(detect_missing_required_indicator(content, filepath))
-    all_issues.extend(detect_missing_error_association(content, filepath))
-    all_issues.extend(detect_missing_fieldset(content, filepath))
-    all_issues.extend(detect_missing_aria_invalid(content, filepath))
+    lines = scan(content).lines
+    
+    # Detectar todos os problemas (uma passada com as regras ativas)
+    if engine is None:
+        engine = FORM_RULES.compile()
+    all_issues = engine.run(content, filepath)
     
     result.issues = all_issues
     result.issues_found = len(all_issues)
@@ -790,32 +774,29 @@ def process_file(filepath: Path, dry_run: bool = True) -> FileResult:
                     issues_by_line[issue.line] = []
                 issues_by_line[issue.line].append(issue)
         
-        # Aplicar correções linha por linha
-        new_lines = []
-        for i, line in enumerate(lines):
-            line_num = i + 1
-            current_line = line
+        # Aplicar correções só nas linhas com problemas
+        new_lines: Dict[int, str] = {}
+        for line_num in sorted(issues_by_line):
+            current_line = lines[line_num - 1]
             
-            if line_num in issues_by_line:
-                for issue in issues_by_line[line_num]:
-                    fix_func = fix_functions.get(issue.issue_type)
-                    if fix_func:
-                        fixed_line, fix = fix_func(current_line, issue)
-                        if fix:
-                            current_line = fixed_line
-                            result.fixes.append(fix)
-                            result.issues_fixed += 1
+            for issue in issues_by_line[line_num]:
+                fix_func = fix_functions.get(issue.issue_type)
+                if fix_func:
+                    fixed_line, fix = fix_func(current_line, issue)
+                    if fix:
+                        current_line = fixed_line
+                        result.fixes.append(fix)
+                        result.issues_fixed += 1
             
-            new_lines.append(current_line)
-        
-        new_content = '\n'.join(new_lines)
+            new_lines[line_num] = current_line
         
         # Salvar se houve alterações
-        if new_content != original_content:
-            if CREATE_BACKUPS:
-                create_backup(filepath, original_content)
-            
-            filepath.write_text(new_content, encoding='utf-8')
+        if edits is not None:
+            edits.replace_lines(filepath, original_content, new_lines)
+        else:
+            single = EditSet('fix-form-accessibility')
+            single.replace_lines(filepath, original_content, new_lines)
+            single.commit(snapshot=CREATE_BACKUPS)
     
     return result
 
@@ -886,7 +867,7 @@ def generate_report(stats: ProcessingStats, results: List[FileResult]) -> str:
 # INTERFACE DE LINHA DE COMANDO
 # =============================================================================
 
-def main():
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(
         description='Corrige problemas de acessibilidade em formulários React/TypeScript',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -896,6 +877,8 @@ Exemplos:
   python3 fix-form-accessibility.py --apply
   python3 fix-form-accessibility.py --report
   python3 fix-form-accessibility.py --file src/components/LoginForm.tsx --apply
+  python3 fix-form-accessibility.py --skip-rules autocomplete,fieldset
+  python3 fix-form-accessibility.py --list-rules
         """
     )
     
@@ -911,8 +894,10 @@ Exemplos:
                         help='Não criar backups')
     parser.add_argument('--no-validate', action='store_true',
                         help='Não validar build após correções')
+    add_rule_arguments(parser)
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    engine = engine_from_args(FORM_RULES, parser, args)
     
     # Configurar flags globais
     global CREATE_BACKUPS, VALIDATE_BUILD
@@ -949,9 +934,10 @@ Exemplos:
     # Processar arquivos
     stats = ProcessingStats()
     results = []
+    edits = EditSet('fix-form-accessibility')
     
     for filepath in files:
-        result = process_file(filepath, dry_run=dry_run)
+        result = process_file(filepath, dry_run=dry_run, engine=engine, edits=edits)
         results.append(result)
         
         stats.files_analyzed += 1
@@ -969,6 +955,14 @@ Exemplos:
             severity_name = issue.severity.value
             stats.issues_by_severity[severity_name] = stats.issues_by_severity.get(severity_name, 0) + 1
     
+    # Gravar todos os arquivos de uma vez
+    if not dry_run:
+        snapshot = edits.commit(snapshot=CREATE_BACKUPS)
+        if snapshot:
+            print(f"📦 Snapshot: {snapshot}")
+            print(f"↩️ Para desfazer: {ROLLBACK_COMMAND}")
+            print()
+    
     # Exibir resultados
     print("📊 RESULTADOS")
     print("-" * 50)
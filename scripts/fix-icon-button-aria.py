@@ -11,6 +11,7 @@ Uso:
     python3 scripts/fix-icon-button-aria.py --dry-run    # Simular alterações
     python3 scripts/fix-icon-button-aria.py --apply      # Aplicar alterações
     python3 scripts/fix-icon-button-aria.py --report     # Gerar relatório
+    python3 scripts/fix-icon-button-aria.py --list-rules # Listar regras
 """
 
 import re
@@ -18,12 +19,18 @@ import argparse
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
+from typing import Iterator, Optional
+
+from a11y_rules import RuleContext, RuleEngine, RuleRegistry, add_rule_arguments, engine_from_args
 
 # Diretório base
 BASE_DIR = Path(__file__).parent.parent
 SRC_DIR = BASE_DIR / "src"
 BACKUP_DIR = BASE_DIR / "backups" / "aria-fixes"
 
+# Tamanhos de Button que mostram só o ícone
+ICON_SIZE_PATTERN = re.compile(r'size="(?:icon|xs)"')
+
 # Mapeamento de ícones para labels em português
 ICON_TO_LABEL = {
     # Ações comuns
@@ -274,63 +281,59 @@ def find_button_close_tag(content: str, start_pos: int) -> int:
     return -1
 
 
-def process_file(filepath: Path, dry_run: bool = True) -> dict:
+ICON_BUTTON_RULES = RuleRegistry('fix-icon-button-aria')
+
+
+@ICON_BUTTON_RULES.element('icon-button-label', 'icon-buttons', tags=('Button',), attrs=('size',))
+def icon_button_without_label(ctx: RuleContext, element) -> Iterator[dict]:
+    """Button size="icon"/"xs" sem aria-label."""
+    content = ctx.content
+    start_pos = element.start
+    tag_end = element.end - 1
+    
+    # Extrair a tag de abertura completa
+    opening_tag = content[start_pos:tag_end+1]
+    
+    # Verificar se tem size="icon" ou size="xs" e se já tem aria-label
+    if not ICON_SIZE_PATTERN.search(opening_tag) or 'aria-label=' in opening_tag:
+        return
+    
+    # Encontrar o conteúdo do botão (entre > e </Button>)
+    if element.self_closing:
+        # Self-closing, sem conteúdo interno
+        button_content = ""
+    else:
+        close_tag_pos = find_button_close_tag(content, tag_end + 1)
+        if close_tag_pos == -1:
+            return
+        button_content = content[tag_end+1:close_tag_pos-9]  # -9 para </Button>
+    
+    # Encontrar o label apropriado baseado no ícone
+    label = find_icon_in_content(button_content)
+    
+    if label:
+        yield {
+            'line': element.line,
+            'label': label,
+            'context': button_content[:50].strip() if button_content else opening_tag[:50],
+            'start': start_pos,
+            'tag_end': tag_end,
+            'opening_tag': opening_tag
+        }
+
+
+def process_file(filepath: Path, dry_run: bool = True, engine: Optional[RuleEngine] = None) -> dict:
     """Processa um arquivo e adiciona aria-labels aos botões de ícone."""
     
     with open(filepath, 'r', encoding='utf-8') as f:
         content = f.read()
     
     original_content = content
-    changes = []
     
-    # Encontrar todos os <Button que têm size="icon" ou size="xs"
-    button_pattern = r'<Button\s'
-    
-    offset = 0
-    for match in re.finditer(button_pattern, original_content):
-        start_pos = match.start()
-        
-        # Encontrar o fim da tag de abertura
-        tag_end = find_button_end(original_content, start_pos)
-        if tag_end == -1:
-            continue
-        
-        # Extrair a tag de abertura completa
-        opening_tag = original_content[start_pos:tag_end+1]
-        
-        # Verificar se tem size="icon" ou size="xs"
-        if not re.search(r'size="(?:icon|xs)"', opening_tag):
-            continue
-        
-        # Verificar se já tem aria-label
-        if 'aria-label=' in opening_tag:
-            continue
-        
-        # Encontrar o conteúdo do botão (entre > e </Button>)
-        if opening_tag.endswith('/>'):
-            # Self-closing, sem conteúdo interno
-            button_content = ""
-        else:
-            close_tag_pos = find_button_close_tag(original_content, tag_end + 1)
-            if close_tag_pos == -1:
-                continue
-            button_content = original_content[tag_end+1:close_tag_pos-9]  # -9 para </Button>
-        
-        # Encontrar o label apropriado baseado no ícone
-        label = find_icon_in_content(button_content)
-        
-        if label:
-            # Calcular a linha
-            line_num = original_content[:start_pos].count('\n') + 1
-            
-            changes.append({
-                'line': line_num,
-                'label': label,
-                'context': button_content[:50].strip() if button_content else opening_tag[:50],
-                'start': start_pos,
-                'tag_end': tag_end,
-                'opening_tag': opening_tag
-            })
+    # Encontrar todos os <Button com size="icon" ou size="xs" sem aria-label
+    if engine is None:
+        engine = ICON_BUTTON_RULES.compile()
+    changes = engine.run(original_content, str(filepath))
     
     # Aplicar as mudanças de trás para frente para não afetar os offsets
     new_content = original_content
@@ -386,8 +389,10 @@ def main():
                         help='Gerar relatório detalhado')
     parser.add_argument('--file', type=str,
                         help='Processar arquivo específico')
+    add_rule_arguments(parser)
     
     args = parser.parse_args()
+    engine = engine_from_args(ICON_BUTTON_RULES, parser, args)
     
     if not any([args.dry_run, args.apply, args.report]):
         args.dry_run = True
@@ -409,7 +414,7 @@ def main():
     
     for filepath in files:
         try:
-            result = process_file(filepath, dry_run=not args.apply)
+            result = process_file(filepath, dry_run=not args.apply, engine=engine)
             if result['changes']:
                 results.append(result)
                 total_changes += len(result['changes'])
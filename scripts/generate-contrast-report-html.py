@@ -12,6 +12,9 @@ Funcionalidades:
 - Ordenação por múltiplas colunas
 - Sugestões de cores acessíveis
 - Exportação para CSV
+- Issues em arquivo de dados separado (report.issues.js), gravado em
+  streaming e exibido com rolagem virtual: a página abre instantaneamente
+  mesmo com dezenas de milhares de issues
 
 Uso:
     python3 generate-contrast-report-html.py --analyze src/
@@ -26,9 +29,11 @@ import os
 import sys
 import argparse
 import json
+from functools import lru_cache
+from html import escape
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
 
 # Importar analisador de contraste
 from contrast_analyzer import (
@@ -187,13 +192,42 @@ HTML_TEMPLATE = """
             border-color: var(--accent);
         }}
         
+        .result-count {{
+            color: var(--text-secondary);
+            font-size: 0.9rem;
+            margin-bottom: 0.75rem;
+        }}
+        
+        .table-viewport {{
+            max-height: 75vh;
+            overflow-y: auto;
+            border-radius: 12px;
+            border: 1px solid var(--border);
+        }}
+        
         .issues-table {{
             width: 100%;
             border-collapse: collapse;
             background: var(--bg-secondary);
-            border-radius: 12px;
-            overflow: hidden;
-            border: 1px solid var(--border);
+        }}
+        
+        .issues-table thead th {{
+            position: sticky;
+            top: 0;
+            z-index: 1;
+        }}
+        
+        .issues-table tr.issue-row td {{
+            white-space: nowrap;
+        }}
+        
+        .issues-table tr.spacer td {{
+            padding: 0;
+            border: none;
+        }}
+        
+        .issues-table tr.spacer:hover {{
+            background: none;
         }}
         
         .issues-table th {{
@@ -432,8 +466,7 @@ HTML_TEMPLATE = """
                 width: 100%;
             }}
             
-            .issues-table {{
-                display: block;
+            .table-viewport {{
                 overflow-x: auto;
             }}
         }}
@@ -489,7 +522,6 @@ HTML_TEMPLATE = """
                     <label>Arquivo</label>
                     <select id="filter-file">
                         <option value="">Todos</option>
-                        {file_options}
                     </select>
                 </div>
                 <div class="filter-group">
@@ -507,22 +539,24 @@ HTML_TEMPLATE = """
             </div>
         </div>
         
-        <table class="issues-table" id="issues-table">
-            <thead>
-                <tr>
-                    <th data-sort="severity">Severidade <span class="sort-icon">↕</span></th>
-                    <th data-sort="ratio">Ratio <span class="sort-icon">↕</span></th>
-                    <th data-sort="file">Arquivo <span class="sort-icon">↕</span></th>
-                    <th>Texto</th>
-                    <th>Fundo</th>
-                    <th>Preview</th>
-                    <th>Sugestão</th>
-                </tr>
-            </thead>
-            <tbody id="issues-body">
-                {issues_rows}
-            </tbody>
-        </table>
+        <div class="result-count" id="result-count">Carregando issues...</div>
+        
+        <div class="table-viewport" id="table-viewport">
+            <table class="issues-table" id="issues-table">
+                <thead>
+                    <tr>
+                        <th data-sort="severity">Severidade <span class="sort-icon">↕</span></th>
+                        <th data-sort="ratio">Ratio <span class="sort-icon">↕</span></th>
+                        <th data-sort="file">Arquivo <span class="sort-icon">↕</span></th>
+                        <th>Texto</th>
+                        <th>Fundo</th>
+                        <th>Preview</th>
+                        <th>Sugestão</th>
+                    </tr>
+                </thead>
+                <tbody id="issues-body"></tbody>
+            </table>
+        </div>
         
         <div class="no-results" id="no-results" style="display: none;">
             Nenhum issue encontrado com os filtros selecionados.
@@ -534,46 +568,166 @@ HTML_TEMPLATE = """
         </footer>
     </div>
     
+    <script src="{data_src}"></script>
     <script>
-        const issuesData = {issues_json};
+        // Dados em arquivo separado: {{files: [...], issues: [[...], ...]}}
+        // Campos de cada issue: ver ISSUE_FIELDS em generate-contrast-report-html.py
+        const report = window.{data_variable} || {{ files: [], issues: [] }};
+        const SEVERITIES = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW'];
+        const SEVERITY_ICONS = ['🔴', '🟠', '🟡', '🟢'];
+        const F = {{ SEVERITY: 0, RATIO: 1, REQUIRED: 2, FILE: 3, LINE: 4, FG: 5, BG: 6,
+                    FG_LUM: 7, BG_LUM: 8, SUGGESTION: 9, SUGGESTION_RATIO: 10 }};
+        const OVERSCAN = 10;
+        
+        const issues = report.issues;
+        const files = report.files;
+        const fileNames = files.map(f => f.split('/').pop());
         
-        // Filtros
         const filterSeverity = document.getElementById('filter-severity');
         const filterFile = document.getElementById('filter-file');
         const filterRatio = document.getElementById('filter-ratio');
         const filterSearch = document.getElementById('filter-search');
+        const viewport = document.getElementById('table-viewport');
         const issuesBody = document.getElementById('issues-body');
         const noResults = document.getElementById('no-results');
+        const resultCount = document.getElementById('result-count');
+        
+        // Índices (em issues) visíveis após filtro e ordenação
+        let view = issues.map((_, index) => index);
+        let rowHeight = 76;
+        let searchIndex = null;
+        
+        function esc(value) {{
+            return String(value).replace(/[&<>"']/g, c => ({{
+                '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+            }})[c]);
+        }}
+        
+        // Opções de arquivo (nomes únicos, como antes)
+        Array.from(new Set(fileNames)).sort().forEach(name => {{
+            const option = document.createElement('option');
+            option.value = name;
+            option.textContent = name;
+            filterFile.appendChild(option);
+        }});
+        
+        function issueRow(issue) {{
+            const severity = SEVERITIES[issue[F.SEVERITY]];
+            const ratioClass = issue[F.RATIO] >= issue[F.REQUIRED] ? 'pass' : 'fail';
+            const file = files[issue[F.FILE]];
+            const fg = esc(issue[F.FG]);
+            const bg = esc(issue[F.BG]);
+            const suggestion = issue[F.SUGGESTION] === null
+                ? '<span class="color-luminance">—</span>'
+                : `<div class="suggestion">
+                        <span class="suggestion-arrow">→</span>
+                        <div class="suggestion-color">
+                            <div class="suggestion-swatch" style="background: ${{esc(issue[F.SUGGESTION])}}"></div>
+                            <span class="suggestion-hex">${{esc(issue[F.SUGGESTION])}}</span>
+                            <span class="color-luminance">(${{issue[F.SUGGESTION_RATIO].toFixed(1)}}:1)</span>
+                        </div>
+                    </div>`;
+            return `<tr class="issue-row">
+                <td><span class="severity-badge ${{severity.toLowerCase()}}">${{SEVERITY_ICONS[issue[F.SEVERITY]]}} ${{severity}}</span></td>
+                <td>
+                    <span class="ratio-value ${{ratioClass}}">${{issue[F.RATIO].toFixed(2)}}:1</span>
+                    <div class="color-luminance">Req: ${{issue[F.REQUIRED]}}:1</div>
+                </td>
+                <td>
+                    <a href="#" class="file-link" title="${{esc(file)}}">${{esc(fileNames[issue[F.FILE]])}}</a>
+                    <div class="line-number">Linha ${{issue[F.LINE]}}</div>
+                </td>
+                <td><div class="color-preview">
+                    <div class="color-swatch" style="background: ${{fg}}"></div>
+                    <div class="color-info">
+                        <span class="color-hex">${{fg}}</span>
+                        <span class="color-luminance">L: ${{issue[F.FG_LUM].toFixed(3)}}</span>
+                    </div>
+                </div></td>
+                <td><div class="color-preview">
+                    <div class="color-swatch" style="background: ${{bg}}"></div>
+                    <div class="color-info">
+                        <span class="color-hex">${{bg}}</span>
+                        <span class="color-luminance">L: ${{issue[F.BG_LUM].toFixed(3)}}</span>
+                    </div>
+                </div></td>
+                <td><div class="contrast-preview">
+                    <div class="contrast-sample" style="background: ${{bg}}; color: ${{fg}}">Texto</div>
+                </div></td>
+                <td>${{suggestion}}</td>
+            </tr>`;
+        }}
+        
+        // Rolagem virtual: só as linhas visíveis (+ margem) existem no DOM
+        function render() {{
+            const first = Math.max(0, Math.floor(viewport.scrollTop / rowHeight) - OVERSCAN);
+            const last = Math.min(view.length, Math.ceil((viewport.scrollTop + viewport.clientHeight) / rowHeight) + OVERSCAN);
+            
+            let html = `<tr class="spacer"><td colspan="7" style="height: ${{first * rowHeight}}px"></td></tr>`;
+            for (let i = first; i < last; i++) {{
+                html += issueRow(issues[view[i]]);
+            }}
+            html += `<tr class="spacer"><td colspan="7" style="height: ${{(view.length - last) * rowHeight}}px"></td></tr>`;
+            issuesBody.innerHTML = html;
+            
+            // Ajustar à altura real da linha na primeira renderização
+            const row = issuesBody.querySelector('tr.issue-row');
+            if (row && Math.abs(row.offsetHeight - rowHeight) > 1) {{
+                rowHeight = row.offsetHeight;
+                render();
+            }}
+        }}
+        
+        let renderPending = false;
+        viewport.addEventListener('scroll', () => {{
+            if (renderPending) return;
+            renderPending = true;
+            requestAnimationFrame(() => {{
+                renderPending = false;
+                render();
+            }});
+        }});
+        window.addEventListener('resize', render);
+        
+        // Filtros
+        function searchText(index) {{
+            if (searchIndex === null) {{
+                searchIndex = issues.map(issue => [
+                    SEVERITIES[issue[F.SEVERITY]], issue[F.RATIO], issue[F.REQUIRED],
+                    files[issue[F.FILE]], issue[F.LINE], issue[F.FG], issue[F.BG], issue[F.SUGGESTION] || ''
+                ].join(' ').toLowerCase());
+            }}
+            return searchIndex[index];
+        }}
         
         function applyFilters() {{
-            const severity = filterSeverity.value;
+            const severity = SEVERITIES.indexOf(filterSeverity.value);
             const file = filterFile.value;
             const maxRatio = parseFloat(filterRatio.value) || 999;
             const search = filterSearch.value.toLowerCase();
             
-            let visibleCount = 0;
-            const rows = issuesBody.querySelectorAll('tr');
-            
-            rows.forEach((row, index) => {{
-                const issue = issuesData[index];
-                let visible = true;
-                
-                if (severity && issue.severity !== severity) visible = false;
-                if (file && !issue.file.includes(file)) visible = false;
-                if (issue.ratio > maxRatio) visible = false;
-                if (search && !JSON.stringify(issue).toLowerCase().includes(search)) visible = false;
-                
-                row.style.display = visible ? '' : 'none';
-                if (visible) visibleCount++;
-            }});
-            
-            noResults.style.display = visibleCount === 0 ? 'block' : 'none';
+            view = [];
+            for (let index = 0; index < issues.length; index++) {{
+                const issue = issues[index];
+                if (severity >= 0 && issue[F.SEVERITY] !== severity) continue;
+                if (file && fileNames[issue[F.FILE]] !== file) continue;
+                if (issue[F.RATIO] > maxRatio) continue;
+                if (search && !searchText(index).includes(search)) continue;
+                view.push(index);
+            }}
+            sortView();
+        }}
+        
+        let searchTimer = null;
+        function applyFiltersLater() {{
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(applyFilters, 150);
         }}
         
         filterSeverity.addEventListener('change', applyFilters);
         filterFile.addEventListener('change', applyFilters);
-        filterRatio.addEventListener('input', applyFilters);
-        filterSearch.addEventListener('input', applyFilters);
+        filterRatio.addEventListener('input', applyFiltersLater);
+        filterSearch.addEventListener('input', applyFiltersLater);
         
         // Ordenação
         let currentSort = {{ column: 'ratio', direction: 'asc' }};
@@ -589,46 +743,27 @@ HTML_TEMPLATE = """
                     currentSort.direction = 'asc';
                 }}
                 
-                sortTable();
+                sortView();
             }});
         }});
         
-        function sortTable() {{
-            const rows = Array.from(issuesBody.querySelectorAll('tr'));
+        function sortView() {{
+            const key = {{
+                severity: index => issues[index][F.SEVERITY],
+                ratio: index => issues[index][F.RATIO],
+                file: index => files[issues[index][F.FILE]],
+            }}[currentSort.column];
+            const sign = currentSort.direction === 'asc' ? 1 : -1;
             
-            rows.sort((a, b) => {{
-                const indexA = parseInt(a.dataset.index);
-                const indexB = parseInt(b.dataset.index);
-                const issueA = issuesData[indexA];
-                const issueB = issuesData[indexB];
-                
-                let valA, valB;
-                
-                switch (currentSort.column) {{
-                    case 'severity':
-                        const order = {{ 'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3 }};
-                        valA = order[issueA.severity];
-                        valB = order[issueB.severity];
-                        break;
-                    case 'ratio':
-                        valA = issueA.ratio;
-                        valB = issueB.ratio;
-                        break;
-                    case 'file':
-                        valA = issueA.file;
-                        valB = issueB.file;
-                        break;
-                    default:
-                        return 0;
-                }}
-                
-                if (valA < valB) return currentSort.direction === 'asc' ? -1 : 1;
-                if (valA > valB) return currentSort.direction === 'asc' ? 1 : -1;
-                return 0;
+            // Desempate pelo índice original (ordem por ratio do gerador)
+            view.sort((a, b) => {{
+                const valA = key(a);
+                const valB = key(b);
+                if (valA < valB) return -sign;
+                if (valA > valB) return sign;
+                return a - b;
             }});
             
-            rows.forEach(row => issuesBody.appendChild(row));
-            
             // Atualizar indicadores de ordenação
             document.querySelectorAll('.issues-table th').forEach(th => {{
                 th.classList.remove('sorted');
@@ -642,21 +777,30 @@ HTML_TEMPLATE = """
                 const icon = sortedTh.querySelector('.sort-icon');
                 if (icon) icon.textContent = currentSort.direction === 'asc' ? '↑' : '↓';
             }}
+            
+            resultCount.textContent = `Mostrando ${{view.length}} de ${{issues.length}} issues`;
+            noResults.style.display = view.length === 0 ? 'block' : 'none';
+            viewport.scrollTop = 0;
+            render();
         }}
         
-        // Exportar CSV
+        // Exportar CSV (issues filtrados, na ordem atual)
         function exportCSV() {{
+            const quote = value => /[",\\n]/.test(String(value)) ? `"${{String(value).replace(/"/g, '""')}}"` : value;
             const headers = ['Severidade', 'Ratio', 'Requerido', 'Arquivo', 'Linha', 'Texto', 'Fundo', 'Sugestão'];
-            const rows = issuesData.map(issue => [
-                issue.severity,
-                issue.ratio,
-                issue.required_ratio,
-                issue.file,
-                issue.line,
-                issue.foreground,
-                issue.background,
-                issue.suggestion || ''
-            ]);
+            const rows = view.map(index => {{
+                const issue = issues[index];
+                return [
+                    SEVERITIES[issue[F.SEVERITY]],
+                    issue[F.RATIO],
+                    issue[F.REQUIRED],
+                    files[issue[F.FILE]],
+                    issue[F.LINE],
+                    issue[F.FG],
+                    issue[F.BG],
+                    issue[F.SUGGESTION] || ''
+                ].map(quote);
+            }});
             
             const csv = [headers, ...rows].map(row => row.join(',')).join('\\n');
             const blob = new Blob([csv], {{ type: 'text/csv' }});
@@ -670,8 +814,11 @@ HTML_TEMPLATE = """
             URL.revokeObjectURL(url);
         }}
         
-        // Ordenar por ratio inicialmente
-        sortTable();
+        if (!window.{data_variable}) {{
+            resultCount.textContent = 'Arquivo de dados não encontrado: {data_src}';
+        }} else {{
+            applyFilters();
+        }}
     </script>
 </body>
 </html>
@@ -682,118 +829,104 @@ HTML_TEMPLATE = """
 # GERAÇÃO DO RELATÓRIO
 # =============================================================================
 
-def generate_issue_row(issue: ContrastIssue, index: int) -> str:
-    """Gera uma linha HTML para um issue."""
-    
-    severity_class = issue.severity.lower()
-    severity_icons = {
-        'CRITICAL': '🔴',
-        'HIGH': '🟠',
-        'MEDIUM': '🟡',
-        'LOW': '🟢'
-    }
-    
-    # Calcular sugestão de cor acessível
-    suggestion_html = ''
-    fg = parse_color(issue.foreground.hex)
-    bg = parse_color(issue.background.hex)
-    
-    if fg and bg:
-        suggested = suggest_accessible_color(fg, bg, issue.required_ratio)
-        if suggested:
-            new_ratio = calculate_contrast_ratio(suggested, bg)
-            suggestion_html = f'''
-                <div class="suggestion">
-                    <span class="suggestion-arrow">→</span>
-                    <div class="suggestion-color">
-                        <div class="suggestion-swatch" style="background: {suggested.hex}"></div>
-                        <span class="suggestion-hex">{suggested.hex}</span>
-                        <span class="color-luminance">({new_ratio:.1f}:1)</span>
-                    </div>
-                </div>
-            '''
-    
-    # Determinar se passa ou falha
-    ratio_class = 'pass' if issue.ratio >= issue.required_ratio else 'fail'
-    
-    # Extrair nome do arquivo
-    filename = Path(issue.file).name
-    
-    return f'''
-        <tr data-index="{index}">
-            <td>
-                <span class="severity-badge {severity_class}">
-                    {severity_icons.get(issue.severity, '')} {issue.severity}
-                </span>
-            </td>
-            <td>
-                <span class="ratio-value {ratio_class}">{issue.ratio:.2f}:1</span>
-                <div class="color-luminance">Req: {issue.required_ratio}:1</div>
-            </td>
-            <td>
-                <a href="#" class="file-link" title="{issue.file}">{filename}</a>
-                <div class="line-number">Linha {issue.line}</div>
-            </td>
-            <td>
-                <div class="color-preview">
-                    <div class="color-swatch" style="background: {issue.foreground.hex}"></div>
-                    <div class="color-info">
-                        <span class="color-hex">{issue.foreground.hex}</span>
-                        <span class="color-luminance">L: {issue.foreground.luminance:.3f}</span>
-                    </div>
-                </div>
-            </td>
-            <td>
-                <div class="color-preview">
-                    <div class="color-swatch" style="background: {issue.background.hex}"></div>
-                    <div class="color-info">
-                        <span class="color-hex">{issue.background.hex}</span>
-                        <span class="color-luminance">L: {issue.background.luminance:.3f}</span>
-                    </div>
-                </div>
-            </td>
-            <td>
-                <div class="contrast-preview">
-                    <div class="contrast-sample" style="background: {issue.background.hex}; color: {issue.foreground.hex}">
-                        Texto
-                    </div>
-                </div>
-            </td>
-            <td>
-                {suggestion_html if suggestion_html else '<span class="color-luminance">—</span>'}
-            </td>
-        </tr>
-    '''
+# Variável global definida pelo arquivo de dados
+DATA_VARIABLE = 'CONTRAST_REPORT'
+
+# Sufixo do arquivo de dados ao lado do HTML (report.html → report.issues.js)
+DATA_SUFFIX = '.issues.js'
+
+# Ordem dos campos de cada issue no arquivo de dados (ver `F` no template)
+ISSUE_FIELDS = (
+    'severity', 'ratio', 'required_ratio', 'file', 'line', 'foreground',
+    'background', 'foreground_luminance', 'background_luminance',
+    'suggestion', 'suggestion_ratio',
+)
+
+SEVERITIES = ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW')
+
+
+def data_path_for(output_path: Path) -> Path:
+    """Caminho do arquivo de dados de um relatório."""
+    return output_path.with_name(output_path.stem + DATA_SUFFIX)
+
+
+@lru_cache(maxsize=4096)
+def _suggestion(fg_hex: str, bg_hex: str, required_ratio: float) -> Tuple[Optional[str], Optional[float]]:
+    """Cor sugerida e novo ratio; pares repetidos são calculados uma vez."""
+    fg = parse_color(fg_hex)
+    bg = parse_color(bg_hex)
+    if not (fg and bg):
+        return None, None
+    suggested = suggest_accessible_color(fg, bg, required_ratio)
+    if not suggested:
+        return None, None
+    return suggested.hex, round(calculate_contrast_ratio(suggested, bg), 2)
 
 
-def generate_html_report(metrics: ContrastMetrics, project_name: str = 'TSiJUKEBOX') -> str:
-    """Gera o relatório HTML completo."""
+def issue_record(issue: ContrastIssue, file_index: Dict[str, int]) -> list:
+    """
+    Issue compacto (lista na ordem de ISSUE_FIELDS).
     
-    # Gerar linhas da tabela
-    issues_rows = '\n'.join(
-        generate_issue_row(issue, i) 
-        for i, issue in enumerate(sorted(metrics.issues, key=lambda x: x.ratio))
+    Severidade e arquivo viram índices (em SEVERITIES e na lista de
+    arquivos, acrescentada a `file_index` quando necessário).
+    """
+    file_id = file_index.setdefault(issue.file, len(file_index))
+    suggestion, suggestion_ratio = _suggestion(
+        issue.foreground.hex, issue.background.hex, issue.required_ratio
     )
+    return [
+        SEVERITIES.index(issue.severity) if issue.severity in SEVERITIES else len(SEVERITIES) - 1,
+        round(issue.ratio, 2),
+        issue.required_ratio,
+        file_id,
+        issue.line,
+        issue.foreground.hex,
+        issue.background.hex,
+        round(issue.foreground.luminance, 3),
+        round(issue.background.luminance, 3),
+        suggestion,
+        suggestion_ratio,
+    ]
+
+
+def write_issues_data(issues: Iterable[ContrastIssue], out: TextIO) -> int:
+    """
+    Grava os issues no formato do arquivo de dados, um por linha.
     
-    # Gerar opções de arquivo
-    files = sorted(set(Path(i.file).name for i in metrics.issues))
-    file_options = '\n'.join(f'<option value="{f}">{f}</option>' for f in files)
+    Cada issue é serializado e escrito logo em seguida (nada do relatório
+    é montado em memória); a lista de arquivos vai ao final.
     
-    # Gerar JSON dos issues para JavaScript
-    issues_json = json.dumps([{
-        'severity': i.severity,
-        'ratio': i.ratio,
-        'required_ratio': i.required_ratio,
-        'file': i.file,
-        'line': i.line,
-        'foreground': i.foreground.hex,
-        'background': i.background.hex,
-        'suggestion': None,  # Será calculado no frontend se necessário
-    } for i in metrics.issues])
+    Returns:
+        Número de issues gravados
+    """
+    file_index: Dict[str, int] = {}
+    count = 0
+    out.write(f'window.{DATA_VARIABLE} = {{"issues": [\n')
+    for issue in issues:
+        if count:
+            out.write(',\n')
+        out.write(json.dumps(issue_record(issue, file_index), separators=(',', ':')))
+        count += 1
+    out.write('\n], "files": ')
+    out.write(json.dumps(list(file_index), separators=(',', ':')))
+    out.write('};\n')
+    return count
+
+
+def generate_html_report(
+    metrics: ContrastMetrics,
+    project_name: str = 'TSiJUKEBOX',
+    data_src: str = 'contrast-report' + DATA_SUFFIX
+) -> str:
+    """
+    Gera a página HTML do relatório (sem os issues).
     
-    # Preencher template
-    html = HTML_TEMPLATE.format(
-        project_name=project_name,
+    A página carrega `data_src` (gerado por write_issues_data) e monta a
+    tabela no navegador com rolagem virtual; o tamanho independe do
+    número de issues.
+    """
+    return HTML_TEMPLATE.format(
+        project_name=escape(project_name),
         generated_at=datetime.now().strftime('%d/%m/%Y às %H:%M'),
         total_issues=metrics.issues_found,
         critical_count=metrics.issues_by_severity.get('CRITICAL', 0),
@@ -801,12 +934,35 @@ def generate_html_report(metrics: ContrastMetrics, project_name: str = 'TSiJUKEB
         medium_count=metrics.issues_by_severity.get('MEDIUM', 0),
         worst_ratio=f"{metrics.worst_ratio:.2f}:1",
         pass_rate=f"{metrics.pass_rate_aa:.1f}",
-        file_options=file_options,
-        issues_rows=issues_rows,
-        issues_json=issues_json,
+        data_src=escape(data_src),
+        data_variable=DATA_VARIABLE,
     )
+
+
+def write_html_report(
+    metrics: ContrastMetrics,
+    output_path: Path,
+    project_name: str = 'TSiJUKEBOX'
+) -> Tuple[Path, int]:
+    """
+    Grava o relatório: página HTML + arquivo de dados ao lado.
     
-    return html
+    Returns:
+        (caminho do arquivo de dados, número de issues gravados)
+    """
+    data_path = data_path_for(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    # Pior ratio primeiro (ordem inicial da tabela)
+    issues = sorted(metrics.issues, key=lambda x: x.ratio)
+    with open(data_path, 'w', encoding='utf-8') as f:
+        count = write_issues_data(issues, f)
+    
+    output_path.write_text(
+        generate_html_report(metrics, project_name, data_path.name),
+        encoding='utf-8'
+    )
+    return data_path, count
 
 
 # =============================================================================
@@ -888,21 +1044,18 @@ def main():
     
     print(f"📊 Issues encontrados: {metrics.issues_found}")
     
-    # Gerar HTML
+    # Gerar HTML + dados
     print("📝 Gerando relatório HTML...")
-    html = generate_html_report(metrics, args.project_name)
-    
-    # Salvar
     output_path = Path(args.output)
     if not output_path.is_absolute():
         output_path = BASE_DIR / output_path
     
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(html, encoding='utf-8')
+    data_path, count = write_html_report(metrics, output_path, args.project_name)
     
     print()
     print("=" * 70)
     print(f"✅ Relatório gerado: {output_path}")
+    print(f"📦 Dados ({count} issues): {data_path}")
     print("=" * 70)
     
     return 0
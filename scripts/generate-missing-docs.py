@@ -14,12 +14,16 @@ Categorias:
 - Guias de Acessibilidade (4)
 - Guias de Testes (3)
 
+A geração é incremental (doc_build.py): só são gravadas as páginas cujo
+template ou parâmetros mudaram desde a última execução; as demais não são
+tocadas. Páginas editadas à mão são preservadas, a não ser com --force.
+
 Uso:
     python3 generate-missing-docs.py [--dry-run] [--force]
 
 Opções:
     --dry-run   Mostra o que seria criado sem criar os arquivos
-    --force     Sobrescreve arquivos existentes
+    --force     Sobrescreve também arquivos editados à mão
 """
 
 import os
@@ -28,6 +32,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+from doc_build import DocBuild, DocPage, PageStatus
+
 # Configuração
 DOCS_DIR = Path(__file__).parent.parent / "docs"
 DATE_TODAY = datetime.now().strftime("%d/%m/%Y")
@@ -915,31 +921,32 @@ Por que essa funcionalidade seria útil?
     }),
 ]
 
+def doc_page(filepath: str, template_key: str, params: Dict) -> DocPage:
+    """Página do build: a data entra no conteúdo, mas não no hash."""
+    return DocPage(filepath, TEMPLATES[template_key], params, volatile={"date": DATE_TODAY})
+
 def generate_doc(template_key: str, params: Dict) -> str:
     """Gera o conteúdo de uma documentação a partir do template."""
-    template = TEMPLATES[template_key]
-    params["date"] = DATE_TODAY
-    return template.format(**params)
-
-def create_doc_file(filepath: Path, content: str, dry_run: bool = False, force: bool = False) -> bool:
-    """Cria um arquivo de documentação."""
-    if filepath.exists() and not force:
+    return doc_page("", template_key, params).content()
+
+def print_page_result(filepath: Path, status: PageStatus, dry_run: bool, error: str = ""):
+    """Imprime o resultado de uma página."""
+    if status is PageStatus.CREATED:
+        if dry_run:
+            print(f"{Colors.BLUE}🔍 [DRY-RUN] Criaria: {filepath}{Colors.RESET}")
+        else:
+            print(f"{Colors.GREEN}✅ Criado: {filepath}{Colors.RESET}")
+    elif status is PageStatus.UPDATED:
+        if dry_run:
+            print(f"{Colors.BLUE}🔍 [DRY-RUN] Atualizaria: {filepath}{Colors.RESET}")
+        else:
+            print(f"{Colors.GREEN}🔄 Atualizado: {filepath}{Colors.RESET}")
+    elif status is PageStatus.UNCHANGED:
+        print(f"⏭️  Inalterado: {filepath}")
+    elif status is PageStatus.PRESERVED:
         print(f"{Colors.YELLOW}⚠️  Arquivo já existe: {filepath}{Colors.RESET}")
-        return False
-    
-    if dry_run:
-        print(f"{Colors.BLUE}🔍 [DRY-RUN] Criaria: {filepath}{Colors.RESET}")
-        return True
-    
-    # Criar diretório se não existir
-    filepath.parent.mkdir(parents=True, exist_ok=True)
-    
-    # Escrever arquivo
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(content)
-    
-    print(f"{Colors.GREEN}✅ Criado: {filepath}{Colors.RESET}")
-    return True
+    else:
+        print(f"{Colors.RED}❌ Erro ao criar {filepath}: {error}{Colors.RESET}")
 
 def main():
     """Função principal."""
@@ -957,27 +964,25 @@ def main():
         print(f"{Colors.YELLOW}🔍 Modo DRY-RUN ativado - nenhum arquivo será criado{Colors.RESET}\n")
     
     if force:
-        print(f"{Colors.YELLOW}⚠️  Modo FORCE ativado - arquivos existentes serão sobrescritos{Colors.RESET}\n")
-    
-    # Estatísticas
-    created = 0
-    skipped = 0
-    errors = 0
+        print(f"{Colors.YELLOW}⚠️  Modo FORCE ativado - arquivos editados à mão serão sobrescritos{Colors.RESET}\n")
     
     print(f"{Colors.CYAN}📝 Gerando {len(DOCS_TO_CREATE)} documentações...{Colors.RESET}\n")
     
+    build = DocBuild("missing-docs", DOCS_DIR, overwrite=force)
     for filepath, template_key, name, params in DOCS_TO_CREATE:
-        full_path = DOCS_DIR / filepath
-        
-        try:
-            content = generate_doc(template_key, params)
-            if create_doc_file(full_path, content, dry_run, force):
-                created += 1
-            else:
-                skipped += 1
-        except Exception as e:
-            print(f"{Colors.RED}❌ Erro ao criar {filepath}: {e}{Colors.RESET}")
-            errors += 1
+        build.add(doc_page(filepath, template_key, params))
+    report = build.run(dry_run=dry_run)
+    
+    for result in report.results:
+        print_page_result(DOCS_DIR / result.page.path, result.status, dry_run, result.error)
+    
+    # Estatísticas
+    counts = report.counts()
+    created = counts[PageStatus.CREATED.value]
+    updated = counts[PageStatus.UPDATED.value]
+    unchanged = counts[PageStatus.UNCHANGED.value]
+    preserved = counts[PageStatus.PRESERVED.value]
+    errors = counts[PageStatus.ERROR.value]
     
     # Resumo
     print(f"""
@@ -985,14 +990,19 @@ def main():
                          RESUMO
 ═══════════════════════════════════════════════════════════════{Colors.RESET}
 
-{Colors.GREEN}✅ Criados:  {created}{Colors.RESET}
-{Colors.YELLOW}⚠️  Pulados:  {skipped}{Colors.RESET}
-{Colors.RED}❌ Erros:    {errors}{Colors.RESET}
+{Colors.GREEN}✅ Criados:      {created}{Colors.RESET}
+{Colors.GREEN}🔄 Atualizados:  {updated}{Colors.RESET}
+⏭️  Inalterados:  {unchanged}
+{Colors.YELLOW}⚠️  Preservados:  {preserved}{Colors.RESET}
+{Colors.RED}❌ Erros:        {errors}{Colors.RESET}
 
-{Colors.CYAN}Total:       {len(DOCS_TO_CREATE)}{Colors.RESET}
+{Colors.CYAN}Total:           {len(DOCS_TO_CREATE)}{Colors.RESET}
 """)
     
-    if not dry_run and created > 0:
+    if preserved and not force:
+        print(f"{Colors.YELLOW}💡 Use --force para sobrescrever os arquivos existentes{Colors.RESET}")
+    
+    if not dry_run and created + updated > 0:
         print(f"{Colors.GREEN}🎉 Documentações geradas com sucesso!{Colors.RESET}")
         print(f"{Colors.CYAN}📁 Diretório: {DOCS_DIR}{Colors.RESET}")
 
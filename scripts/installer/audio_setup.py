@@ -197,14 +197,9 @@ class AudioSetup:
         if not self.install_packages(self.PIPEWIRE_PACKAGES):
             return False
         
-        # Configurar serviços do usuário
-        self._run_as_user(['systemctl', '--user', 'enable', 'pipewire'])
-        self._run_as_user(['systemctl', '--user', 'enable', 'pipewire-pulse'])
-        self._run_as_user(['systemctl', '--user', 'enable', 'wireplumber'])
-        
-        self._run_as_user(['systemctl', '--user', 'start', 'pipewire'])
-        self._run_as_user(['systemctl', '--user', 'start', 'pipewire-pulse'])
-        self._run_as_user(['systemctl', '--user', 'start', 'wireplumber'])
+        # Configurar serviços do usuário (uma chamada para as três unidades)
+        self._run_as_user(['systemctl', '--user', 'enable', '--now',
+                           'pipewire', 'pipewire-pulse', 'wireplumber'])
         
         self._log("PipeWire instalado com sucesso", "success")
         return True
@@ -219,11 +214,10 @@ class AudioSetup:
         
         # Bluetooth para PipeWire
         if self.config.backend == AudioBackend.PIPEWIRE:
-            self._run(['pacman', '-S', '--noconfirm', '--needed', 'pipewire-bluetooth'])
+            self.install_packages(['pipewire-bluetooth'])
         
         # Habilitar serviço
-        self._run(['systemctl', 'enable', 'bluetooth'])
-        self._run(['systemctl', 'start', 'bluetooth'])
+        self._run(['systemctl', 'enable', '--now', 'bluetooth'])
         
         self._log("Suporte Bluetooth instalado", "success")
         return True
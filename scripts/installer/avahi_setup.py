@@ -17,6 +17,7 @@ from dataclasses import dataclass
 from typing import Optional, List
 
 from .config import Colors, config
+from .file_plan import FilePlan
 
 
 @dataclass
@@ -42,6 +43,8 @@ class AvahiSetup:
         self.config = avahi_config or AvahiConfig()
         self.analytics = analytics
         self.services_dir = Path('/etc/avahi/services')
+        # Arquivos gerados: regravados só quando o conteúdo muda
+        self.files = FilePlan()
     
     def _log(self, message: str, color: str = Colors.WHITE):
         """Log colorido"""
@@ -110,7 +113,7 @@ class AvahiSetup:
                         new_lines.append(line)
                 new_content = '\n'.join(new_lines)
             
-            nsswitch_path.write_text(new_content)
+            self.files.write(nsswitch_path, new_content)
             self._log("✅ nsswitch.conf configurado", Colors.GREEN)
             return True
             
@@ -146,8 +149,6 @@ class AvahiSetup:
         """Cria arquivo de serviço HTTP/HTTPS do TSiJUKEBOX"""
         self._log("📝 Criando serviço mDNS do TSiJUKEBOX...", Colors.CYAN)
         
-        self.services_dir.mkdir(parents=True, exist_ok=True)
-        
         # Determinar tipo de serviço baseado em HTTPS
         service_type = "_https._tcp" if self.config.https_enabled else "_http._tcp"
         protocol = "https" if self.config.https_enabled else "http"
@@ -177,7 +178,7 @@ class AvahiSetup:
 """
         
         service_path = self.services_dir / 'tsijukebox.service'
-        service_path.write_text(service_content)
+        self.files.write(service_path, service_content)
         
         self._log(f"✅ Serviço HTTP/HTTPS criado em {service_path}", Colors.GREEN)
         return True
@@ -206,7 +207,7 @@ class AvahiSetup:
 """
         
         service_path = self.services_dir / 'grafana.service'
-        service_path.write_text(service_content)
+        self.files.write(service_path, service_content)
         
         self._log(f"✅ Serviço Grafana criado", Colors.GREEN)
         return True
@@ -242,7 +243,7 @@ class AvahiSetup:
 """
         
         service_path = self.services_dir / 'prometheus.service'
-        service_path.write_text(service_content)
+        self.files.write(service_path, service_content)
         
         self._log(f"✅ Serviço Prometheus criado", Colors.GREEN)
         return True
@@ -268,7 +269,7 @@ class AvahiSetup:
 """
         
         service_path = self.services_dir / 'ssh.service'
-        service_path.write_text(service_content)
+        self.files.write(service_path, service_content)
         
         self._log(f"✅ Serviço SSH criado", Colors.GREEN)
         return True
@@ -308,9 +309,11 @@ class AvahiSetup:
         self._log("🚀 Habilitando e iniciando Avahi...", Colors.CYAN)
         
         try:
-            self._run_command(['systemctl', 'enable', 'avahi-daemon'])
-            self._run_command(['systemctl', 'start', 'avahi-daemon'])
-            self._run_command(['systemctl', 'restart', 'avahi-daemon'])
+            self._run_command(['systemctl', 'enable', '--now', 'avahi-daemon'])
+            
+            # O daemon já relê /etc/avahi/services; reinicia só se algo mudou
+            if self.files.changed:
+                self._run_command(['systemctl', 'restart', 'avahi-daemon'])
             
             self._log("✅ Avahi daemon iniciado", Colors.GREEN)
             return True
@@ -11,6 +11,7 @@ from pathlib import Path
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 
+from .offline_bundle import OfflineBundle
 from .utils.logger import Logger
 
 @dataclass
@@ -216,8 +217,21 @@ volumes:
             self.logger.error(f"Failed to create .env file: {e}")
             return False
     
-    def pull_image(self, image: str = "ghcr.io/b0yz4kr14/tsijukebox:latest") -> bool:
-        """Pull Docker image."""
+    def pull_image(
+        self,
+        image: str = "ghcr.io/b0yz4kr14/tsijukebox:latest",
+        bundle: Optional[Any] = None
+    ) -> bool:
+        """Pull Docker image, or load it from an offline bundle when it has one."""
+        archive = bundle.image_archive(image) if bundle else None
+        if archive:
+            self.logger.info(f"Loading Docker image from bundle: {image}")
+            code, out, err = self._run_command(["docker", "load", "-i", str(archive)])
+            if code == 0:
+                self.logger.success("Image loaded successfully")
+                return True
+            self.logger.warning(f"Failed to load image from bundle: {err}")
+        
         self.logger.info(f"Pulling Docker image: {image}")
         
         code, out, err = self._run_command(
@@ -400,8 +414,8 @@ volumes:
             "APP_PORT": str(port)
         })
         
-        # Pull image and start
-        if self.pull_image() and self.start():
+        # Pull image (or load it from $TSIJUKEBOX_BUNDLE) and start
+        if self.pull_image(bundle=OfflineBundle.from_env(self.logger)) and self.start():
             self.logger.success("TSiJUKEBOX Docker setup complete!")
             self.logger.info(f"Access at: http://localhost:{port}")
             return True
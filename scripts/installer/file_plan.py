@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+TSiJUKEBOX - File Plan
+======================
+Motor declarativo de escrita de arquivos gerados pelo instalador.
+
+As fases declaram o estado desejado (conteúdo, modo, dono) em vez de
+escrever e depois chamar `chown`/`chmod`. O plano compara com o disco
+por SHA-256, grava só o que mudou (arquivo temporário + rename, com modo
+e dono já aplicados) e, se alguma unidade systemd mudou, faz um único
+`systemctl daemon-reload` no fim. Em dry-run mostra o diff de cada
+arquivo sem tocar em nada.
+
+Uso:
+    files = FilePlan(logger=logger, dry_run=False)
+    files.write(home / ".xinitrc", conteudo, mode=0o755, owner=user, group=user)
+
+    with files.transaction():          # aplica tudo de uma vez na saída
+        files.write(unit_path, unit)   # /etc/systemd/... → daemon-reload
+        files.after(["systemctl", "enable", "tsijukebox-watchdog"])
+
+Autor: B0.y_Z4kr14
+Licença: Domínio Público
+"""
+
+import difflib
+import grp
+import hashlib
+import os
+import pwd
+import shutil
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Union
+
+try:
+    from .utils.runner import CommandRunner, PrivilegedBatch, coalesce
+except ImportError:
+    from utils.runner import CommandRunner, PrivilegedBatch, coalesce
+
+
+DEFAULT_MODE = 0o644
+DIFF_MAX_LINES = 40
+SYSTEMD_DIRS = ("/etc/systemd/", "/usr/lib/systemd/", "/run/systemd/")
+UNIT_SUFFIXES = (".service", ".timer", ".socket", ".path", ".mount", ".target")
+
+
+@dataclass
+class PlannedFile:
+    """Arquivo desejado."""
+    path: Path
+    data: bytes
+    mode: Optional[int] = None
+    owner: Optional[str] = None
+    group: Optional[str] = None
+    parents: bool = True
+    backup: bool = False
+    unit: bool = False
+
+    @property
+    def sha256(self) -> str:
+        return hashlib.sha256(self.data).hexdigest()
+
+
+@dataclass
+class FileChange:
+    """Diferença entre o plano e o disco."""
+    path: Path
+    action: str  # create, update, metadata, unchanged
+    diff: str = ""
+
+    @property
+    def changed(self) -> bool:
+        return self.action != "unchanged"
+
+
+def is_system_unit(path: Path) -> bool:
+    """True para unidades e drop-ins do systemd de sistema."""
+    text = str(path)
+    if not text.startswith(SYSTEMD_DIRS):
+        return False
+    return path.suffix in UNIT_SUFFIXES or path.parent.name.endswith(".d")
+
+
+def _ids(owner: Optional[str], group: Optional[str]) -> Tuple[int, int]:
+    """(uid, gid) para chown; -1 mantém o atual. LookupError se não existir."""
+    try:
+        uid = pwd.getpwnam(owner).pw_uid if owner else -1
+        gid = grp.getgrnam(group).gr_gid if group else -1
+    except KeyError as e:
+        raise LookupError(f"Usuário ou grupo inexistente: {e}") from None
+    return uid, gid
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def atomic_write(path: Path, data: bytes, mode: int = DEFAULT_MODE, uid: int = -1, gid: int = -1) -> None:
+    """Grava via arquivo temporário no mesmo diretório e rename atômico."""
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fchmod(f.fileno(), mode)
+            if uid != -1 or gid != -1:
+                os.fchown(f.fileno(), uid, gid)
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class FilePlan:
+    """Conjunto de arquivos desejados aplicado por diff de hash."""
+
+    def __init__(
+        self,
+        logger: Any = None,
+        dry_run: bool = False,
+        run: Optional[Callable[[List[str]], Any]] = None
+    ):
+        self.logger = logger
+        self.dry_run = dry_run
+        # Executor dos comandos pós-escrita; padrão: um único lote privilegiado
+        self.run = run
+        self.pending: List[PlannedFile] = []
+        self.commands: List[Tuple[List[str], bool]] = []
+        self.changed: List[Path] = []
+        self._depth = 0
+
+    def _log(self, message: str, level: str = "info"):
+        if self.logger:
+            getattr(self.logger, level, self.logger.info)(message)
+        elif level != "debug":
+            # Sem logger não há nível configurável: só info para cima
+            print(f"[FILES] {message}")
+
+    # ------------------------------------------------------------------
+    # Declaração
+    # ------------------------------------------------------------------
+
+    def add(
+        self,
+        path: Union[str, Path],
+        content: Union[str, bytes],
+        mode: Optional[int] = None,
+        owner: Optional[str] = None,
+        group: Optional[str] = None,
+        parents: bool = True,
+        backup: bool = False,
+        unit: Optional[bool] = None
+    ) -> PlannedFile:
+        """Declara um arquivo sem aplicar."""
+        path = Path(path)
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        planned = PlannedFile(path, data, mode, owner, group, parents, backup,
+                              is_system_unit(path) if unit is None else unit)
+        # A última declaração do mesmo caminho prevalece
+        self.pending = [p for p in self.pending if p.path != path] + [planned]
+        return planned
+
+    def write(self, path: Union[str, Path], content: Union[str, bytes], **options) -> PlannedFile:
+        """Declara um arquivo e aplica já, salvo dentro de transaction()."""
+        planned = self.add(path, content, **options)
+        if not self._depth:
+            self.apply()
+        return planned
+
+    def after(self, cmd: List[str], on_change: bool = False) -> None:
+        """
+        Comando executado depois da escrita (e do daemon-reload).
+
+        on_change=True só executa se algum arquivo do plano mudou.
+        """
+        self.commands.append((list(cmd), on_change))
+        if not self._depth:
+            self.apply()
+
+    @contextmanager
+    def transaction(self) -> Iterator["FilePlan"]:
+        """Agrupa declarações; aplica tudo ao sair do bloco mais externo."""
+        self._depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._depth -= 1
+            if not self._depth:
+                self.pending, self.commands = [], []
+            raise
+        self._depth -= 1
+        if not self._depth:
+            self.apply()
+
+    # ------------------------------------------------------------------
+    # Diff e aplicação
+    # ------------------------------------------------------------------
+
+    def _compare(self, planned: PlannedFile) -> FileChange:
+        path = planned.path
+        if not path.exists():
+            return FileChange(path, "create", self._diff(b"", planned))
+        if _sha256_file(path) != planned.sha256:
+            return FileChange(path, "update", self._diff(path.read_bytes(), planned))
+        st = path.stat()
+        if planned.mode is not None and (st.st_mode & 0o7777) != planned.mode:
+            return FileChange(path, "metadata")
+        try:
+            uid, gid = _ids(planned.owner, planned.group)
+        except LookupError:
+            uid, gid = -1, -1
+        if (uid != -1 and st.st_uid != uid) or (gid != -1 and st.st_gid != gid):
+            return FileChange(path, "metadata")
+        return FileChange(path, "unchanged")
+
+    @staticmethod
+    def _diff(current: bytes, planned: PlannedFile) -> str:
+        old = current.decode("utf-8", "replace").splitlines(keepends=True)
+        new = planned.data.decode("utf-8", "replace").splitlines(keepends=True)
+        lines = list(difflib.unified_diff(old, new, str(planned.path), str(planned.path)))
+        if len(lines) > DIFF_MAX_LINES:
+            lines = lines[:DIFF_MAX_LINES] + [f"... (+{len(lines) - DIFF_MAX_LINES} linhas)\n"]
+        return "".join(lines)
+
+    def diff(self) -> List[FileChange]:
+        """Compara os arquivos pendentes com o disco, sem escrever."""
+        return [self._compare(p) for p in self.pending]
+
+    def _make_parents(self, planned: PlannedFile, uid: int, gid: int) -> None:
+        missing = []
+        parent = planned.path.parent
+        while not parent.exists():
+            missing.append(parent)
+            parent = parent.parent
+        for directory in reversed(missing):
+            directory.mkdir()
+            if uid != -1 or gid != -1:
+                os.chown(directory, uid, gid)
+
+    def _apply_file(self, planned: PlannedFile, change: FileChange) -> None:
+        path = planned.path
+        uid, gid = _ids(planned.owner, planned.group)
+        if change.action == "metadata":
+            if planned.mode is not None:
+                os.chmod(path, planned.mode)
+            if uid != -1 or gid != -1:
+                os.chown(path, uid, gid)
+            return
+        if planned.parents:
+            self._make_parents(planned, uid, gid)
+        mode = planned.mode
+        if mode is None:
+            mode = path.stat().st_mode & 0o7777 if path.exists() else DEFAULT_MODE
+        if planned.backup and path.exists():
+            shutil.copy2(path, path.with_name(path.name + ".bak"))
+        atomic_write(path, planned.data, mode, uid, gid)
+
+    def apply(self) -> List[FileChange]:
+        """
+        Grava o que mudou, faz um daemon-reload se preciso e roda os comandos.
+
+        Raises:
+            OSError/LookupError da escrita; o plano pendente é descartado.
+        """
+        pending, self.pending = self.pending, []
+        commands, self.commands = self.commands, []
+        changes = []
+        reload_needed = False
+
+        for planned in pending:
+            change = self._compare(planned)
+            changes.append(change)
+            if not change.changed:
+                continue
+            if self.dry_run:
+                self._log(f"[DRY-RUN] {change.action}: {planned.path}")
+                if change.diff:
+                    # O diff é a saída do dry-run, não detalhe de depuração
+                    self._log(change.diff.rstrip("\n"))
+            else:
+                self._apply_file(planned, change)
+            self.changed.append(planned.path)
+            reload_needed = reload_needed or (planned.unit and change.action != "metadata")
+
+        any_changed = any(c.changed for c in changes)
+        to_run = [cmd for cmd, on_change in commands if any_changed or not on_change]
+        if reload_needed:
+            to_run.insert(0, ["systemctl", "daemon-reload"])
+        self._run_commands(to_run)
+
+        written = sum(1 for c in changes if c.changed)
+        if changes and not self.dry_run:
+            self._log(f"{written} de {len(changes)} arquivo(s) atualizado(s)", "debug")
+        return changes
+
+    def _run_commands(self, commands: List[List[str]]) -> None:
+        if not commands:
+            return
+        if self.run is not None:
+            for cmd in coalesce(commands):
+                self.run(cmd)
+            return
+        batch = PrivilegedBatch(CommandRunner(logger=self.logger, dry_run=self.dry_run))
+        for cmd in commands:
+            batch.add(cmd)
+        batch.run()
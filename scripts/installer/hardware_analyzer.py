@@ -8,13 +8,14 @@ Autor: B0.y_Z4kr14
 Licença: Domínio Público
 """
 
-import os
-import re
-import subprocess
-from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import List, Optional
 from dataclasses import dataclass
 
+try:
+    from .system_probe import probe_system
+except ImportError:
+    from system_probe import probe_system
+
 
 @dataclass
 class HardwareInfo:
@@ -52,163 +53,25 @@ class HardwareAnalyzer:
     def __init__(self, verbose: bool = False):
         self.verbose = verbose
     
-    def _run_command(self, cmd: List[str]) -> Tuple[int, str, str]:
-        """Executa comando shell."""
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            return result.returncode, result.stdout, result.stderr
-        except Exception as e:
-            return 1, "", str(e)
-    
-    def _get_cpu_info(self) -> Tuple[str, int, int]:
-        """Obtém informações da CPU."""
-        model = ""
-        cores = 1
-        threads = 1
-        
-        cpuinfo = Path("/proc/cpuinfo")
-        if cpuinfo.exists():
-            content = cpuinfo.read_text()
-            
-            # Model name
-            match = re.search(r'model name\s*:\s*(.+)', content)
-            if match:
-                model = match.group(1).strip()
-            
-            # Count physical cores
-            cores = content.count("processor")
-            threads = cores
-            
-            # Try to get actual core count
-            match = re.search(r'cpu cores\s*:\s*(\d+)', content)
-            if match:
-                cores = int(match.group(1))
-        
-        return model, cores, threads
-    
-    def _get_memory_info(self) -> Tuple[float, float]:
-        """Obtém informações de memória em GB."""
-        total_gb = 0.0
-        available_gb = 0.0
-        
-        meminfo = Path("/proc/meminfo")
-        if meminfo.exists():
-            content = meminfo.read_text()
-            
-            match = re.search(r'MemTotal:\s*(\d+)', content)
-            if match:
-                total_gb = int(match.group(1)) / 1024 / 1024
-            
-            match = re.search(r'MemAvailable:\s*(\d+)', content)
-            if match:
-                available_gb = int(match.group(1)) / 1024 / 1024
-        
-        return total_gb, available_gb
-    
-    def _get_disk_info(self) -> Tuple[float, float]:
-        """Obtém informações de disco em GB."""
-        try:
-            stat = os.statvfs("/")
-            total_gb = (stat.f_blocks * stat.f_frsize) / 1024 / 1024 / 1024
-            free_gb = (stat.f_bavail * stat.f_frsize) / 1024 / 1024 / 1024
-            return total_gb, free_gb
-        except:
-            return 0.0, 0.0
-    
-    def _get_gpu_info(self) -> Tuple[str, str]:
-        """Detecta GPU."""
-        vendor = ""
-        model = ""
-        
-        # Try lspci
-        code, out, _ = self._run_command(['lspci'])
-        if code == 0:
-            for line in out.split('\n'):
-                if 'VGA' in line or '3D' in line:
-                    if 'NVIDIA' in line.upper():
-                        vendor = 'nvidia'
-                    elif 'AMD' in line.upper() or 'ATI' in line.upper():
-                        vendor = 'amd'
-                    elif 'INTEL' in line.upper():
-                        vendor = 'intel'
-                    model = line.split(':')[-1].strip() if ':' in line else line
-                    break
-        
-        return vendor, model
-    
-    def _is_raspberry_pi(self) -> bool:
-        """Detecta se é Raspberry Pi."""
-        model = Path("/proc/device-tree/model")
-        if model.exists():
-            content = model.read_text().lower()
-            return 'raspberry' in content
-        
-        cpuinfo = Path("/proc/cpuinfo")
-        if cpuinfo.exists():
-            content = cpuinfo.read_text().lower()
-            return 'raspberry' in content or 'bcm2' in content
-        
-        return False
-    
-    def _is_virtual_machine(self) -> bool:
-        """Detecta se é máquina virtual."""
-        # Check systemd-detect-virt
-        code, out, _ = self._run_command(['systemd-detect-virt'])
-        if code == 0 and out.strip() not in ['none', '']:
-            return True
-        
-        # Check DMI
-        dmi = Path("/sys/class/dmi/id/product_name")
-        if dmi.exists():
-            product = dmi.read_text().lower()
-            vm_indicators = ['vmware', 'virtualbox', 'kvm', 'qemu', 'xen', 'hyper-v']
-            for indicator in vm_indicators:
-                if indicator in product:
-                    return True
-        
-        return False
-    
-    def _has_audio_device(self) -> bool:
-        """Verifica se há dispositivo de áudio."""
-        # Check ALSA
-        code, out, _ = self._run_command(['aplay', '-l'])
-        if code == 0 and 'card' in out.lower():
-            return True
-        
-        # Check /proc/asound
-        asound = Path("/proc/asound/cards")
-        if asound.exists():
-            content = asound.read_text()
-            return len(content.strip()) > 0
-        
-        return False
-    
-    def _has_display(self) -> bool:
-        """Verifica se há display conectado."""
-        return os.environ.get('DISPLAY') is not None or Path("/dev/fb0").exists()
-    
-    def detect_hardware(self) -> HardwareInfo:
-        """Detecta todo o hardware do sistema."""
-        cpu_model, cpu_cores, cpu_threads = self._get_cpu_info()
-        ram_total, ram_available = self._get_memory_info()
-        disk_total, disk_free = self._get_disk_info()
-        gpu_vendor, gpu_model = self._get_gpu_info()
+    def detect_hardware(self, refresh: bool = False) -> HardwareInfo:
+        """Detecta todo o hardware do sistema (sonda compartilhada, em cache)."""
+        probe = probe_system(refresh=refresh)
         
         return HardwareInfo(
-            cpu_model=cpu_model,
-            cpu_cores=cpu_cores,
-            cpu_threads=cpu_threads,
-            ram_gb=ram_total,
-            ram_available_gb=ram_available,
-            disk_total_gb=disk_total,
-            disk_free_gb=disk_free,
-            gpu_vendor=gpu_vendor,
-            gpu_model=gpu_model,
-            is_raspberry_pi=self._is_raspberry_pi(),
-            is_virtual_machine=self._is_virtual_machine(),
-            arch=os.uname().machine,
-            has_audio_device=self._has_audio_device(),
-            has_display=self._has_display()
+            cpu_model=probe.cpu_model,
+            cpu_cores=probe.cpu_cores,
+            cpu_threads=probe.cpu_threads,
+            ram_gb=probe.ram_gb,
+            ram_available_gb=probe.ram_available_gb,
+            disk_total_gb=probe.disk_total_gb,
+            disk_free_gb=probe.disk_free_gb,
+            gpu_vendor=probe.gpu_vendor,
+            gpu_model=probe.gpu_model,
+            is_raspberry_pi=probe.is_raspberry_pi,
+            is_virtual_machine=probe.is_virtual_machine,
+            arch=probe.arch,
+            has_audio_device=probe.audio_cards > 0,
+            has_display=probe.has_display
         )
     
     def analyze(self, hw: Optional[HardwareInfo] = None) -> InstallRecommendation:
@@ -15,6 +15,11 @@ from pathlib import Path
 from typing import Optional, List, Tuple, Dict, Any
 from dataclasses import dataclass
 
+try:
+    from .file_plan import FilePlan
+except ImportError:
+    from file_plan import FilePlan
+
 
 @dataclass
 class KioskChromiumConfig:
@@ -90,6 +95,8 @@ class KioskChromiumSetup:
         self.logger = logger
         self.dry_run = dry_run
         self.home = Path(f"/home/{self.config.user}")
+        # Arquivos gerados: só grava o que mudou, um daemon-reload por transação
+        self.files = FilePlan(logger=logger, dry_run=dry_run, run=self._run)
     
     def _log(self, message: str, level: str = "info"):
         if self.logger:
@@ -119,6 +126,10 @@ class KioskChromiumSetup:
             cmd = ['sudo', '-u', self.config.user] + cmd
         return self._run(cmd)
     
+    def _owner(self) -> Dict[str, str]:
+        """Dono dos arquivos gerados no home do usuário."""
+        return {'owner': self.config.user, 'group': self.config.user}
+    
     def install_xorg(self) -> bool:
         """Instala Xorg e dependências."""
         self._log("Instalando Xorg...", "info")
@@ -153,7 +164,7 @@ class KioskChromiumSetup:
             self._log("Chromium já instalado", "info")
             return True
         
-        code, _, err = self._run(['pacman', '-S', '--noconfirm'] + self.BROWSER_PACKAGES)
+        code, _, err = self._run(['pacman', '-S', '--noconfirm', '--needed'] + self.BROWSER_PACKAGES)
         
         if code != 0:
             self._log(f"Falha ao instalar Chromium: {err}", "error")
@@ -197,11 +208,7 @@ exec openbox-session
 """
         
         xinitrc_path = self.home / ".xinitrc"
-        
-        if not self.dry_run:
-            xinitrc_path.write_text(xinitrc_content)
-            xinitrc_path.chmod(0o755)
-            shutil.chown(xinitrc_path, self.config.user, self.config.user)
+        self.files.write(xinitrc_path, xinitrc_content, mode=0o755, **self._owner())
         
         self._log(f".xinitrc configurado: {xinitrc_path}", "success")
         return True
@@ -269,13 +276,7 @@ done
         
         openbox_dir = self.home / ".config/openbox"
         autostart_path = openbox_dir / "autostart"
-        
-        if not self.dry_run:
-            openbox_dir.mkdir(parents=True, exist_ok=True)
-            autostart_path.write_text(autostart_content)
-            autostart_path.chmod(0o755)
-            shutil.chown(openbox_dir, self.config.user, self.config.user)
-            shutil.chown(autostart_path, self.config.user, self.config.user)
+        self.files.write(autostart_path, autostart_content, mode=0o755, **self._owner())
         
         self._log(f"Openbox autostart configurado: {autostart_path}", "success")
         return True
@@ -338,12 +339,7 @@ done
         
         openbox_dir = self.home / ".config/openbox"
         rc_path = openbox_dir / "rc.xml"
-        
-        if not self.dry_run:
-            openbox_dir.mkdir(parents=True, exist_ok=True)
-            rc_path.write_text(rc_content)
-            shutil.chown(openbox_dir, self.config.user, self.config.user)
-            shutil.chown(rc_path, self.config.user, self.config.user)
+        self.files.write(rc_path, rc_content, **self._owner())
         
         self._log(f"Openbox rc.xml configurado: {rc_path}", "success")
         return True
@@ -361,15 +357,8 @@ fi
 """
         
         bash_profile_path = self.home / ".bash_profile"
-        
-        if not self.dry_run:
-            # Backup se existir
-            if bash_profile_path.exists():
-                backup_path = bash_profile_path.with_suffix('.bak')
-                shutil.copy(bash_profile_path, backup_path)
-            
-            bash_profile_path.write_text(bash_profile_content)
-            shutil.chown(bash_profile_path, self.config.user, self.config.user)
+        # Backup (.bash_profile.bak) só quando o conteúdo muda
+        self.files.write(bash_profile_path, bash_profile_content, backup=True, **self._owner())
         
         self._log(f".bash_profile configurado: {bash_profile_path}", "success")
         return True
@@ -386,12 +375,9 @@ ExecStart=
 ExecStart=-/sbin/agetty --autologin {self.config.user} --noclear %I $TERM
 """
         
-        if not self.dry_run:
-            override_dir.mkdir(parents=True, exist_ok=True)
-            override_file.write_text(override_content)
-            
-            self._run(['systemctl', 'daemon-reload'])
-            self._run(['systemctl', 'enable', 'getty@tty1.service'])
+        with self.files.transaction():
+            self.files.add(override_file, override_content)
+            self.files.after(['systemctl', 'enable', 'getty@tty1.service'])
         
         self._log("Autologin configurado", "success")
         return True
@@ -446,17 +432,11 @@ WantedBy=multi-user.target
         
         service_path = Path("/etc/systemd/system/tsijukebox-watchdog.service")
         
-        if not self.dry_run:
-            watchdog_path.parent.mkdir(parents=True, exist_ok=True)
-            watchdog_path.write_text(watchdog_script)
-            watchdog_path.chmod(0o755)
-            
-            service_path.write_text(service_content)
-            
-            self._run(['systemctl', 'daemon-reload'])
-            
+        with self.files.transaction():
+            self.files.add(watchdog_path, watchdog_script, mode=0o755)
+            self.files.add(service_path, service_content)
             if self.config.watchdog_enabled:
-                self._run(['systemctl', 'enable', 'tsijukebox-watchdog'])
+                self.files.after(['systemctl', 'enable', 'tsijukebox-watchdog'])
         
         self._log("Watchdog criado", "success")
         return True
@@ -477,16 +457,17 @@ WantedBy=multi-user.target
         
         self.install_utilities()
         
-        # Configurar
-        self.configure_xinitrc()
-        self.configure_openbox_autostart()
-        self.configure_openbox_rc()
-        self.configure_bash_profile()
-        self.configure_autologin()
-        
-        # Watchdog
-        if self.config.watchdog_enabled:
-            self.create_watchdog_service()
+        # Configurar (arquivos aplicados juntos, um único daemon-reload)
+        with self.files.transaction():
+            self.configure_xinitrc()
+            self.configure_openbox_autostart()
+            self.configure_openbox_rc()
+            self.configure_bash_profile()
+            self.configure_autologin()
+            
+            # Watchdog
+            if self.config.watchdog_enabled:
+                self.create_watchdog_service()
         
         self._log("Configuração de modo kiosk concluída!", "success")
         self._log(f"Reinicie o sistema para ativar o modo kiosk", "info")
@@ -18,6 +18,11 @@ from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
 
+try:
+    from .utils.runner import CommandRunner, PrivilegedBatch
+except ImportError:
+    from utils.runner import CommandRunner, PrivilegedBatch
+
 
 class NTPProvider(Enum):
     """Provedores NTP suportados."""
@@ -107,6 +112,13 @@ class NTPSetup:
         except Exception as e:
             return 1, "", str(e)
     
+    def _run_privileged(self, commands: List[List[str]]) -> bool:
+        """Executa vários comandos root num único processo auxiliar (um sudo só)."""
+        batch = PrivilegedBatch(CommandRunner(logger=self.logger, dry_run=self.dry_run))
+        for cmd in commands:
+            batch.add(cmd)
+        return batch.run()
+    
     def detect_provider(self) -> NTPProvider:
         """Detecta qual provedor NTP está instalado/ativo."""
         # Verificar chrony primeiro (mais preciso)
@@ -245,13 +257,17 @@ PollIntervalMaxSec=2048
                 temp_file.write_text(config_content)
                 
                 conf_dir = Path("/etc/systemd/timesyncd.conf.d")
-                self._run_command(['sudo', 'mkdir', '-p', str(conf_dir)])
-                self._run_command(['sudo', 'cp', str(temp_file), str(conf_dir / "tsijukebox.conf")])
+                self._run_privileged([
+                    ['mkdir', '-p', str(conf_dir)],
+                    ['cp', str(temp_file), str(conf_dir / "tsijukebox.conf")],
+                ])
                 temp_file.unlink()
         
         # Habilitar e iniciar serviço
-        self._run_command(['sudo', 'systemctl', 'enable', 'systemd-timesyncd'])
-        self._run_command(['sudo', 'systemctl', 'restart', 'systemd-timesyncd'])
+        self._run_privileged([
+            ['systemctl', 'enable', 'systemd-timesyncd'],
+            ['systemctl', 'restart', 'systemd-timesyncd'],
+        ])
         
         # Habilitar NTP
         self.enable_ntp()
@@ -324,12 +340,12 @@ logdir /var/log/chrony
                 self.logger.error(f"Erro ao configurar chrony: {e}")
                 return False
         
-        # Desabilitar timesyncd (conflita com chrony)
-        self._run_command(['sudo', 'systemctl', 'disable', '--now', 'systemd-timesyncd'])
-        
-        # Habilitar e iniciar chrony
-        self._run_command(['sudo', 'systemctl', 'enable', 'chronyd'])
-        self._run_command(['sudo', 'systemctl', 'restart', 'chronyd'])
+        # Desabilitar timesyncd (conflita com chrony), habilitar e iniciar chrony
+        self._run_privileged([
+            ['systemctl', 'disable', '--now', 'systemd-timesyncd'],
+            ['systemctl', 'enable', 'chronyd'],
+            ['systemctl', 'restart', 'chronyd'],
+        ])
         
         self.logger.success("chrony configurado")
         return True
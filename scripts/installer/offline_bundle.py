@@ -0,0 +1,612 @@
+#!/usr/bin/env python3
+"""
+TSiJUKEBOX - Offline Bundle Module
+==================================
+Gera e consome bundles offline versionados para instalações em massa.
+
+Um bundle é um diretório com:
+    manifest.json   versão, arquitetura e lista de artefatos com SHA-256
+    SHA256SUMS      mesmos checksums no formato do `sha256sum -c`
+    packages/       pacotes pacman (fechamento completo de dependências)
+    sync/           bancos de sincronização usados para gerar o bundle
+    files/          arquivos avulsos (modelos Vosk, scripts, tarballs)
+    images/         imagens Docker salvas com `docker save`
+    npm/            cache do npm empacotado em tar
+    repos/          repositório da aplicação como `git bundle`
+
+O bundle é lido direto de um pendrive ou de um espelho HTTP na LAN
+(ex.: `python3 -m http.server -d /srv/tsijukebox-bundle`); do espelho os
+artefatos são baixados sob demanda para um diretório local, verificados
+e reaproveitados entre execuções. Assim um rollout de 20 kiosks baixa
+tudo da internet uma única vez.
+
+Uso:
+    python3 offline_bundle.py build -o /mnt/usb/bundle --version 8.0.0 \\
+        --packages nodejs npm nginx chromium --url https://.../model.zip \\
+        --git-repo https://github.com/B0yZ4kr14/TSiJUKEBOX.git
+    python3 offline_bundle.py verify /mnt/usb/bundle
+    python3 offline_bundle.py list http://192.168.0.10:8000
+
+Autor: B0.y_Z4kr14
+Licença: Domínio Público
+"""
+
+import hashlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tarfile
+import tempfile
+import urllib.parse
+import urllib.request
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .utils.downloader import Downloader, DownloadError
+except ImportError:
+    from utils.downloader import Downloader, DownloadError
+
+
+BUNDLE_FORMAT = 1
+MANIFEST_NAME = "manifest.json"
+SUMS_NAME = "SHA256SUMS"
+DEFAULT_STAGING = Path("/var/cache/tsijukebox/bundle")
+BUNDLE_ENV = "TSIJUKEBOX_BUNDLE"
+CHUNK_SIZE = 1 << 20
+FETCH_TIMEOUT = 60
+
+# Tipos de artefato
+KIND_PACKAGE = "package"
+KIND_AUR_PACKAGE = "aur-package"
+KIND_SYNC_DB = "sync-db"
+KIND_FILE = "file"
+KIND_IMAGE = "image"
+KIND_NPM_CACHE = "npm-cache"
+KIND_GIT_REPO = "git-repo"
+
+KIND_DIRS = {
+    KIND_PACKAGE: "packages",
+    KIND_AUR_PACKAGE: "packages",
+    KIND_SYNC_DB: "sync",
+    KIND_FILE: "files",
+    KIND_IMAGE: "images",
+    KIND_NPM_CACHE: "npm",
+    KIND_GIT_REPO: "repos",
+}
+
+PACKAGE_SUFFIXES = (".pkg.tar.zst", ".pkg.tar.xz", ".pkg.tar.gz")
+
+
+class Colors:
+    RED = '\033[91m'
+    GREEN = '\033[92m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    RESET = '\033[0m'
+
+
+class BundleError(Exception):
+    """Bundle ausente, incompleto ou corrompido."""
+
+
+def _checked_members(tar: tarfile.TarFile, dest: Path):
+    """
+    Membros do tar que ficam dentro de `dest` (para Pythons sem o filtro
+    "data" de extractall). Links e dispositivos são recusados: o cache do
+    npm só tem arquivos e diretórios.
+    """
+    root = dest.resolve()
+    for member in tar.getmembers():
+        target = (root / member.name).resolve()
+        if not (member.isfile() or member.isdir()) or (target != root and root not in target.parents):
+            raise BundleError(f"Entrada insegura no tar: {member.name}")
+        yield member
+
+
+def _is_relative(path: str) -> bool:
+    """Caminho relativo sem `..`: não sai da raiz do bundle nem do staging."""
+    pure = PurePosixPath(path)
+    return bool(path) and "\\" not in path and not pure.is_absolute() and ".." not in pure.parts
+
+
+def _inside(root: Path, relative: str) -> Path:
+    """`root / relative`, recusando destinos fora de `root` (inclusive via symlink)."""
+    base = root.resolve()
+    target = (base / relative).resolve()
+    if base not in target.parents:
+        raise BundleError(f"Caminho fora do bundle: {relative}")
+    return root / relative
+
+
+@dataclass
+class BundleArtifact:
+    """Um arquivo do bundle."""
+    kind: str
+    name: str
+    path: str  # relativo à raiz do bundle
+    sha256: str
+    size: int
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class BundleManifest:
+    """Conteúdo do manifest.json."""
+    version: str
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    arch: str = field(default_factory=platform.machine)
+    format: int = BUNDLE_FORMAT
+    artifacts: List[BundleArtifact] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BundleManifest':
+        if data.get("format") != BUNDLE_FORMAT:
+            raise BundleError(f"Formato de bundle não suportado: {data.get('format')}")
+        artifacts = [BundleArtifact(**item) for item in data.get("artifacts", [])]
+        for artifact in artifacts:
+            # O manifest vem de pendrive ou espelho e o instalador roda como root
+            if not _is_relative(artifact.path):
+                raise BundleError(f"Caminho inseguro no manifest: {artifact.path}")
+            if artifact.kind == KIND_SYNC_DB and (
+                    "/" in artifact.name or "\\" in artifact.name or artifact.name in ("", ".", "..")):
+                raise BundleError(f"Nome inseguro no manifest: {artifact.name}")
+        return cls(version=data["version"], created_at=data.get("created_at", ""),
+                   arch=data.get("arch", ""), artifacts=artifacts)
+
+    def find(self, kind: str, name: str) -> Optional[BundleArtifact]:
+        return next((a for a in self.artifacts if a.kind == kind and a.name == name), None)
+
+    def of_kind(self, kind: str) -> List[BundleArtifact]:
+        return [a for a in self.artifacts if a.kind == kind]
+
+    def add(self, artifact: BundleArtifact) -> None:
+        self.artifacts = [a for a in self.artifacts
+                          if (a.kind, a.name) != (artifact.kind, artifact.name)]
+        self.artifacts.append(artifact)
+
+
+def sha256_file(path: Path) -> str:
+    """SHA-256 de um arquivo, lido em blocos."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def package_name(filename: str) -> str:
+    """Nome do pacote a partir de nome-versão-release-arch.pkg.tar.*"""
+    base = filename
+    for suffix in PACKAGE_SUFFIXES:
+        if base.endswith(suffix):
+            base = base[:-len(suffix)]
+            break
+    parts = base.rsplit('-', 3)
+    return parts[0] if len(parts) == 4 else base
+
+
+def _safe_name(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "._-" else "_" for c in name)
+
+
+class _Reporter:
+    """Log compartilhado por builder e consumidor (logger opcional)."""
+
+    logger: Any = None
+
+    def _log(self, message: str, level: str = "info"):
+        if self.logger:
+            getattr(self.logger, level, self.logger.info)(message)
+        else:
+            color = {
+                'info': Colors.BLUE,
+                'success': Colors.GREEN,
+                'warning': Colors.YELLOW,
+                'error': Colors.RED,
+            }.get(level, Colors.BLUE)
+            print(f"{color}[BUNDLE]{Colors.RESET} {message}")
+
+
+# =============================================================================
+# GERAÇÃO
+# =============================================================================
+
+class BundleBuilder(_Reporter):
+    """Monta um bundle offline num diretório."""
+
+    def __init__(self, root: Path, version: str, logger: Any = None, dry_run: bool = False):
+        self.root = Path(root)
+        self.logger = logger
+        self.dry_run = dry_run
+        manifest_file = self.root / MANIFEST_NAME
+        if manifest_file.exists():
+            # Incremental: acrescenta ao bundle existente
+            self.manifest = BundleManifest.from_dict(json.loads(manifest_file.read_text()))
+            self.manifest.version = version
+        else:
+            self.manifest = BundleManifest(version=version)
+
+    def _run(self, cmd: List[str], cwd: Optional[Path] = None) -> Tuple[int, str, str]:
+        if self.dry_run:
+            self._log(f"[DRY-RUN] {' '.join(cmd)}", "info")
+            return 0, "", ""
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
+            return result.returncode, result.stdout, result.stderr
+        except Exception as e:
+            return 1, "", str(e)
+
+    def _dir(self, kind: str) -> Path:
+        path = self.root / KIND_DIRS[kind]
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def _record(self, kind: str, name: str, path: Path, **meta) -> BundleArtifact:
+        artifact = BundleArtifact(
+            kind=kind,
+            name=name,
+            path=path.relative_to(self.root).as_posix(),
+            sha256=sha256_file(path),
+            size=path.stat().st_size,
+            meta=meta,
+        )
+        self.manifest.add(artifact)
+        return artifact
+
+    def add_pacman_packages(self, packages: List[str]) -> bool:
+        """
+        Baixa os pacotes com todas as dependências.
+
+        Usa um banco local vazio (--dbpath) para o pacman tratar nada como
+        instalado e baixar o fechamento completo; os bancos de sincronização
+        vão junto para o kiosk resolver exatamente as mesmas versões.
+        """
+        if not packages:
+            return True
+        self._log(f"Baixando {len(packages)} pacotes e dependências...", "info")
+        pkg_dir = self._dir(KIND_PACKAGE)
+        with tempfile.TemporaryDirectory(prefix="tsijukebox-pacman-db-") as dbpath:
+            code, _, err = self._run([
+                "pacman", "-Syw", "--noconfirm", "--needed",
+                "--dbpath", dbpath, "--cachedir", str(pkg_dir),
+            ] + packages)
+            if code != 0:
+                self._log(f"Falha ao baixar pacotes: {err}", "error")
+                return False
+            if self.dry_run:
+                return True
+            sync_dir = self._dir(KIND_SYNC_DB)
+            for db in sorted(Path(dbpath, "sync").glob("*.db")):
+                target = sync_dir / db.name
+                shutil.copy2(db, target)
+                self._record(KIND_SYNC_DB, db.name, target)
+
+        for path in sorted(pkg_dir.iterdir()):
+            if path.name.endswith(PACKAGE_SUFFIXES):
+                existing = self.manifest.find(KIND_AUR_PACKAGE, package_name(path.name))
+                if existing and existing.path.endswith(path.name):
+                    continue
+                self._record(KIND_PACKAGE, path.name, path, pkgname=package_name(path.name))
+        self._log("Pacotes adicionados ao bundle", "success")
+        return True
+
+    def add_package_files(self, files: List[Path]) -> bool:
+        """Adiciona pacotes já compilados (ex.: AUR), instalados com pacman -U."""
+        pkg_dir = self._dir(KIND_AUR_PACKAGE)
+        for source in files:
+            source = Path(source)
+            target = pkg_dir / source.name
+            if not self.dry_run:
+                shutil.copy2(source, target)
+                self._record(KIND_AUR_PACKAGE, package_name(source.name), target)
+        return True
+
+    def add_url(self, url: str, name: Optional[str] = None, sha256: Optional[str] = None) -> bool:
+        """Baixa um arquivo avulso; `sha256`, se informado, é conferido."""
+        name = name or Path(urllib.parse.urlparse(url).path).name
+        target = self._dir(KIND_FILE) / _safe_name(name)
+        self._log(f"Baixando {name}...", "info")
+        if self.dry_run:
+            self._log(f"[DRY-RUN] GET {url}", "info")
+            return True
+        tmp = target.with_name(target.name + ".part")
+        try:
+            request = urllib.request.Request(url, headers={"User-Agent": "TSiJUKEBOX-bundle"})
+            with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response, open(tmp, 'wb') as f:
+                shutil.copyfileobj(response, f, CHUNK_SIZE)
+        except OSError as e:
+            tmp.unlink(missing_ok=True)
+            self._log(f"Falha ao baixar {url}: {e}", "error")
+            return False
+        if sha256 and sha256_file(tmp) != sha256.lower():
+            tmp.unlink(missing_ok=True)
+            self._log(f"Checksum divergente para {name}", "error")
+            return False
+        os.replace(tmp, target)
+        self._record(KIND_FILE, name, target, url=url)
+        return True
+
+    def add_docker_image(self, image: str) -> bool:
+        """Salva uma imagem Docker como tarball."""
+        target = self._dir(KIND_IMAGE) / f"{_safe_name(image)}.tar"
+        self._log(f"Exportando imagem {image}...", "info")
+        for cmd in (["docker", "pull", image], ["docker", "save", "-o", str(target), image]):
+            code, _, err = self._run(cmd)
+            if code != 0:
+                self._log(f"Falha ao exportar {image}: {err}", "error")
+                return False
+        if not self.dry_run:
+            self._record(KIND_IMAGE, image, target)
+        return True
+
+    def add_npm_cache(self, project_dir: Path, name: str = "frontend") -> bool:
+        """Popula um cache npm com as dependências do projeto e o empacota."""
+        target = self._dir(KIND_NPM_CACHE) / f"{_safe_name(name)}.tar"
+        self._log("Gerando cache do npm...", "info")
+        with tempfile.TemporaryDirectory(prefix="tsijukebox-npm-") as cache:
+            code, _, err = self._run([
+                "npm", "install", "--cache", cache, "--ignore-scripts", "--no-audit", "--no-fund",
+            ], cwd=Path(project_dir))
+            if code != 0:
+                self._log(f"Falha ao gerar cache do npm: {err}", "error")
+                return False
+            if self.dry_run:
+                return True
+            with tarfile.open(target, 'w') as tar:
+                tar.add(cache, arcname=".")
+        self._record(KIND_NPM_CACHE, name, target)
+        return True
+
+    def add_git_repo(self, repo: str, name: str = "tsijukebox") -> bool:
+        """Empacota um repositório git (todas as refs) com `git bundle`."""
+        target = self._dir(KIND_GIT_REPO) / f"{_safe_name(name)}.bundle"
+        self._log(f"Empacotando repositório {repo}...", "info")
+        with tempfile.TemporaryDirectory(prefix="tsijukebox-git-") as tmp:
+            mirror = Path(tmp) / "mirror.git"
+            for cmd, cwd in ((["git", "clone", "--mirror", repo, str(mirror)], None),
+                             (["git", "bundle", "create", str(target), "--all"], mirror)):
+                code, _, err = self._run(cmd, cwd=cwd)
+                if code != 0:
+                    self._log(f"Falha ao empacotar {repo}: {err}", "error")
+                    return False
+        if not self.dry_run:
+            self._record(KIND_GIT_REPO, name, target, url=repo)
+        return True
+
+    def write_manifest(self) -> Path:
+        """Grava manifest.json e SHA256SUMS."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        manifest_file = self.root / MANIFEST_NAME
+        tmp = manifest_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.manifest.to_dict(), indent=2))
+        os.replace(tmp, manifest_file)
+        sums = "".join(f"{a.sha256}  {a.path}\n" for a in self.manifest.artifacts)
+        (self.root / SUMS_NAME).write_text(sums)
+        total = sum(a.size for a in self.manifest.artifacts) / (1024 ** 2)
+        self._log(f"Bundle {self.manifest.version}: {len(self.manifest.artifacts)} artefatos, "
+                  f"{total:.1f} MB", "success")
+        return manifest_file
+
+
+# =============================================================================
+# CONSUMO
+# =============================================================================
+
+class OfflineBundle(_Reporter):
+    """Bundle lido de um diretório local ou de um espelho HTTP."""
+
+    def __init__(self, source: str, staging: Path = DEFAULT_STAGING, logger: Any = None):
+        self.source = str(source).rstrip('/')
+        self.staging = Path(staging)
+        self.logger = logger
+        self.remote = urllib.parse.urlparse(self.source).scheme in ("http", "https")
+        self._manifest: Optional[BundleManifest] = None
+        self._verified: Dict[str, Tuple[float, int]] = {}
+        self._downloader: Optional[Downloader] = None
+
+    @classmethod
+    def from_env(cls, logger: Any = None) -> Optional['OfflineBundle']:
+        """Bundle indicado em $TSIJUKEBOX_BUNDLE, se houver."""
+        source = os.environ.get(BUNDLE_ENV)
+        return cls(source, logger=logger) if source else None
+
+    def _url(self, relative: str) -> str:
+        return f"{self.source}/{urllib.parse.quote(relative)}"
+
+    @property
+    def manifest(self) -> BundleManifest:
+        if self._manifest is None:
+            try:
+                if self.remote:
+                    with urllib.request.urlopen(self._url(MANIFEST_NAME), timeout=FETCH_TIMEOUT) as r:
+                        data = json.loads(r.read())
+                else:
+                    data = json.loads((Path(self.source) / MANIFEST_NAME).read_text())
+            except (OSError, ValueError) as e:
+                raise BundleError(f"Manifest do bundle ilegível em {self.source}: {e}") from e
+            self._manifest = BundleManifest.from_dict(data)
+        return self._manifest
+
+    @property
+    def version(self) -> str:
+        return self.manifest.version
+
+    def find(self, kind: str, name: str) -> Optional[BundleArtifact]:
+        return self.manifest.find(kind, name)
+
+    def _is_valid(self, path: Path, artifact: BundleArtifact) -> bool:
+        """Confere o checksum, lembrando arquivos já verificados nesta execução."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        key = (stat.st_mtime, stat.st_size)
+        if self._verified.get(str(path)) == key:
+            return True
+        if stat.st_size != artifact.size or sha256_file(path) != artifact.sha256:
+            return False
+        self._verified[str(path)] = key
+        return True
+
+    def fetch(self, artifact: BundleArtifact) -> Path:
+        """
+        Caminho local verificado do artefato.
+
+        Local: o próprio arquivo do bundle. Remoto: cópia em `staging`
+        mantendo o caminho relativo (o pacman exige o nome original).
+        """
+        if not self.remote:
+            path = _inside(Path(self.source), artifact.path)
+            if not self._is_valid(path, artifact):
+                raise BundleError(f"Artefato ausente ou corrompido: {artifact.path}")
+            return path
+
+        path = _inside(self.staging, artifact.path)
+        if self._is_valid(path, artifact):
+            return path
+        if self._downloader is None:
+            # Cache no mesmo sistema de arquivos do staging (hard links)
+            self._downloader = Downloader(cache_dir=self.staging / ".downloads", logger=self.logger)
+        self._log(f"Baixando {artifact.path} do espelho...", "info")
+        try:
+            self._downloader.download(self._url(artifact.path), path, sha256=artifact.sha256)
+        except (DownloadError, OSError) as e:
+            raise BundleError(f"Falha ao baixar {artifact.path}: {e}") from e
+        if not self._is_valid(path, artifact):
+            raise BundleError(f"Checksum divergente: {artifact.path}")
+        return path
+
+    def fetch_file(self, name: str) -> Optional[Path]:
+        """Arquivo avulso pelo nome (ex.: nome do zip do modelo Vosk)."""
+        artifact = self.find(KIND_FILE, name)
+        return self.fetch(artifact) if artifact else None
+
+    def package_cache(self) -> Optional[Path]:
+        """Diretório com todos os pacotes, para usar como --cachedir do pacman."""
+        artifacts = self.manifest.of_kind(KIND_PACKAGE)
+        if not artifacts:
+            return None
+        for artifact in artifacts:
+            self.fetch(artifact)
+        root = self.staging if self.remote else Path(self.source)
+        return root / KIND_DIRS[KIND_PACKAGE]
+
+    def aur_packages(self, names: List[str]) -> List[Path]:
+        """Pacotes AUR pré-compilados presentes no bundle."""
+        return [self.fetch(a) for a in self.manifest.of_kind(KIND_AUR_PACKAGE) if a.name in names]
+
+    def install_sync_dbs(self, target: Path = Path("/var/lib/pacman/sync")) -> int:
+        """Copia os bancos de sincronização do bundle para o pacman."""
+        count = 0
+        for artifact in self.manifest.of_kind(KIND_SYNC_DB):
+            target.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(self.fetch(artifact), target / artifact.name)
+            count += 1
+        return count
+
+    def extract_npm_cache(self, dest: Path, name: str = "frontend") -> Optional[Path]:
+        """Extrai o cache do npm para `dest` (usar com npm --cache dest --offline)."""
+        artifact = self.find(KIND_NPM_CACHE, name)
+        if not artifact:
+            return None
+        dest = Path(dest)
+        dest.mkdir(parents=True, exist_ok=True)
+        archive = self.fetch(artifact)
+        try:
+            with tarfile.open(archive) as tar:
+                if hasattr(tarfile, "data_filter"):
+                    tar.extractall(dest, filter="data")
+                else:
+                    tar.extractall(dest, members=_checked_members(tar, dest))
+        except (tarfile.TarError, OSError) as e:
+            raise BundleError(f"Falha ao extrair {artifact.path}: {e}") from e
+        return dest
+
+    def git_repo(self, name: str = "tsijukebox") -> Optional[Path]:
+        """`git bundle` do repositório (para git clone/pull sem rede)."""
+        artifact = self.find(KIND_GIT_REPO, name)
+        return self.fetch(artifact) if artifact else None
+
+    def image_archive(self, image: str) -> Optional[Path]:
+        """Tarball de uma imagem Docker (para docker load -i)."""
+        artifact = self.find(KIND_IMAGE, image)
+        return self.fetch(artifact) if artifact else None
+
+    def verify(self) -> List[str]:
+        """Verifica todos os artefatos; retorna os caminhos com problema."""
+        bad = []
+        for artifact in self.manifest.artifacts:
+            try:
+                self.fetch(artifact)
+            except BundleError:
+                bad.append(artifact.path)
+        return bad
+
+
+def main():
+    """Ponto de entrada para execução standalone."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='TSiJUKEBOX Offline Bundle')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help='Gerar ou ampliar um bundle')
+    build.add_argument('-o', '--output', required=True, help='Diretório do bundle')
+    build.add_argument('--version', required=True, help='Versão do bundle')
+    build.add_argument('--packages', nargs='*', default=[], help='Pacotes pacman')
+    build.add_argument('--aur-files', nargs='*', default=[], help='Pacotes AUR já compilados')
+    build.add_argument('--url', action='append', default=[],
+                       help='Arquivo avulso: URL ou URL#sha256')
+    build.add_argument('--image', action='append', default=[], help='Imagem Docker')
+    build.add_argument('--npm-project', help='Projeto cujo cache npm será incluído')
+    build.add_argument('--git-repo', help='Repositório da aplicação (URL ou caminho) para git bundle')
+    build.add_argument('--dry-run', action='store_true', help='Simular')
+
+    for name, help_text in (('verify', 'Verificar checksums'), ('list', 'Listar artefatos')):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument('source', help='Diretório ou URL do espelho')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        builder = BundleBuilder(Path(args.output), args.version, dry_run=args.dry_run)
+        ok = builder.add_pacman_packages(args.packages)
+        ok = builder.add_package_files([Path(p) for p in args.aur_files]) and ok
+        for spec in args.url:
+            url, _, digest = spec.partition('#')
+            ok = builder.add_url(url, sha256=digest or None) and ok
+        for image in args.image:
+            ok = builder.add_docker_image(image) and ok
+        if args.npm_project:
+            ok = builder.add_npm_cache(Path(args.npm_project)) and ok
+        if args.git_repo:
+            ok = builder.add_git_repo(args.git_repo) and ok
+        if not args.dry_run:
+            builder.write_manifest()
+        exit(0 if ok else 1)
+
+    bundle = OfflineBundle(args.source)
+    if args.command == 'list':
+        print(f"Bundle {bundle.version} ({bundle.manifest.arch}, {bundle.manifest.created_at})")
+        for a in bundle.manifest.artifacts:
+            print(f"  {a.kind:12} {a.name:50} {a.size / 1024:10.0f} KB")
+        exit(0)
+
+    bad = bundle.verify()
+    for path in bad:
+        print(f"{Colors.RED}✗{Colors.RESET} {path}")
+    if not bad:
+        print(f"{Colors.GREEN}✓{Colors.RESET} {len(bundle.manifest.artifacts)} artefatos íntegros")
+    exit(1 if bad else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,16 @@ TSiJUKEBOX Installer - Openbox Window Manager Setup
 Configura Openbox para modo kiosk sem decorações de janela.
 """
 
+import grp
 import os
+import pwd
 import subprocess
 from pathlib import Path
 from dataclasses import dataclass
 from typing import Optional, List
 
 from .config import Colors, config
+from .file_plan import FilePlan
 
 
 @dataclass
@@ -31,6 +34,8 @@ class OpenboxSetup:
         self.analytics = analytics
         self.user_home = Path(f'/home/{self.config.user}')
         self.openbox_dir = self.user_home / '.config' / 'openbox'
+        # Arquivos gerados com dono e modo finais; regravados só se mudarem
+        self.files = FilePlan()
     
     def _log(self, message: str, color: str = Colors.WHITE):
         """Log colorido"""
@@ -45,12 +50,24 @@ class OpenboxSetup:
             self._log(f"Erro ao executar {' '.join(cmd)}: {e.stderr}", Colors.RED)
             raise
     
+    def _owner(self) -> dict:
+        """
+        Dono dos arquivos gerados no home do usuário. Sem o usuário (ou
+        grupo) no sistema os arquivos ficam com o dono atual, como antes
+        do FilePlan; fix_permissions tenta o chown de novo no fim.
+        """
+        try:
+            pwd.getpwnam(self.config.user)
+            grp.getgrnam(self.config.user)
+        except KeyError:
+            self._log(f"⚠️  Usuário {self.config.user} não existe; arquivos mantêm o dono atual", Colors.YELLOW)
+            return {}
+        return {'owner': self.config.user, 'group': self.config.user}
+    
     def create_rc_xml(self) -> bool:
         """Cria arquivo rc.xml (configuração principal do Openbox)"""
         self._log("📝 Criando rc.xml...", Colors.CYAN)
         
-        self.openbox_dir.mkdir(parents=True, exist_ok=True)
-        
         rc_xml_content = """<?xml version="1.0" encoding="UTF-8"?>
 <openbox_config xmlns="http://openbox.org/3.4/rc"
                 xmlns:xi="http://www.w3.org/2001/XInclude">
@@ -261,7 +278,7 @@ class OpenboxSetup:
 """
         
         rc_xml_path = self.openbox_dir / 'rc.xml'
-        rc_xml_path.write_text(rc_xml_content)
+        self.files.write(rc_xml_path, rc_xml_content, **self._owner())
         
         self._log(f"✅ rc.xml criado em {rc_xml_path}", Colors.GREEN)
         return True
@@ -340,7 +357,7 @@ class OpenboxSetup:
 """
         
         menu_xml_path = self.openbox_dir / 'menu.xml'
-        menu_xml_path.write_text(menu_xml_content)
+        self.files.write(menu_xml_path, menu_xml_content, **self._owner())
         
         self._log(f"✅ menu.xml criado em {menu_xml_path}", Colors.GREEN)
         return True
@@ -404,8 +421,7 @@ echo "[$(date)] TSiJUKEBOX Openbox autostart concluído" >> /var/log/jukebox/aut
 """
         
         autostart_path = self.openbox_dir / 'autostart'
-        autostart_path.write_text(autostart_content)
-        os.chmod(autostart_path, 0o755)
+        self.files.write(autostart_path, autostart_content, mode=0o755, **self._owner())
         
         self._log(f"✅ autostart criado em {autostart_path}", Colors.GREEN)
         return True
@@ -7,7 +7,7 @@
 import subprocess
 import shutil
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Set, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -156,14 +156,15 @@ class PackageManagerHandler:
             Dict mapping package names to installation success
         """
         results = {}
+        installed = self.get_installed_set()
         
         # Separate already installed
         to_install = []
         for pkg in packages:
-            if self.is_installed(pkg):
+            if pkg in installed:
                 self.logger.info(f"Package already installed: {pkg}")
                 results[pkg] = True
-            else:
+            elif pkg not in to_install:
                 to_install.append(pkg)
         
         if not to_install:
@@ -173,9 +174,9 @@ class PackageManagerHandler:
         
         # Choose package manager
         if aur and self.aur_helper:
-            cmd = [self.aur_helper, "-S"]
+            cmd = [self.aur_helper, "-S", "--needed"]
         else:
-            cmd = ["pacman", "-S"]
+            cmd = ["pacman", "-S", "--needed"]
         
         if not confirm:
             cmd.append("--noconfirm")
@@ -191,8 +192,9 @@ class PackageManagerHandler:
         else:
             self.logger.error(f"Installation failed: {err}")
             # Check which packages failed
+            installed = self.get_installed_set()
             for pkg in to_install:
-                results[pkg] = self.is_installed(pkg)
+                results[pkg] = pkg in installed
         
         return results
     
@@ -217,7 +219,8 @@ class PackageManagerHandler:
         """
         results = {}
         
-        to_remove = [pkg for pkg in packages if self.is_installed(pkg)]
+        installed = self.get_installed_set()
+        to_remove = [pkg for pkg in packages if pkg in installed]
         
         if not to_remove:
             self.logger.info("No packages to remove")
@@ -240,8 +243,9 @@ class PackageManagerHandler:
                 self.logger.success(f"Removed: {pkg}")
         else:
             self.logger.error(f"Removal failed: {err}")
+            installed = self.get_installed_set()
             for pkg in to_remove:
-                results[pkg] = not self.is_installed(pkg)
+                results[pkg] = pkg not in installed
         
         return results
     
@@ -304,6 +308,10 @@ class PackageManagerHandler:
             return out.strip().split("\n")
         return []
     
+    def get_installed_set(self) -> Set[str]:
+        """Installed package names from a single `pacman -Qq` call."""
+        return {pkg for pkg in self.get_installed_packages() if pkg}
+    
     def get_orphan_packages(self) -> List[str]:
         """Get packages no longer required as dependencies."""
         code, out, _ = self._run_command(
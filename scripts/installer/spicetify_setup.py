@@ -10,11 +10,13 @@ import shutil
 import json
 import time
 import random
+import tempfile
 from pathlib import Path
 from typing import Optional, Dict, Any, List, Callable, TypeVar
 from dataclasses import dataclass, field
 
 from .config import Config
+from .utils.downloader import Downloader, DownloadError
 from .utils.logger import Logger
 
 # Type variable for generic retry function
@@ -679,13 +681,8 @@ class SpicetifySetup:
         
         self.logger.info("Installing Spicetify...")
         
-        # Install via curl (official method)
-        install_cmd = "curl -fsSL https://raw.githubusercontent.com/spicetify/cli/main/install.sh | sh"
-        
-        code, out, err = self._run_command(
-            ["bash", "-c", install_cmd],
-            capture=True
-        )
+        # Official install script, fetched completely before it runs
+        code, out, err = self._run_install_script(self.config.SPICETIFY_INSTALL_URL)
         
         if code == 0:
             self.logger.success("Spicetify installed successfully")
@@ -708,6 +705,21 @@ class SpicetifySetup:
                 return code == 0
             return False
     
+    def _run_install_script(self, url: str) -> tuple[int, str, str]:
+        """
+        Download an install script and run it with sh.
+        
+        Unlike `curl | sh`, a dropped connection can never execute a
+        truncated script.
+        """
+        with tempfile.TemporaryDirectory(prefix="spicetify-") as tmp:
+            script = Path(tmp) / "install.sh"
+            try:
+                Downloader(logger=self.logger).download(url, script)
+            except (DownloadError, OSError) as e:
+                return 1, "", str(e)
+            return self._run_command(["sh", str(script)], capture=True)
+    
     def _detect_aur_helper(self) -> str:
         """Detect available AUR helper (paru preferred)."""
         import shutil
@@ -776,11 +788,8 @@ class SpicetifySetup:
         self.logger.info("Installing Spicetify Marketplace...")
         
         # Official marketplace installation
-        install_cmd = "curl -fsSL https://raw.githubusercontent.com/spicetify/marketplace/main/resources/install.sh | sh"
-        
-        code, _, err = self._run_command(
-            ["bash", "-c", install_cmd],
-            capture=True
+        code, _, err = self._run_install_script(
+            "https://raw.githubusercontent.com/spicetify/marketplace/main/resources/install.sh"
         )
         
         if code == 0:
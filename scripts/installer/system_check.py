@@ -5,16 +5,15 @@ Gera log com sugestão de banco de dados baseado no hardware detectado.
 """
 
 import os
-import platform
 import subprocess
 import json
-import re
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
 from .config import Config, Colors
+from .system_probe import probe_system
 
 
 @dataclass
@@ -82,141 +81,26 @@ class SystemChecker:
         shell_name = Path(shell_path).name
         return shell_name if shell_name in Config.SUPPORTED_SHELLS else 'bash'
     
-    def detect_hardware(self) -> HardwareInfo:
-        """Detecta informações de hardware"""
-        hw = HardwareInfo()
+    def detect_hardware(self, refresh: bool = False) -> HardwareInfo:
+        """Detecta informações de hardware (sonda compartilhada, em cache)"""
+        probe = probe_system(refresh=refresh)
         
-        # CPU
-        try:
-            with open('/proc/cpuinfo', 'r') as f:
-                cpuinfo = f.read()
-            
-            model_match = re.search(r'model name\s*:\s*(.+)', cpuinfo)
-            if model_match:
-                hw.cpu_model = model_match.group(1).strip()
-            
-            hw.cpu_cores = cpuinfo.count('processor')
-            hw.cpu_threads = cpuinfo.count('processor')
-            
-            # Detectar cores físicos vs threads
-            cores_match = re.search(r'cpu cores\s*:\s*(\d+)', cpuinfo)
-            if cores_match:
-                hw.cpu_cores = int(cores_match.group(1))
-        except Exception:
-            pass
-        
-        # Arquitetura
-        hw.cpu_arch = platform.machine()
+        hw = HardwareInfo(
+            cpu_model=probe.cpu_model,
+            cpu_cores=probe.cpu_cores,
+            cpu_threads=probe.cpu_threads,
+            cpu_arch=probe.arch,
+            ram_total_bytes=probe.ram_total_kb * 1024,
+            ram_gb=probe.ram_gb,
+            disk_total_bytes=probe.disk_total_bytes,
+            disk_gb=probe.disk_total_gb,
+            disk_type=probe.disk_type,
+            gpu_model=probe.gpu_model,
+            is_vm=probe.is_virtual_machine,
+        )
         hw.is_arm = hw.cpu_arch.startswith('arm') or hw.cpu_arch.startswith('aarch')
-        
-        # RAM
-        try:
-            with open('/proc/meminfo', 'r') as f:
-                meminfo = f.read()
-            
-            match = re.search(r'MemTotal:\s*(\d+)\s*kB', meminfo)
-            if match:
-                hw.ram_total_bytes = int(match.group(1)) * 1024
-                hw.ram_gb = hw.ram_total_bytes / (1024 ** 3)
-        except Exception:
-            pass
-        
-        # Disco
-        try:
-            statvfs = os.statvfs('/')
-            hw.disk_total_bytes = statvfs.f_frsize * statvfs.f_blocks
-            hw.disk_gb = hw.disk_total_bytes / (1024 ** 3)
-            
-            # Detectar tipo de disco (SSD/HDD/NVMe)
-            hw.disk_type = self._detect_disk_type()
-        except Exception:
-            pass
-        
-        # GPU
-        try:
-            result = subprocess.run(
-                ['lspci', '-v'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            for line in result.stdout.split('\n'):
-                if 'VGA' in line or 'Display' in line or '3D' in line:
-                    hw.gpu_model = line.split(':')[-1].strip()
-                    break
-        except Exception:
-            pass
-        
-        # Verificar se é VM
-        hw.is_vm = self._is_virtual_machine()
-        
         return hw
     
-    def _detect_disk_type(self) -> str:
-        """Detecta se o disco principal é SSD, HDD ou NVMe"""
-        try:
-            # Encontrar dispositivo raiz
-            result = subprocess.run(
-                ['findmnt', '-n', '-o', 'SOURCE', '/'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            root_device = result.stdout.strip()
-            
-            # Remover partição para obter dispositivo base
-            base_device = re.sub(r'p?\d+$', '', root_device)
-            device_name = Path(base_device).name
-            
-            # Verificar rotacional (0 = SSD, 1 = HDD)
-            rotational_path = Path(f'/sys/block/{device_name}/queue/rotational')
-            if rotational_path.exists():
-                is_rotational = rotational_path.read_text().strip() == '1'
-                
-                # Verificar NVMe
-                if 'nvme' in device_name:
-                    return 'nvme'
-                return 'hdd' if is_rotational else 'ssd'
-        except Exception:
-            pass
-        
-        return 'unknown'
-    
-    def _is_virtual_machine(self) -> bool:
-        """Detecta se está rodando em VM"""
-        vm_indicators = [
-            'VMware', 'VirtualBox', 'QEMU', 'Hyper-V', 'Xen', 'KVM'
-        ]
-        
-        try:
-            # Verificar via systemd-detect-virt
-            result = subprocess.run(
-                ['systemd-detect-virt'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0 and result.stdout.strip() != 'none':
-                return True
-        except Exception:
-            pass
-        
-        # Verificar via dmesg
-        try:
-            result = subprocess.run(
-                ['dmesg'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            for indicator in vm_indicators:
-                if indicator.lower() in result.stdout.lower():
-                    return True
-        except Exception:
-            pass
-        
-        return False
-    
     def get_installed_packages(self) -> List[str]:
         """Lista pacotes instalados no sistema"""
         packages = []
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+TSiJUKEBOX - System Probe
+=========================
+Sondagem única de sistema e hardware, compartilhada por instaladores,
+doctor e ferramentas de status.
+
+Lê /proc e /sys diretamente; só o que não tem fonte no kernel
+(`systemd-detect-virt`, nome da GPU via `lspci`) vira subprocesso, e
+esses rodam em paralelo. O resultado fica num snapshot JSON com TTL,
+válido apenas no mesmo boot; memória e disco livres são relidos a cada
+carga, pois custam microssegundos e mudam durante a instalação.
+
+Uso:
+    from system_probe import probe_system
+    probe = probe_system()          # cache de até DEFAULT_TTL segundos
+    probe = probe_system(refresh=True)
+
+    python3 system_probe.py --json
+
+Autor: B0.y_Z4kr14
+Licença: Domínio Público
+"""
+
+import json
+import os
+import platform
+import re
+import shutil
+import socket
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+SNAPSHOT_FILE = Path("/var/cache/tsijukebox/system-probe.json")
+USER_SNAPSHOT_FILE = Path.home() / ".cache" / "tsijukebox" / "system-probe.json"
+DEFAULT_TTL = 300
+COMMAND_TIMEOUT = 5
+
+PCI_DISPLAY_CLASS = "0x03"
+GPU_VENDORS = {
+    "0x10de": "nvidia",
+    "0x1002": "amd",
+    "0x8086": "intel",
+    "0x15ad": "vmware",
+    "0x1af4": "virtio",
+    "0x1234": "qemu",
+    "0x80ee": "virtualbox",
+}
+VM_STRINGS = ("vmware", "virtualbox", "kvm", "qemu", "xen", "hyper-v", "bochs", "parallels")
+
+
+@dataclass
+class SystemProbe:
+    """Snapshot do sistema (campos em unidades brutas: kB e bytes)."""
+    timestamp: float = 0.0
+    boot_id: str = ""
+    hostname: str = ""
+    os_release: Dict[str, str] = field(default_factory=dict)
+    kernel: str = ""
+    arch: str = ""
+    cpu_model: str = ""
+    cpu_cores: int = 1
+    cpu_threads: int = 1
+    ram_total_kb: int = 0
+    ram_available_kb: int = 0
+    disk_total_bytes: int = 0
+    disk_free_bytes: int = 0
+    root_device: str = ""
+    disk_type: str = "unknown"  # ssd, hdd, nvme
+    gpu_vendor: str = ""
+    gpu_model: str = ""
+    virtualization: str = ""  # vazio = bare metal
+    device_model: str = ""
+    is_raspberry_pi: bool = False
+    audio_cards: int = 0
+    has_display: bool = False
+
+    @property
+    def ram_gb(self) -> float:
+        return self.ram_total_kb / 1024 / 1024
+
+    @property
+    def ram_available_gb(self) -> float:
+        return self.ram_available_kb / 1024 / 1024
+
+    @property
+    def disk_total_gb(self) -> float:
+        return self.disk_total_bytes / 1024 ** 3
+
+    @property
+    def disk_free_gb(self) -> float:
+        return self.disk_free_bytes / 1024 ** 3
+
+    @property
+    def is_virtual_machine(self) -> bool:
+        return bool(self.virtualization)
+
+    @property
+    def distro_id(self) -> str:
+        return self.os_release.get("ID", "unknown").lower()
+
+    @property
+    def distro_name(self) -> str:
+        return self.os_release.get("PRETTY_NAME") or self.os_release.get("NAME", "Unknown")
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SystemProbe':
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+
+# =============================================================================
+# LEITURAS DE /proc E /sys
+# =============================================================================
+
+def _read(path: str, default: str = "") -> str:
+    try:
+        with open(path, errors="replace") as f:
+            return f.read()
+    except OSError:
+        return default
+
+
+def read_os_release(path: str = "/etc/os-release") -> Dict[str, str]:
+    """Pares chave=valor do os-release, sem aspas."""
+    result = {}
+    for line in _read(path).splitlines():
+        if "=" in line and not line.startswith("#"):
+            key, value = line.split("=", 1)
+            result[key.strip()] = value.strip().strip('"\'')
+    return result
+
+
+def parse_cpuinfo(content: str) -> Tuple[str, int, int]:
+    """Modelo, cores físicos e threads a partir de /proc/cpuinfo."""
+    model = ""
+    threads = 0
+    physical = set()
+    physical_id = core_id = None
+    cores_field = 0
+    for line in content.splitlines() + [""]:
+        key, _, value = line.partition(":")
+        key, value = key.strip(), value.strip()
+        if key == "processor":
+            threads += 1
+        elif key in ("model name", "Model", "Hardware") and not model:
+            model = value
+        elif key == "physical id":
+            physical_id = value
+        elif key == "core id":
+            core_id = value
+        elif key == "cpu cores" and value.isdigit():
+            cores_field = int(value)
+        elif not line.strip():
+            if core_id is not None:
+                physical.add((physical_id, core_id))
+            physical_id = core_id = None
+    threads = threads or os.cpu_count() or 1
+    cores = len(physical) or cores_field or threads
+    return model, cores, threads
+
+
+def read_meminfo() -> Tuple[int, int]:
+    """MemTotal e MemAvailable em kB."""
+    total = available = 0
+    for line in _read("/proc/meminfo").splitlines():
+        if line.startswith("MemTotal:"):
+            total = int(line.split()[1])
+        elif line.startswith("MemAvailable:"):
+            available = int(line.split()[1])
+    return total, available
+
+
+def read_disk(path: str = "/") -> Tuple[int, int]:
+    """Total e livre (para usuário comum) em bytes."""
+    try:
+        stat = os.statvfs(path)
+        return stat.f_blocks * stat.f_frsize, stat.f_bavail * stat.f_frsize
+    except OSError:
+        return 0, 0
+
+
+def root_block_device() -> str:
+    """Dispositivo de bloco base da raiz (ex.: nvme0n1, sda), via mountinfo."""
+    for line in _read("/proc/self/mountinfo").splitlines():
+        parts = line.split()
+        if len(parts) > 4 and parts[4] == "/":
+            sys_path = Path(f"/sys/dev/block/{parts[2]}")
+            try:
+                resolved = sys_path.resolve(strict=True)
+            except OSError:
+                return ""
+            # Partição: o diretório pai é o disco
+            if (resolved / "partition").exists():
+                resolved = resolved.parent
+            return resolved.name
+    return ""
+
+
+def disk_type(device: str) -> str:
+    if not device:
+        return "unknown"
+    if device.startswith("nvme"):
+        return "nvme"
+    rotational = _read(f"/sys/block/{device}/queue/rotational").strip()
+    if rotational == "1":
+        return "hdd"
+    if rotational == "0":
+        return "ssd"
+    return "unknown"
+
+
+def pci_display_devices() -> List[Tuple[str, str]]:
+    """(slot, vendor id) dos controladores de vídeo no barramento PCI."""
+    devices = []
+    root = Path("/sys/bus/pci/devices")
+    try:
+        entries = sorted(root.iterdir())
+    except OSError:
+        return devices
+    for entry in entries:
+        if _read(str(entry / "class")).startswith(PCI_DISPLAY_CLASS):
+            devices.append((entry.name, _read(str(entry / "vendor")).strip()))
+    return devices
+
+
+def dmi_virtualization() -> str:
+    """Hypervisor indicado por DMI, /sys/hypervisor ou flag da CPU."""
+    hypervisor = _read("/sys/hypervisor/type").strip()
+    if hypervisor:
+        return hypervisor
+    for name in ("product_name", "sys_vendor", "board_vendor"):
+        content = _read(f"/sys/class/dmi/id/{name}").lower()
+        for vm in VM_STRINGS:
+            if vm in content:
+                return vm
+    return ""
+
+
+def audio_card_count() -> int:
+    return len(re.findall(r"^\s*\d+\s+\[", _read("/proc/asound/cards"), re.MULTILINE))
+
+
+def has_display() -> bool:
+    if os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY") or Path("/dev/fb0").exists():
+        return True
+    try:
+        return any(_read(str(p)).strip() == "connected" for p in Path("/sys/class/drm").glob("*/status"))
+    except OSError:
+        return False
+
+
+# =============================================================================
+# COMANDOS (EM PARALELO)
+# =============================================================================
+
+def _command(cmd: List[str]) -> str:
+    if not shutil.which(cmd[0]):
+        return ""
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=COMMAND_TIMEOUT)
+        return result.stdout.strip() if result.returncode == 0 else ""
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def _detect_virt() -> str:
+    out = _command(["systemd-detect-virt"])
+    return "" if out in ("", "none") else out
+
+
+def _gpu_name(slot: str) -> str:
+    # lspci -mm: "slot" "classe" "fabricante" "dispositivo" ...
+    out = _command(["lspci", "-mm", "-s", slot])
+    fields_ = re.findall(r'"([^"]*)"', out)
+    return " ".join(fields_[1:3]) if len(fields_) >= 3 else ""
+
+
+# =============================================================================
+# SONDA E CACHE
+# =============================================================================
+
+def run_probe() -> SystemProbe:
+    """Executa a sondagem completa (sem cache)."""
+    gpus = pci_display_devices()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        virt_future = pool.submit(_detect_virt)
+        gpu_future = pool.submit(_gpu_name, gpus[0][0]) if gpus else None
+
+        cpuinfo = _read("/proc/cpuinfo")
+        cpu_model, cpu_cores, cpu_threads = parse_cpuinfo(cpuinfo)
+        ram_total, ram_available = read_meminfo()
+        disk_total, disk_free = read_disk()
+        device = root_block_device()
+        device_model = _read("/proc/device-tree/model").strip("\x00\n ")
+        lowered = (device_model + cpuinfo).lower()
+
+        probe = SystemProbe(
+            timestamp=time.time(),
+            boot_id=_read("/proc/sys/kernel/random/boot_id").strip(),
+            hostname=socket.gethostname(),
+            os_release=read_os_release(),
+            kernel=platform.release(),
+            arch=platform.machine(),
+            cpu_model=cpu_model,
+            cpu_cores=cpu_cores,
+            cpu_threads=cpu_threads,
+            ram_total_kb=ram_total,
+            ram_available_kb=ram_available,
+            disk_total_bytes=disk_total,
+            disk_free_bytes=disk_free,
+            root_device=device,
+            disk_type=disk_type(device),
+            gpu_vendor=GPU_VENDORS.get(gpus[0][1], "") if gpus else "",
+            device_model=device_model,
+            is_raspberry_pi="raspberry" in lowered or "bcm2" in lowered,
+            audio_cards=audio_card_count(),
+            has_display=has_display(),
+        )
+
+        probe.virtualization = virt_future.result() or dmi_virtualization()
+        if gpu_future:
+            probe.gpu_model = gpu_future.result()
+    return probe
+
+
+def refresh_volatile(probe: SystemProbe) -> SystemProbe:
+    """Relê memória e disco livres (baratos e voláteis)."""
+    probe.ram_total_kb, probe.ram_available_kb = read_meminfo()
+    probe.disk_total_bytes, probe.disk_free_bytes = read_disk()
+    return probe
+
+
+def _snapshot_path() -> Path:
+    return SNAPSHOT_FILE if os.geteuid() == 0 else USER_SNAPSHOT_FILE
+
+
+def load_snapshot(path: Path, ttl: float) -> Optional[SystemProbe]:
+    """Snapshot válido (mesmo boot e dentro do TTL) ou None."""
+    try:
+        probe = SystemProbe.from_dict(json.loads(path.read_text()))
+    except (OSError, ValueError, TypeError):
+        return None
+    if probe.boot_id != _read("/proc/sys/kernel/random/boot_id").strip():
+        return None
+    if not 0 <= time.time() - probe.timestamp < ttl:
+        return None
+    return probe
+
+
+def save_snapshot(probe: SystemProbe, path: Path) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}")
+        tmp.write_text(json.dumps(probe.to_dict(), indent=2))
+        os.replace(tmp, path)
+    except OSError:
+        pass  # cache é só otimização
+
+
+_memory: Optional[SystemProbe] = None
+_memory_lock = threading.Lock()
+
+
+def probe_system(ttl: float = DEFAULT_TTL, refresh: bool = False,
+                 path: Optional[Path] = None) -> SystemProbe:
+    """
+    Sonda do sistema com cache em memória e em disco.
+
+    `refresh=True` ignora o cache; `ttl=0` também.
+    """
+    global _memory
+    path = path or _snapshot_path()
+    with _memory_lock:
+        probe = None
+        if not refresh and ttl > 0:
+            if _memory and time.time() - _memory.timestamp < ttl:
+                probe = _memory
+            else:
+                probe = load_snapshot(path, ttl)
+        if probe is None:
+            probe = run_probe()
+            save_snapshot(probe, path)
+        else:
+            probe = refresh_volatile(probe)
+        _memory = probe
+        return probe
+
+
+def main():
+    """Ponto de entrada para execução standalone."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='TSiJUKEBOX System Probe')
+    parser.add_argument('--refresh', action='store_true', help='Ignorar o snapshot em cache')
+    parser.add_argument('--ttl', type=float, default=DEFAULT_TTL, help='Validade do snapshot (s)')
+    parser.add_argument('--json', action='store_true', help='Saída JSON')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    probe = probe_system(ttl=args.ttl, refresh=args.refresh)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    if args.json:
+        print(json.dumps(probe.to_dict(), indent=2))
+        return
+    print(f"Host:    {probe.hostname} ({probe.distro_name}, {probe.kernel}, {probe.arch})")
+    print(f"CPU:     {probe.cpu_model} ({probe.cpu_cores} cores, {probe.cpu_threads} threads)")
+    print(f"RAM:     {probe.ram_gb:.1f} GB (disponível: {probe.ram_available_gb:.1f} GB)")
+    print(f"Disco:   {probe.disk_total_gb:.1f} GB (livre: {probe.disk_free_gb:.1f} GB, "
+          f"{probe.root_device or '?'} {probe.disk_type})")
+    print(f"GPU:     {probe.gpu_vendor} {probe.gpu_model}".rstrip())
+    print(f"Virt:    {probe.virtualization or 'nenhuma'}")
+    print(f"Áudio:   {probe.audio_cards} placa(s)   Display: {'sim' if probe.has_display else 'não'}")
+    print(f"Sondagem: {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,12 @@
 """
 TSiJUKEBOX Installer - Utilities Module
 ========================================
-Provides logging, validation, and helper utilities.
+Provides logging, validation, download, command and helper utilities.
 """
 
 from .logger import Logger, LogLevel, setup_logger
+from .downloader import Downloader, DownloadError, DownloadResult
+from .runner import CommandRunner, CommandResult, PrivilegedBatch
 from .validators import (
     SystemValidator,
     ConfigValidator,
@@ -17,6 +19,12 @@ __all__ = [
     'Logger',
     'LogLevel',
     'setup_logger',
+    'Downloader',
+    'DownloadError',
+    'DownloadResult',
+    'CommandRunner',
+    'CommandResult',
+    'PrivilegedBatch',
     'SystemValidator',
     'ConfigValidator',
     'InputValidator',
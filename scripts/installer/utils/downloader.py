@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+TSiJUKEBOX Installer - Download Utilities
+=========================================
+Resumable, segmented downloads with streaming SHA-256 verification.
+
+Features:
+- Parallel HTTP range requests for large files (falls back to a single
+  stream when the server has no range support)
+- Resume from partial files after a dropped connection or a new run
+- SHA-256 computed while the data arrives, no second pass over the file
+- Content-addressed cache: a known digest is never downloaded twice
+  (only downloads verified against an expected digest are cached)
+
+Author: B0.y_Z4kr14
+License: Public Domain (see docs/CREDITS.md)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+DEFAULT_CACHE_DIR = Path("/var/cache/tsijukebox/downloads")
+USER_CACHE_DIR = Path.home() / ".cache" / "tsijukebox" / "downloads"
+CHUNK_SIZE = 256 * 1024
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024
+STATE_SAVE_INTERVAL = 4 * 1024 * 1024
+USER_AGENT = "TSiJUKEBOX-installer"
+
+
+class DownloadError(Exception):
+    """Download failed or the file did not match its expected digest."""
+
+
+class _RangeNotSupported(DownloadError):
+    """Server answered a range request with the whole file."""
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of a download."""
+    path: Path
+    sha256: str
+    size: int
+    from_cache: bool = False
+    resumed_bytes: int = 0
+
+
+@dataclass
+class _Segment:
+    """Byte range [start, end] of the file; `done` bytes already on disk."""
+    start: int
+    end: Optional[int]
+    done: int = 0
+
+    @property
+    def offset(self) -> int:
+        return self.start + self.done
+
+    @property
+    def complete(self) -> bool:
+        return self.end is not None and self.offset > self.end
+
+
+@dataclass
+class _PartialState:
+    """Sidecar of a .part file, used to resume it."""
+    url: str
+    size: Optional[int]
+    ranges: bool = False
+    etag: str = ""
+    segments: List[_Segment] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['_PartialState']:
+        try:
+            data = json.loads(path.read_text())
+            segments = [_Segment(**s) for s in data.pop("segments")]
+            return cls(segments=segments, **data)
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+
+    def save(self, path: Path) -> None:
+        data = {
+            "url": self.url,
+            "size": self.size,
+            "ranges": self.ranges,
+            "etag": self.etag,
+            "segments": [vars(s) for s in self.segments],
+        }
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, path)
+
+
+class _StreamingHasher:
+    """
+    SHA-256 over data written out of order.
+
+    Bytes at the current offset are hashed immediately; ranges written
+    further ahead by other segments are read back from the file once the
+    offset reaches them (usually still in the page cache).
+    """
+
+    def __init__(self, fd: int):
+        self.fd = fd
+        self.digest = hashlib.sha256()
+        self.offset = 0
+        self.pending: Dict[int, int] = {}
+        self.lock = threading.Lock()
+
+    def feed(self, start: int, data: bytes) -> None:
+        with self.lock:
+            if start == self.offset:
+                self.digest.update(data)
+                self.offset += len(data)
+            elif start > self.offset:
+                self.pending[start] = start + len(data)
+            self._drain()
+
+    def mark_written(self, start: int, end: int) -> None:
+        """Register bytes already on disk (resumed from a previous run)."""
+        if end > start:
+            with self.lock:
+                self.pending[start] = end
+                self._drain()
+
+    def reset(self) -> None:
+        """Start over (single stream restarted from byte zero)."""
+        with self.lock:
+            self.digest = hashlib.sha256()
+            self.offset = 0
+            self.pending.clear()
+
+    def _drain(self) -> None:
+        while self.offset in self.pending:
+            end = self.pending.pop(self.offset)
+            while self.offset < end:
+                data = os.pread(self.fd, min(CHUNK_SIZE, end - self.offset), self.offset)
+                if not data:
+                    return
+                self.digest.update(data)
+                self.offset += len(data)
+
+    def hexdigest(self) -> str:
+        return self.digest.hexdigest()
+
+
+class Downloader:
+    """
+    Shared download helper for installer assets.
+
+    Example:
+        downloader = Downloader(logger=logger)
+        result = downloader.download(url, Path("/tmp/model.zip"), sha256=digest)
+
+    The destination is hard-linked to the cache entry when possible, so
+    callers should replace it rather than edit it in place.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        segments: int = 4,
+        min_segment_size: int = MIN_SEGMENT_SIZE,
+        retries: int = 3,
+        timeout: int = 30,
+        logger: Any = None,
+    ):
+        if cache_dir is None:
+            cache_dir = DEFAULT_CACHE_DIR if os.geteuid() == 0 else USER_CACHE_DIR
+        self.cache_dir = Path(cache_dir)
+        self.segments = max(1, segments)
+        self.min_segment_size = min_segment_size
+        self.retries = retries
+        self.timeout = timeout
+        self.logger = logger
+        self._url_locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def _debug(self, message: str) -> None:
+        if self.logger:
+            self.logger.debug(message)
+
+    # -------------------------------------------------------------------------
+    # Cache
+    # -------------------------------------------------------------------------
+
+    def cached_path(self, sha256: str) -> Path:
+        """Location of a file with the given digest in the cache."""
+        return self.cache_dir / sha256[:2] / sha256
+
+    def _partial_paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha256(url.encode()).hexdigest()[:32]
+        base = self.cache_dir / "partial" / key
+        return base.with_suffix(".part"), base.with_suffix(".json")
+
+    @staticmethod
+    def _place(source: Path, dest: Path) -> None:
+        """Hard-link (or copy) a cached file to its destination."""
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(dest.name + ".tmp")
+        tmp.unlink(missing_ok=True)
+        try:
+            os.link(source, tmp)
+        except OSError:
+            shutil.copyfile(source, tmp)
+        os.replace(tmp, dest)
+
+    # -------------------------------------------------------------------------
+    # HTTP
+    # -------------------------------------------------------------------------
+
+    def _open(self, url: str, start: int = 0, end: Optional[int] = None, method: str = "GET"):
+        headers = {"User-Agent": USER_AGENT}
+        if start or end is not None:
+            headers["Range"] = f"bytes={start}-{'' if end is None else end}"
+        request = urllib.request.Request(url, headers=headers, method=method)
+        return urllib.request.urlopen(request, timeout=self.timeout)
+
+    def _probe(self, url: str) -> Tuple[Optional[int], bool, str]:
+        """Size, range support and ETag of the remote file."""
+        try:
+            with self._open(url, method="HEAD") as response:
+                length = response.headers.get("Content-Length")
+                ranges = response.headers.get("Accept-Ranges", "").lower() == "bytes"
+                return (int(length) if length else None), ranges, response.headers.get("ETag", "")
+        except (urllib.error.URLError, OSError, ValueError):
+            # Some servers reject HEAD; the GET path still works without ranges
+            return None, False, ""
+
+    def _fetch_segment(self, url: str, fd: int, segment: _Segment, hasher: _StreamingHasher,
+                       state: _PartialState, state_file: Path, lock: threading.Lock) -> None:
+        """Download one segment, retrying from where it stopped."""
+        for attempt in range(self.retries + 1):
+            try:
+                self._stream_segment(url, fd, segment, hasher, state, state_file, lock)
+                return
+            except _RangeNotSupported:
+                raise
+            except (urllib.error.URLError, OSError, DownloadError) as e:
+                with lock:
+                    state.save(state_file)
+                if attempt == self.retries:
+                    raise DownloadError(f"{url}: {e}") from e
+                if not state.ranges:
+                    # No way to ask for the rest: restart the stream
+                    segment.done = 0
+                    hasher.reset()
+                self._debug(f"Retrying {url} at byte {segment.offset} ({e})")
+                time.sleep(min(2 ** attempt, 10))
+
+    def _stream_segment(self, url: str, fd: int, segment: _Segment, hasher: _StreamingHasher,
+                        state: _PartialState, state_file: Path, lock: threading.Lock) -> None:
+        whole_file = segment.offset == 0 and (segment.end is None or segment.end == state.size - 1)
+        start, end = (0, None) if whole_file else (segment.offset, segment.end)
+        with self._open(url, start, end) as response:
+            if not whole_file and response.status != 206:
+                raise _RangeNotSupported(f"{url}: server ignored the range request")
+            unsaved = 0
+            while not segment.complete:
+                want = CHUNK_SIZE if segment.end is None else min(CHUNK_SIZE, segment.end + 1 - segment.offset)
+                data = response.read(want)
+                if not data:
+                    break
+                position = segment.offset
+                os.pwrite(fd, data, position)
+                hasher.feed(position, data)
+                segment.done += len(data)
+                unsaved += len(data)
+                if unsaved >= STATE_SAVE_INTERVAL:
+                    with lock:
+                        state.save(state_file)
+                    unsaved = 0
+        if segment.end is not None and not segment.complete:
+            raise DownloadError("connection closed before the end of the segment")
+
+    # -------------------------------------------------------------------------
+    # API
+    # -------------------------------------------------------------------------
+
+    def download(self, url: str, dest: Path, sha256: Optional[str] = None) -> DownloadResult:
+        """
+        Download `url` to `dest`.
+
+        With `sha256` the cache is consulted first and a mismatching file
+        raises DownloadError. The verified file is kept in the cache.
+        Without it the file goes straight to `dest` and is not cached:
+        nothing vouches for its content on a later run.
+        """
+        dest = Path(dest)
+        expected = sha256.lower() if sha256 else None
+
+        # One transfer per URL: concurrent callers share the .part file
+        with self._guard:
+            url_lock = self._url_locks.setdefault(url, threading.Lock())
+        with url_lock:
+            if expected:
+                cached = self.cached_path(expected)
+                if cached.exists():
+                    self._place(cached, dest)
+                    self._debug(f"Cache hit for {dest.name}")
+                    return DownloadResult(dest, expected, cached.stat().st_size, from_cache=True)
+            return self._download(url, dest, expected)
+
+    def _download(self, url: str, dest: Path, expected: Optional[str]) -> DownloadResult:
+        part_file, state_file = self._partial_paths(url)
+        part_file.parent.mkdir(parents=True, exist_ok=True)
+
+        size, ranges, etag = self._probe(url)
+        state = _PartialState.load(state_file)
+        resumable = (state is not None and part_file.exists() and ranges
+                     and state.url == url and state.size == size and state.etag == etag
+                     and size is not None)
+        if not resumable:
+            state = _PartialState(url, size, ranges, etag, self._plan(size, ranges))
+            part_file.unlink(missing_ok=True)
+        try:
+            return self._download_part(url, dest, expected, state, part_file, state_file, resumable)
+        except _RangeNotSupported:
+            self._debug(f"{url}: no range support, downloading as a single stream")
+            state = _PartialState(url, size, False, etag, self._plan(size, False))
+            part_file.unlink(missing_ok=True)
+            return self._download_part(url, dest, expected, state, part_file, state_file, False)
+
+    def _download_part(self, url: str, dest: Path, expected: Optional[str], state: _PartialState,
+                       part_file: Path, state_file: Path, resumable: bool) -> DownloadResult:
+        """Fetch the missing segments of `part_file`, verify and cache it."""
+        resumed = sum(s.done for s in state.segments)
+
+        fd = os.open(part_file, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if not resumable and state.size is not None:
+                os.ftruncate(fd, state.size)
+            hasher = _StreamingHasher(fd)
+            for segment in state.segments:
+                hasher.mark_written(segment.start, segment.offset)
+            lock = threading.Lock()
+            pending = [s for s in state.segments if not s.complete]
+            if resumed:
+                self._debug(f"Resuming {dest.name} at {resumed} bytes")
+            if len(pending) > 1:
+                with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+                    futures = [pool.submit(self._fetch_segment, url, fd, s, hasher, state, state_file, lock)
+                               for s in pending]
+                    for future in futures:
+                        future.result()
+            elif pending:
+                self._fetch_segment(url, fd, pending[0], hasher, state, state_file, lock)
+            total = os.fstat(fd).st_size
+            digest = hasher.hexdigest()
+            complete = hasher.offset == total
+        finally:
+            os.close(fd)
+
+        if not complete:
+            # Out-of-order bytes never joined the stream (should not happen)
+            digest = _sha256_file(part_file)
+
+        if expected and digest != expected:
+            part_file.unlink(missing_ok=True)
+            state_file.unlink(missing_ok=True)
+            raise DownloadError(f"Checksum mismatch for {url}: expected {expected}, got {digest}")
+
+        state_file.unlink(missing_ok=True)
+        if not expected:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(part_file), str(dest))
+            return DownloadResult(dest, digest, total, resumed_bytes=resumed)
+
+        cached = self.cached_path(digest)
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(part_file, cached)
+        self._place(cached, dest)
+        return DownloadResult(dest, digest, total, resumed_bytes=resumed)
+
+    def download_many(
+        self,
+        items: List[Tuple[str, Path, Optional[str]]],
+        workers: int = 4,
+    ) -> List[DownloadResult]:
+        """Download several (url, dest, sha256) items concurrently."""
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = [pool.submit(self.download, url, dest, digest) for url, dest, digest in items]
+            return [future.result() for future in futures]
+
+    def _plan(self, size: Optional[int], ranges: bool) -> List[_Segment]:
+        """Split the file into segments (one when size or ranges are unknown)."""
+        if not size or not ranges:
+            return [_Segment(0, None if size is None else size - 1)]
+        count = max(1, min(self.segments, size // self.min_segment_size))
+        step = -(-size // count)
+        return [_Segment(start, min(start + step, size) - 1) for start in range(0, size, step)]
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
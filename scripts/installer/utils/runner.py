@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+TSiJUKEBOX Installer - Command Runner
+=====================================
+Shared subprocess runner with streaming output and privileged batching.
+
+Features:
+- Output streamed line by line to a callback or the logger, keeping only
+  a bounded tail in memory when asked to (tar, npm, pacman transactions)
+- Timeouts and cancellation that kill the whole process group
+- Results unpack like the old (returncode, stdout, stderr) tuples
+- PrivilegedBatch: many small idempotent root commands (systemctl,
+  usermod, chmod, chown, mkdir, ln) merged and executed by a single
+  helper process instead of a sudo/fork each
+
+Author: B0.y_Z4kr14
+License: Public Domain (see docs/CREDITS.md)
+"""
+
+import json
+import os
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+
+KILL_GRACE = 3.0
+POLL_INTERVAL = 0.1
+READER_JOIN_TIMEOUT = 5.0
+
+LineCallback = Callable[[str, str], None]  # (stream name, line)
+
+
+@dataclass
+class CommandResult:
+    """Outcome of a command. Unpacks as (returncode, stdout, stderr)."""
+    cmd: List[str]
+    returncode: int
+    stdout: str = ""
+    stderr: str = ""
+    duration: float = 0.0
+    timed_out: bool = False
+    cancelled: bool = False
+    truncated: bool = False  # output longer than the kept tail
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter((self.returncode, self.stdout, self.stderr))
+
+
+class _Stream:
+    """Reads one pipe line by line into an optionally bounded buffer."""
+
+    def __init__(self, name: str, pipe, tail_lines: Optional[int], callback: Optional[LineCallback]):
+        self.name = name
+        self.lines: Deque[str] = deque(maxlen=tail_lines)
+        self.count = 0
+        self._pipe = pipe
+        self._callback = callback
+        self.thread = threading.Thread(target=self._read, daemon=True)
+        self.thread.start()
+
+    def _read(self) -> None:
+        try:
+            for line in iter(self._pipe.readline, ''):
+                line = line.rstrip('\n')
+                self.lines.append(line)
+                self.count += 1
+                if self._callback:
+                    self._callback(self.name, line)
+        except (OSError, ValueError):
+            pass
+        finally:
+            self._pipe.close()
+
+    @property
+    def text(self) -> str:
+        return '\n'.join(self.lines)
+
+    @property
+    def truncated(self) -> bool:
+        return self.count > len(self.lines)
+
+
+class CommandRunner:
+    """
+    Run commands with streaming output.
+
+    Example:
+        runner = CommandRunner(logger=logger)
+        code, out, err = runner.run(["pacman", "-Q"])
+        result = runner.run(["tar", "cf", ...], tail_lines=50, stream=True, timeout=600)
+    """
+
+    def __init__(self, logger: Any = None, dry_run: bool = False):
+        self.logger = logger
+        self.dry_run = dry_run
+
+    def run(
+        self,
+        cmd: List[str],
+        cwd: Optional[Path] = None,
+        env: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        cancel: Optional[threading.Event] = None,
+        on_line: Optional[LineCallback] = None,
+        stream: bool = False,
+        tail_lines: Optional[int] = None,
+        input: Optional[str] = None,
+    ) -> CommandResult:
+        """
+        Run `cmd` and wait for it.
+
+        Args:
+            timeout: seconds before the process group is killed
+            cancel: event that kills the process group when set
+            on_line: called for every output line as it arrives
+            stream: send every line to logger.debug
+            tail_lines: keep only the last N lines of each stream
+            input: text written to stdin
+        """
+        cmd = [str(part) for part in cmd]
+        if self.dry_run:
+            if self.logger:
+                self.logger.info(f"[DRY-RUN] {' '.join(cmd)}")
+            return CommandResult(cmd, 0)
+
+        callback = on_line
+        if stream and self.logger:
+            def log_line(name: str, line: str, _user=on_line):
+                self.logger.debug(line)
+                if _user:
+                    _user(name, line)
+            callback = log_line
+
+        full_env = None
+        if env:
+            full_env = os.environ.copy()
+            full_env.update(env)
+
+        started = time.monotonic()
+        try:
+            proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding='utf-8',
+                errors='replace',
+                cwd=str(cwd) if cwd else None,
+                env=full_env,
+                start_new_session=True,
+            )
+        except FileNotFoundError:
+            return CommandResult(cmd, 127, stderr=f"Command not found: {cmd[0]}")
+        except OSError as e:
+            return CommandResult(cmd, 1, stderr=str(e))
+
+        out = _Stream("stdout", proc.stdout, tail_lines, callback)
+        err = _Stream("stderr", proc.stderr, tail_lines, callback)
+        if input is not None:
+            threading.Thread(target=self._feed, args=(proc, input), daemon=True).start()
+
+        timed_out = cancelled = False
+        deadline = started + timeout if timeout else None
+        while True:
+            try:
+                proc.wait(timeout=POLL_INTERVAL)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+            if cancel is not None and cancel.is_set():
+                cancelled = True
+            elif deadline is not None and time.monotonic() >= deadline:
+                timed_out = True
+            if timed_out or cancelled:
+                self._kill(proc)
+                break
+
+        out.thread.join(READER_JOIN_TIMEOUT)
+        err.thread.join(READER_JOIN_TIMEOUT)
+        stderr = err.text
+        if timed_out:
+            stderr = (stderr + "\n" if stderr else "") + f"Timeout after {timeout}s"
+        elif cancelled:
+            stderr = (stderr + "\n" if stderr else "") + "Cancelled"
+        return CommandResult(
+            cmd=cmd,
+            returncode=proc.returncode if not (timed_out or cancelled) else -signal.SIGKILL,
+            stdout=out.text,
+            stderr=stderr,
+            duration=time.monotonic() - started,
+            timed_out=timed_out,
+            cancelled=cancelled,
+            truncated=out.truncated or err.truncated,
+        )
+
+    @staticmethod
+    def _feed(proc: subprocess.Popen, text: str) -> None:
+        try:
+            proc.stdin.write(text)
+            proc.stdin.close()
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def _kill(proc: subprocess.Popen) -> None:
+        """SIGTERM the process group, SIGKILL it after a grace period."""
+        for sig, grace in ((signal.SIGTERM, KILL_GRACE), (signal.SIGKILL, None)):
+            try:
+                os.killpg(proc.pid, sig)
+            except (ProcessLookupError, PermissionError):
+                return
+            try:
+                proc.wait(timeout=grace)
+                return
+            except subprocess.TimeoutExpired:
+                continue
+
+
+# =============================================================================
+# PRIVILEGED BATCH
+# =============================================================================
+
+@dataclass
+class BatchResult:
+    """Outcome of one (possibly merged) command of a batch."""
+    cmd: List[str]
+    returncode: int
+    output: str = ""
+
+
+_OCTAL_MODE = re.compile(r'^[0-7]{3,4}$')
+
+
+def _systemctl_parts(cmd: List[str]) -> Optional[Tuple[Tuple[str, ...], List[str]]]:
+    """
+    (flags + verb, units) for `systemctl [flags] verb [flags] units...`
+    commands that can merge. Flags after the verb are part of the key:
+    `enable --now a` must not absorb a plain `enable b`.
+    """
+    if not cmd or cmd[0] != "systemctl":
+        return None
+    args = cmd[1:]
+    index = next((i for i, arg in enumerate(args) if not arg.startswith('-')), None)
+    if index is None:
+        return None
+    verb = args[index]
+    if verb not in ("enable", "disable", "start", "stop", "restart", "mask", "unmask"):
+        return None
+    rest = args[index + 1:]
+    units = [arg for arg in rest if not arg.startswith('-')]
+    if not units:
+        return None
+    return tuple(args[:index + 1]) + tuple(arg for arg in rest if arg.startswith('-')), units
+
+
+def _usermod_key(cmd: List[str]) -> Optional[str]:
+    """User of `usermod -aG groups user` commands."""
+    if len(cmd) == 4 and cmd[0] == "usermod" and cmd[1] == "-aG":
+        return cmd[3]
+    return None
+
+
+def coalesce(commands: List[List[str]]) -> List[List[str]]:
+    """
+    Merge adjacent compatible commands, keeping the overall order.
+
+    `systemctl enable a`, `systemctl enable b` → `systemctl enable a b`;
+    `usermod -aG audio u`, `usermod -aG video u` → `usermod -aG audio,video u`.
+    Only neighbours merge, so a daemon-reload between them still runs first.
+    """
+    merged: List[List[str]] = []
+    for cmd in commands:
+        previous = merged[-1] if merged else None
+        parts = _systemctl_parts(cmd)
+        previous_parts = _systemctl_parts(previous) if parts and previous else None
+        if previous_parts and previous_parts[0] == parts[0]:
+            key, units = previous_parts
+            units += [u for u in parts[1] if u not in units]
+            merged[-1] = ["systemctl", *key, *units]
+            continue
+        user = _usermod_key(cmd)
+        if user and previous and _usermod_key(previous) == user:
+            groups = previous[2].split(',')
+            groups += [g for g in cmd[2].split(',') if g not in groups]
+            previous[2] = ','.join(groups)
+            continue
+        merged.append(list(cmd))
+    return merged
+
+
+def _native(cmd: List[str]) -> Optional[Callable[[], None]]:
+    """In-process implementation of simple file commands (no fork)."""
+    name, args = cmd[0], cmd[1:]
+    if name == "chmod" and len(args) >= 2 and _OCTAL_MODE.match(args[0]):
+        mode = int(args[0], 8)
+        return lambda: [os.chmod(path, mode) for path in args[1:]]
+    if name == "chown" and len(args) >= 2 and not args[0].startswith('-') and not args[0].endswith(':'):
+        user, _, group = args[0].partition(':')
+        return lambda: [shutil.chown(path, user or None, group or None) for path in args[1:]]
+    if name == "mkdir" and len(args) >= 2 and args[0] == "-p":
+        return lambda: [os.makedirs(path, exist_ok=True) for path in args[1:]]
+    if name == "ln" and len(args) == 3 and args[0] in ("-sf", "-sfn"):
+        def link(source=args[1], target=args[2]):
+            if os.path.lexists(target):
+                os.unlink(target)
+            os.symlink(source, target)
+        return link
+    return None
+
+
+def execute_plan(plan: List[List[str]], runner: Optional[CommandRunner] = None) -> List[BatchResult]:
+    """Run an already coalesced plan in this process (must be privileged)."""
+    runner = runner or CommandRunner()
+    results = []
+    for cmd in plan:
+        action = _native(cmd)
+        if action is not None:
+            try:
+                action()
+                results.append(BatchResult(cmd, 0))
+            except (OSError, LookupError) as e:
+                # shutil.chown raises LookupError for an unknown user or group
+                results.append(BatchResult(cmd, 1, str(e)))
+            continue
+        code, out, err = runner.run(cmd, tail_lines=20)
+        results.append(BatchResult(cmd, code, (err or out).strip()))
+    return results
+
+
+class PrivilegedBatch:
+    """
+    Queue of small idempotent root commands executed together.
+
+    Example:
+        batch = PrivilegedBatch(logger=logger)
+        batch.add(["systemctl", "enable", "bluetooth"])
+        batch.add(["usermod", "-aG", "audio", user])
+        ok = batch.run()
+    """
+
+    def __init__(self, runner: Optional[CommandRunner] = None, logger: Any = None,
+                 sudo: Optional[bool] = None):
+        self.runner = runner or CommandRunner(logger=logger)
+        self.logger = logger or self.runner.logger
+        self.sudo = (os.geteuid() != 0) if sudo is None else sudo
+        self.commands: List[List[str]] = []
+        self.results: List[BatchResult] = []
+
+    def add(self, cmd: List[str]) -> None:
+        if cmd and cmd[0] == "sudo":
+            cmd = cmd[1:]
+        self.commands.append([str(part) for part in cmd])
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+    def plan(self) -> List[List[str]]:
+        return coalesce(self.commands)
+
+    def run(self) -> bool:
+        """Execute the queue; True when every command succeeded."""
+        plan = self.plan()
+        self.commands = []
+        if not plan:
+            self.results = []
+            return True
+        if self.runner.dry_run:
+            for cmd in plan:
+                self.runner.run(cmd)
+            self.results = [BatchResult(cmd, 0) for cmd in plan]
+            return True
+
+        if self.sudo:
+            self.results = self._run_helper(plan)
+        else:
+            self.results = execute_plan(plan, self.runner)
+        for result in self.results:
+            if result.returncode != 0 and self.logger:
+                self.logger.warning(f"{' '.join(result.cmd)}: {result.output}")
+        return all(r.returncode == 0 for r in self.results)
+
+    def _run_helper(self, plan: List[List[str]]) -> List[BatchResult]:
+        """One `sudo python3 runner.py --batch-helper` for the whole plan."""
+        helper = ["sudo", sys.executable, str(Path(__file__).resolve()), "--batch-helper"]
+        code, out, err = self.runner.run(helper, input=json.dumps(plan))
+        try:
+            return [BatchResult(**item) for item in json.loads(out)]
+        except (ValueError, TypeError):
+            return [BatchResult(cmd, code or 1, err.strip()) for cmd in plan]
+
+
+def _batch_helper() -> int:
+    """Entry point of the privileged helper: JSON plan on stdin, results on stdout."""
+    plan = json.load(sys.stdin)
+    results = execute_plan(plan)
+    json.dump([vars(r) for r in results], sys.stdout)
+    return 0
+
+
+if __name__ == "__main__" and sys.argv[1:] == ["--batch-helper"]:
+    sys.exit(_batch_helper())
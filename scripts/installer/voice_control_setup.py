@@ -16,6 +16,16 @@ from typing import Optional, List, Tuple, Dict, Any
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    from .utils.downloader import Downloader, DownloadError
+except ImportError:
+    from utils.downloader import Downloader, DownloadError
+
+try:
+    from .offline_bundle import OfflineBundle
+except ImportError:
+    from offline_bundle import OfflineBundle
+
 
 class VoiceEngine(Enum):
     """Engines de reconhecimento de voz."""
@@ -56,17 +66,20 @@ class VoiceControlSetup:
     """Configura controle por voz para TSiJUKEBOX."""
     
     # Modelos Vosk por idioma
+    # Zips versionados do alphacephei: o SHA-256 é conferido pelo Downloader
+    # e indexa o cache de downloads. Digest None = ainda não fixado (só aviso).
     VOSK_MODELS = {
         'pt-BR': {
-            'small': 'https://alphacephei.com/vosk/models/vosk-model-small-pt-0.3.zip',
-            'large': 'https://alphacephei.com/vosk/models/vosk-model-pt-fb-v0.1.1-20220516_2113.zip',
+            'small': {'url': 'https://alphacephei.com/vosk/models/vosk-model-small-pt-0.3.zip', 'sha256': None},
+            'large': {'url': 'https://alphacephei.com/vosk/models/vosk-model-pt-fb-v0.1.1-20220516_2113.zip',
+                      'sha256': None},
         },
         'en-US': {
-            'small': 'https://alphacephei.com/vosk/models/vosk-model-small-en-us-0.15.zip',
-            'large': 'https://alphacephei.com/vosk/models/vosk-model-en-us-0.22.zip',
+            'small': {'url': 'https://alphacephei.com/vosk/models/vosk-model-small-en-us-0.15.zip', 'sha256': None},
+            'large': {'url': 'https://alphacephei.com/vosk/models/vosk-model-en-us-0.22.zip', 'sha256': None},
         },
         'es': {
-            'small': 'https://alphacephei.com/vosk/models/vosk-model-small-es-0.42.zip',
+            'small': {'url': 'https://alphacephei.com/vosk/models/vosk-model-small-es-0.42.zip', 'sha256': None},
         },
     }
     
@@ -90,12 +103,15 @@ class VoiceControlSetup:
         config: Optional[VoiceControlConfig] = None,
         logger: Any = None,
         user: Optional[str] = None,
-        dry_run: bool = False
+        dry_run: bool = False,
+        bundle: Any = None
     ):
         self.config = config or VoiceControlConfig()
         self.logger = logger
         self.user = user or os.environ.get('SUDO_USER', 'root')
         self.dry_run = dry_run
+        # OfflineBundle opcional: modelos vêm do bundle em vez da internet
+        self.bundle = bundle
         self.home = Path(f"/home/{self.user}") if self.user != 'root' else Path.home()
     
     def _log(self, message: str, level: str = "info"):
@@ -168,12 +184,13 @@ class VoiceControlSetup:
         self._log(f"Baixando modelo Vosk para {self.config.language}...", "info")
         
         lang_models = self.VOSK_MODELS.get(self.config.language, self.VOSK_MODELS['en-US'])
-        model_url = lang_models.get(self.config.model_size, lang_models.get('small'))
+        model = lang_models.get(self.config.model_size, lang_models.get('small'))
         
-        if not model_url:
+        if not model:
             self._log("Modelo não encontrado para idioma/tamanho", "error")
             return False
         
+        model_url, model_sha256 = model['url'], model['sha256']
         model_name = model_url.split('/')[-1].replace('.zip', '')
         model_path = self.config.models_dir / model_name
         
@@ -181,21 +198,31 @@ class VoiceControlSetup:
             self._log("Modelo já existe, pulando download", "info")
             return True
         
-        # Baixar
-        temp_zip = Path(f"/tmp/{model_name}.zip")
-        
-        code, _, err = self._run([
-            'curl', '-fsSL', '-o', str(temp_zip), model_url
-        ])
-        
-        if code != 0:
-            self._log(f"Falha ao baixar modelo: {err}", "error")
-            return False
+        # Bundle offline tem precedência sobre o download
+        bundled_zip = self.bundle.fetch_file(f"{model_name}.zip") if self.bundle else None
+        if bundled_zip:
+            self._log(f"Usando modelo do bundle offline {self.bundle.version}", "info")
+            temp_zip = bundled_zip
+        else:
+            temp_zip = Path(f"/tmp/{model_name}.zip")
+            
+            if self.dry_run:
+                self._log(f"[DRY-RUN] Baixaria {model_url}", "info")
+            else:
+                if not model_sha256:
+                    self._log(f"Sem SHA-256 fixado para {model_name}; download não verificado", "warning")
+                # Segmentos paralelos, retomada após queda, checksum e cache em disco
+                try:
+                    Downloader(logger=self.logger).download(model_url, temp_zip, sha256=model_sha256)
+                except (DownloadError, OSError) as e:
+                    self._log(f"Falha ao baixar modelo: {e}", "error")
+                    return False
         
         # Extrair
         if not self.dry_run:
             self._run(['unzip', '-o', str(temp_zip), '-d', str(self.config.models_dir)])
-            temp_zip.unlink(missing_ok=True)
+            if not bundled_zip:
+                temp_zip.unlink(missing_ok=True)
             
             # Criar symlink para 'current'
             current_link = self.config.models_dir / 'current'
@@ -469,6 +496,8 @@ def main():
                        help='Simular sem executar')
     parser.add_argument('--status', action='store_true',
                        help='Mostrar status')
+    parser.add_argument('--bundle', metavar='DIR_OU_URL',
+                       help='Bundle offline com o modelo (padrão: $TSIJUKEBOX_BUNDLE)')
     
     args = parser.parse_args()
     
@@ -478,7 +507,8 @@ def main():
         model_size=args.model_size,
     )
     
-    setup = VoiceControlSetup(config=config, dry_run=args.dry_run)
+    bundle = OfflineBundle(args.bundle) if args.bundle else OfflineBundle.from_env()
+    setup = VoiceControlSetup(config=config, dry_run=args.dry_run, bundle=bundle)
     
     if args.status:
         import json
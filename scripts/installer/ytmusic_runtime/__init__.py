@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+TSiJUKEBOX - YouTube Music Bridge Runtime
+=========================================
+Módulos usados pelo bridge WebSocket gerado por ytmusic_setup.py.
+São copiados para o diretório de instalação do bridge e dependem
+apenas da biblioteca padrão.
+"""
+
+from .queue_engine import QueueEngine, QueueEntry, NowPlaying
+from .broadcaster import Broadcaster, ClientChannel
+from .api_cache import CachedYTMusic, TTLCache
+from .prefetch import DiskCache, Prefetcher
+
+__all__ = [
+    'QueueEngine',
+    'QueueEntry',
+    'NowPlaying',
+    'Broadcaster',
+    'ClientChannel',
+    'CachedYTMusic',
+    'TTLCache',
+    'DiskCache',
+    'Prefetcher',
+]
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+TSiJUKEBOX - YouTube Music API Cache
+====================================
+Wrapper assíncrono para a ytmusicapi (que é síncrona).
+
+- Chamadas rodam num pool de threads, sem bloquear o loop do bridge.
+- Requisições idênticas em andamento são unidas: vários kiosks pedindo
+  a mesma busca geram uma única chamada ao YouTube.
+- Respostas ficam num cache TTL + LRU em memória, com TTL por método,
+  e opcionalmente num SQLite local para sobreviver a reinícios.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+# TTL em segundos por método. 0 = nunca cacheado (só unido e executado em thread).
+DEFAULT_TTLS: Dict[str, float] = {
+    'search': 600,
+    'get_home': 900,
+    'get_playlist': 300,
+    'get_song': 3600,
+    'get_watch_playlist': 600,
+    'get_lyrics': 86400,
+    'get_library_playlists': 60,
+    'get_library_songs': 60,
+    'get_liked_songs': 60,
+    'rate_song': 0,
+}
+
+# Métodos cujas respostas valem a pena manter em disco
+PERSISTED_METHODS = frozenset({'search', 'get_song', 'get_watch_playlist', 'get_lyrics', 'get_playlist'})
+
+# Escritas que tornam respostas em cache obsoletas
+INVALIDATES: Dict[str, Tuple[str, ...]] = {
+    'rate_song': ('get_liked_songs', 'get_library_songs'),
+}
+
+DEFAULT_MAX_ENTRIES = 512
+
+
+def make_key(method: str, args: Iterable[Any], kwargs: Dict[str, Any]) -> str:
+    """Chave estável para método + argumentos"""
+    return json.dumps([method, list(args), kwargs], sort_keys=True, default=str)
+
+
+class TTLCache:
+    """Cache LRU com expiração por item (uso apenas no loop de eventos)"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._data: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        item = self._data.get(key)
+        if item is None:
+            return False, None
+        expires_at, value = item
+        if expires_at <= self.clock():
+            del self._data[key]
+            return False, None
+        self._data.move_to_end(key)
+        return True, value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._data[key] = (self.clock() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def invalidate(self, prefix: str) -> int:
+        """Remove entradas cuja chave começa com `prefix`"""
+        keys = [k for k in self._data if k.startswith(prefix)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+
+class SQLiteStore:
+    """Segundo nível do cache, em disco. Acesso serializado por lock."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+            self._conn.execute('DELETE FROM cache WHERE expires_at <= ?', (time.time(),))
+            self._conn.commit()
+
+    def get(self, key: str) -> Tuple[bool, Any, float]:
+        """(achou, valor, segundos restantes)"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, expires_at FROM cache WHERE key = ?', (key,)
+            ).fetchone()
+        if not row:
+            return False, None, 0.0
+        remaining = row[1] - time.time()
+        if remaining <= 0:
+            return False, None, 0.0
+        return True, json.loads(row[0]), remaining
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        data = json.dumps(value, default=str)
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, data, time.time() + ttl),
+            )
+            self._conn.commit()
+
+    def invalidate(self, prefix: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedYTMusic:
+    """Cliente assíncrono com cache e união de requisições em andamento"""
+
+    def __init__(
+        self,
+        client: Any,
+        ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        persist_path: Optional[Path] = None,
+        workers: int = 4,
+    ):
+        self.client = client
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.memory = TTLCache(max_entries)
+        self.store = SQLiteStore(persist_path) if persist_path else None
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ytmusic')
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'coalesced': 0}
+
+    def _fetch(self, key: str, method: str, args: tuple, kwargs: dict) -> Tuple[Any, float]:
+        """Executa no pool de threads: disco primeiro, depois a API"""
+        ttl = self.ttls.get(method, 0)
+        persist = self.store is not None and ttl > 0 and method in PERSISTED_METHODS
+
+        if persist:
+            found, value, remaining = self.store.get(key)
+            if found:
+                self.stats['disk_hits'] += 1
+                return value, remaining
+
+        value = getattr(self.client, method)(*args, **kwargs)
+        if persist:
+            self.store.set(key, value, ttl)
+        return value, ttl
+
+    async def call(self, method: str, *args, **kwargs) -> Any:
+        ttl = self.ttls.get(method, 0)
+        key = make_key(method, args, kwargs)
+
+        for target in INVALIDATES.get(method, ()):
+            self.invalidate(target)
+
+        if ttl > 0:
+            found, value = self.memory.get(key)
+            if found:
+                self.stats['hits'] += 1
+                return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats['coalesced'] += 1
+            value, _ = await asyncio.shield(inflight)
+            return value
+
+        self.stats['misses'] += 1
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, self._fetch, key, method, args, kwargs)
+        self._inflight[key] = future
+        try:
+            value, remaining = await asyncio.shield(future)
+        finally:
+            self._inflight.pop(key, None)
+
+        if ttl > 0:
+            self.memory.set(key, value, remaining)
+        return value
+
+    def invalidate(self, method: str) -> None:
+        """Descarta todas as respostas em cache de um método"""
+        prefix = json.dumps([method])[:-1]  # '["metodo"'
+        self.memory.invalidate(prefix)
+        if self.store:
+            self.store.invalidate(prefix)
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False)
+        if self.store:
+            self.store.close()
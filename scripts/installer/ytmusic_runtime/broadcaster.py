@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+TSiJUKEBOX - WebSocket Broadcaster
+==================================
+Fan-out de eventos para os clientes do bridge (tablets, kiosks).
+
+Cada cliente tem sua própria fila de envio limitada e uma task dedicada.
+`publish` serializa a mensagem uma única vez e nunca espera por um
+cliente lento: se a fila de um cliente enche, a mensagem mais antiga é
+descartada e o cliente é marcado como fora de sincronia, recebendo um
+snapshot completo antes dos próximos deltas. Clientes desconectados são
+removidos sem afetar os demais.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PENDING = 64
+DEFAULT_SEND_TIMEOUT = 5.0
+
+
+class ClientChannel:
+    """Fila de envio limitada de um cliente"""
+
+    def __init__(
+        self,
+        websocket,
+        snapshot: Callable[[], Dict[str, Any]],
+        max_pending: int = DEFAULT_MAX_PENDING,
+        send_timeout: float = DEFAULT_SEND_TIMEOUT,
+        on_close: Optional[Callable[['ClientChannel'], None]] = None,
+    ):
+        self.websocket = websocket
+        self.snapshot = snapshot
+        self.send_timeout = send_timeout
+        self.on_close = on_close
+        self.pending: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self.stale = True  # primeiro envio é sempre o snapshot completo
+        self.dropped = 0
+        self.closed = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.ensure_future(self._writer())
+
+    def offer(self, data: str) -> None:
+        """Enfileira sem bloquear; descarta a mais antiga se cheia"""
+        if self.closed:
+            return
+        if self.pending.full():
+            try:
+                self.pending.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            self.dropped += 1
+            # Um delta perdido invalida os seguintes: reenvia o estado completo
+            self.stale = True
+        self.pending.put_nowait(data)
+
+    async def _send(self, data: str) -> None:
+        await asyncio.wait_for(self.websocket.send(data), timeout=self.send_timeout)
+
+    async def _writer(self) -> None:
+        try:
+            while not self.closed:
+                if self.stale:
+                    self.stale = False
+                    # Deltas já enfileirados estão contidos no snapshot
+                    while not self.pending.empty():
+                        self.pending.get_nowait()
+                    await self._send(json.dumps({'type': 'state', **self.snapshot()}))
+                    continue
+
+                data = await self.pending.get()
+                if not self.stale:
+                    await self._send(data)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            # Cliente lento demais ou desconectado: só ele é afetado
+            logger.info(f"Canal encerrado para {getattr(self.websocket, 'remote_address', '?')}: {e}")
+        finally:
+            self.closed = True
+            if self.on_close:
+                self.on_close(self)
+
+    async def close(self) -> None:
+        self.closed = True
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+class Broadcaster:
+    """Distribui eventos para todos os clientes sem bloquear o loop"""
+
+    def __init__(
+        self,
+        snapshot: Callable[[], Dict[str, Any]],
+        max_pending: int = DEFAULT_MAX_PENDING,
+        send_timeout: float = DEFAULT_SEND_TIMEOUT,
+    ):
+        self.snapshot = snapshot
+        self.max_pending = max_pending
+        self.send_timeout = send_timeout
+        self.channels: Dict[Any, ClientChannel] = {}
+
+    def __len__(self) -> int:
+        return len(self.channels)
+
+    def register(self, websocket) -> ClientChannel:
+        channel = ClientChannel(
+            websocket,
+            self.snapshot,
+            max_pending=self.max_pending,
+            send_timeout=self.send_timeout,
+            on_close=self._forget,
+        )
+        self.channels[websocket] = channel
+        channel.start()
+        return channel
+
+    def _forget(self, channel: ClientChannel) -> None:
+        if self.channels.get(channel.websocket) is channel:
+            del self.channels[channel.websocket]
+
+    async def unregister(self, websocket) -> None:
+        channel = self.channels.pop(websocket, None)
+        if channel:
+            await channel.close()
+
+    def publish(self, message: Dict[str, Any]) -> None:
+        """Serializa uma vez e enfileira para cada cliente"""
+        if not self.channels:
+            return
+        data = json.dumps(message)
+        for channel in list(self.channels.values()):
+            channel.offer(data)
+
+    async def close(self) -> None:
+        for websocket in list(self.channels):
+            await self.unregister(websocket)
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+TSiJUKEBOX - Prefetch de mídia
+==============================
+Antecipa metadados, letras e capas das próximas faixas da fila.
+
+Quando a fila muda, o bridge agenda o prefetch das próximas N entradas.
+Os resultados ficam num cache em disco com limite de tamanho (LRU por
+último acesso) e, para respostas da API, com a mesma expiração que o
+CachedYTMusic usa para o método (get_song, get_lyrics). Assim a tela "tocando agora" é atualizada sem esperar
+a rede na troca de faixa, mesmo com o link do local instável.
+
+Capas são baixadas já no tamanho usado pela UI: as URLs de thumbnail do
+YouTube Music aceitam o tamanho como sufixo (=wNNN-hNNN), então não há
+redimensionamento local.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .api_cache import DEFAULT_TTLS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEPTH = 3
+DEFAULT_ARTWORK_SIZE = 544
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+FETCH_TIMEOUT = 10
+
+_SIZE_SUFFIX = re.compile(r'=w\d+-h\d+')
+
+
+def resize_thumbnail_url(thumbnails: List[Dict[str, Any]], size: int) -> Optional[str]:
+    """Escolhe a thumbnail adequada e pede ao CDN o tamanho exato"""
+    if not thumbnails:
+        return None
+    ordered = sorted(thumbnails, key=lambda t: t.get('width') or 0)
+    best = next((t for t in ordered if (t.get('width') or 0) >= size), ordered[-1])
+    url = best.get('url', '')
+    if _SIZE_SUFFIX.search(url):
+        return _SIZE_SUFFIX.sub(f'=w{size}-h{size}', url)
+    return url
+
+
+def _download(url: str) -> bytes:
+    request = urllib.request.Request(url, headers={'User-Agent': 'TSiJUKEBOX-ytmusic-bridge'})
+    with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+        return response.read()
+
+
+class DiskCache:
+    """Cache em disco por namespace com limite total de bytes (LRU)"""
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES, clock: Callable[[], float] = time.time):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.clock = clock  # relógio de parede: expirações sobrevivem a reinícios
+        self.total_bytes = 0
+        self._lock = threading.Lock()
+        self._index: 'OrderedDict[Path, int]' = OrderedDict()
+        self._load_index()
+
+    def _load_index(self) -> None:
+        if not self.root.exists():
+            return
+        files = [p for p in self.root.rglob('*') if p.is_file() and not p.name.endswith('.tmp')]
+        for path in sorted(files, key=lambda p: p.stat().st_mtime):
+            size = path.stat().st_size
+            self._index[path] = size
+            self.total_bytes += size
+
+    def _path(self, namespace: str, key: str) -> Path:
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return self.root / namespace / digest[:2] / digest
+
+    def __contains__(self, item) -> bool:
+        namespace, key = item
+        with self._lock:
+            return self._path(namespace, key) in self._index
+
+    def discard(self, namespace: str, key: str) -> None:
+        path = self._path(namespace, key)
+        with self._lock:
+            self.total_bytes -= self._index.pop(path, 0)
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def get_bytes(self, namespace: str, key: str) -> Optional[bytes]:
+        path = self._path(namespace, key)
+        with self._lock:
+            if path not in self._index:
+                return None
+            self._index.move_to_end(path)
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # mantém a ordem LRU após reinício
+            return data
+        except OSError:
+            with self._lock:
+                self.total_bytes -= self._index.pop(path, 0)
+            return None
+
+    def put_bytes(self, namespace: str, key: str, data: bytes) -> None:
+        path = self._path(namespace, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        with self._lock:
+            self.total_bytes += len(data) - self._index.pop(path, 0)
+            self._index[path] = len(data)
+            self._evict()
+
+    def get_json(self, namespace: str, key: str) -> Optional[Any]:
+        """Valor gravado com put_json, ou None se ausente ou expirado"""
+        data = self.get_bytes(namespace, key)
+        if data is None:
+            return None
+        entry = json.loads(data)
+        expires = entry.get('expires') if isinstance(entry, dict) else None
+        if not isinstance(entry, dict) or 'value' not in entry or (expires is not None and expires <= self.clock()):
+            self.discard(namespace, key)
+            return None
+        return entry['value']
+
+    def put_json(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Grava um valor JSON; com `ttl` (segundos) ele expira"""
+        expires = self.clock() + ttl if ttl is not None else None
+        entry = {'expires': expires, 'value': value}
+        self.put_bytes(namespace, key, json.dumps(entry, default=str).encode())
+
+    def _evict(self) -> None:
+        while self.total_bytes > self.max_bytes and self._index:
+            path, size = self._index.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+class Prefetcher:
+    """Busca e guarda em disco dados das próximas faixas"""
+
+    def __init__(
+        self,
+        api: Any,
+        cache: DiskCache,
+        depth: int = DEFAULT_DEPTH,
+        artwork_size: int = DEFAULT_ARTWORK_SIZE,
+        download: Callable[[str], bytes] = _download,
+    ):
+        self.api = api
+        self.cache = cache
+        self.depth = depth
+        self.artwork_size = artwork_size
+        self.download = download
+        self._task: Optional[asyncio.Task] = None
+        self._wanted: List[str] = []
+
+    async def _in_thread(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    def _ttl(self, method: str) -> float:
+        # Mesmo TTL do CachedYTMusic, para o disco não servir dados que a API já renovaria
+        return getattr(self.api, 'ttls', DEFAULT_TTLS).get(method, 0)
+
+    async def _store(self, namespace: str, key: str, value: Any, method: str) -> None:
+        ttl = self._ttl(method)
+        if ttl > 0:
+            await self._in_thread(self.cache.put_json, namespace, key, value, ttl)
+
+    async def song(self, video_id: str) -> Dict[str, Any]:
+        cached = await self._in_thread(self.cache.get_json, 'song', video_id)
+        if cached is not None:
+            return cached
+        song = await self.api.call('get_song', video_id)
+        await self._store('song', video_id, song, 'get_song')
+        return song
+
+    async def lyrics(self, video_id: str) -> Optional[Dict[str, Any]]:
+        # Guardado como {"lyrics": ...} para lembrar também faixas sem letra
+        cached = await self._in_thread(self.cache.get_json, 'lyrics', video_id)
+        if cached is not None:
+            return cached['lyrics']
+        watch = await self.api.call('get_watch_playlist', video_id)
+        lyrics = None
+        if watch.get('lyrics'):
+            lyrics = await self.api.call('get_lyrics', watch['lyrics'])
+        await self._store('lyrics', video_id, {'lyrics': lyrics}, 'get_lyrics')
+        return lyrics
+
+    async def artwork(self, video_id: str) -> Optional[bytes]:
+        key = f'{video_id}@{self.artwork_size}'
+        cached = await self._in_thread(self.cache.get_bytes, 'artwork', key)
+        if cached is not None:
+            return cached
+        song = await self.song(video_id)
+        thumbnails = (song.get('videoDetails') or {}).get('thumbnail', {}).get('thumbnails', [])
+        url = resize_thumbnail_url(thumbnails, self.artwork_size)
+        if not url:
+            return None
+        data = await self._in_thread(self.download, url)
+        await self._in_thread(self.cache.put_bytes, 'artwork', key, data)
+        return data
+
+    async def warm(self, video_id: str) -> None:
+        """Garante metadados, letra e capa em disco para uma faixa"""
+        results = await asyncio.gather(
+            self.song(video_id), self.lyrics(video_id), self.artwork(video_id),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.debug(f"Prefetch incompleto para {video_id}: {result}")
+
+    async def _run(self, video_ids: List[str]) -> None:
+        # Em ordem: a próxima faixa é a mais urgente
+        for video_id in video_ids:
+            await self.warm(video_id)
+
+    def schedule(self, video_ids: Iterable[Optional[str]]) -> None:
+        """Substitui o prefetch em andamento pelas próximas `depth` faixas"""
+        wanted: List[str] = []
+        for video_id in video_ids:
+            if video_id and video_id not in wanted:
+                wanted.append(video_id)
+            if len(wanted) >= self.depth:
+                break
+        # Atualizações de posição/playback não mudam as próximas faixas
+        if wanted == self._wanted:
+            return
+        self._wanted = wanted
+        if self._task and not self._task.done():
+            self._task.cancel()
+        if wanted:
+            self._task = asyncio.ensure_future(self._run(wanted))
+
+    async def close(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
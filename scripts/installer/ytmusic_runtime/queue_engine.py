@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+TSiJUKEBOX - Queue Engine
+=========================
+Fila de reprodução e estado "tocando agora" do YouTube Music Bridge.
+
+A fila é uma lista duplamente ligada indexada por entry_id: adicionar,
+remover, mover e avançar são O(1), independente do tamanho da fila.
+Cada mutação incrementa `version` e devolve um delta pronto para ser
+enviado aos clientes, em vez do estado completo.
+
+O estado é persistido em JSON (escrita atômica) para sobreviver a
+reinícios do serviço.
+"""
+
+import json
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+@dataclass
+class QueueEntry:
+    """Item da fila. O mesmo vídeo pode aparecer várias vezes."""
+    video_id: str
+    entry_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    title: str = ''
+    artist: str = ''
+    duration: Optional[int] = None
+    thumbnail: Optional[str] = None
+    added_by: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'QueueEntry':
+        known = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        return cls(**known)
+
+
+@dataclass
+class NowPlaying:
+    """Faixa atual e estado do player"""
+    track: Optional[Dict[str, Any]] = None
+    is_playing: bool = False
+    position: float = 0.0
+    updated_at: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class _Node:
+    __slots__ = ('entry', 'prev', 'next')
+
+    def __init__(self, entry: Optional[QueueEntry]):
+        self.entry = entry
+        self.prev: '_Node' = self
+        self.next: '_Node' = self
+
+
+class QueueEngine:
+    """Fila com remoção/movimentação O(1) e deltas versionados"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self.version = 0
+        self.dirty = False
+        self.now_playing = NowPlaying()
+        self._root = _Node(None)  # sentinela: root.next é o primeiro item
+        self._index: Dict[str, _Node] = {}
+
+        if self.path and self.path.exists():
+            self.load()
+
+    # -------------------------------------------------------------------------
+    # Leitura
+    # -------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, entry_id: str) -> bool:
+        return entry_id in self._index
+
+    def __iter__(self) -> Iterator[QueueEntry]:
+        node = self._root.next
+        while node is not self._root:
+            yield node.entry
+            node = node.next
+
+    def get(self, entry_id: str) -> QueueEntry:
+        return self._index[entry_id].entry
+
+    def peek(self, count: int = 1) -> List[QueueEntry]:
+        """Próximos `count` itens, sem percorrer a fila inteira"""
+        items = []
+        node = self._root.next
+        while node is not self._root and len(items) < count:
+            items.append(node.entry)
+            node = node.next
+        return items
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado completo (para clientes novos ou fora de sincronia)"""
+        return {
+            'version': self.version,
+            'queue': [entry.to_dict() for entry in self],
+            'now_playing': self.now_playing.to_dict(),
+        }
+
+    # -------------------------------------------------------------------------
+    # Lista ligada
+    # -------------------------------------------------------------------------
+
+    def _anchor(self, after: Optional[str]) -> _Node:
+        if after is None:
+            return self._root
+        return self._index[after]
+
+    @staticmethod
+    def _link(node: _Node, anchor: _Node) -> None:
+        node.prev = anchor
+        node.next = anchor.next
+        anchor.next.prev = node
+        anchor.next = node
+
+    @staticmethod
+    def _unlink(node: _Node) -> None:
+        node.prev.next = node.next
+        node.next.prev = node.prev
+
+    def _delta(self, op: str, **payload) -> Dict[str, Any]:
+        self.version += 1
+        self.dirty = True
+        return {'op': op, 'version': self.version, **payload}
+
+    # -------------------------------------------------------------------------
+    # Mutações (cada uma devolve um delta)
+    # -------------------------------------------------------------------------
+
+    def add(self, entry: QueueEntry, after: Optional[str] = None, front: bool = False) -> Dict[str, Any]:
+        """
+        Adiciona ao fim da fila, logo após `after` ou no início (`front`).
+        """
+        if after is None and not front:
+            anchor = self._root.prev
+        else:
+            anchor = self._anchor(after)
+
+        node = _Node(entry)
+        self._link(node, anchor)
+        self._index[entry.entry_id] = node
+        return self._delta('add', entry=entry.to_dict(), after=anchor.entry.entry_id if anchor.entry else None)
+
+    def remove(self, entry_id: str) -> Dict[str, Any]:
+        node = self._index.pop(entry_id)
+        self._unlink(node)
+        return self._delta('remove', entry_id=entry_id)
+
+    def move(self, entry_id: str, after: Optional[str] = None) -> Dict[str, Any]:
+        """Move o item para depois de `after` (None = início da fila)"""
+        if entry_id == after:
+            raise ValueError("Item não pode ser movido para depois de si mesmo")
+        node = self._index[entry_id]
+        anchor = self._anchor(after)
+        self._unlink(node)
+        self._link(node, anchor)
+        return self._delta('move', entry_id=entry_id, after=after)
+
+    def pop_next(self) -> Optional[QueueEntry]:
+        """Remove e devolve o primeiro item (sem gerar delta)"""
+        node = self._root.next
+        if node is self._root:
+            return None
+        del self._index[node.entry.entry_id]
+        self._unlink(node)
+        self.dirty = True
+        return node.entry
+
+    def clear(self) -> Dict[str, Any]:
+        self._root.next = self._root.prev = self._root
+        self._index = {}
+        return self._delta('clear')
+
+    def set_now_playing(self, track: Optional[Dict[str, Any]], is_playing: bool = True) -> Dict[str, Any]:
+        self.now_playing = NowPlaying(track=track, is_playing=is_playing, position=0.0, updated_at=time.time())
+        return self._delta('now_playing', now_playing=self.now_playing.to_dict())
+
+    def set_playback(self, is_playing: Optional[bool] = None, position: Optional[float] = None) -> Dict[str, Any]:
+        """Atualiza só os campos informados; o delta contém apenas o que mudou"""
+        changes: Dict[str, Any] = {}
+        if is_playing is not None and is_playing != self.now_playing.is_playing:
+            self.now_playing.is_playing = changes['is_playing'] = bool(is_playing)
+        if position is not None:
+            self.now_playing.position = changes['position'] = float(position)
+        self.now_playing.updated_at = changes['updated_at'] = time.time()
+        return self._delta('playback', changes=changes)
+
+    def advance(self) -> Dict[str, Any]:
+        """Toca o próximo item da fila. Delta combina remoção e nova faixa."""
+        entry = self.pop_next()
+        track = entry.to_dict() if entry else None
+        self.now_playing = NowPlaying(track=track, is_playing=entry is not None, updated_at=time.time())
+        return self._delta(
+            'advance',
+            entry_id=entry.entry_id if entry else None,
+            now_playing=self.now_playing.to_dict(),
+        )
+
+    # -------------------------------------------------------------------------
+    # Persistência
+    # -------------------------------------------------------------------------
+
+    def load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+
+        self.clear()
+        for item in data.get('queue', []):
+            self.add(QueueEntry.from_dict(item))
+        now_playing = data.get('now_playing') or {}
+        self.now_playing = NowPlaying(**{k: v for k, v in now_playing.items() if k in NowPlaying.__dataclass_fields__})
+        # Reprodução não é retomada automaticamente após reinício
+        self.now_playing.is_playing = False
+        self.version = int(data.get('version', 0))
+        self.dirty = False
+
+    def save(self, force: bool = False) -> bool:
+        """Grava o estado se houve mudança desde a última gravação"""
+        if not self.path or not (self.dirty or force):
+            return False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + '.tmp')
+        tmp.write_text(json.dumps(self.snapshot()))
+        os.replace(tmp, self.path)
+        self.dirty = False
+        return True
@@ -5,6 +5,7 @@ Configura integração com YouTube Music via python-ytmusicapi.
 """
 
 import os
+import shutil
 import subprocess
 from pathlib import Path
 from dataclasses import dataclass
@@ -18,6 +19,13 @@ class YTMusicConfig:
     """Configuração do YouTube Music"""
     user: str = 'tsi'
     websocket_port: int = 9876
+    client_max_pending: int = 64  # mensagens por cliente antes de descartar as mais antigas
+    api_workers: int = 4  # threads para chamadas à ytmusicapi
+    api_cache_entries: int = 512
+    api_cache_persist: bool = True  # mantém buscas/letras em SQLite entre reinícios
+    prefetch_depth: int = 3  # próximas faixas com metadados, letra e capa antecipados
+    artwork_size: int = 544  # lado da capa em pixels (tamanho usado pela UI)
+    media_cache_mb: int = 200
     oauth_enabled: bool = True
     auto_start: bool = True
 
@@ -82,6 +90,8 @@ class YTMusicSetup:
         
         self.install_dir.mkdir(parents=True, exist_ok=True)
         
+        api_cache_file = "CACHE_DIR / 'api-cache.sqlite'" if self.config.api_cache_persist else "None"
+        
         bridge_script = f'''#!/usr/bin/env python3
 """
 TSiJUKEBOX - YouTube Music WebSocket Bridge
@@ -89,6 +99,7 @@ Permite controle do YouTube Music via WebSocket.
 """
 
 import asyncio
+import base64
 import json
 import logging
 from pathlib import Path
@@ -97,6 +108,7 @@ from typing import Optional, Dict, Any
 try:
     import websockets
     from ytmusicapi import YTMusic
+    from ytmusic_runtime import Broadcaster, CachedYTMusic, DiskCache, Prefetcher, QueueEngine, QueueEntry
 except ImportError as e:
     print(f"Erro: dependência não instalada - {{e}}")
     print("Execute: pip install ytmusicapi websockets")
@@ -116,6 +128,18 @@ logger = logging.getLogger(__name__)
 # Configurações
 WEBSOCKET_PORT = {self.config.websocket_port}
 OAUTH_FILE = Path.home() / '.config' / 'ytmusic' / 'oauth.json'
+STATE_DIR = Path.home() / '.local' / 'state' / 'ytmusic-bridge'
+QUEUE_FILE = STATE_DIR / 'queue.json'
+CLIENT_MAX_PENDING = {self.config.client_max_pending}
+PERSIST_INTERVAL = 2.0  # segundos entre gravações da fila
+CACHE_DIR = Path.home() / '.cache' / 'ytmusic-bridge'
+API_WORKERS = {self.config.api_workers}
+API_CACHE_ENTRIES = {self.config.api_cache_entries}
+API_CACHE_FILE = {api_cache_file}
+MEDIA_CACHE_DIR = CACHE_DIR / 'media'
+MEDIA_CACHE_BYTES = {self.config.media_cache_mb} * 1024 * 1024
+PREFETCH_DEPTH = {self.config.prefetch_depth}
+ARTWORK_SIZE = {self.config.artwork_size}
 
 
 class YTMusicBridge:
@@ -123,10 +147,23 @@ class YTMusicBridge:
     
     def __init__(self):
         self.ytmusic: Optional[YTMusic] = None
-        self.connected_clients: set = set()
-        self.current_track: Optional[Dict] = None
-        self.is_playing: bool = False
-        self.queue: list = []
+        self.api: Optional[CachedYTMusic] = None
+        self.prefetcher: Optional[Prefetcher] = None
+        self.queue = QueueEngine(QUEUE_FILE)
+        self.broadcaster = Broadcaster(self.queue.snapshot, max_pending=CLIENT_MAX_PENDING)
+    
+    def _publish_queue(self, delta: Dict[str, Any]) -> Dict[str, Any]:
+        """Envia delta da fila para todos os clientes e antecipa as próximas faixas"""
+        self.broadcaster.publish({{"type": "queue", **delta}})
+        self._schedule_prefetch()
+        return delta
+    
+    def _schedule_prefetch(self):
+        if not self.prefetcher:
+            return
+        current = (self.queue.now_playing.track or {{}}).get("video_id")
+        upcoming = [entry.video_id for entry in self.queue.peek(PREFETCH_DEPTH)]
+        self.prefetcher.schedule([current] + upcoming)
     
     async def initialize(self) -> bool:
         """Inicializa conexão com YouTube Music"""
@@ -137,6 +174,21 @@ class YTMusicBridge:
             else:
                 self.ytmusic = YTMusic()
                 logger.warning("YouTube Music em modo não autenticado (funcionalidade limitada)")
+            # Chamadas em threads, com cache e união de requisições idênticas
+            self.api = CachedYTMusic(
+                self.ytmusic,
+                max_entries=API_CACHE_ENTRIES,
+                persist_path=API_CACHE_FILE,
+                workers=API_WORKERS,
+            )
+            self.prefetcher = Prefetcher(
+                self.api,
+                DiskCache(MEDIA_CACHE_DIR, MEDIA_CACHE_BYTES),
+                depth=PREFETCH_DEPTH + 1,  # faixa atual + próximas
+                artwork_size=ARTWORK_SIZE,
+            )
+            # Fila restaurada do disco: aquece o cache antes do primeiro cliente
+            self._schedule_prefetch()
             return True
         except Exception as e:
             logger.error(f"Erro ao inicializar YTMusic: {{e}}")
@@ -145,79 +197,120 @@ class YTMusicBridge:
     async def handle_command(self, command: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Processa comandos recebidos via WebSocket"""
         
-        if not self.ytmusic:
+        if not self.api:
             return {{"error": "YouTube Music não inicializado"}}
         
         try:
             if command == "search":
                 query = params.get("query", "")
                 filter_type = params.get("filter", "songs")
-                results = self.ytmusic.search(query, filter=filter_type, limit=20)
+                results = await self.api.call("search", query, filter=filter_type, limit=20)
                 return {{"results": results}}
             
             elif command == "get_home":
-                home = self.ytmusic.get_home(limit=10)
+                home = await self.api.call("get_home", limit=10)
                 return {{"home": home}}
             
             elif command == "get_library_playlists":
-                playlists = self.ytmusic.get_library_playlists(limit=50)
+                playlists = await self.api.call("get_library_playlists", limit=50)
                 return {{"playlists": playlists}}
             
             elif command == "get_playlist":
                 playlist_id = params.get("playlist_id")
-                playlist = self.ytmusic.get_playlist(playlist_id, limit=100)
+                playlist = await self.api.call("get_playlist", playlist_id, limit=100)
                 return {{"playlist": playlist}}
             
             elif command == "get_song":
                 video_id = params.get("video_id")
-                song = self.ytmusic.get_song(video_id)
+                song = await self.prefetcher.song(video_id)
                 return {{"song": song}}
             
             elif command == "get_watch_playlist":
                 video_id = params.get("video_id")
-                playlist = self.ytmusic.get_watch_playlist(video_id, limit=25)
+                playlist = await self.api.call("get_watch_playlist", video_id, limit=25)
                 return {{"watch_playlist": playlist}}
             
             elif command == "get_lyrics":
                 video_id = params.get("video_id")
-                watch = self.ytmusic.get_watch_playlist(video_id)
-                if watch.get("lyrics"):
-                    lyrics = self.ytmusic.get_lyrics(watch["lyrics"])
-                    return {{"lyrics": lyrics}}
-                return {{"lyrics": None}}
+                lyrics = await self.prefetcher.lyrics(video_id)
+                return {{"lyrics": lyrics}}
             
-            elif command == "add_to_queue":
+            elif command == "get_artwork":
                 video_id = params.get("video_id")
-                self.queue.append(video_id)
+                artwork = await self.prefetcher.artwork(video_id)
+                if artwork is None:
+                    return {{"artwork": None}}
+                encoded = base64.b64encode(artwork).decode()
+                return {{"artwork": f"data:image/jpeg;base64,{{encoded}}"}}
+            
+            elif command == "add_to_queue":
+                entry = QueueEntry(
+                    video_id=params.get("video_id"),
+                    title=params.get("title", ""),
+                    artist=params.get("artist", ""),
+                    duration=params.get("duration"),
+                    thumbnail=params.get("thumbnail"),
+                    added_by=params.get("added_by"),
+                )
+                self._publish_queue(
+                    self.queue.add(entry, after=params.get("after"), front=bool(params.get("next")))
+                )
+                return {{"success": True, "entry": entry.to_dict(), "queue_length": len(self.queue)}}
+            
+            elif command == "remove_from_queue":
+                self._publish_queue(self.queue.remove(params.get("entry_id")))
                 return {{"success": True, "queue_length": len(self.queue)}}
             
-            elif command == "get_queue":
-                return {{"queue": self.queue}}
+            elif command == "move_in_queue":
+                self._publish_queue(self.queue.move(params.get("entry_id"), after=params.get("after")))
+                return {{"success": True}}
+            
+            elif command in ("get_queue", "get_state"):
+                return self.queue.snapshot()
             
             elif command == "clear_queue":
-                self.queue.clear()
+                self._publish_queue(self.queue.clear())
+                return {{"success": True}}
+            
+            elif command == "next_track":
+                delta = self._publish_queue(self.queue.advance())
+                return {{"now_playing": delta["now_playing"], "queue_length": len(self.queue)}}
+            
+            elif command == "set_now_playing":
+                delta = self._publish_queue(
+                    self.queue.set_now_playing(params.get("track"), params.get("is_playing", True))
+                )
+                return {{"now_playing": delta["now_playing"]}}
+            
+            elif command == "set_playback":
+                self._publish_queue(
+                    self.queue.set_playback(params.get("is_playing"), params.get("position"))
+                )
                 return {{"success": True}}
             
             elif command == "rate_song":
                 video_id = params.get("video_id")
                 rating = params.get("rating", "LIKE")  # LIKE, DISLIKE, INDIFFERENT
-                self.ytmusic.rate_song(video_id, rating)
+                await self.api.call("rate_song", video_id, rating)
                 return {{"success": True}}
             
             elif command == "get_library_songs":
-                songs = self.ytmusic.get_library_songs(limit=100)
+                songs = await self.api.call("get_library_songs", limit=100)
                 return {{"songs": songs}}
             
             elif command == "get_liked_songs":
-                playlist = self.ytmusic.get_liked_songs(limit=100)
+                playlist = await self.api.call("get_liked_songs", limit=100)
                 return {{"liked_songs": playlist}}
             
             elif command == "status":
                 return {{
                     "authenticated": OAUTH_FILE.exists(),
-                    "is_playing": self.is_playing,
-                    "current_track": self.current_track,
+                    "is_playing": self.queue.now_playing.is_playing,
+                    "current_track": self.queue.now_playing.track,
                     "queue_length": len(self.queue),
+                    "queue_version": self.queue.version,
+                    "clients": len(self.broadcaster),
+                    "api_cache": self.api.stats,
                 }}
             
             elif command == "ping":
@@ -226,13 +319,16 @@ class YTMusicBridge:
             else:
                 return {{"error": f"Comando desconhecido: {{command}}"}}
                 
+        except KeyError as e:
+            return {{"error": f"Item não encontrado na fila: {{e}}"}}
         except Exception as e:
             logger.error(f"Erro ao processar comando {{command}}: {{e}}")
             return {{"error": str(e)}}
     
     async def handle_client(self, websocket):
         """Gerencia conexão de um cliente WebSocket"""
-        self.connected_clients.add(websocket)
+        # Eventos (deltas de fila/estado) vão pelo canal limitado do cliente
+        self.broadcaster.register(websocket)
         client_addr = websocket.remote_address
         logger.info(f"Cliente conectado: {{client_addr}}")
         
@@ -257,14 +353,20 @@ class YTMusicBridge:
         except websockets.exceptions.ConnectionClosed:
             logger.info(f"Cliente desconectado: {{client_addr}}")
         finally:
-            self.connected_clients.discard(websocket)
+            await self.broadcaster.unregister(websocket)
     
     async def broadcast(self, message: Dict):
-        """Envia mensagem para todos os clientes conectados"""
-        if self.connected_clients:
-            await asyncio.gather(
-                *[client.send(json.dumps(message)) for client in self.connected_clients]
-            )
+        """Envia mensagem para todos os clientes conectados sem esperar os lentos"""
+        self.broadcaster.publish(message)
+    
+    async def persist_queue(self):
+        """Grava a fila em disco periodicamente (só quando mudou)"""
+        try:
+            while True:
+                await asyncio.sleep(PERSIST_INTERVAL)
+                self.queue.save()
+        finally:
+            self.queue.save()
     
     async def run(self):
         """Inicia o servidor WebSocket"""
@@ -273,6 +375,7 @@ class YTMusicBridge:
             return
         
         logger.info(f"Iniciando servidor WebSocket na porta {{WEBSOCKET_PORT}}...")
+        persist_task = asyncio.create_task(self.persist_queue())
         
         async with websockets.serve(
             self.handle_client,
@@ -282,7 +385,13 @@ class YTMusicBridge:
             ping_timeout=10
         ):
             logger.info(f"YouTube Music Bridge rodando em ws://0.0.0.0:{{WEBSOCKET_PORT}}")
-            await asyncio.Future()  # Run forever
+            try:
+                await asyncio.Future()  # Run forever
+            finally:
+                persist_task.cancel()
+                await self.broadcaster.close()
+                await self.prefetcher.close()
+                self.api.close()
 
 
 async def main():
@@ -299,6 +408,14 @@ if __name__ == "__main__":
         bridge_path.write_text(bridge_script)
         os.chmod(bridge_path, 0o755)
         
+        # Fila, broadcaster e caches usados pelo bridge
+        shutil.copytree(
+            Path(__file__).resolve().parent / 'ytmusic_runtime',
+            self.install_dir / 'ytmusic_runtime',
+            dirs_exist_ok=True,
+            ignore=shutil.ignore_patterns('__pycache__', '*.pyc'),
+        )
+        
         self._log(f"✅ Bridge script criado em {bridge_path}", Colors.GREEN)
         return True
     
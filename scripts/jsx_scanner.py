@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Scanner JSX/TSX
+===============
+
+Tokeniza um arquivo TSX/JSX uma única vez em elementos (tag, atributos,
+classes e linha) para os scripts de auditoria, que antes liam o arquivo e
+rodavam as próprias regexes em cada linha.
+
+Funcionalidades:
+- Tags de abertura, inclusive as que ocupam várias linhas
+- Atributos com valores "..." / '...' / {expressão}; `=>` e `>` dentro de
+  expressões e strings não encerram a tag
+- className de string ou expressão (cn("a", x && "b"), template literal)
+- Índice de linhas com bisect (offset → linha em O(log n))
+- scan() memoizado pelo conteúdo: detectores diferentes sobre o mesmo
+  arquivo compartilham uma única tokenização
+- shared_sources(): cache sem limite de tamanho para vários scripts
+  percorrerem o projeto em sequência no mesmo processo (master-fix.py)
+
+Uso:
+    from jsx_scanner import scan, scan_file
+
+    scanned = scan_file("src/components/Player.tsx")
+    for element in scanned.by_tag('button'):
+        if not element.has('aria-label'):
+            print(element.line, element.context)
+
+Autor: TSiJUKEBOX Team
+Versão: 1.0.0
+"""
+
+import os
+import re
+from bisect import bisect_right
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+
+# Quantidade de arquivos tokenizados mantidos em memória
+SCAN_CACHE_SIZE = 256
+
+# Início de tag: '<' seguido de nome (Foo, foo, Foo.Bar, svg:path, my-el)
+_TAG_OPEN_RE = re.compile(r'<([A-Za-z][\w.:-]*)')
+
+# Caracteres antes de '<' que indicam genérico TS (useState<T>, Array<T>)
+_GENERIC_PREFIX = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$.)]')
+
+# Próximo token relevante dentro de uma tag
+_TAG_TOKEN_RE = re.compile(
+    r'"(?:[^"\\]|\\.)*"'          # string com aspas duplas
+    r"|'(?:[^'\\]|\\.)*'"         # string com aspas simples
+    r'|`(?:[^`\\]|\\.)*`'         # template literal
+    r'|/\*.*?\*/'                 # comentário de bloco ({/* ... */})
+    r'|[{}<>]',
+    re.DOTALL
+)
+
+# Nome de atributo e início do valor
+_ATTR_RE = re.compile(r'([\w:.-]+)\s*(=\s*)?')
+
+# Literais de string dentro de uma expressão
+_STRING_LITERAL_RE = re.compile(r'"((?:[^"\\]|\\.)*)"|\'((?:[^\'\\]|\\.)*)\'|`((?:[^`\\]|\\.)*)`', re.DOTALL)
+
+
+# =============================================================================
+# ESTRUTURAS
+# =============================================================================
+
+@dataclass
+class JSXElement:
+    """
+    Tag de abertura JSX.
+
+    Attributes:
+        tag: Nome da tag ('button', 'Card', 'Foo.Bar')
+        attrs: Texto bruto dos atributos (entre o nome e '>' ou '/>')
+        start: Offset de '<' no arquivo
+        end: Offset logo após '>'
+        line: Linha de '<' (1-indexed)
+        end_line: Linha de '>'
+        self_closing: True para '/>'
+        context: Linhas ocupadas pela tag, sem indentação, unidas por espaço
+    """
+    tag: str
+    attrs: str
+    start: int
+    end: int
+    line: int
+    end_line: int
+    self_closing: bool
+    context: str
+    _raw: Optional[Dict[str, str]] = field(default=None, repr=False, compare=False)
+
+    @property
+    def raw_attributes(self) -> Dict[str, str]:
+        """Atributos por nome com o valor bruto ("...", {...} ou '')."""
+        if self._raw is None:
+            self._raw = _raw_values(self.attrs)
+        return self._raw
+
+    @property
+    def attributes(self) -> Dict[str, str]:
+        """
+        Atributos por nome.
+
+        O valor é o conteúdo de "..." / '...', a expressão entre {} (sem as
+        chaves) ou '' para atributos booleanos. Spreads ({...props}) são
+        ignorados.
+        """
+        return {name: _unwrap(raw) for name, raw in self.raw_attributes.items()}
+
+    def has(self, name: str) -> bool:
+        """True se o atributo existe."""
+        return name in self.raw_attributes
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Valor do atributo ou default."""
+        raw = self.raw_attributes.get(name)
+        return default if raw is None else _unwrap(raw)
+
+    @property
+    def class_string(self) -> str:
+        """
+        Classes de className/class.
+
+        Para expressões (cn(...), clsx(...), template literal) junta os
+        literais de string encontrados.
+        """
+        raw = self.raw_attributes.get('className')
+        if raw is None:
+            raw = self.raw_attributes.get('class')
+        if raw is None:
+            return ''
+        if raw[:1] in ('"', "'"):
+            return raw[1:-1]
+        return ' '.join(
+            next(group for group in match.groups() if group is not None)
+            for match in _STRING_LITERAL_RE.finditer(raw)
+        ).strip()
+
+    @property
+    def classes(self) -> List[str]:
+        """Lista de classes."""
+        return self.class_string.split()
+
+
+@dataclass
+class ScannedFile:
+    """Arquivo tokenizado."""
+    content: str
+    lines: List[str]
+    line_starts: List[int]
+    elements: List[JSXElement]
+
+    def line_of(self, offset: int) -> int:
+        """Linha (1-indexed) de um offset."""
+        return bisect_right(self.line_starts, offset)
+
+    def by_tag(self, *tags: str, ignore_case: bool = False) -> Iterator[JSXElement]:
+        """Elementos com uma das tags."""
+        if ignore_case:
+            wanted = {tag.lower() for tag in tags}
+            return (e for e in self.elements if e.tag.lower() in wanted)
+        wanted = set(tags)
+        return (e for e in self.elements if e.tag in wanted)
+
+    def with_classes(self) -> Iterator[JSXElement]:
+        """Elementos com className/class."""
+        return (e for e in self.elements if e.has('className') or e.has('class'))
+
+
+# =============================================================================
+# TOKENIZAÇÃO
+# =============================================================================
+
+def _tag_end(content: str, pos: int) -> Optional[Tuple[int, bool]]:
+    """
+    Fim da tag iniciada antes de `pos`: (offset após '>', auto-fechada).
+
+    None se a tag não fecha (código TS que não é JSX).
+    """
+    depth = 0
+    while True:
+        match = _TAG_TOKEN_RE.search(content, pos)
+        if not match:
+            return None
+        token = match.group()
+        pos = match.end()
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth = max(0, depth - 1)
+        elif depth:
+            continue
+        elif token == '>':
+            return pos, content[match.start() - 1] == '/'
+        elif token == '<':
+            return None
+        elif token[0] == '`':
+            # Template literal fora de {} não é JSX válido
+            return None
+
+
+def _raw_values(attrs: str) -> Dict[str, str]:
+    """Atributos por nome com o valor bruto (com aspas/chaves)."""
+    values = {}
+    pos = 0
+    length = len(attrs)
+    while pos < length:
+        char = attrs[pos]
+        if char.isspace() or char == '/':
+            pos += 1
+            continue
+        if char == '{':
+            # Spread {...props}: pular a expressão
+            pos = _expression_end(attrs, pos)
+            continue
+        match = _ATTR_RE.match(attrs, pos)
+        if not match:
+            pos += 1
+            continue
+        name = match.group(1)
+        pos = match.end()
+        if not match.group(2) or pos >= length:
+            values[name] = ''
+            continue
+        if attrs[pos] == '{':
+            end = _expression_end(attrs, pos)
+        elif attrs[pos] in ('"', "'"):
+            end = attrs.find(attrs[pos], pos + 1) + 1 or length
+        else:
+            end = pos
+            while end < length and not attrs[end].isspace():
+                end += 1
+        values[name] = attrs[pos:end]
+        pos = end
+    return values
+
+
+def _expression_end(text: str, pos: int) -> int:
+    """Offset após o '}' que fecha o '{' em `pos`."""
+    depth = 0
+    for match in _TAG_TOKEN_RE.finditer(text, pos):
+        token = match.group()
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    return len(text)
+
+
+def _unwrap(raw: str) -> str:
+    """Remove aspas ou chaves de um valor bruto."""
+    return raw[1:-1] if raw[:1] in ('"', "'", '{') else raw
+
+
+def scan(content: str) -> ScannedFile:
+    """
+    Tokeniza o conteúdo de um arquivo TSX/JSX.
+
+    Memoizado pelo conteúdo: chamar de vários detectores com a mesma
+    string reaproveita a mesma tokenização. Trate o resultado como
+    somente leitura.
+
+    Args:
+        content: Conteúdo do arquivo
+
+    Returns:
+        ScannedFile com linhas, índice de offsets e elementos
+    """
+    if _session is not None:
+        return _session.scan(content)
+    return _scan(content)
+
+
+@lru_cache(maxsize=SCAN_CACHE_SIZE)
+def _scan(content: str) -> ScannedFile:
+    lines = content.split('\n')
+    line_starts = [0] * len(lines)
+    offset = 0
+    for index, line in enumerate(lines):
+        line_starts[index] = offset
+        offset += len(line) + 1
+
+    elements = []
+    for match in _TAG_OPEN_RE.finditer(content):
+        start = match.start()
+        if start and content[start - 1] in _GENERIC_PREFIX:
+            continue
+        closing = _tag_end(content, match.end())
+        if closing is None:
+            continue
+        end, self_closing = closing
+        line = bisect_right(line_starts, start)
+        end_line = bisect_right(line_starts, end - 1)
+        attrs = content[match.end():end - (2 if self_closing else 1)]
+        elements.append(JSXElement(
+            tag=match.group(1),
+            attrs=attrs,
+            start=start,
+            end=end,
+            line=line,
+            end_line=end_line,
+            self_closing=self_closing,
+            context=' '.join(part.strip() for part in lines[line - 1:end_line]),
+        ))
+
+    return ScannedFile(content=content, lines=lines, line_starts=line_starts, elements=elements)
+
+
+@lru_cache(maxsize=SCAN_CACHE_SIZE)
+def _scan_path(path: str, mtime_ns: int, size: int) -> ScannedFile:
+    with open(path, encoding='utf-8') as f:
+        return _scan(f.read())
+
+
+def scan_file(path: Union[str, Path]) -> ScannedFile:
+    """
+    Lê e tokeniza um arquivo, reaproveitando o resultado enquanto o
+    arquivo não mudar (mtime e tamanho).
+    """
+    if _session is not None:
+        return _session.scan(_session.read(path))
+    st = os.stat(path)
+    return _scan_path(str(path), st.st_mtime_ns, st.st_size)
+
+
+# =============================================================================
+# CACHE COMPARTILHADO
+# =============================================================================
+
+class SourceCache:
+    """
+    Conteúdo e tokenização dos arquivos lidos durante shared_sources().
+
+    Os caches LRU de scan()/scan_file() guardam SCAN_CACHE_SIZE arquivos;
+    vários scripts percorrendo o projeto inteiro em sequência esgotam o
+    LRU a cada passada. Aqui não há limite: cada versão de arquivo é lida
+    e tokenizada uma única vez na sessão. Cada leitura confere inode,
+    mtime e tamanho, então um arquivo gravado por um script é relido pelo
+    seguinte.
+    """
+
+    def __init__(self):
+        self._files: Dict[str, Tuple[Tuple[int, int, int], str]] = {}
+        self._scans: Dict[str, ScannedFile] = {}
+        self.reads = 0
+        self.hits = 0
+
+    def read(self, path: Union[str, Path]) -> str:
+        """Conteúdo atual do arquivo, relido só se ele mudou."""
+        key = str(path)
+        st = os.stat(key)
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        cached = self._files.get(key)
+        if cached is not None:
+            if cached[0] == stamp:
+                self.hits += 1
+                return cached[1]
+            self._scans.pop(cached[1], None)
+        with open(key, encoding='utf-8') as f:
+            content = f.read()
+        self._files[key] = (stamp, content)
+        self.reads += 1
+        return content
+
+    def scan(self, content: str) -> ScannedFile:
+        """Tokenização de `content`, feita uma vez por sessão."""
+        scanned = self._scans.get(content)
+        if scanned is None:
+            scanned = self._scans[content] = _scan(content)
+        return scanned
+
+
+_session: Optional[SourceCache] = None
+
+
+@contextmanager
+def shared_sources() -> Iterator[SourceCache]:
+    """
+    Ativa um SourceCache para read_source(), scan() e scan_file() até o
+    fim do bloco. Blocos aninhados reaproveitam a sessão externa.
+    """
+    global _session
+    previous = _session
+    _session = previous or SourceCache()
+    try:
+        yield _session
+    finally:
+        _session = previous
+
+
+def read_source(path: Union[str, Path]) -> str:
+    """Lê um arquivo-fonte, pelo cache da sessão quando houver uma."""
+    if _session is not None:
+        return _session.read(path)
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+if __name__ == '__main__':
+    import sys
+    for arg in sys.argv[1:]:
+        scanned = scan_file(arg)
+        print(f"{arg}: {len(scanned.lines)} linhas, {len(scanned.elements)} elementos")
+        for element in scanned.elements:
+            print(f"  {element.line:>5}  <{element.tag}>  {element.class_string}")
@@ -35,6 +35,12 @@ USO:
     python3 scripts/master-fix.py --docs             # Apenas geração de documentação
     python3 scripts/master-fix.py --dry-run          # Simula sem aplicar alterações
     python3 scripts/master-fix.py --report           # Gera relatório de status
+    python3 scripts/master-fix.py --all --jobs 1     # Fases em sequência, sem paralelismo
+
+As fases independentes rodam em paralelo (documentação junto com as
+correções de TypeScript, por exemplo); fases que editam os mesmos arquivos
+ou usam o pnpm nunca rodam ao mesmo tempo. O resumo final mostra o tempo
+de cada fase.
 
 Autor: Manus AI + B0yZ4kr14
 Data: 2025-12-25
@@ -42,18 +48,27 @@ Licença: MIT
 """
 
 import os
+import io
 import sys
 import json
+import time
 import shutil
 import argparse
+import threading
 import subprocess
+import importlib.util
 import re
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional, Any
-from dataclasses import dataclass, field
+from typing import List, Dict, Tuple, Optional, Any, Callable, FrozenSet, Iterator, Set
+from dataclasses import dataclass, field, replace
+from contextlib import contextmanager, redirect_stdout
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from enum import Enum
 
+from doc_build import DocBuild, DocPage, PageStatus
+from jsx_scanner import shared_sources
+
 # =============================================================================
 # CONSTANTES E CONFIGURAÇÃO
 # =============================================================================
@@ -200,6 +215,61 @@ def write_file(file_path: Path, content: str) -> bool:
     except Exception:
         return False
 
+class ThreadOutput:
+    """
+    sys.stdout com destino por thread: dentro de capture() os prints da
+    thread vão para um buffer próprio; fora dele, para o stream original.
+    Permite rodar fases em paralelo sem intercalar as linhas de cada uma.
+    """
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+    
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, 'buffer', None)
+        return (self.stream if buffer is None else buffer).write(text)
+    
+    def flush(self):
+        if getattr(self._local, 'buffer', None) is None:
+            self.stream.flush()
+    
+    def __getattr__(self, name: str):
+        return getattr(self.stream, name)
+    
+    @contextmanager
+    def capture(self) -> Iterator[io.StringIO]:
+        """Acumula a saída da thread atual até o fim do bloco"""
+        previous = getattr(self._local, 'buffer', None)
+        self._local.buffer = io.StringIO()
+        try:
+            yield self._local.buffer
+        finally:
+            self._local.buffer = previous
+
+@contextmanager
+def capture_output() -> Iterator[io.StringIO]:
+    """Desvia os prints da thread atual para um buffer"""
+    if isinstance(sys.stdout, ThreadOutput):
+        with sys.stdout.capture() as buffer:
+            yield buffer
+    else:
+        with redirect_stdout(io.StringIO()) as buffer:
+            yield buffer
+
+_loaded_scripts: Dict[Path, Any] = {}
+
+def load_script(script_path: Path):
+    """Importa um script de scripts/ (nomes com hífen) como módulo, uma vez só"""
+    module = _loaded_scripts.get(script_path)
+    if module is None:
+        name = script_path.stem.replace('-', '_')
+        spec = importlib.util.spec_from_file_location(name, script_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _loaded_scripts[script_path] = module
+    return module
+
 # =============================================================================
 # MÓDULO 1: CORREÇÕES DE TYPESCRIPT
 # =============================================================================
@@ -437,7 +507,14 @@ class TypeScriptFixer:
 # =============================================================================
 
 class AccessibilityFixer:
-    """Corrige problemas de acessibilidade"""
+    """
+    Corrige problemas de acessibilidade.
+    
+    Os scripts de correção são importados e executados no próprio
+    processo, em sequência, sobre um único cache de fontes
+    (jsx_scanner.shared_sources): cada arquivo de src/ é lido e tokenizado
+    uma vez, e só é relido pelo estágio seguinte se um estágio o alterou.
+    """
     
     def __init__(self, dry_run: bool = False):
         self.dry_run = dry_run
@@ -451,17 +528,20 @@ class AccessibilityFixer:
         
         results = []
         
-        # 1. Executar script de aria-labels
-        results.append(self._run_aria_labels_script())
-        
-        # 2. Executar script de falsos positivos
-        results.append(self._run_false_positive_filter())
-        
-        # 3. Executar correções de contraste crítico
-        results.append(self._run_contrast_fixes())
+        with shared_sources() as sources:
+            # 1. Executar script de aria-labels
+            results.append(self._run_aria_labels_script())
+            
+            # 2. Executar script de falsos positivos
+            results.append(self._run_false_positive_filter())
+            
+            # 3. Executar correções de contraste crítico
+            results.append(self._run_contrast_fixes())
+            
+            # 4. Executar correções de formulários
+            results.append(self._run_form_accessibility())
         
-        # 4. Executar correções de formulários
-        results.append(self._run_form_accessibility())
+        print_info(f"Cache de fontes: {sources.reads} leituras, {sources.hits} reaproveitadas")
         
         duration = (datetime.now() - start_time).total_seconds()
         
@@ -475,46 +555,54 @@ class AccessibilityFixer:
             duration=duration
         )
     
-    def _run_script(self, script_name: str, args: str = "") -> FixResult:
-        """Executa um script Python de correção"""
+    def _run_script(self, script_name: str, args: Tuple[str, ...] = ()) -> FixResult:
+        """Executa o main() de um script Python de correção no próprio processo"""
         script_path = SCRIPTS_DIR / script_name
         
         if not script_path.exists():
             print_warning(f"Script {script_name} não encontrado")
             return FixResult(name=script_name, success=False, errors=[f"Script não encontrado: {script_name}"])
         
-        cmd = f"python3 {script_path} {args}"
-        if self.dry_run:
-            cmd += " --dry-run"
+        argv = ["--dry-run" if self.dry_run else "--apply", *args]
+        error = ""
         
-        code, stdout, stderr = run_command(cmd)
+        with capture_output() as output:
+            try:
+                code = load_script(script_path).main(argv)
+            except SystemExit as e:
+                code = e.code
+            except Exception as e:
+                code, error = 1, f"{type(e).__name__}: {e}"
         
-        if code == 0:
+        if code in (0, None):
             print_success(f"Script {script_name} executado com sucesso")
             return FixResult(name=script_name, success=True, errors_fixed=1)
         else:
-            print_error(f"Falha ao executar {script_name}: {stderr}")
-            return FixResult(name=script_name, success=False, errors=[stderr])
+            error = error or '\n'.join(output.getvalue().strip().splitlines()[-5:])
+            print_error(f"Falha ao executar {script_name}: {error}")
+            return FixResult(name=script_name, success=False, errors=[error])
     
     def _run_aria_labels_script(self) -> FixResult:
         """Executa script de aria-labels"""
         print_step("Executando correções de aria-labels...")
-        return self._run_script("add-aria-labels.py", "--apply")
+        return self._run_script("add-aria-labels.py")
     
     def _run_false_positive_filter(self) -> FixResult:
         """Executa filtro de falsos positivos"""
         print_step("Executando filtro de falsos positivos...")
-        return self._run_script("false_positive_filter.py", "--apply")
+        return self._run_script("false_positive_filter.py")
     
     def _run_contrast_fixes(self) -> FixResult:
         """Executa correções de contraste"""
         print_step("Executando correções de contraste crítico...")
-        return self._run_script("fix-critical-contrast.py", "--apply")
+        return self._run_script("fix-critical-contrast.py")
     
     def _run_form_accessibility(self) -> FixResult:
         """Executa correções de acessibilidade de formulários"""
         print_step("Executando correções de formulários...")
-        return self._run_script("fix-form-accessibility.py", "--apply")
+        # O build fica com a fase de validação: rodar aqui disputaria o
+        # node_modules com a fase de dependências, que roda em paralelo
+        return self._run_script("fix-form-accessibility.py", ("--no-validate",))
 
 # =============================================================================
 # MÓDULO 3: ATUALIZAÇÃO DE DEPENDÊNCIAS
@@ -607,7 +695,13 @@ class DependencyUpdater:
 # =============================================================================
 
 class DocumentationGenerator:
-    """Gera e atualiza documentação do projeto"""
+    """
+    Gera e atualiza documentação do projeto.
+    
+    README, Wiki e relatório de status passam pelo build incremental
+    (doc_build.py): só são gravadas as páginas cujo conteúdo gerado mudou
+    desde a última execução; as demais não são tocadas.
+    """
     
     def __init__(self, dry_run: bool = False):
         self.dry_run = dry_run
@@ -636,26 +730,41 @@ class DocumentationGenerator:
         return FixResult(
             name="Documentation Generation",
             success=all(r.success for r in results),
+            files_modified=sum(r.files_modified for r in results),
             errors_fixed=sum(r.errors_fixed for r in results),
             duration=duration
         )
     
+    def _build(self, name: str, pages: List[DocPage]) -> FixResult:
+        """Grava só as páginas alteradas (backup antes de sobrescrever)"""
+        build = DocBuild("master-fix", PROJECT_ROOT)
+        for page in pages:
+            build.add(page)
+        report = build.run(dry_run=self.dry_run, before_write=backup_file)
+        
+        errors = []
+        for result in report.results:
+            if result.status is PageStatus.ERROR:
+                print_error(f"Falha ao gerar {result.page.path}: {result.error}")
+                errors.append(result.error)
+            elif result.status in (PageStatus.CREATED, PageStatus.UPDATED):
+                if self.dry_run:
+                    print_info(f"[DRY-RUN] Geraria {result.page.path}")
+                else:
+                    print_success(f"{result.page.path} ({result.status.value})")
+        
+        skipped = [result.page.path for result in report.skipped]
+        if skipped:
+            print_info(f"Inalteradas ({len(skipped)}): {', '.join(skipped)}")
+        
+        written = 0 if self.dry_run else len(report.written)
+        return FixResult(name=name, success=not errors, files_modified=written,
+                         errors_fixed=written, errors=errors)
+    
     def _generate_readme(self) -> FixResult:
         """Gera README atualizado"""
         print_step("Gerando README atualizado...")
-        
-        readme_content = self._create_readme_content()
-        readme_path = PROJECT_ROOT / "README.md"
-        
-        if self.dry_run:
-            print_info("[DRY-RUN] Geraria README.md atualizado")
-            return FixResult(name="Generate README", success=True)
-        
-        backup_file(readme_path)
-        write_file(readme_path, readme_content)
-        
-        print_success("README.md gerado com sucesso")
-        return FixResult(name="Generate README", success=True, errors_fixed=1)
+        return self._build("Generate README", [DocPage.static("README.md", self._create_readme_content())])
     
     def _create_readme_content(self) -> str:
         """Cria conteúdo do README"""
@@ -869,9 +978,6 @@ Este projeto está licenciado sob a Licença MIT - veja o arquivo [LICENSE](LICE
         """Gera páginas do Wiki"""
         print_step("Gerando páginas do Wiki...")
         
-        wiki_dir = PROJECT_ROOT / "wiki"
-        wiki_dir.mkdir(exist_ok=True)
-        
         pages = {
             "Home.md": self._create_wiki_home(),
             "Installation-Guide.md": self._create_wiki_installation(),
@@ -885,16 +991,8 @@ Este projeto está licenciado sob a Licença MIT - veja o arquivo [LICENSE](LICE
             "_Footer.md": self._create_wiki_footer(),
         }
         
-        if self.dry_run:
-            print_info(f"[DRY-RUN] Geraria {len(pages)} páginas do Wiki")
-            return FixResult(name="Generate Wiki", success=True)
-        
-        for filename, content in pages.items():
-            file_path = wiki_dir / filename
-            write_file(file_path, content)
-        
-        print_success(f"Geradas {len(pages)} páginas do Wiki")
-        return FixResult(name="Generate Wiki", success=True, errors_fixed=len(pages))
+        return self._build("Generate Wiki", [DocPage.static(f"wiki/{filename}", content)
+                                             for filename, content in pages.items()])
     
     def _create_wiki_home(self) -> str:
         """Cria página inicial do Wiki"""
@@ -1618,11 +1716,11 @@ Se o problema persistir:
         """Gera relatório de status"""
         print_step("Gerando relatório de status...")
         
-        report_path = DOCS_DIR / "STATUS_REPORT.md"
-        
-        report_content = f'''# 📊 Relatório de Status - TSiJUKEBOX
+        # A data de geração não entra no hash: sem outras mudanças, o
+        # relatório não é regravado
+        report_template = '''# 📊 Relatório de Status - TSiJUKEBOX
 
-**Gerado em:** {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+**Gerado em:** {generated_at}
 **Versão:** 4.2.0
 
 ## ✅ Status Geral
@@ -1659,13 +1757,9 @@ Se o problema persistir:
 4. Deploy em ambiente de staging
 '''
         
-        if self.dry_run:
-            print_info("[DRY-RUN] Geraria relatório de status")
-            return FixResult(name="Generate Status Report", success=True)
-        
-        write_file(report_path, report_content)
-        print_success("Relatório de status gerado")
-        return FixResult(name="Generate Status Report", success=True, errors_fixed=1)
+        page = DocPage("docs/STATUS_REPORT.md", report_template,
+                       volatile={"generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
+        return self._build("Generate Status Report", [page])
     
     def _update_changelog(self) -> FixResult:
         """Atualiza CHANGELOG"""
@@ -1691,12 +1785,17 @@ Se o problema persistir:
 
 '''
         
+        existing = read_file(changelog_path) if changelog_path.exists() else "# Changelog\n\n"
+        
+        # A entrada já foi inserida numa execução anterior
+        if new_entry.split(" - ", 1)[0] in existing:
+            print_info("CHANGELOG já contém a entrada 4.2.1 (inalterado)")
+            return FixResult(name="Update Changelog", success=True)
+        
         if self.dry_run:
             print_info("[DRY-RUN] Atualizaria CHANGELOG.md")
             return FixResult(name="Update Changelog", success=True)
         
-        existing = read_file(changelog_path) if changelog_path.exists() else "# Changelog\n\n"
-        
         # Insere nova entrada após o título
         if "# Changelog" in existing:
             parts = existing.split("# Changelog", 1)
@@ -1783,6 +1882,140 @@ class ProjectValidator:
         
         return FixResult(name="Type Validation", success=True, warnings=[f"{error_count} erros"])
 
+# =============================================================================
+# PIPELINE DE FASES
+# =============================================================================
+
+# Recursos disputados pelas fases: duas fases que declaram o mesmo recurso
+# nunca rodam ao mesmo tempo.
+RESOURCE_SRC = "src"            # arquivos de src/ editados pelas correções
+RESOURCE_PACKAGES = "packages"  # package.json, lockfile e node_modules (pnpm)
+RESOURCE_DOCS = "docs"          # README, wiki, docs/ e CHANGELOG
+
+DEFAULT_JOBS = 3
+
+@dataclass(frozen=True)
+class PhaseSpec:
+    """Declaração de uma fase: execução, dependências e recursos usados"""
+    phase: FixPhase
+    run: Callable[[bool], FixResult]  # recebe dry_run
+    depends: Tuple[FixPhase, ...] = ()
+    resources: FrozenSet[str] = frozenset()
+
+# Ordem de declaração = ordem sequencial original, prioridade entre fases
+# prontas e ordem da saída no terminal.
+PHASE_GRAPH: List[PhaseSpec] = [
+    PhaseSpec(FixPhase.TYPESCRIPT, lambda dry_run: TypeScriptFixer(dry_run).fix_all(),
+              (), frozenset({RESOURCE_SRC, RESOURCE_PACKAGES})),
+    PhaseSpec(FixPhase.ACCESSIBILITY, lambda dry_run: AccessibilityFixer(dry_run).fix_all(),
+              (), frozenset({RESOURCE_SRC})),
+    PhaseSpec(FixPhase.DEPENDENCIES, lambda dry_run: DependencyUpdater(dry_run).update_all(),
+              (), frozenset({RESOURCE_PACKAGES})),
+    PhaseSpec(FixPhase.DOCUMENTATION, lambda dry_run: DocumentationGenerator(dry_run).generate_all(),
+              (), frozenset({RESOURCE_DOCS})),
+    PhaseSpec(FixPhase.VALIDATION, lambda dry_run: ProjectValidator().validate_all(),
+              (FixPhase.TYPESCRIPT, FixPhase.ACCESSIBILITY, FixPhase.DEPENDENCIES, FixPhase.DOCUMENTATION)),
+]
+
+@dataclass
+class PhaseRun:
+    """Resultado de uma fase e quando ela rodou (segundos desde o início do pipeline)"""
+    spec: PhaseSpec
+    result: FixResult
+    started: float
+    finished: float
+    
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started
+
+class PhasePipeline:
+    """
+    Executa as fases selecionadas em paralelo, respeitando dependências e
+    recursos.
+    
+    Uma fase começa quando as dependências selecionadas terminaram (com ou
+    sem sucesso: como na execução sequencial, uma falha não interrompe as
+    demais) e nenhuma fase em andamento usa um dos seus recursos. Entre as
+    prontas vale a ordem de declaração, então com jobs=1 a execução é a
+    sequencial. A saída de cada fase é impressa em bloco, na ordem
+    declarada, sem intercalar linhas.
+    """
+    
+    def __init__(self, specs: List[PhaseSpec], dry_run: bool = False, jobs: int = DEFAULT_JOBS):
+        selected = {spec.phase for spec in specs}
+        self.specs = [replace(spec, depends=tuple(d for d in spec.depends if d in selected))
+                      for spec in specs]
+        self.dry_run = dry_run
+        self.jobs = max(1, jobs)
+        self.elapsed = 0.0
+    
+    def _execute(self, spec: PhaseSpec, output: ThreadOutput, origin: float) -> Tuple[PhaseRun, str]:
+        started = time.perf_counter() - origin
+        with output.capture() as buffer:
+            try:
+                result = spec.run(self.dry_run)
+            except Exception as e:
+                print_error(f"Fase {spec.phase.value} interrompida: {type(e).__name__}: {e}")
+                result = FixResult(name=spec.phase.value, success=False, errors=[str(e)])
+        return PhaseRun(spec, result, started, time.perf_counter() - origin), buffer.getvalue()
+    
+    def run(self) -> List[PhaseRun]:
+        """Executa todas as fases e devolve os resultados na ordem declarada"""
+        output = ThreadOutput(sys.stdout)
+        sys.stdout = output
+        origin = time.perf_counter()
+        
+        pending = list(self.specs)
+        running: Dict[Any, PhaseSpec] = {}
+        busy: Set[str] = set()
+        runs: Dict[FixPhase, PhaseRun] = {}
+        texts: Dict[FixPhase, str] = {}
+        flushed = 0
+        
+        pool = ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="phase")
+        try:
+            while pending or running:
+                for spec in list(pending):
+                    if len(running) >= self.jobs:
+                        break
+                    if all(d in runs for d in spec.depends) and not spec.resources & busy:
+                        busy |= spec.resources
+                        pending.remove(spec)
+                        running[pool.submit(self._execute, spec, output, origin)] = spec
+                
+                if not running:
+                    raise RuntimeError("Dependências impossíveis de satisfazer: "
+                                       + ", ".join(s.phase.value for s in pending))
+                
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    spec = running.pop(future)
+                    busy -= spec.resources
+                    runs[spec.phase], texts[spec.phase] = future.result()
+                
+                # Saída das fases já concluídas, na ordem declarada
+                while flushed < len(self.specs) and self.specs[flushed].phase in texts:
+                    output.stream.write(texts.pop(self.specs[flushed].phase))
+                    flushed += 1
+                output.stream.flush()
+        finally:
+            pool.shutdown(wait=True)
+            sys.stdout = output.stream
+            self.elapsed = time.perf_counter() - origin
+        
+        return [runs[spec.phase] for spec in self.specs]
+
+def print_phase_timings(runs: List[PhaseRun], elapsed: float):
+    """Imprime início, fim e duração de cada fase"""
+    print(f"{Colors.GOLD}Tempo por fase:{Colors.RESET}")
+    for run in runs:
+        icon = f"{Colors.GREEN}{Icons.CHECK}" if run.result.success else f"{Colors.RED}{Icons.CROSS}"
+        print(f"  {icon}{Colors.RESET} {run.result.name:<26} "
+              f"{run.started:7.1f}s {Icons.ARROW} {run.finished:7.1f}s  ({run.duration:.1f}s)")
+    serial = sum(run.duration for run in runs)
+    print_info(f"Tempo total: {elapsed:.1f}s (soma das fases: {serial:.1f}s)")
+
 # =============================================================================
 # FUNÇÃO PRINCIPAL
 # =============================================================================
@@ -1798,6 +2031,7 @@ Exemplos:
   python3 master-fix.py --typescript       # Apenas correções TypeScript
   python3 master-fix.py --accessibility    # Apenas correções de acessibilidade
   python3 master-fix.py --dry-run          # Simula sem aplicar alterações
+  python3 master-fix.py --all --jobs 1     # Executa as fases em sequência
         """
     )
     
@@ -1809,6 +2043,8 @@ Exemplos:
     parser.add_argument("--validate", action="store_true", help="Validação do projeto")
     parser.add_argument("--dry-run", action="store_true", help="Simula sem aplicar alterações")
     parser.add_argument("--report", action="store_true", help="Gera apenas relatório de status")
+    parser.add_argument("--jobs", "-j", type=int, default=DEFAULT_JOBS,
+                        help=f"Fases executadas em paralelo (padrão: {DEFAULT_JOBS}; 1 = sequencial)")
     
     args = parser.parse_args()
     
@@ -1835,7 +2071,9 @@ Exemplos:
     # Criar diretório de backup
     BACKUP_DIR.mkdir(parents=True, exist_ok=True)
     
-    results = []
+    # Os scripts de acessibilidade rodam em processo e alguns usam caminhos
+    # relativos à raiz (antes eram executados com cwd=PROJECT_ROOT)
+    os.chdir(PROJECT_ROOT)
     
     # Determinar o que executar
     run_all = args.all or not any([args.typescript, args.accessibility, args.dependencies, args.docs, args.validate, args.report])
@@ -1845,29 +2083,22 @@ Exemplos:
         doc_gen._generate_status_report()
         return
     
-    # Executar módulos
-    if run_all or args.typescript:
-        ts_fixer = TypeScriptFixer(dry_run=args.dry_run)
-        results.append(ts_fixer.fix_all())
-    
-    if run_all or args.accessibility:
-        a11y_fixer = AccessibilityFixer(dry_run=args.dry_run)
-        results.append(a11y_fixer.fix_all())
-    
-    if run_all or args.dependencies:
-        dep_updater = DependencyUpdater(dry_run=args.dry_run)
-        results.append(dep_updater.update_all())
-    
-    if run_all or args.docs:
-        doc_gen = DocumentationGenerator(dry_run=args.dry_run)
-        results.append(doc_gen.generate_all())
-    
-    if run_all or args.validate:
-        validator = ProjectValidator()
-        results.append(validator.validate_all())
+    # Executar módulos (independentes em paralelo)
+    selected = {
+        FixPhase.TYPESCRIPT: args.typescript,
+        FixPhase.ACCESSIBILITY: args.accessibility,
+        FixPhase.DEPENDENCIES: args.dependencies,
+        FixPhase.DOCUMENTATION: args.docs,
+        FixPhase.VALIDATION: args.validate,
+    }
+    pipeline = PhasePipeline([spec for spec in PHASE_GRAPH if run_all or selected[spec.phase]],
+                             dry_run=args.dry_run, jobs=args.jobs)
+    runs = pipeline.run()
+    results = [run.result for run in runs]
     
     # Resumo final
     print_header(f"{Icons.STAR} Resumo Final")
+    print_phase_timings(runs, pipeline.elapsed)
     
     total_fixes = sum(r.errors_fixed for r in results)
     total_files = sum(r.files_modified for r in results)
@@ -19,12 +19,14 @@ import os
 import re
 import sys
 import argparse
-import shutil
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, field
 
+from edit_engine import ROLLBACK_COMMAND, EditSet
+from jsx_scanner import scan_file
+
 # ============================================================================
 # CONFIGURAÇÃO
 # ============================================================================
@@ -33,7 +35,6 @@ PROJECT_ROOT = Path(__file__).parent.parent
 SRC_DIR = PROJECT_ROOT / "src"
 PAGES_DIR = SRC_DIR / "pages"
 COMPONENTS_DIR = SRC_DIR / "components"
-BACKUP_DIR = PROJECT_ROOT / "backups" / "ui-migration"
 
 # Arquivos prioritários para migração
 PRIORITY_FILES = [
@@ -125,7 +126,7 @@ class MigrationResult:
     """Resultado da migração de um arquivo."""
     path: str
     success: bool
-    backup_path: Optional[str] = None
+    backup_path: Optional[str] = None  # Snapshot com o original (rollback)
     changes_made: int = 0
     errors: List[str] = field(default_factory=list)
 
@@ -144,33 +145,28 @@ def analyze_file(file_path: Path) -> FileAnalysis:
     )
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            lines = content.split('\n')
-            analysis.lines = len(lines)
+        scanned = scan_file(file_path)
+        content = scanned.content
+        lines = scanned.lines
+        analysis.lines = len(lines)
         
         # Analisar imports
         for pattern, replacement in IMPORT_MAPPINGS.items():
             if re.search(pattern, content):
                 analysis.imports_to_update.append(pattern)
         
-        # Contar uso de componentes
+        # Contar uso de componentes (<Component ...>)
         components_to_check = ['Button', 'Card', 'Input', 'Badge', 'Switch', 'Slider', 'Toggle']
-        for comp in components_to_check:
-            # Contar ocorrências de <Component
-            pattern = rf'<{comp}[\s>]'
-            matches = list(re.finditer(pattern, content))
-            if matches:
-                line_numbers = []
-                for match in matches:
-                    line_num = content[:match.start()].count('\n') + 1
-                    line_numbers.append(line_num)
-                
-                analysis.components[comp] = ComponentUsage(
-                    component=comp,
-                    count=len(matches),
-                    lines=line_numbers
-                )
+        for element in scanned.by_tag(*components_to_check):
+            usage = analysis.components.setdefault(
+                element.tag, ComponentUsage(component=element.tag, count=0)
+            )
+            usage.count += 1
+            usage.lines.append(element.line)
+        analysis.components = {
+            comp: analysis.components[comp]
+            for comp in components_to_check if comp in analysis.components
+        }
         
         # Verificar props que precisam ser atualizadas
         for line_num, line in enumerate(lines, 1):
@@ -212,21 +208,6 @@ def analyze_all_files() -> List[FileAnalysis]:
 # FUNÇÕES DE MIGRAÇÃO
 # ============================================================================
 
-def create_backup(file_path: Path) -> Optional[Path]:
-    """Cria backup do arquivo antes da migração."""
-    BACKUP_DIR.mkdir(parents=True, exist_ok=True)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_name = f"{file_path.stem}_{timestamp}{file_path.suffix}"
-    backup_path = BACKUP_DIR / backup_name
-    
-    try:
-        shutil.copy2(file_path, backup_path)
-        return backup_path
-    except Exception as e:
-        print(f"Erro ao criar backup: {e}")
-        return None
-
 def migrate_imports(content: str) -> Tuple[str, int]:
     """Migra imports antigos para novos."""
     changes = 0
@@ -283,8 +264,13 @@ def migrate_card_structure(content: str) -> Tuple[str, int]:
     
     return content, changes
 
-def migrate_file(file_path: Path, dry_run: bool = False) -> MigrationResult:
-    """Migra um arquivo para usar os novos componentes."""
+def migrate_file(file_path: Path, dry_run: bool = False, edits: Optional[EditSet] = None) -> MigrationResult:
+    """
+    Migra um arquivo para usar os novos componentes.
+    
+    Com `edits`, a alteração é acumulada para o chamador gravar junto com
+    as dos outros arquivos (edits.commit()); senão é gravada na hora.
+    """
     result = MigrationResult(path=str(file_path), success=False)
     
     try:
@@ -316,14 +302,14 @@ def migrate_file(file_path: Path, dry_run: bool = False) -> MigrationResult:
             return result
         
         if total_changes > 0:
-            # Criar backup
-            backup_path = create_backup(file_path)
-            if backup_path:
-                result.backup_path = str(backup_path)
-            
-            # Escrever conteúdo migrado
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            if edits is not None:
+                edits.set_content(file_path, original_content, content)
+            else:
+                single = EditSet('migrate-ui-components')
+                single.set_content(file_path, original_content, content)
+                snapshot = single.commit()
+                if snapshot:
+                    result.backup_path = str(snapshot)
             
             print(f"✅ Migrado: {file_path} ({total_changes} alterações)")
         else:
@@ -494,7 +480,8 @@ Exemplos:
         if result.success:
             print(f"\n✅ Migração concluída: {result.changes_made} alterações")
             if result.backup_path:
-                print(f"📦 Backup: {result.backup_path}")
+                print(f"📦 Snapshot: {result.backup_path}")
+                print(f"↩️ Para desfazer: {ROLLBACK_COMMAND}")
         return
     
     if args.migrate_all or args.migrate_priority:
@@ -503,12 +490,20 @@ Exemplos:
         print(f"\n🔄 Migrando {len(files_to_migrate)} arquivos...")
         
         results = []
+        edits = EditSet('migrate-ui-components')
         for file_path in files_to_migrate:
             full_path = PROJECT_ROOT / file_path
             if full_path.exists():
-                result = migrate_file(full_path)
+                result = migrate_file(full_path, edits=edits)
                 results.append(result)
         
+        # Gravar todos os arquivos de uma vez
+        snapshot = edits.commit()
+        if snapshot:
+            for result in results:
+                if result.changes_made:
+                    result.backup_path = str(snapshot)
+        
         # Resumo
         successful = sum(1 for r in results if r.success)
         total_changes = sum(r.changes_made for r in results)
@@ -518,6 +513,9 @@ Exemplos:
         print("="*60)
         print(f"✅ Arquivos migrados: {successful}/{len(results)}")
         print(f"📝 Total de alterações: {total_changes}")
+        if snapshot:
+            print(f"📦 Snapshot: {snapshot}")
+            print(f"↩️ Para desfazer: {ROLLBACK_COMMAND}")
         print("="*60)
 
 if __name__ == "__main__":
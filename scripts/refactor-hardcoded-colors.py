@@ -31,6 +31,8 @@ from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from collections import defaultdict
 
+from edit_engine import ROLLBACK_COMMAND, EditSet
+
 # Configuração
 SRC_DIR = Path(__file__).parent.parent / "src"
 COMPONENTS_DIR = SRC_DIR / "components"
@@ -525,9 +527,15 @@ module.exports = {{
     return report
 
 def apply_refactoring(occurrences: List[ColorOccurrence], dry_run: bool = True) -> int:
-    """Aplica as refatorações sugeridas."""
+    """
+    Aplica as refatorações sugeridas.
+    
+    Cada ocorrência substitui a próxima aparição ainda não substituída da
+    cor no arquivo; todos os arquivos são gravados juntos no final, com
+    snapshot para rollback.
+    """
     changes = 0
-    files_modified = set()
+    edits = EditSet('refactor-hardcoded-colors')
     
     # Agrupar por arquivo
     by_file = defaultdict(list)
@@ -540,7 +548,8 @@ def apply_refactoring(occurrences: List[ColorOccurrence], dry_run: bool = True)
             with open(filepath, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            original_content = content
+            # Próxima posição de busca de cada padrão
+            cursors: Dict[str, int] = {}
             
             for occ in occs:
                 # Substituir cor hardcoded por classe Tailwind
@@ -548,23 +557,29 @@ def apply_refactoring(occurrences: List[ColorOccurrence], dry_run: bool = True)
                 old_pattern = f'"{occ.color}"'
                 new_value = f'"{occ.suggested_token["css"]}"'
                 
-                if old_pattern in content:
-                    if dry_run:
+                if dry_run:
+                    if old_pattern in content:
                         print(f"{Colors.BLUE}[DRY-RUN] {filepath}:{occ.line_number}{Colors.RESET}")
                         print(f"  {Colors.RED}- {old_pattern}{Colors.RESET}")
                         print(f"  {Colors.GREEN}+ {new_value}{Colors.RESET}")
-                    else:
-                        content = content.replace(old_pattern, new_value, 1)
+                        changes += 1
+                    continue
+                
+                position = content.find(old_pattern, cursors.get(old_pattern, 0))
+                if position != -1:
+                    edits.add(filepath, position, position + len(old_pattern), new_value, content)
+                    cursors[old_pattern] = position + len(old_pattern)
                     changes += 1
-            
-            if not dry_run and content != original_content:
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                files_modified.add(filepath)
         
         except Exception as e:
             print(f"{Colors.RED}❌ Erro ao processar {filepath}: {e}{Colors.RESET}")
     
+    if not dry_run:
+        snapshot = edits.commit()
+        if snapshot:
+            print(f"{Colors.CYAN}📦 Snapshot: {snapshot}{Colors.RESET}")
+            print(f"{Colors.CYAN}↩️ Para desfazer: {ROLLBACK_COMMAND}{Colors.RESET}")
+    
     return changes
 
 def main():
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para a11y_rules.py
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from a11y_rules import RuleRegistry, add_rule_arguments, engine_from_args
+
+SOURCE = '''<form>
+  <Input name="email" />
+  <img src="a.png" />
+  <input type="radio" name="plan" />
+  <input type="radio" name="plan" />
+  {errors.email && <span>Erro</span>}
+  <ERRORBOX />
+</form>'''
+
+
+@pytest.fixture
+def registry():
+    rules = RuleRegistry('teste')
+
+    @rules.element('input-name', 'inputs', tags=('input',), ignore_case=True, attrs=('name',))
+    def input_name(ctx, element):
+        """Input com name."""
+        yield ('input-name', element.line)
+
+    @rules.element('img-alt', 'images', tags=('img',))
+    def img_alt(ctx, element):
+        """Imagem sem alt."""
+        if not element.has('alt'):
+            yield ('img-alt', element.line)
+
+    def groups(ctx):
+        return [('radio-group', name, lines) for name, lines in ctx.state.get('radios', {}).items()]
+
+    @rules.element('radio-group', 'inputs', tags=('input',), finalize=groups)
+    def radio(ctx, element):
+        """Radios agrupados por name."""
+        if element.get('type') == 'radio':
+            ctx.state.setdefault('radios', {}).setdefault(element.get('name'), []).append(element.line)
+
+    @rules.line('error-text', 'errors', r'errors?\.\w+\s*&&')
+    def error_text(ctx, number, line, match):
+        """Mensagem de erro."""
+        yield ('error-text', number, match.group())
+
+    @rules.line('error-box', 'errors', r'errorbox', re.IGNORECASE)
+    def error_box(ctx, number, line, match):
+        """Caixa de erro."""
+        yield ('error-box', number)
+
+    return rules
+
+
+class TestRuleEngine:
+    """Testes para RuleRegistry/RuleEngine."""
+
+    def test_results_in_registration_order(self, registry):
+        """Testa agrupamento por regra e ordem do arquivo dentro da regra."""
+        assert registry.compile().run(SOURCE, 'A.tsx') == [
+            ('input-name', 2), ('input-name', 4), ('input-name', 5),
+            ('img-alt', 3),
+            ('radio-group', 'plan', [4, 5]),
+            ('error-text', 6, 'errors.email &&'),
+            ('error-box', 7),
+        ]
+
+    def test_select_by_ruleset_and_id(self, registry):
+        """Testa --rules/--skip-rules por conjunto ou por regra."""
+        assert registry.compile(['errors']).ids == ['error-text', 'error-box']
+        assert registry.compile(disabled=['inputs', 'error-box']).ids == ['img-alt', 'error-text']
+
+    def test_compile_is_memoized(self, registry):
+        """Testa que a mesma seleção reaproveita o motor."""
+        assert registry.compile(['images']) is registry.compile(['images'])
+
+    def test_unknown_rule(self, registry):
+        """Testa nome desconhecido."""
+        with pytest.raises(ValueError):
+            registry.compile(['nao-existe'])
+
+    def test_duplicate_rule(self, registry):
+        """Testa que ids repetidos são rejeitados."""
+        with pytest.raises(ValueError):
+            registry.line('error-box', 'errors', r'x')(lambda *args: None)
+
+    def test_scoped_flags_in_prefilter(self, registry):
+        """Testa que IGNORECASE de uma regra não vaza para as outras."""
+        engine = registry.compile(['errors'])
+        assert engine.run('ERRORS.EMAIL && <ErrorBox />') == [('error-box', 1)]
+
+    def test_line_rules_skip_jsx_scan(self, registry, monkeypatch):
+        """Testa que só regras de linha não tokenizam o JSX."""
+        import a11y_rules
+
+        def fail(content):
+            raise AssertionError('scan chamado')
+
+        monkeypatch.setattr(a11y_rules, 'scan', fail)
+        assert len(registry.compile(['errors']).run(SOURCE)) == 2
+
+    def test_command_line(self, registry, capsys):
+        """Testa argumentos de linha de comando e --list-rules."""
+        parser = argparse.ArgumentParser()
+        add_rule_arguments(parser)
+
+        engine = engine_from_args(registry, parser, parser.parse_args(['--skip-rules', 'inputs, errors']))
+        assert engine.ids == ['img-alt']
+
+        with pytest.raises(SystemExit):
+            engine_from_args(registry, parser, parser.parse_args(['--list-rules']))
+        assert 'radio-group' in capsys.readouterr().out
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para o cache de resultados de contrast_analyzer.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import contrast_analyzer
+from contrast_analyzer import analyze_color_contrast, config_fingerprint
+
+SOURCES = {
+    'A.tsx': 'export const A = () => <div className="bg-white text-gray-300">Oi</div>;\n',
+    'B.tsx': 'export const B = () => <p className="bg-zinc-900 text-zinc-700">Oi</p>;\n',
+}
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """Arquivos analisados sob um BASE_DIR temporário."""
+    monkeypatch.setattr(contrast_analyzer, 'BASE_DIR', tmp_path)
+    for name, source in SOURCES.items():
+        (tmp_path / name).write_text(source)
+    return tmp_path
+
+
+@pytest.fixture
+def analyzed(monkeypatch):
+    """Registra os arquivos que passam por analyze_file."""
+    calls = []
+    analyze_file = contrast_analyzer.analyze_file
+
+    def record(path, config=None):
+        calls.append(path.name)
+        return analyze_file(path, config)
+
+    monkeypatch.setattr(contrast_analyzer, 'analyze_file', record)
+    return calls
+
+
+def _run(project, **config):
+    files = [project / name for name in SOURCES]
+    return analyze_color_contrast(files, {'cache': project / 'cache.json', **config})
+
+
+class TestResultCache:
+    """Testes do cache por arquivo em analyze_paths."""
+
+    def test_warm_run_matches_cold_run(self, project, analyzed):
+        """Testa que resultados vindos do cache geram as mesmas métricas."""
+        cold = _run(project)
+        assert cold.issues_found == 2
+        assert sorted(analyzed) == ['A.tsx', 'B.tsx']
+
+        warm = _run(project)
+        assert sorted(analyzed) == ['A.tsx', 'B.tsx']
+        assert warm == cold
+        assert warm == analyze_color_contrast([project / name for name in SOURCES])
+
+    def test_edited_file_is_reanalyzed_alone(self, project, analyzed):
+        """Testa que só o arquivo alterado é reanalisado."""
+        _run(project)
+        analyzed.clear()
+
+        (project / 'B.tsx').write_text(SOURCES['B.tsx'].replace('text-zinc-700', 'text-zinc-50 '))
+        metrics = _run(project)
+        assert analyzed == ['B.tsx']
+        assert [i.file for i in metrics.issues] == ['A.tsx']
+
+    def test_config_change_invalidates(self, project, analyzed):
+        """Testa que mudar a configuração de análise reanalisa tudo."""
+        _run(project)
+        analyzed.clear()
+
+        _run(project, min_severity='HIGH', jobs=1)
+        assert analyzed == []
+
+        _run(project, level='aaa')
+        assert sorted(analyzed) == ['A.tsx', 'B.tsx']
+
+    def test_version_change_invalidates(self, project, analyzed, monkeypatch):
+        """Testa que uma nova ANALYZER_VERSION descarta o cache."""
+        _run(project)
+        analyzed.clear()
+
+        before = config_fingerprint({})
+        monkeypatch.setattr(contrast_analyzer, 'ANALYZER_VERSION', '99.0.0')
+        assert config_fingerprint({}) != before
+
+        _run(project)
+        assert sorted(analyzed) == ['A.tsx', 'B.tsx']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para generate-contrast-report-html.py
+"""
+
+import importlib.util
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+spec = importlib.util.spec_from_file_location(
+    "contrast_report",
+    Path(__file__).parent.parent / "generate-contrast-report-html.py"
+)
+contrast_report = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(contrast_report)
+
+from color_utils import parse_color
+from contrast_analyzer import ContrastIssue, ContrastMetrics
+
+ISSUE_FIELDS = contrast_report.ISSUE_FIELDS
+SEVERITIES = contrast_report.SEVERITIES
+
+ODD_FILE = 'src/a "b" <c>\\d.tsx'
+
+
+def _issue(file, ratio, severity, fg='#777777', bg='#ffffff', line=1):
+    return ContrastIssue(
+        file=file, line=line, foreground=parse_color(fg), background=parse_color(bg),
+        ratio=ratio, required_ratio=4.5, wcag_level='FAIL', text_size='normal',
+        severity=severity, context='<p>',
+    )
+
+
+ISSUES = [
+    _issue('src/A.tsx', 3.2, 'HIGH', line=10),
+    _issue(ODD_FILE, 1.5, 'CRITICAL', fg='#eeeeee', line=2),
+    _issue('src/A.tsx', 4.1, 'MEDIUM', line=30),
+]
+
+
+def _load(text):
+    """Objeto JSON do arquivo de dados (sem `window.X =` e `;`)."""
+    prefix = f'window.{contrast_report.DATA_VARIABLE} = '
+    assert text.startswith(prefix)
+    return json.loads(text[len(prefix):].rstrip().rstrip(';'))
+
+
+class TestIssuesData:
+    """Testes do arquivo de dados lido pelo relatório."""
+
+    def test_write_issues_data_round_trip(self):
+        """Testa ordem dos campos, índices de arquivo e caminhos com caracteres especiais."""
+        out = io.StringIO()
+        assert contrast_report.write_issues_data(ISSUES, out) == 3
+
+        data = _load(out.getvalue())
+        assert data['files'] == ['src/A.tsx', ODD_FILE]
+        records = [dict(zip(ISSUE_FIELDS, record)) for record in data['issues']]
+        assert all(len(record) == len(ISSUE_FIELDS) for record in data['issues'])
+
+        for record, issue in zip(records, ISSUES):
+            assert data['files'][record['file']] == issue.file
+            assert SEVERITIES[record['severity']] == issue.severity
+            assert record['ratio'] == issue.ratio
+            assert record['required_ratio'] == issue.required_ratio
+            assert record['line'] == issue.line
+            assert record['foreground'] == issue.foreground.hex
+            assert record['background'] == issue.background.hex
+            assert record['foreground_luminance'] == round(issue.foreground.luminance, 3)
+
+        suggested = records[1]
+        assert suggested['suggestion'].startswith('#')
+        assert suggested['suggestion_ratio'] >= 4.5
+
+    def test_write_issues_data_empty(self):
+        """Testa arquivo de dados sem issues."""
+        out = io.StringIO()
+        assert contrast_report.write_issues_data([], out) == 0
+        assert _load(out.getvalue()) == {'issues': [], 'files': []}
+
+    def test_write_html_report(self, tmp_path):
+        """Testa página + dados ao lado, com o pior ratio primeiro."""
+        metrics = ContrastMetrics(issues=list(ISSUES), issues_found=len(ISSUES))
+        metrics.calculate_aggregates()
+        output = tmp_path / 'report.html'
+
+        data_path, count = contrast_report.write_html_report(metrics, output, 'Projeto <X>')
+        assert data_path == tmp_path / 'report.issues.js'
+        assert count == 3
+
+        data = _load(data_path.read_text(encoding='utf-8'))
+        records = [dict(zip(ISSUE_FIELDS, record)) for record in data['issues']]
+        assert [r['ratio'] for r in records] == [1.5, 3.2, 4.1]
+        assert data['files'] == [ODD_FILE, 'src/A.tsx']
+        assert [r['file'] for r in records] == [0, 1, 1]
+
+        page = output.read_text(encoding='utf-8')
+        assert '<script src="report.issues.js"></script>' in page
+        assert 'Projeto &lt;X&gt;' in page
+        assert ODD_FILE not in page
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
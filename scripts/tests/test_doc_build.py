@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para doc_build.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from doc_build import DocBuild, DocPage, PageStatus
+
+TEMPLATE = "# {title}\n\n> Atualizado em {date}\n\n{body}\n"
+
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / 'docs').mkdir()
+    return tmp_path / 'docs'
+
+
+def _build(root, pages, overwrite=True, date='01/01/2026'):
+    build = DocBuild('teste', root, overwrite=overwrite, jobs=4, cache_dir=root.parent / 'cache')
+    for path, template, params in pages:
+        build.add(DocPage(path, template, params, volatile={'date': date}))
+    return build
+
+
+def _pages(body_b='b'):
+    return [
+        ('a/A.md', TEMPLATE, {'title': 'A', 'body': 'a'}),
+        ('b/B.md', TEMPLATE, {'title': 'B', 'body': body_b}),
+        ('C.md', "fixo: {title}\n", {'title': 'C'}),
+    ]
+
+
+def _statuses(report):
+    return {r.page.path: r.status for r in report.results}
+
+
+class TestDocBuild:
+    """Testes para DocBuild."""
+
+    def test_first_run_creates_and_second_skips(self, root):
+        """Testa criação e, na execução seguinte, nenhuma renderização."""
+        report = _build(root, _pages()).run()
+        assert set(_statuses(report).values()) == {PageStatus.CREATED}
+        assert (root / 'a' / 'A.md').read_text() == "# A\n\n> Atualizado em 01/01/2026\n\na\n"
+
+        report = _build(root, _pages(), date='02/02/2026').run()
+        assert set(_statuses(report).values()) == {PageStatus.UNCHANGED}
+        assert not any(r.rendered for r in report.results)
+        assert '01/01/2026' in (root / 'a' / 'A.md').read_text()
+
+    def test_changed_params_touch_one_file(self, root):
+        """Testa que só a página com parâmetros alterados é regravada."""
+        _build(root, _pages()).run()
+        before = {p: os.stat(root / p).st_mtime_ns for p in ('a/A.md', 'b/B.md', 'C.md')}
+        os.utime(root / 'a' / 'A.md', ns=(1, 1))
+        before['a/A.md'] = 1
+
+        report = _build(root, _pages(body_b='novo')).run()
+        assert [r.page.path for r in report.written] == ['b/B.md']
+        assert (root / 'b' / 'B.md').read_text().endswith('novo\n')
+        assert os.stat(root / 'a' / 'A.md').st_mtime_ns == 1
+        assert os.stat(root / 'C.md').st_mtime_ns == before['C.md']
+
+    def test_deleted_output_is_recreated(self, root):
+        """Testa que uma saída apagada volta mesmo com o hash igual."""
+        _build(root, _pages()).run()
+        (root / 'C.md').unlink()
+        report = _build(root, _pages()).run()
+        assert _statuses(report)['C.md'] is PageStatus.CREATED
+        assert (root / 'C.md').read_text() == "fixo: C\n"
+
+    def test_hand_edited_output_preserved_without_overwrite(self, root):
+        """Testa que edições à mão só são sobrescritas com overwrite."""
+        _build(root, _pages()).run()
+        (root / 'C.md').write_text('editado à mão\n')
+
+        report = _build(root, _pages(), overwrite=False).run()
+        assert _statuses(report)['C.md'] is PageStatus.PRESERVED
+        assert (root / 'C.md').read_text() == 'editado à mão\n'
+
+        report = _build(root, _pages(), overwrite=True).run()
+        assert _statuses(report)['C.md'] is PageStatus.UPDATED
+        assert (root / 'C.md').read_text() == "fixo: C\n"
+
+    def test_identical_existing_output_is_adopted(self, root):
+        """Testa que saída idêntica de antes do manifesto não é regravada."""
+        (root / 'C.md').write_text("fixo: C\n")
+        os.utime(root / 'C.md', ns=(1, 1))
+        report = _build(root, _pages()[2:], overwrite=False).run()
+        assert _statuses(report)['C.md'] is PageStatus.UNCHANGED
+        assert os.stat(root / 'C.md').st_mtime_ns == 1
+
+        report = _build(root, _pages()[2:], overwrite=False).run()
+        assert not report.results[0].rendered
+
+    def test_dry_run_writes_nothing(self, root):
+        """Testa que dry-run não grava páginas nem manifesto."""
+        build = _build(root, _pages())
+        report = build.run(dry_run=True)
+        assert len(report.written) == 3
+        assert list(root.iterdir()) == []
+        assert not build.manifest_path.exists()
+
+    def test_render_error_is_reported(self, root):
+        """Testa que um erro de renderização não interrompe as demais páginas."""
+        pages = _pages() + [('D.md', "{inexistente}", {})]
+        report = _build(root, pages).run()
+        assert _statuses(report)['D.md'] is PageStatus.ERROR
+        assert report.counts()[PageStatus.CREATED.value] == 3
+
+    def test_static_page_keeps_braces(self, root):
+        """Testa páginas de conteúdo fixo com chaves literais."""
+        build = DocBuild('teste', root, cache_dir=root.parent / 'cache')
+        build.add(DocPage.static('S.md', 'const x = { a: 1 };\n'))
+        build.run()
+        assert (root / 'S.md').read_text() == 'const x = { a: 1 };\n'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
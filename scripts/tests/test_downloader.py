@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para installer/utils/downloader.py
+"""
+
+import functools
+import hashlib
+import http.server
+import importlib.util
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from installer.utils.downloader import Downloader, DownloadError
+
+PAYLOAD = os.urandom(300 * 1024 + 123)
+DIGEST = hashlib.sha256(PAYLOAD).hexdigest()
+
+
+class RangeHandler(http.server.BaseHTTPRequestHandler):
+    """Servidor com suporte a Range; pode cortar a conexão ou ignorar ranges."""
+
+    ranges = True
+    cut_after = None  # bytes enviados antes de derrubar a conexão (uma vez)
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def _headers(self, status, start, end):
+        self.send_response(status)
+        self.send_header("Content-Length", str(end - start + 1))
+        if self.ranges:
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("ETag", '"v1"')
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(PAYLOAD)}")
+        self.end_headers()
+
+    def do_HEAD(self):
+        self._headers(200, 0, len(PAYLOAD) - 1)
+
+    def do_GET(self):
+        start, end, status = 0, len(PAYLOAD) - 1, 200
+        match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if match and self.ranges:
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else end
+            status = 206
+        type(self).requests.append(self.headers.get("Range"))
+        self._headers(status, start, end)
+        body = PAYLOAD[start:end + 1]
+        cut = type(self).cut_after
+        if cut is not None:
+            type(self).cut_after = None
+            self.wfile.write(body[:cut])
+            self.wfile.flush()
+            self.connection.shutdown(2)
+            return
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    handler = type("Handler", (RangeHandler,), {"requests": []})
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield handler, f"http://127.0.0.1:{httpd.server_port}/asset.bin"
+    httpd.shutdown()
+
+
+@pytest.fixture
+def downloader(tmp_path):
+    return Downloader(cache_dir=tmp_path / "cache", segments=4, min_segment_size=64 * 1024,
+                      retries=2, timeout=5)
+
+
+class TestDownloader:
+    """Testes para Downloader."""
+
+    def test_parallel_segments(self, server, downloader, tmp_path):
+        """Testa download em segmentos paralelos com checksum."""
+        handler, url = server
+        result = downloader.download(url, tmp_path / "out.bin", sha256=DIGEST)
+
+        assert (tmp_path / "out.bin").read_bytes() == PAYLOAD
+        assert result.sha256 == DIGEST
+        assert len([r for r in handler.requests if r]) == 4
+
+    def test_digest_without_expected(self, server, downloader, tmp_path):
+        """Testa que o SHA-256 é calculado mesmo sem valor esperado."""
+        _, url = server
+        assert downloader.download(url, tmp_path / "out.bin").sha256 == DIGEST
+
+    def test_download_without_digest_not_cached(self, server, downloader, tmp_path):
+        """Testa que downloads sem digest esperado não entram no cache."""
+        handler, url = server
+        downloader.download(url, tmp_path / "a.bin")
+        assert (tmp_path / "a.bin").read_bytes() == PAYLOAD
+        assert not downloader.cached_path(DIGEST).exists()
+
+        handler.requests.clear()
+        result = downloader.download(url, tmp_path / "b.bin", sha256=DIGEST)
+        assert not result.from_cache
+        assert handler.requests
+
+    def test_cache_hit_skips_network(self, server, downloader, tmp_path):
+        """Testa que digest já em cache não gera requisição."""
+        handler, url = server
+        downloader.download(url, tmp_path / "a.bin", sha256=DIGEST)
+        handler.requests.clear()
+
+        result = downloader.download(url, tmp_path / "b.bin", sha256=DIGEST)
+
+        assert result.from_cache
+        assert handler.requests == []
+        assert (tmp_path / "b.bin").read_bytes() == PAYLOAD
+
+    def test_checksum_mismatch(self, server, downloader, tmp_path):
+        """Testa que checksum divergente falha e não entra no cache."""
+        _, url = server
+        with pytest.raises(DownloadError):
+            downloader.download(url, tmp_path / "out.bin", sha256="0" * 64)
+        assert not (tmp_path / "out.bin").exists()
+        assert not downloader.cached_path(DIGEST).exists()
+
+    def test_retry_resumes_segment(self, server, downloader, tmp_path):
+        """Testa que queda de conexão retoma do byte onde parou."""
+        handler, url = server
+        handler.cut_after = 10_000
+        downloader.segments = 1
+
+        result = downloader.download(url, tmp_path / "out.bin", sha256=DIGEST)
+
+        assert result.sha256 == DIGEST
+        assert handler.requests[-1].startswith("bytes=")
+        assert int(handler.requests[-1][6:].split("-")[0]) > 0
+
+    def test_resume_partial_from_previous_run(self, server, downloader, tmp_path):
+        """Testa retomada de um .part deixado por execução anterior."""
+        handler, url = server
+        handler.cut_after = 50_000
+        downloader.segments = 1
+        downloader.retries = 0
+        with pytest.raises(DownloadError):
+            downloader.download(url, tmp_path / "out.bin")
+
+        downloader.retries = 2
+        result = downloader.download(url, tmp_path / "out.bin", sha256=DIGEST)
+
+        assert result.resumed_bytes > 0
+        assert (tmp_path / "out.bin").read_bytes() == PAYLOAD
+
+    def test_no_range_support(self, server, downloader, tmp_path):
+        """Testa servidor sem Range: um único stream completo."""
+        handler, url = server
+        handler.ranges = False
+
+        result = downloader.download(url, tmp_path / "out.bin", sha256=DIGEST)
+
+        assert result.sha256 == DIGEST
+        assert handler.requests == [None]
+
+    def test_download_many(self, server, downloader, tmp_path):
+        """Testa vários downloads concorrentes."""
+        _, url = server
+        items = [(url, tmp_path / f"{i}.bin", DIGEST) for i in range(3)]
+
+        results = downloader.download_many(items, workers=3)
+
+        assert all(r.sha256 == DIGEST for r in results)
+
+
+
+class TestInstallScript:
+    """Testa o script de instalação baixado por inteiro pelo unified-installer."""
+
+    @pytest.fixture
+    def installer(self):
+        spec = importlib.util.spec_from_file_location(
+            "unified_installer", Path(__file__).parent.parent / "unified-installer.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        installer = module.UnifiedInstaller(module.InstallConfig(quiet=True))
+        installer.system_info.user = "kiosk"
+        return module, installer
+
+    def test_script_runs_only_after_full_download(self, server, installer):
+        _, url = server
+        module, installer = installer
+        ran = []
+
+        def run_as_user(cmd, user, dry_run=False, **kwargs):
+            ran.append((cmd[0], user, Path(cmd[1]).read_bytes()))
+            return 0, "", ""
+
+        with patch.object(module, "run_as_user", run_as_user):
+            assert installer._run_install_script(url) == (0, "", "")
+        assert ran == [("sh", "kiosk", PAYLOAD)]
+
+    def test_dropped_connection_runs_nothing(self, server, installer):
+        handler, url = server
+        handler.ranges = False
+        handler.cut_after = 1000
+        module, installer = installer
+
+        with patch.object(module, "run_as_user") as run_as_user, \
+                patch.object(module, "Downloader", functools.partial(Downloader, retries=0, timeout=5)):
+            code, _, _ = installer._run_install_script(url)
+        assert code != 0
+        run_as_user.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para edit_engine.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import edit_engine
+from edit_engine import (
+    Edit, EditConflict, EditSet, apply_edits, diff_edit, line_offsets,
+    list_snapshots, read_manifest, rollback,
+)
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / 'src').mkdir()
+    a = tmp_path / 'src' / 'A.tsx'
+    b = tmp_path / 'src' / 'B.tsx'
+    a.write_text('<p className="text-cyan-400">\n  <span>oi</span>\n</p>\n')
+    b.write_text('const color = "#1DB954";\n')
+    return tmp_path
+
+
+def _edits(project):
+    return EditSet('teste', snapshot_dir=project / 'snapshots', root=project)
+
+
+class TestApplyEdits:
+    """Testes para apply_edits/diff_edit."""
+
+    def test_reverse_order_single_pass(self):
+        """Testa que índices calculados no original continuam válidos."""
+        content = 'abc def ghi'
+        edits = [Edit(8, 11, 'GHI!'), Edit(0, 3, 'A'), Edit(4, 4, '>> ')]
+        assert apply_edits(content, edits) == 'A >> def GHI!'
+
+    def test_overlap_is_rejected(self):
+        """Testa conflito entre intervalos sobrepostos."""
+        with pytest.raises(EditConflict):
+            apply_edits('abcdef', [Edit(0, 4, 'x'), Edit(2, 5, 'y')])
+
+    def test_duplicate_edit_applied_once(self):
+        """Testa que a mesma edição registrada duas vezes não duplica."""
+        assert apply_edits('abc', [Edit(1, 2, 'B'), Edit(1, 2, 'B')]) == 'aBc'
+
+    def test_diff_edit(self):
+        """Testa a edição mínima entre dois conteúdos."""
+        edit = diff_edit('one two three', 'one 2 three')
+        assert edit == Edit(4, 7, '2')
+        assert diff_edit('same', 'same') is None
+
+    def test_line_offsets(self):
+        """Testa início de cada linha."""
+        assert line_offsets('a\nbc\n') == [0, 2, 5]
+
+
+class TestEditSet:
+    """Testes para EditSet, snapshots e rollback."""
+
+    def test_commit_writes_all_files_and_snapshot(self, project):
+        """Testa gravação conjunta e snapshot único."""
+        a, b = project / 'src' / 'A.tsx', project / 'src' / 'B.tsx'
+        original_a, original_b = a.read_text(), b.read_text()
+
+        edits = _edits(project)
+        edits.replace_lines(a, original_a, {1: '<p className="text-cyan-700">'})
+        position = original_b.index('"#1DB954"')
+        edits.add(b, position, position + 9, '"var(--spotify-green)"', original_b)
+        snapshot = edits.commit()
+
+        assert a.read_text().startswith('<p className="text-cyan-700">\n  <span>')
+        assert b.read_text() == 'const color = "var(--spotify-green)";\n'
+        assert list_snapshots(project / 'snapshots') == [snapshot]
+        manifest = read_manifest(snapshot)
+        assert manifest['tool'] == 'teste'
+        assert sorted(e['member'] for e in manifest['files']) == ['files/src/A.tsx', 'files/src/B.tsx']
+
+        assert sorted(rollback(snapshot)) == sorted([a.resolve(), b.resolve()])
+        assert (a.read_text(), b.read_text()) == (original_a, original_b)
+        assert list_snapshots(project / 'snapshots') == []
+
+    def test_stale_file_is_not_written(self, project):
+        """Testa que nada é gravado se um arquivo mudou desde a análise."""
+        a, b = project / 'src' / 'A.tsx', project / 'src' / 'B.tsx'
+        original_a, original_b = a.read_text(), b.read_text()
+
+        edits = _edits(project)
+        edits.set_content(a, original_a, original_a.replace('oi', 'olá'))
+        edits.set_content(b, original_b, original_b.replace('const', 'let'))
+        b.write_text('// editado\n' + original_b)
+
+        with pytest.raises(EditConflict):
+            edits.commit()
+        assert a.read_text() == original_a
+        assert not (project / 'snapshots').exists()
+
+    def test_failed_write_restores_written_files(self, project, monkeypatch):
+        """Testa que uma falha no meio da gravação desfaz as anteriores."""
+        a, b = project / 'src' / 'A.tsx', project / 'src' / 'B.tsx'
+        original_a, original_b = a.read_text(), b.read_text()
+
+        edits = _edits(project)
+        edits.set_content(a, original_a, original_a.upper())
+        edits.set_content(b, original_b, original_b.upper())
+
+        real_write = edit_engine.write_atomic
+        calls = []
+
+        def flaky_write(path, content):
+            calls.append(path)
+            if len(calls) == 2:
+                raise OSError('disco cheio')
+            real_write(path, content)
+
+        monkeypatch.setattr(edit_engine, 'write_atomic', flaky_write)
+        with pytest.raises(OSError):
+            edits.commit()
+        assert (a.read_text(), b.read_text()) == (original_a, original_b)
+
+    def test_rollback_refuses_later_changes(self, project):
+        """Testa que o rollback não sobrescreve edições posteriores sem --force."""
+        a = project / 'src' / 'A.tsx'
+        original = a.read_text()
+        edits = _edits(project)
+        edits.set_content(a, original, original.replace('oi', 'olá'))
+        snapshot = edits.commit()
+
+        a.write_text('editado à mão\n')
+        with pytest.raises(EditConflict):
+            rollback(snapshot)
+        assert a.read_text() == 'editado à mão\n'
+
+        rollback(snapshot, force=True)
+        assert a.read_text() == original
+
+    def test_no_changes_no_snapshot(self, project):
+        """Testa que um conjunto sem alterações não cria snapshot."""
+        a = project / 'src' / 'A.tsx'
+        edits = _edits(project)
+        edits.replace_lines(a, a.read_text(), {2: '  <span>oi</span>'})
+        assert edits.commit() is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
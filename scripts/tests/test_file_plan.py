@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para installer/file_plan.py
+"""
+
+import getpass
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'installer'))
+
+from file_plan import FilePlan, is_system_unit
+from kiosk_chromium_setup import KioskChromiumConfig, KioskChromiumSetup
+
+
+@pytest.fixture
+def commands():
+    return []
+
+
+@pytest.fixture
+def plan(commands):
+    return FilePlan(logger=None, run=commands.append)
+
+
+class TestFilePlan:
+    """Testes para FilePlan."""
+
+    def test_create_with_mode_and_parents(self, plan, tmp_path):
+        """Testa criação com diretórios pais e modo final."""
+        path = tmp_path / "a" / "b" / "script.sh"
+
+        plan.write(path, "#!/bin/sh\n", mode=0o755)
+
+        assert path.read_text() == "#!/bin/sh\n"
+        assert path.stat().st_mode & 0o777 == 0o755
+
+    def test_unchanged_file_not_rewritten(self, plan, tmp_path):
+        """Testa que conteúdo igual não regrava o arquivo."""
+        path = tmp_path / "conf"
+        plan.write(path, "x=1\n")
+        inode = path.stat().st_ino
+
+        plan.add(path, "x=1\n")
+        changes = plan.apply()
+
+        assert [c.action for c in changes] == ["unchanged"]
+        assert path.stat().st_ino == inode
+
+    def test_update_is_atomic_replace(self, plan, tmp_path):
+        """Testa que atualização troca o inode (rename) e preserva o modo."""
+        path = tmp_path / "conf"
+        path.write_text("old\n")
+        path.chmod(0o600)
+        inode = path.stat().st_ino
+
+        plan.add(path, "new\n")
+        changes = plan.apply()
+
+        assert changes[0].action == "update"
+        assert path.read_text() == "new\n"
+        assert path.stat().st_ino != inode
+        assert path.stat().st_mode & 0o777 == 0o600
+        assert [p.name for p in tmp_path.iterdir()] == ["conf"]
+
+    def test_metadata_only(self, plan, tmp_path):
+        """Testa ajuste só de modo quando o conteúdo é igual."""
+        path = tmp_path / "conf"
+        path.write_text("x\n")
+        path.chmod(0o644)
+
+        plan.add(path, "x\n", mode=0o600, owner=getpass.getuser())
+        changes = plan.apply()
+
+        assert changes[0].action == "metadata"
+        assert path.stat().st_mode & 0o777 == 0o600
+
+    def test_single_daemon_reload_for_units(self, plan, commands, tmp_path):
+        """Testa um único daemon-reload antes dos comandos pós-escrita."""
+        with plan.transaction():
+            plan.add(tmp_path / "a.service", "[Unit]\n", unit=True)
+            plan.add(tmp_path / "b.timer", "[Timer]\n", unit=True)
+            plan.after(["systemctl", "enable", "a"])
+            plan.after(["systemctl", "enable", "b.timer"])
+
+        assert commands == [["systemctl", "daemon-reload"], ["systemctl", "enable", "a", "b.timer"]]
+
+    def test_rerun_skips_reload_and_on_change(self, plan, commands, tmp_path):
+        """Testa que reexecução idêntica não recarrega o systemd."""
+        for _ in range(2):
+            with plan.transaction():
+                plan.add(tmp_path / "a.service", "[Unit]\n", unit=True)
+                plan.after(["systemctl", "restart", "a"], on_change=True)
+
+        assert commands == [["systemctl", "daemon-reload"], ["systemctl", "restart", "a"]]
+
+    def test_dry_run_reports_diff(self, commands, tmp_path, capsys):
+        """Testa que dry-run mostra o diff e não escreve."""
+        path = tmp_path / "conf"
+        path.write_text("a=1\n")
+        plan = FilePlan(dry_run=True, run=commands.append)
+
+        plan.write(path, "a=2\n")
+
+        assert path.read_text() == "a=1\n"
+        out = capsys.readouterr().out
+        assert "-a=1" in out and "+a=2" in out
+
+    def test_backup_only_when_changed(self, plan, tmp_path):
+        """Testa backup .bak só quando o conteúdo muda."""
+        path = tmp_path / ".bash_profile"
+        path.write_text("antigo\n")
+
+        plan.write(path, "antigo\n", backup=True)
+        assert not (tmp_path / ".bash_profile.bak").exists()
+
+        plan.write(path, "novo\n", backup=True)
+        assert (tmp_path / ".bash_profile.bak").read_text() == "antigo\n"
+
+    def test_failed_transaction_discards(self, plan, tmp_path):
+        """Testa que exceção dentro da transação não grava nada."""
+        with pytest.raises(RuntimeError):
+            with plan.transaction():
+                plan.add(tmp_path / "x", "1")
+                raise RuntimeError("falha")
+        assert not (tmp_path / "x").exists()
+        assert plan.pending == []
+
+    def test_no_logger_prints_info_only(self, plan, tmp_path, capsys):
+        """Testa que, sem logger, mensagens de debug não são impressas."""
+        plan.write(tmp_path / "conf", "a=1\n")
+        assert capsys.readouterr().out == ""
+
+    def test_is_system_unit(self):
+        """Testa detecção de unidades e drop-ins do systemd."""
+        assert is_system_unit(Path("/etc/systemd/system/tsijukebox.service"))
+        assert is_system_unit(Path("/etc/systemd/system/getty@tty1.service.d/autologin.conf"))
+        assert not is_system_unit(Path("/etc/avahi/services/tsijukebox.service"))
+
+
+class TestKioskFiles:
+    """Testa o kiosk sobre o FilePlan."""
+
+    def test_rerun_keeps_files(self, tmp_path):
+        """Testa que o kiosk grava em home e reexecuta sem regravar."""
+        user = getpass.getuser()
+        setup = KioskChromiumSetup(KioskChromiumConfig(user=user))
+        setup.home = tmp_path
+
+        with setup.files.transaction():
+            setup.configure_xinitrc()
+            setup.configure_openbox_rc()
+        inode = (tmp_path / ".xinitrc").stat().st_ino
+        setup.configure_xinitrc()
+
+        assert (tmp_path / ".config/openbox/rc.xml").exists()
+        assert (tmp_path / ".xinitrc").stat().st_mode & 0o777 == 0o755
+        assert (tmp_path / ".xinitrc").stat().st_ino == inode
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para file_watcher.py
+"""
+
+import io
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from file_watcher import FileWatcher, WatchSession, _load_libc, write_json_atomic
+
+BACKENDS = ['polling'] + (['inotify'] if _load_libc() is not None else [])
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / 'components').mkdir()
+    (tmp_path / 'node_modules').mkdir()
+    (tmp_path / 'components' / 'A.tsx').write_text('a')
+    (tmp_path / 'node_modules' / 'B.tsx').write_text('b')
+    (tmp_path / 'notes.md').write_text('c')
+    return tmp_path.resolve()
+
+
+def _later(action, delay=0.05):
+    thread = threading.Thread(target=lambda: (time.sleep(delay), action()))
+    thread.start()
+    return thread
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+class TestFileWatcher:
+    """Testes para FileWatcher nos dois backends."""
+
+    def _watcher(self, tree, backend):
+        return FileWatcher([tree], backend=backend, poll_interval=0.05)
+
+    def test_list_files_filters(self, tree, backend):
+        """Testa extensões e diretórios excluídos."""
+        with self._watcher(tree, backend) as watcher:
+            assert watcher.list_files() == [tree / 'components' / 'A.tsx']
+
+    def test_write(self, tree, backend):
+        """Testa gravação direta."""
+        target = tree / 'components' / 'A.tsx'
+        with self._watcher(tree, backend) as watcher:
+            _later(lambda: target.write_text('changed')).join()
+            assert watcher.wait(timeout=2) == ({target}, set())
+
+    def test_rename_save(self, tree, backend):
+        """Testa salvamento atômico (temporário + rename) como um único evento."""
+        target = tree / 'components' / 'A.tsx'
+
+        def save():
+            tmp = target.with_name('.A.tsx.swp')
+            tmp.write_text('salvo pelo editor')
+            os.replace(tmp, target)
+
+        with self._watcher(tree, backend) as watcher:
+            _later(save).join()
+            assert watcher.wait(timeout=2) == ({target}, set())
+
+    def test_delete(self, tree, backend):
+        """Testa remoção de arquivo."""
+        target = tree / 'components' / 'A.tsx'
+        with self._watcher(tree, backend) as watcher:
+            _later(target.unlink).join()
+            assert watcher.wait(timeout=2) == (set(), {target})
+
+    def test_new_directory(self, tree, backend):
+        """Testa que diretórios novos passam a ser observados."""
+        with self._watcher(tree, backend) as watcher:
+            (tree / 'pages').mkdir()
+            (tree / 'pages' / 'Home.tsx').write_text('home')
+            assert watcher.wait(timeout=2) == ({tree / 'pages' / 'Home.tsx'}, set())
+
+            _later(lambda: (tree / 'pages' / 'Home.tsx').write_text('editado')).join()
+            assert watcher.wait(timeout=2) == ({tree / 'pages' / 'Home.tsx'}, set())
+
+    def test_ignored_changes(self, tree, backend):
+        """Testa que excluídos e outras extensões não geram eventos."""
+        with self._watcher(tree, backend) as watcher:
+            (tree / 'node_modules' / 'B.tsx').write_text('x')
+            (tree / 'notes.md').write_text('x')
+            assert watcher.wait(timeout=0.3) is None
+
+
+class TestWatchSession:
+    """Testes para WatchSession."""
+
+    def _session(self, tmp_path, calls):
+        def analyze(path):
+            calls.append(path.name)
+            return path.read_text().count('!')
+
+        return WatchSession(
+            analyze=analyze,
+            report=lambda results: {
+                'issues_found': sum(results.values()),
+                'by_file': {p.name: n for p, n in results.items()},
+            },
+            describe=lambda path, count: [f"problema {i}" for i in range(count)],
+            json_path=tmp_path / 'out' / 'watch.json',
+            out=io.StringIO(),
+        )
+
+    def test_update_reanalyzes_only_changed(self, tree, tmp_path):
+        """Testa reanálise incremental e JSON republicado."""
+        calls = []
+        session = self._session(tmp_path, calls)
+        a = tree / 'components' / 'A.tsx'
+        b = tree / 'components' / 'B.tsx'
+        b.write_text('!!')
+        session.load([a, b])
+        assert calls == ['A.tsx', 'B.tsx']
+
+        a.write_text('!!!')
+        payload = session.update({a}, set())
+        assert calls[2:] == ['A.tsx']
+        assert payload['issues_found'] == 5
+
+        saved = json.loads((tmp_path / 'out' / 'watch.json').read_text())
+        assert saved['files'] == 2
+        assert saved['by_file'] == {'A.tsx': 3, 'B.tsx': 2}
+        assert '3 problema(s)' in session.out.getvalue()
+
+    def test_update_removed_directory(self, tree, tmp_path):
+        """Testa que remover um diretório descarta os arquivos abaixo dele."""
+        session = self._session(tmp_path, [])
+        a = tree / 'components' / 'A.tsx'
+        session.load([a])
+        shutil.rmtree(tree / 'components')
+        assert session.update(set(), {tree / 'components'})['issues_found'] == 0
+        assert session.results == {}
+
+    def test_run_until_stopped(self, tree, tmp_path):
+        """Testa o loop completo com parada por evento."""
+        session = self._session(tmp_path, [])
+        stop = threading.Event()
+        thread = threading.Thread(target=session.run, args=([tree],),
+                                  kwargs={'backend': 'polling', 'stop': stop})
+        thread.start()
+        try:
+            deadline = time.monotonic() + 5
+            while 'Aguardando' not in session.out.getvalue() and time.monotonic() < deadline:
+                time.sleep(0.02)
+            (tree / 'components' / 'A.tsx').write_text('!')
+            while session.updates == 0 and time.monotonic() < deadline:
+                time.sleep(0.02)
+        finally:
+            stop.set()
+            thread.join(timeout=5)
+        assert session.updates >= 1
+        assert session.results[tree / 'components' / 'A.tsx'] == 1
+
+
+def test_write_json_atomic(tmp_path):
+    """Testa gravação atômica sem sobras de temporários."""
+    target = tmp_path / 'x' / 'data.json'
+    write_json_atomic(target, {'a': 1})
+    write_json_atomic(target, {'a': 2})
+    assert json.loads(target.read_text()) == {'a': 2}
+    assert os.listdir(target.parent) == ['data.json']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para jsx_scanner.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from jsx_scanner import read_source, scan, scan_file, shared_sources
+
+SOURCE = '''const [query, setQuery] = useState<string>("");
+return (
+  <div className={cn("text-white", active && "bg-zinc-900")} onClick={() => go(a > b)}>
+    {/* don't */}
+    <button
+      type="button"
+      aria-label="Play"
+    >
+      <PlayIcon className="w-4 h-4" />
+    </button>
+    <img src={`/a/${query}`} {...props} disabled />
+  </div>
+);'''
+
+
+@pytest.fixture
+def scanned():
+    return scan(SOURCE)
+
+
+class TestScan:
+    """Testes para scan()."""
+
+    def test_elements_and_lines(self, scanned):
+        """Testa tags encontradas e linha de cada uma."""
+        assert [(e.tag, e.line) for e in scanned.elements] == [
+            ("div", 3), ("button", 5), ("PlayIcon", 9), ("img", 11)
+        ]
+
+    def test_ignores_typescript_generics(self, scanned):
+        """Testa que useState<string> não vira elemento."""
+        assert not list(scanned.by_tag("string"))
+
+    def test_arrow_function_does_not_close_tag(self, scanned):
+        """Testa que '=>' e '>' dentro de {} não encerram a tag."""
+        div = scanned.elements[0]
+        assert div.get("onClick") == "() => go(a > b)"
+        assert div.line == div.end_line == 3
+
+    def test_multiline_tag(self, scanned):
+        """Testa tag em várias linhas com contexto unido."""
+        button = next(scanned.by_tag("button"))
+        assert (button.line, button.end_line) == (5, 8)
+        assert button.context == '<button type="button" aria-label="Play" >'
+        assert button.attributes == {"type": "button", "aria-label": "Play"}
+
+    def test_class_string_from_expression(self, scanned):
+        """Testa classes de cn(...) e de string simples."""
+        assert scanned.elements[0].class_string == "text-white bg-zinc-900"
+        assert next(scanned.by_tag("PlayIcon")).classes == ["w-4", "h-4"]
+
+    def test_self_closing_spread_and_boolean(self, scanned):
+        """Testa spread ignorado, atributo booleano e template literal."""
+        img = next(scanned.by_tag("img"))
+        assert img.self_closing
+        assert img.has("disabled") and img.get("disabled") == ""
+        assert img.get("src") == "`/a/${query}`"
+        assert not img.has("props")
+
+    def test_line_of_offset(self, scanned):
+        """Testa índice offset → linha."""
+        assert scanned.line_of(0) == 1
+        assert scanned.line_of(SOURCE.index("<img")) == 11
+        assert scanned.lines[10].strip().startswith("<img")
+
+    def test_same_content_shares_scan(self):
+        """Testa que o mesmo conteúdo reaproveita a tokenização."""
+        assert scan(SOURCE) is scan(SOURCE)
+
+    def test_scan_file_refreshes_on_change(self, tmp_path):
+        """Testa que scan_file relê o arquivo quando ele muda."""
+        path = tmp_path / "A.tsx"
+        path.write_text("<div />\n")
+        assert [e.tag for e in scan_file(path).elements] == ["div"]
+
+        path.write_text("<span />\n<p />\n")
+        assert [e.tag for e in scan_file(path).elements] == ["span", "p"]
+
+
+
+class TestSharedSources:
+    """Testes para o cache compartilhado entre scripts."""
+
+    def test_reads_and_scans_once_per_version(self, tmp_path):
+        """Testa que leituras repetidas reaproveitam conteúdo e tokenização."""
+        path = tmp_path / "A.tsx"
+        path.write_text("<p>oi</p>")
+        with shared_sources() as sources:
+            content = read_source(path)
+            assert read_source(str(path)) is content
+            assert scan_file(path) is scan(content)
+            assert (sources.reads, sources.hits) == (1, 2)
+
+            path.write_text("<span>olá</span>")
+            assert [e.tag for e in scan_file(path).elements] == ["span"]
+            assert sources.reads == 2
+
+    def test_nested_and_inactive(self, tmp_path):
+        """Testa reuso da sessão externa e leitura direta fora de sessões."""
+        path = tmp_path / "A.tsx"
+        path.write_text("<p>oi</p>")
+        with shared_sources() as outer:
+            with shared_sources() as inner:
+                assert inner is outer
+        assert read_source(path) == "<p>oi</p>"
+        assert outer.reads == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
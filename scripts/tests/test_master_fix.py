@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+TSiJUKEBOX - Master Fix Pipeline Tests
+======================================
+Testes do pipeline paralelo de fases do master-fix.py.
+
+Uso:
+    cd scripts && python -m pytest tests/test_master_fix.py -v
+"""
+
+import importlib.util
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+spec = importlib.util.spec_from_file_location(
+    "master_fix",
+    Path(__file__).parent.parent / "master-fix.py"
+)
+master_fix = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(master_fix)
+
+FixPhase = master_fix.FixPhase
+FixResult = master_fix.FixResult
+PhaseSpec = master_fix.PhaseSpec
+PhasePipeline = master_fix.PhasePipeline
+PHASE_GRAPH = master_fix.PHASE_GRAPH
+
+
+class Recorder:
+    """Fases falsas que registram a janela de execução de cada uma."""
+
+    def __init__(self, duration: float = 0.05, fail=(), crash=()):
+        self.duration = duration
+        self.fail = set(fail)
+        self.crash = set(crash)
+        self.windows = {}
+        self.lock = threading.Lock()
+
+    def phase(self, phase):
+        def run(dry_run):
+            start = time.monotonic()
+            print(f"saída de {phase.value}")
+            time.sleep(self.duration)
+            if phase in self.crash:
+                raise RuntimeError("quebrou")
+            with self.lock:
+                self.windows[phase] = (start, time.monotonic())
+            return FixResult(name=phase.value, success=phase not in self.fail)
+        return run
+
+    def overlap(self, a, b) -> bool:
+        (start_a, end_a), (start_b, end_b) = self.windows[a], self.windows[b]
+        return start_a < end_b and start_b < end_a
+
+
+def _graph(recorder):
+    """PHASE_GRAPH com as mesmas dependências e recursos, mas fases falsas."""
+    return [PhaseSpec(s.phase, recorder.phase(s.phase), s.depends, s.resources)
+            for s in PHASE_GRAPH]
+
+
+class TestPhaseGraph:
+    """Testes da declaração das fases."""
+
+    def test_graph_covers_all_phases_in_original_order(self):
+        """Testa que a ordem declarada é a ordem sequencial de antes."""
+        assert [s.phase for s in PHASE_GRAPH] == list(FixPhase)
+
+    def test_validation_depends_on_everything(self):
+        """Testa que a validação roda depois de todas as correções."""
+        validation = next(s for s in PHASE_GRAPH if s.phase is FixPhase.VALIDATION)
+        assert set(validation.depends) == set(FixPhase) - {FixPhase.VALIDATION}
+
+
+class TestPhasePipeline:
+    """Testes do PhasePipeline."""
+
+    def test_independent_phases_overlap(self, capsys):
+        """Testa documentação em paralelo com TypeScript e recursos exclusivos."""
+        recorder = Recorder()
+        runs = PhasePipeline(_graph(recorder), jobs=3).run()
+
+        assert [r.spec.phase for r in runs] == list(FixPhase)
+        assert recorder.overlap(FixPhase.TYPESCRIPT, FixPhase.DOCUMENTATION)
+        assert recorder.overlap(FixPhase.ACCESSIBILITY, FixPhase.DEPENDENCIES)
+        # src/ e pnpm nunca são usados por duas fases ao mesmo tempo
+        assert not recorder.overlap(FixPhase.TYPESCRIPT, FixPhase.ACCESSIBILITY)
+        assert not recorder.overlap(FixPhase.TYPESCRIPT, FixPhase.DEPENDENCIES)
+        validation_start = recorder.windows[FixPhase.VALIDATION][0]
+        assert all(end <= validation_start for phase, (_, end) in recorder.windows.items()
+                   if phase is not FixPhase.VALIDATION)
+
+    def test_output_in_declared_order(self, capsys):
+        """Testa que a saída de cada fase sai em bloco, na ordem declarada."""
+        PhasePipeline(_graph(Recorder()), jobs=3).run()
+        lines = capsys.readouterr().out.splitlines()
+        assert lines == [f"saída de {phase.value}" for phase in FixPhase]
+
+    def test_jobs_one_is_sequential(self, capsys):
+        """Testa que jobs=1 reproduz a execução sequencial."""
+        recorder = Recorder(duration=0.01)
+        pipeline = PhasePipeline(_graph(recorder), jobs=1)
+        runs = pipeline.run()
+        starts = [recorder.windows[r.spec.phase][0] for r in runs]
+        assert starts == sorted(starts)
+        assert all(a.finished <= b.started for a, b in zip(runs, runs[1:]))
+        assert pipeline.elapsed >= sum(r.duration for r in runs)
+
+    def test_failures_do_not_stop_other_phases(self, capsys):
+        """Testa que falhas e exceções não interrompem as demais fases."""
+        recorder = Recorder(duration=0.01, fail={FixPhase.TYPESCRIPT},
+                            crash={FixPhase.DOCUMENTATION})
+        runs = {r.spec.phase: r.result for r in PhasePipeline(_graph(recorder)).run()}
+
+        assert not runs[FixPhase.TYPESCRIPT].success
+        assert not runs[FixPhase.DOCUMENTATION].success
+        assert runs[FixPhase.DOCUMENTATION].errors == ["quebrou"]
+        assert runs[FixPhase.VALIDATION].success
+        assert "interrompida" in capsys.readouterr().out
+
+    def test_unselected_dependencies_are_ignored(self, capsys):
+        """Testa --validate sozinho: dependências fora da seleção não bloqueiam."""
+        recorder = Recorder(duration=0.01)
+        validation = [s for s in _graph(recorder) if s.phase is FixPhase.VALIDATION]
+        runs = PhasePipeline(validation).run()
+        assert [r.spec.phase for r in runs] == [FixPhase.VALIDATION]
+
+    def test_stdout_restored(self):
+        """Testa que sys.stdout volta ao original depois do pipeline."""
+        original = sys.stdout
+        PhasePipeline(_graph(Recorder(duration=0))).run()
+        assert sys.stdout is original
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+TSiJUKEBOX - Offline Bundle Tests
+=================================
+Testes da geração e do consumo de bundles offline (local e espelho HTTP).
+
+Uso:
+    cd scripts && python -m pytest tests/test_offline_bundle.py -v
+"""
+
+import functools
+import http.server
+import io
+import json
+import subprocess
+import sys
+import tarfile
+import threading
+import urllib.request
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'installer'))
+
+from offline_bundle import (
+    BundleBuilder, BundleError, OfflineBundle, BUNDLE_ENV, KIND_GIT_REPO, KIND_NPM_CACHE, KIND_PACKAGE,
+    MANIFEST_NAME, SUMS_NAME, package_name, sha256_file,
+)
+import voice_control_setup
+from voice_control_setup import VoiceControlSetup, VoiceControlConfig
+
+
+@pytest.fixture
+def bundle_dir(tmp_path):
+    """Bundle com um pacote e um modelo Vosk falsos."""
+    source = tmp_path / "src"
+    source.mkdir()
+    model = source / "vosk-model-small-pt-0.3.zip"
+    model.write_bytes(b"zip" * 1000)
+
+    root = tmp_path / "bundle"
+    builder = BundleBuilder(root, "8.0.0", logger=Mock())
+    assert builder.add_url(model.as_uri())
+    pkg_dir = root / "packages"
+    pkg_dir.mkdir()
+    pkg = pkg_dir / "nginx-1.26.2-1-x86_64.pkg.tar.zst"
+    pkg.write_bytes(b"pkg")
+    builder._record(KIND_PACKAGE, pkg.name, pkg, pkgname="nginx")
+    builder.write_manifest()
+    return root
+
+
+@pytest.fixture
+def mirror(bundle_dir):
+    """Serve o bundle por HTTP, como um espelho na LAN."""
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=str(bundle_dir))
+    handler.log_message = lambda *args: None
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+class TestBundleBuilder:
+    """Testa BundleBuilder."""
+
+    def test_manifest_and_sums(self, bundle_dir):
+        manifest = json.loads((bundle_dir / MANIFEST_NAME).read_text())
+        assert manifest["version"] == "8.0.0"
+        sums = (bundle_dir / SUMS_NAME).read_text().splitlines()
+        assert len(sums) == len(manifest["artifacts"]) == 2
+        digest, path = sums[0].split("  ")
+        assert sha256_file(bundle_dir / path) == digest
+
+    def test_checksum_mismatch_rejected(self, tmp_path):
+        source = tmp_path / "file.bin"
+        source.write_bytes(b"data")
+        builder = BundleBuilder(tmp_path / "bundle", "1", logger=Mock())
+        assert not builder.add_url(source.as_uri(), sha256="0" * 64)
+        assert builder.manifest.artifacts == []
+
+    def test_incremental_build_keeps_artifacts(self, bundle_dir, tmp_path):
+        extra = tmp_path / "extra.tar"
+        extra.write_bytes(b"x")
+        builder = BundleBuilder(bundle_dir, "8.0.1", logger=Mock())
+        builder.add_url(extra.as_uri())
+        builder.write_manifest()
+        bundle = OfflineBundle(str(bundle_dir))
+        assert bundle.version == "8.0.1"
+        assert len(bundle.manifest.artifacts) == 3
+
+    def test_git_repo_bundle_clones(self, tmp_path, monkeypatch):
+        for var in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+            monkeypatch.setenv(var, "dev")
+        for var in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+            monkeypatch.setenv(var, "dev@example.com")
+        repo = tmp_path / "repo"
+        subprocess.run(["git", "init", "-q", str(repo)], check=True)
+        (repo / "README.md").write_text("jukebox")
+        subprocess.run(["git", "add", "."], cwd=repo, check=True)
+        subprocess.run(["git", "commit", "-q", "-m", "init"], cwd=repo, check=True)
+
+        builder = BundleBuilder(tmp_path / "bundle", "1", logger=Mock())
+        assert builder.add_git_repo(str(repo))
+        builder.write_manifest()
+        source = OfflineBundle(str(tmp_path / "bundle")).git_repo()
+        assert source and builder.manifest.find(KIND_GIT_REPO, "tsijukebox")
+
+        clone = tmp_path / "clone"
+        subprocess.run(["git", "clone", "-q", str(source), str(clone)], check=True)
+        assert (clone / "README.md").read_text() == "jukebox"
+
+    def test_package_name(self):
+        assert package_name("python-vosk-0.3.45-2-any.pkg.tar.zst") == "python-vosk"
+        assert package_name("nginx-1.26.2-1-x86_64.pkg.tar.xz") == "nginx"
+
+
+class TestOfflineBundle:
+    """Testa o consumo do bundle."""
+
+    def test_local_fetch_in_place(self, bundle_dir):
+        bundle = OfflineBundle(str(bundle_dir))
+        path = bundle.fetch_file("vosk-model-small-pt-0.3.zip")
+        assert path.parent == bundle_dir / "files"
+        assert bundle.package_cache() == bundle_dir / "packages"
+
+    def test_corruption_detected(self, bundle_dir):
+        (bundle_dir / "packages" / "nginx-1.26.2-1-x86_64.pkg.tar.zst").write_bytes(b"bad")
+        bundle = OfflineBundle(str(bundle_dir))
+        assert bundle.verify() == ["packages/nginx-1.26.2-1-x86_64.pkg.tar.zst"]
+        with pytest.raises(BundleError):
+            bundle.package_cache()
+
+    def test_missing_manifest(self, tmp_path):
+        with pytest.raises(BundleError):
+            OfflineBundle(str(tmp_path)).manifest
+
+    @pytest.mark.parametrize("path", ["../../etc/passwd", "/etc/passwd", "files/../../x", "files\\..\\x"])
+    def test_path_outside_bundle_rejected(self, bundle_dir, path):
+        manifest = json.loads((bundle_dir / MANIFEST_NAME).read_text())
+        manifest["artifacts"][0]["path"] = path
+        (bundle_dir / MANIFEST_NAME).write_text(json.dumps(manifest))
+        with pytest.raises(BundleError):
+            OfflineBundle(str(bundle_dir)).manifest
+
+    def test_sync_db_name_with_path_rejected(self, bundle_dir):
+        manifest = json.loads((bundle_dir / MANIFEST_NAME).read_text())
+        manifest["artifacts"][0].update(kind="sync-db", name="../../../etc/shadow")
+        (bundle_dir / MANIFEST_NAME).write_text(json.dumps(manifest))
+        with pytest.raises(BundleError):
+            OfflineBundle(str(bundle_dir)).manifest
+
+    def test_symlink_outside_bundle_rejected(self, bundle_dir, tmp_path):
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (bundle_dir / "files").rename(tmp_path / "moved")
+        (bundle_dir / "files").symlink_to(outside)
+        with pytest.raises(BundleError, match="fora do bundle"):
+            OfflineBundle(str(bundle_dir)).fetch_file("vosk-model-small-pt-0.3.zip")
+
+    def test_mirror_fetch_to_staging(self, mirror, tmp_path):
+        staging = tmp_path / "staging"
+        bundle = OfflineBundle(mirror, staging=staging)
+        assert bundle.verify() == []
+        path = bundle.fetch_file("vosk-model-small-pt-0.3.zip")
+        assert path == staging / "files" / "vosk-model-small-pt-0.3.zip"
+        assert bundle.package_cache() == staging / "packages"
+
+    def test_mirror_reuses_staged_files(self, mirror, tmp_path):
+        staging = tmp_path / "staging"
+        OfflineBundle(mirror, staging=staging).verify()
+        second = OfflineBundle(mirror, staging=staging)
+        with patch('urllib.request.urlopen', wraps=urllib.request.urlopen) as urlopen:
+            second.verify()
+        assert urlopen.call_count == 1  # só o manifest
+
+
+def _npm_bundle(tmp_path, entries):
+    """Bundle só com um cache do npm contendo `entries` (nome, tipo, dados)."""
+    root = tmp_path / "bundle"
+    target = root / "npm" / "frontend.tar"
+    target.parent.mkdir(parents=True)
+    with tarfile.open(target, "w") as tar:
+        for name, kind, data in entries:
+            info = tarfile.TarInfo(name)
+            info.type = kind
+            if kind == tarfile.SYMTYPE:
+                info.linkname = data.decode()
+                data = b""
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    builder = BundleBuilder(root, "8.0.0", logger=Mock())
+    builder._record(KIND_NPM_CACHE, "frontend", target)
+    builder.write_manifest()
+    return OfflineBundle(str(root))
+
+
+class TestNpmCacheExtraction:
+    """Testa a extração do cache do npm."""
+
+    @pytest.fixture(params=["filter", "fallback"])
+    def extraction(self, request, monkeypatch):
+        if request.param == "fallback":
+            monkeypatch.delattr(tarfile, "data_filter", raising=False)
+        return request.param
+
+    def test_extracts_cache(self, tmp_path, extraction):
+        bundle = _npm_bundle(tmp_path, [("./_cacache/index", tarfile.REGTYPE, b"idx")])
+        dest = bundle.extract_npm_cache(tmp_path / "cache")
+        assert (dest / "_cacache" / "index").read_bytes() == b"idx"
+
+    @pytest.mark.parametrize("entry", [
+        ("../fora.txt", tarfile.REGTYPE, b"x"),
+        ("link", tarfile.SYMTYPE, b"/etc/passwd"),
+    ])
+    def test_unsafe_member_rejected(self, tmp_path, extraction, entry):
+        bundle = _npm_bundle(tmp_path, [entry])
+        with pytest.raises(BundleError):
+            bundle.extract_npm_cache(tmp_path / "cache" / "npm")
+        assert not (tmp_path / "cache" / "fora.txt").exists()
+        assert not (tmp_path / "cache" / "npm" / "link").exists()
+
+
+class TestVoiceControlBundle:
+    """Testa o modelo Vosk vindo do bundle."""
+
+    def test_model_from_bundle_without_curl(self, bundle_dir, tmp_path):
+        config = VoiceControlConfig(language='pt-BR', models_dir=tmp_path / "models")
+        config.models_dir.mkdir()
+        setup = VoiceControlSetup(config=config, logger=Mock(), user='root',
+                                  bundle=OfflineBundle(str(bundle_dir)))
+        with patch.object(setup, '_run', return_value=(0, '', '')) as run, \
+                patch.object(Path, 'symlink_to'):
+            assert setup.download_vosk_model()
+        commands = [call.args[0][0] for call in run.call_args_list]
+        assert 'curl' not in commands
+        assert commands == ['unzip']
+
+    def test_main_resolves_bundle_from_env(self, bundle_dir, monkeypatch):
+        monkeypatch.setenv(BUNDLE_ENV, str(bundle_dir))
+        monkeypatch.setattr(sys, 'argv', ['voice_control_setup.py', '--status'])
+        with patch.object(voice_control_setup, 'VoiceControlSetup') as setup, \
+                patch('json.dumps'), \
+                patch('builtins.print'):
+            voice_control_setup.main()
+        bundle = setup.call_args.kwargs['bundle']
+        assert bundle.source == str(bundle_dir)
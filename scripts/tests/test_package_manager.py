@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para package_manager.py
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from installer.package_manager import PackageManagerHandler
+
+
+@pytest.fixture
+def handler():
+    """Handler sem AUR helper e com logger mockado."""
+    with patch('installer.package_manager.shutil.which', return_value=None):
+        return PackageManagerHandler(logger=Mock())
+
+
+class FakePacman:
+    """Simula pacman: -Qq lista instalados, -S instala."""
+
+    def __init__(self, installed, fail=False):
+        self.installed = set(installed)
+        self.fail = fail
+        self.calls = []
+
+    def __call__(self, cmd, sudo=False, capture=True):
+        self.calls.append(cmd)
+        if cmd[:2] == ['pacman', '-Qq']:
+            return 0, '\n'.join(sorted(self.installed)) + '\n', ''
+        if '-S' in cmd:
+            if self.fail:
+                return 1, '', 'error: target not found'
+            self.installed.update(arg for arg in cmd[1:] if not arg.startswith('-'))
+            return 0, '', ''
+        return 1, '', ''
+
+
+class TestPackageManagerHandler:
+    """Testes para PackageManagerHandler."""
+
+    def test_install_packages_single_query(self, handler):
+        """Testa que o estado instalado vem de um único pacman -Qq."""
+        fake = FakePacman(['git'])
+        with patch.object(handler, '_run_command', side_effect=fake):
+            results = handler.install_packages(['git', 'nginx', 'ufw'])
+
+        assert results == {'git': True, 'nginx': True, 'ufw': True}
+        assert not any('-Qi' in cmd for cmd in fake.calls)
+        assert ['pacman', '-S', '--needed', '--noconfirm', 'nginx', 'ufw'] in fake.calls
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+TSiJUKEBOX - Phase Checkpoint Tests
+===================================
+Testes dos checkpoints persistentes de fases do unified-installer.py.
+
+Uso:
+    cd scripts && python -m pytest tests/test_phase_checkpoints.py -v
+"""
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+spec = importlib.util.spec_from_file_location(
+    "unified_installer",
+    Path(__file__).parent.parent / "unified-installer.py"
+)
+unified_installer = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(unified_installer)
+
+InstallPhase = unified_installer.InstallPhase
+InstallConfig = unified_installer.InstallConfig
+PhaseSpec = unified_installer.PhaseSpec
+PhaseScheduler = unified_installer.PhaseScheduler
+PhaseCheckpoints = unified_installer.PhaseCheckpoints
+UnifiedInstaller = unified_installer.UnifiedInstaller
+
+
+class FakeInstaller(UnifiedInstaller):
+    """Instalador com duas fases falsas: NTP e FONTS (depende de NTP)."""
+
+    def __init__(self, config, checkpoint_file, output_file, fail_fonts=False):
+        super().__init__(config)
+        self.checkpoints = PhaseCheckpoints(checkpoint_file)
+        self.validator.load_installed_packages = lambda: {}
+        self.output_file = output_file
+        self.fail_fonts = fail_fonts
+        self.calls = []
+        self.undone = []
+
+    def _fake_ntp(self):
+        self.calls.append("ntp")
+        self.output_file.write_text(self.config.timezone)
+        self._add_rollback(lambda: self.undone.append("ntp"))
+        return True
+
+    def _fake_fonts(self):
+        self.calls.append("fonts")
+        self._add_rollback(lambda: self.undone.append("fonts"))
+        return not self.fail_fonts
+
+
+@pytest.fixture
+def env(tmp_path):
+    """Arquivos temporários e grafo de duas fases."""
+    output = tmp_path / "ntp.conf"
+    specs = [
+        PhaseSpec(InstallPhase.NTP, "_fake_ntp", outputs=(output,)),
+        PhaseSpec(InstallPhase.FONTS, "_fake_fonts", (InstallPhase.NTP,)),
+    ]
+    with patch.object(unified_installer, "LOG_DIR", tmp_path / "logs"), \
+            patch.object(unified_installer, "PHASE_GRAPH", specs):
+        yield tmp_path / "checkpoints.json", output, specs
+
+
+def run_installer(env, config=None, **kwargs):
+    checkpoint_file, output, specs = env
+    installer = FakeInstaller(config or InstallConfig(quiet=True), checkpoint_file, output, **kwargs)
+    failed = PhaseScheduler(specs, jobs=2).run(installer._execute_phase)
+    if failed is not None:
+        installer._abort()
+    return installer, failed
+
+
+# =============================================================================
+# REGISTRO
+# =============================================================================
+
+class TestPhaseCheckpoints:
+    """Testa PhaseCheckpoints."""
+
+    def test_record_persists(self, tmp_path):
+        path = tmp_path / "ck.json"
+        PhaseCheckpoints(path).record(InstallPhase.NTP, "abc", (), ok=True)
+        assert PhaseCheckpoints(path).is_current(InstallPhase.NTP, "abc")
+
+    def test_fingerprint_mismatch(self, tmp_path):
+        store = PhaseCheckpoints(tmp_path / "ck.json")
+        store.record(InstallPhase.NTP, "abc", (), ok=True)
+        assert not store.is_current(InstallPhase.NTP, "outro")
+        assert store.is_current(InstallPhase.NTP, "outro", resume=True)
+
+    def test_failed_phase_not_current(self, tmp_path):
+        store = PhaseCheckpoints(tmp_path / "ck.json")
+        store.record(InstallPhase.NTP, None, (), ok=False)
+        assert not store.is_current(InstallPhase.NTP, None, resume=True)
+
+    def test_modified_output_invalidates(self, tmp_path):
+        output = tmp_path / "site.conf"
+        output.write_text("original")
+        store = PhaseCheckpoints(tmp_path / "ck.json")
+        store.record(InstallPhase.NGINX, "abc", (output,), ok=True)
+        output.write_text("editado")
+        assert not store.is_current(InstallPhase.NGINX, "abc", resume=True)
+
+    def test_other_version_discarded(self, tmp_path):
+        path = tmp_path / "ck.json"
+        path.write_text(json.dumps({"version": "0.0.1", "phases": {"NTP": {}}}))
+        assert PhaseCheckpoints(path).phases == {}
+
+
+# =============================================================================
+# INSTALADOR
+# =============================================================================
+
+class TestInstallerCheckpoints:
+    """Testa pulo, invalidação e retomada de fases."""
+
+    def test_rerun_skips_unchanged_phases(self, env):
+        run_installer(env)
+        installer, failed = run_installer(env)
+        assert failed is None
+        assert installer.calls == []
+        assert installer.completed_phases == [InstallPhase.NTP, InstallPhase.FONTS]
+
+    def test_config_change_reruns_phase_and_dependents(self, env):
+        run_installer(env)
+        installer, _ = run_installer(env, InstallConfig(quiet=True, timezone="UTC"))
+        assert installer.calls == ["ntp", "fonts"]
+
+    def test_deleted_output_reruns_phase(self, env):
+        _, output, _ = env
+        run_installer(env)
+        output.unlink()
+        installer, _ = run_installer(env)
+        assert "ntp" in installer.calls
+
+    def test_failure_keeps_completed_and_resumes(self, env):
+        installer, failed = run_installer(env, fail_fonts=True)
+        assert failed.phase == InstallPhase.FONTS
+        assert installer.undone == ["fonts"]
+
+        resumed, failed = run_installer(env, InstallConfig(quiet=True, resume=True))
+        assert failed is None
+        assert resumed.calls == ["fonts"]
+
+    def test_without_checkpoints_full_rollback(self, env):
+        checkpoint_file, output, specs = env
+        installer = FakeInstaller(InstallConfig(quiet=True), checkpoint_file, output, fail_fonts=True)
+        installer.checkpoints = None
+        PhaseScheduler(specs, jobs=1).run(installer._execute_phase)
+        installer._abort()
+        assert installer.undone == ["fonts", "ntp"]
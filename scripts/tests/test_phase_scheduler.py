@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+TSiJUKEBOX - Phase Scheduler Tests
+==================================
+Testes do agendador paralelo de fases do unified-installer.py.
+
+Uso:
+    cd scripts && python -m pytest tests/test_phase_scheduler.py -v
+"""
+
+import importlib.util
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+spec = importlib.util.spec_from_file_location(
+    "unified_installer",
+    Path(__file__).parent.parent / "unified-installer.py"
+)
+unified_installer = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(unified_installer)
+
+InstallPhase = unified_installer.InstallPhase
+InstallConfig = unified_installer.InstallConfig
+PhaseSpec = unified_installer.PhaseSpec
+PhaseScheduler = unified_installer.PhaseScheduler
+PHASE_GRAPH = unified_installer.PHASE_GRAPH
+PackagePlan = unified_installer.PackagePlan
+UnifiedInstaller = unified_installer.UnifiedInstaller
+build_package_plan = unified_installer.build_package_plan
+
+
+class Recorder:
+    """Executor falso que registra início/fim e a concorrência por recurso."""
+
+    def __init__(self, duration: float = 0.05, fail=()):
+        self.duration = duration
+        self.fail = set(fail)
+        self.events = []
+        self.lock = threading.Lock()
+        self.active = set()
+        self.max_active = 0
+
+    def __call__(self, spec):
+        with self.lock:
+            self.events.append(("start", spec.phase))
+            self.active.add(spec.phase)
+            self.max_active = max(self.max_active, len(self.active))
+        time.sleep(self.duration)
+        with self.lock:
+            self.active.discard(spec.phase)
+            self.events.append(("end", spec.phase))
+        return spec.phase not in self.fail
+
+    def index(self, kind, phase):
+        return self.events.index((kind, phase))
+
+
+# =============================================================================
+# AGENDADOR
+# =============================================================================
+
+class TestPhaseScheduler:
+    """Testa PhaseScheduler."""
+
+    def test_independent_phases_run_concurrently(self):
+        specs = [PhaseSpec(InstallPhase.NTP, "a"), PhaseSpec(InstallPhase.FONTS, "b"),
+                 PhaseSpec(InstallPhase.VOICE_CONTROL, "c")]
+        recorder = Recorder(duration=0.1)
+        started = time.monotonic()
+        assert PhaseScheduler(specs, jobs=3).run(recorder) is None
+        assert recorder.max_active == 3
+        assert time.monotonic() - started < 0.25
+
+    def test_conflicting_resources_are_serialized(self):
+        pacman = frozenset({"pacman"})
+        specs = [PhaseSpec(InstallPhase.FONTS, "a", (), pacman),
+                 PhaseSpec(InstallPhase.UFW, "b", (), pacman),
+                 PhaseSpec(InstallPhase.NTP, "c")]
+        recorder = Recorder()
+        PhaseScheduler(specs, jobs=3).run(recorder)
+        assert recorder.index("end", InstallPhase.FONTS) < recorder.index("start", InstallPhase.UFW)
+        assert recorder.index("start", InstallPhase.NTP) < recorder.index("end", InstallPhase.FONTS)
+
+    def test_dependencies_respected(self):
+        specs = [PhaseSpec(InstallPhase.APP_CLONE, "a"),
+                 PhaseSpec(InstallPhase.FRONTEND_BUILD, "b", (InstallPhase.APP_CLONE,))]
+        recorder = Recorder()
+        PhaseScheduler(specs, jobs=4).run(recorder)
+        assert recorder.index("end", InstallPhase.APP_CLONE) < recorder.index("start", InstallPhase.FRONTEND_BUILD)
+
+    def test_single_job_keeps_declared_order(self):
+        recorder = Recorder(duration=0)
+        PhaseScheduler(PHASE_GRAPH, jobs=1).run(recorder)
+        starts = [phase for kind, phase in recorder.events if kind == "start"]
+        assert starts == [s.phase for s in PHASE_GRAPH]
+
+    def test_failure_stops_new_phases(self):
+        specs = [PhaseSpec(InstallPhase.SYSTEM_CHECK, "a"),
+                 PhaseSpec(InstallPhase.NODEJS, "b", (InstallPhase.SYSTEM_CHECK,)),
+                 PhaseSpec(InstallPhase.NTP, "c", (InstallPhase.SYSTEM_CHECK,))]
+        recorder = Recorder(fail={InstallPhase.SYSTEM_CHECK})
+        failed = PhaseScheduler(specs, jobs=2).run(recorder)
+        assert failed.phase == InstallPhase.SYSTEM_CHECK
+        assert ("start", InstallPhase.NODEJS) not in recorder.events
+
+    def test_exception_counts_as_failure(self):
+        def boom(spec):
+            raise RuntimeError("falhou")
+        failed = PhaseScheduler([PhaseSpec(InstallPhase.NTP, "a")]).run(boom)
+        assert failed.phase == InstallPhase.NTP
+
+    def test_unknown_dependency_rejected(self):
+        with pytest.raises(ValueError):
+            PhaseScheduler([PhaseSpec(InstallPhase.NTP, "a", (InstallPhase.UFW,))])
+
+
+# =============================================================================
+# GRAFO DE FASES
+# =============================================================================
+
+class TestPhaseGraph:
+    """Testa a declaração PHASE_GRAPH."""
+
+    def test_covers_every_phase_once(self):
+        assert [s.phase for s in PHASE_GRAPH] == list(InstallPhase)
+
+    def test_methods_exist(self):
+        for phase_spec in PHASE_GRAPH:
+            assert callable(getattr(UnifiedInstaller, phase_spec.method))
+
+    def test_dependencies_declared_before(self):
+        seen = set()
+        for phase_spec in PHASE_GRAPH:
+            assert set(phase_spec.depends) <= seen
+            seen.add(phase_spec.phase)
+
+    def test_resources_have_limits(self):
+        for phase_spec in PHASE_GRAPH:
+            assert phase_spec.resources <= set(unified_installer.RESOURCE_LIMITS)
+
+
+# =============================================================================
+# INTEGRAÇÃO COM O INSTALADOR
+# =============================================================================
+
+class TestInstallerScheduling:
+    """Testa log ordenado e rollback sob execução paralela."""
+
+    @pytest.fixture
+    def installer(self):
+        return UnifiedInstaller(InstallConfig(dry_run=True, jobs=4))
+
+    def test_output_flushed_in_declared_order(self, installer, capsys):
+        specs = [PhaseSpec(InstallPhase.NTP, "_slow"), PhaseSpec(InstallPhase.FONTS, "_fast")]
+
+        def make(name, delay):
+            def phase():
+                installer.logger.info(f"{name} 1")
+                time.sleep(delay)
+                installer.logger.info(f"{name} 2")
+                return True
+            return phase
+
+        installer._slow = make("lenta", 0.1)
+        installer._fast = make("rapida", 0)
+        with patch.object(unified_installer, "PHASE_GRAPH", specs):
+            PhaseScheduler(specs, jobs=2).run(
+                installer._execute_phase, lambda s, ok: installer._flush_phase_output(specs))
+        out = capsys.readouterr().out
+        order = [out.index(t) for t in ("lenta 1", "lenta 2", "rapida 1", "rapida 2")]
+        assert order == sorted(order)
+
+    def test_rollback_in_reverse_completion_order(self, installer):
+        specs = [PhaseSpec(InstallPhase.NTP, "_slow"), PhaseSpec(InstallPhase.FONTS, "_fast")]
+        undone = []
+
+        def make(name, delay):
+            def phase():
+                installer._add_rollback(lambda: undone.append(name))
+                time.sleep(delay)
+                return True
+            return phase
+
+        installer._slow = make("lenta", 0.1)
+        installer._fast = make("rapida", 0)
+        installer.logger.quiet = True
+        with patch.object(unified_installer, "PHASE_GRAPH", specs):
+            PhaseScheduler(specs, jobs=2).run(installer._execute_phase)
+        installer._rollback()
+        assert undone == ["lenta", "rapida"]
+
+
+# =============================================================================
+# PLANO DE PACOTES
+# =============================================================================
+
+class FakePacman:
+    """run_command falso: `pacman -Q` lista o estado, `pacman -S --needed` instala."""
+
+    def __init__(self, installed):
+        self.installed = dict(installed)
+        self.calls = []
+
+    def __call__(self, cmd, **kwargs):
+        self.calls.append(cmd)
+        if cmd[:2] == ["pacman", "-Q"]:
+            return 0, "".join(f"{name} {version}\n" for name, version in self.installed.items()), ""
+        if cmd[:3] == ["pacman", "-S", "--needed"]:
+            self.installed.update((pkg, "1.0") for pkg in cmd[4:])
+        if cmd[:3] == ["pacman", "-U", "--needed"]:
+            self.installed.update((Path(pkg).name.split("-")[0], "1.0") for pkg in cmd[4:])
+        return 0, "", ""
+
+
+class FakeBundle:
+    """Bundle offline falso com pacotes AUR pré-compilados."""
+
+    def __init__(self, names):
+        self.names = names
+        self.manifest = SimpleNamespace(of_kind=lambda kind: [SimpleNamespace(name=n) for n in names])
+
+    def aur_packages(self, names):
+        return [Path(f"/bundle/{n}-1.0-1-x86_64.pkg.tar.zst") for n in self.names if n in names]
+
+
+class TestPackagePlan:
+    """Testa o plano de pacotes e o rollback do que a transação instalou."""
+
+    def test_phase_lists_are_shared(self):
+        plan = build_package_plan(InstallConfig(install_dev_tools=True, install_kiosk=True))
+        assert plan.phases[InstallPhase.NODEJS] == (unified_installer.NODEJS_PACKAGES, [])
+        assert plan.phases[InstallPhase.KIOSK][0] == unified_installer.KIOSK_PACKAGES
+        assert plan.repo.count("git") == 1
+
+    def test_record_installed_assigns_first_owner(self):
+        plan = build_package_plan(InstallConfig(install_dev_tools=True))
+        before = {"nodejs": "1", "vim": "1"}
+        after = {**before, "npm": "1", "git": "1", "ufw": "1"}
+        plan.record_installed(before, after)
+        assert plan.installed[InstallPhase.NODEJS] == ["npm"]
+        assert plan.installed[InstallPhase.UFW] == ["ufw"]
+        assert plan.installed[InstallPhase.DEV_TOOLS] == ["git"]
+        assert InstallPhase.APP_CLONE not in plan.installed
+
+    def test_failed_phase_removes_batch_installed_packages(self):
+        installer = UnifiedInstaller(InstallConfig(jobs=1, checkpoints=False, quiet=True))
+        pacman = FakePacman({"nginx": "1.0"})
+        specs = [PhaseSpec(InstallPhase.NODEJS, "_fails"), PhaseSpec(InstallPhase.NGINX, "_works")]
+        installer._fails = lambda: False
+        installer._works = lambda: True
+
+        with patch.object(unified_installer, "run_command", pacman), \
+                patch.object(unified_installer, "PHASE_GRAPH", specs):
+            installer._install_package_plan()
+            PhaseScheduler(specs, jobs=1).run(installer._execute_phase)
+            installer._abort()
+
+        assert installer.package_plan.installed[InstallPhase.NODEJS] == ["nodejs", "npm"]
+        assert InstallPhase.NGINX not in installer.package_plan.installed
+        removals = [cmd[3:] for cmd in pacman.calls if cmd[:2] == ["pacman", "-Rns"]]
+        assert ["nodejs", "npm"] in removals
+        # NGINX rodou e não instalou nada; as demais fases do plano nunca rodaram
+        assert not any("nginx" in packages for packages in removals)
+        assert len(removals) == len(installer.package_plan.installed)
+
+    def test_unexecuted_phases_remove_batch_installed_packages(self):
+        installer = UnifiedInstaller(InstallConfig(jobs=1, checkpoints=False, quiet=True))
+        pacman = FakePacman({})
+        specs = [PhaseSpec(InstallPhase.NODEJS, "_fails"),
+                 PhaseSpec(InstallPhase.NGINX, "_works", depends=(InstallPhase.NODEJS,))]
+        installer._fails = lambda: False
+        installer._works = lambda: True
+
+        with patch.object(unified_installer, "run_command", pacman), \
+                patch.object(unified_installer, "PHASE_GRAPH", specs):
+            installer._install_package_plan()
+            PhaseScheduler(specs, jobs=1).run(installer._execute_phase)
+            installer._abort()
+
+        assert InstallPhase.NGINX not in installer._phase_output
+        removals = [cmd[3:] for cmd in pacman.calls if cmd[:2] == ["pacman", "-Rns"]]
+        assert ["nodejs", "npm"] in removals
+        assert installer.package_plan.installed[InstallPhase.NGINX] in removals
+
+    def test_bundled_aur_packages_are_recorded(self):
+        installer = UnifiedInstaller(InstallConfig(jobs=1, checkpoints=False, quiet=True))
+        installer.bundle = FakeBundle(["spotify"])
+        pacman = FakePacman({})
+        plan = PackagePlan(phases={InstallPhase.SPOTIFY: ([], ["spotify"])})
+
+        with patch.object(unified_installer, "run_command", pacman), \
+                patch.object(unified_installer, "build_package_plan", lambda config: plan):
+            installer._install_package_plan()
+
+        assert installer.package_plan.installed == {InstallPhase.SPOTIFY: ["spotify"]}
+        assert installer.validator.installed_packages == {"spotify": "1.0"}
+
+    def test_failed_baseline_query_records_nothing(self):
+        installer = UnifiedInstaller(InstallConfig(jobs=1, checkpoints=False, quiet=True))
+        pacman = FakePacman({"nginx": "1.0"})
+        queries = []
+
+        def run_command(cmd, **kwargs):
+            if cmd[:2] == ["pacman", "-Q"]:
+                queries.append(cmd)
+                if len(queries) == 1:
+                    return 1, "", "database locked"
+            return pacman(cmd, **kwargs)
+
+        with patch.object(unified_installer, "run_command", run_command):
+            installer._install_package_plan()
+            installer._abort()
+
+        assert installer.package_plan.installed == {}
+        assert not any(cmd[:2] == ["pacman", "-Rns"] for cmd in pacman.calls)
+
+
+# =============================================================================
+# REPOSITÓRIO NO BUNDLE OFFLINE
+# =============================================================================
+
+class GitBundle:
+    """Bundle offline falso com (ou sem) o `git bundle` da aplicação."""
+
+    def __init__(self, repo):
+        self.repo = repo
+
+    def find(self, kind, name):
+        return self.repo if kind == unified_installer.KIND_GIT_REPO else None
+
+    def git_repo(self, name):
+        return self.repo
+
+
+class TestBundledAppRepo:
+    """Testa o clone da aplicação a partir do bundle offline."""
+
+    @pytest.fixture
+    def installer(self):
+        installer = UnifiedInstaller(InstallConfig(dry_run=True, jobs=1, checkpoints=False, quiet=True))
+        installer.validator.check_command = lambda cmd: True
+        return installer
+
+    def test_clone_from_bundle_then_point_origin_at_github(self, installer, tmp_path):
+        installer.bundle = GitBundle(Path("/bundle/repos/tsijukebox.bundle"))
+        pacman = FakePacman({})
+        with patch.object(unified_installer, "run_command", pacman), \
+                patch.object(unified_installer, "INSTALL_DIR", tmp_path / "app"):
+            assert installer._phase_app_clone()
+        assert ["git", "clone", "/bundle/repos/tsijukebox.bundle", str(tmp_path / "app")] in pacman.calls
+        assert ["git", "remote", "set-url", "origin", unified_installer.GITHUB_REPO] in pacman.calls
+
+    def test_update_pulls_from_bundle(self, installer, tmp_path):
+        installer.bundle = GitBundle(Path("/bundle/repos/tsijukebox.bundle"))
+        pacman = FakePacman({})
+        with patch.object(unified_installer, "run_command", pacman), \
+                patch.object(unified_installer, "INSTALL_DIR", tmp_path):
+            assert installer._phase_app_clone()
+        assert pacman.calls == [["git", "pull", "/bundle/repos/tsijukebox.bundle", "HEAD"]]
+
+    def test_internet_still_checked_without_bundled_repo(self, installer):
+        installer.bundle = GitBundle(None)
+        installer.validator.check_root = lambda: True
+        with patch.object(installer.validator, "check_internet", return_value=False) as check:
+            assert not installer.run()
+        check.assert_called_once()
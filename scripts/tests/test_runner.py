@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para installer/utils/runner.py
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from installer.utils.runner import (
+    CommandRunner,
+    PrivilegedBatch,
+    coalesce,
+    execute_plan,
+)
+
+
+@pytest.fixture
+def runner():
+    return CommandRunner()
+
+
+class TestCommandRunner:
+    """Testes para CommandRunner."""
+
+    def test_unpacks_like_tuple(self, runner):
+        """Testa compatibilidade com (código, stdout, stderr)."""
+        code, out, err = runner.run([sys.executable, "-c", "import sys; print('ok'); sys.exit(3)"])
+        assert (code, out, err) == (3, "ok", "")
+
+    def test_streaming_callback(self, runner):
+        """Testa que cada linha chega ao callback com o nome do stream."""
+        lines = []
+        runner.run([sys.executable, "-c", "import sys; print('a'); print('b', file=sys.stderr)"],
+                   on_line=lambda name, line: lines.append((name, line)))
+        assert sorted(lines) == [("stderr", "b"), ("stdout", "a")]
+
+    def test_bounded_tail(self, runner):
+        """Testa que tail_lines mantém só o final da saída."""
+        result = runner.run([sys.executable, "-c", "for i in range(10000): print(i)"], tail_lines=3)
+        assert result.stdout == "9997\n9998\n9999"
+        assert result.truncated
+
+    def test_timeout_kills_process_group(self, runner, tmp_path):
+        """Testa que o timeout mata também os processos filhos."""
+        marker = tmp_path / "child-survived"
+        script = f"sleep 2 && touch {marker}"
+        started = time.monotonic()
+
+        result = runner.run(["sh", "-c", f"({script}) & wait"], timeout=0.5)
+
+        assert result.timed_out
+        assert result.returncode != 0
+        assert time.monotonic() - started < 2
+        time.sleep(2.2)
+        assert not marker.exists()
+
+    def test_cancel(self, runner):
+        """Testa cancelamento via threading.Event."""
+        cancel = threading.Event()
+        threading.Timer(0.3, cancel.set).start()
+
+        result = runner.run(["sleep", "10"], cancel=cancel)
+
+        assert result.cancelled
+        assert result.duration < 5
+
+    def test_command_not_found(self, runner):
+        """Testa comando inexistente."""
+        code, _, err = runner.run(["tsijukebox-nao-existe"])
+        assert code == 127
+        assert "not found" in err
+
+    def test_stdin_input(self, runner):
+        """Testa envio de texto pelo stdin."""
+        result = runner.run(["cat"], input="olá\n")
+        assert result.stdout == "olá"
+
+    def test_dry_run(self, tmp_path):
+        """Testa que dry-run não executa nada."""
+        target = tmp_path / "x"
+        result = CommandRunner(dry_run=True).run(["touch", str(target)])
+        assert result.ok
+        assert not target.exists()
+
+
+class TestPrivilegedBatch:
+    """Testes para coalescência e execução em lote."""
+
+    def test_coalesce_adjacent_systemctl(self):
+        """Testa fusão de systemctl com mesmo verbo e flags."""
+        plan = coalesce([
+            ["systemctl", "enable", "a"],
+            ["systemctl", "enable", "b"],
+            ["systemctl", "--user", "enable", "c"],
+            ["systemctl", "start", "a"],
+            ["systemctl", "start", "a"],
+        ])
+        assert plan == [
+            ["systemctl", "enable", "a", "b"],
+            ["systemctl", "--user", "enable", "c"],
+            ["systemctl", "start", "a"],
+        ]
+
+    def test_coalesce_flags_after_verb(self):
+        """Testa que flags depois do verbo fazem parte da chave de fusão."""
+        plan = coalesce([
+            ["systemctl", "enable", "--now", "a"],
+            ["systemctl", "enable", "b"],
+            ["systemctl", "enable", "c", "--now"],
+            ["systemctl", "enable", "--now", "d"],
+        ])
+        assert plan == [
+            ["systemctl", "enable", "--now", "a"],
+            ["systemctl", "enable", "b"],
+            ["systemctl", "enable", "--now", "c", "d"],
+        ]
+
+    def test_coalesce_keeps_order_barriers(self):
+        """Testa que comandos intermediários impedem a fusão."""
+        plan = coalesce([
+            ["systemctl", "enable", "a"],
+            ["systemctl", "daemon-reload"],
+            ["systemctl", "enable", "b"],
+        ])
+        assert len(plan) == 3
+
+    def test_coalesce_usermod(self):
+        """Testa fusão de grupos do mesmo usuário."""
+        plan = coalesce([
+            ["usermod", "-aG", "audio", "pi"],
+            ["usermod", "-aG", "video,audio", "pi"],
+            ["usermod", "-aG", "audio", "root"],
+        ])
+        assert plan == [["usermod", "-aG", "audio,video", "pi"], ["usermod", "-aG", "audio", "root"]]
+
+    def test_native_file_ops(self, tmp_path):
+        """Testa mkdir/chmod/ln executados sem fork."""
+        target = tmp_path / "a" / "b"
+        link = tmp_path / "link"
+        link.symlink_to(tmp_path)
+
+        results = execute_plan([
+            ["mkdir", "-p", str(target)],
+            ["chmod", "700", str(target)],
+            ["ln", "-sf", str(target), str(link)],
+        ])
+
+        assert all(r.returncode == 0 for r in results)
+        assert target.stat().st_mode & 0o777 == 0o700
+        assert link.resolve() == target
+
+    def test_batch_runs_in_process(self, tmp_path):
+        """Testa o lote sem sudo e o relatório de falhas."""
+        batch = PrivilegedBatch(sudo=False)
+        batch.add(["sudo", "mkdir", "-p", str(tmp_path / "ok")])
+        batch.add(["chmod", "644", str(tmp_path / "nao-existe")])
+
+        assert not batch.run()
+        assert [r.returncode == 0 for r in batch.results] == [True, False]
+        assert (tmp_path / "ok").is_dir()
+
+    def test_unknown_chown_user_fails_only_that_command(self, tmp_path):
+        """Testa que usuário inexistente no chown não derruba o lote."""
+        results = execute_plan([
+            ["chown", "usuario-inexistente-tsijukebox", str(tmp_path)],
+            ["mkdir", "-p", str(tmp_path / "depois")],
+        ])
+
+        assert [r.returncode for r in results] == [1, 0]
+        assert (tmp_path / "depois").is_dir()
+
+    def test_helper_protocol(self, tmp_path, monkeypatch):
+        """Testa o processo auxiliar JSON sem sudo."""
+        batch = PrivilegedBatch(sudo=True)
+        original = batch.runner.run
+        monkeypatch.setattr(batch.runner, "run", lambda cmd, **kw: original(cmd[1:], **kw))
+        batch.add(["mkdir", "-p", str(tmp_path / "via-helper")])
+
+        assert batch.run()
+        assert (tmp_path / "via-helper").is_dir()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
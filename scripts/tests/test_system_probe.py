@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para installer/system_probe.py
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'installer'))
+
+import system_probe
+from system_probe import SystemProbe, parse_cpuinfo, probe_system, read_os_release
+from hardware_analyzer import HardwareAnalyzer
+
+CPUINFO_HT = """processor\t: 0
+model name\t: Intel(R) Core(TM) i5-8250U CPU @ 1.60GHz
+physical id\t: 0
+core id\t\t: 0
+cpu cores\t: 2
+
+processor\t: 1
+model name\t: Intel(R) Core(TM) i5-8250U CPU @ 1.60GHz
+physical id\t: 0
+core id\t\t: 1
+cpu cores\t: 2
+
+processor\t: 2
+model name\t: Intel(R) Core(TM) i5-8250U CPU @ 1.60GHz
+physical id\t: 0
+core id\t\t: 0
+cpu cores\t: 2
+
+processor\t: 3
+model name\t: Intel(R) Core(TM) i5-8250U CPU @ 1.60GHz
+physical id\t: 0
+core id\t\t: 1
+cpu cores\t: 2
+"""
+
+CPUINFO_PI = """processor\t: 0
+BogoMIPS\t: 108.00
+
+processor\t: 1
+BogoMIPS\t: 108.00
+
+Hardware\t: BCM2835
+Model\t\t: Raspberry Pi 4 Model B Rev 1.4
+"""
+
+
+@pytest.fixture(autouse=True)
+def reset_memory():
+    """Isola o cache em memória entre testes."""
+    system_probe._memory = None
+    yield
+    system_probe._memory = None
+
+
+@pytest.fixture
+def fake_probe(monkeypatch):
+    """run_probe contado, com boot_id fixo."""
+    calls = []
+
+    def run():
+        calls.append(1)
+        return SystemProbe(timestamp=time.time(), boot_id="boot-1", cpu_model="Fake CPU",
+                           ram_total_kb=4 * 1024 * 1024, audio_cards=1)
+
+    monkeypatch.setattr(system_probe, "run_probe", run)
+    monkeypatch.setattr(system_probe, "_read", lambda path, default="": "boot-1" if "boot_id" in path else default)
+    monkeypatch.setattr(system_probe, "read_meminfo", lambda: (8 * 1024 * 1024, 1024))
+    monkeypatch.setattr(system_probe, "read_disk", lambda path="/": (100, 50))
+    return calls
+
+
+class TestParsers:
+    """Testa a leitura de /proc."""
+
+    def test_cpuinfo_physical_cores(self):
+        """Testa cores físicos únicos com hyper-threading."""
+        assert parse_cpuinfo(CPUINFO_HT) == ("Intel(R) Core(TM) i5-8250U CPU @ 1.60GHz", 2, 4)
+
+    def test_cpuinfo_arm(self):
+        """Testa cpuinfo ARM sem 'model name' nem 'core id'."""
+        model, cores, threads = parse_cpuinfo(CPUINFO_PI)
+        assert (cores, threads) == (2, 2)
+        assert model == "BCM2835"
+
+    def test_os_release(self, tmp_path):
+        """Testa parse do os-release com aspas e comentários."""
+        path = tmp_path / "os-release"
+        path.write_text('# comentário\nNAME="Arch Linux"\nID=arch\nID_LIKE="arch"\n')
+        assert read_os_release(str(path)) == {"NAME": "Arch Linux", "ID": "arch", "ID_LIKE": "arch"}
+
+    def test_real_probe_is_fast(self, tmp_path):
+        """Testa a sondagem real da máquina de testes."""
+        started = time.perf_counter()
+        probe = probe_system(refresh=True, path=tmp_path / "probe.json")
+        assert probe.cpu_threads >= 1
+        assert time.perf_counter() - started < 2
+
+
+class TestSnapshot:
+    """Testa o cache em JSON."""
+
+    def test_snapshot_reused_across_processes(self, fake_probe, tmp_path):
+        """Testa que um snapshot em disco evita nova sondagem."""
+        path = tmp_path / "probe.json"
+        probe_system(path=path)
+        system_probe._memory = None  # simula outro processo
+
+        probe = probe_system(path=path)
+
+        assert len(fake_probe) == 1
+        assert probe.cpu_model == "Fake CPU"
+
+    def test_volatile_fields_refreshed(self, fake_probe, tmp_path):
+        """Testa que memória e disco livres são relidos do cache."""
+        probe_system(path=tmp_path / "probe.json")
+        probe = probe_system(path=tmp_path / "probe.json")
+        assert len(fake_probe) == 1
+        assert probe.ram_available_kb == 1024
+        assert probe.disk_free_bytes == 50
+
+    def test_expired_snapshot(self, fake_probe, tmp_path):
+        """Testa que snapshot fora do TTL é refeito."""
+        path = tmp_path / "probe.json"
+        probe_system(path=path)
+        data = json.loads(path.read_text())
+        data["timestamp"] -= 3600
+        path.write_text(json.dumps(data))
+        system_probe._memory = None
+
+        probe_system(path=path, ttl=60)
+
+        assert len(fake_probe) == 2
+
+    def test_other_boot_invalidates(self, fake_probe, tmp_path):
+        """Testa que snapshot de outro boot é descartado."""
+        path = tmp_path / "probe.json"
+        probe_system(path=path)
+        data = json.loads(path.read_text())
+        data["boot_id"] = "boot-0"
+        path.write_text(json.dumps(data))
+        system_probe._memory = None
+
+        probe_system(path=path)
+
+        assert len(fake_probe) == 2
+
+    def test_refresh_forces_probe(self, fake_probe, tmp_path):
+        """Testa refresh=True."""
+        path = tmp_path / "probe.json"
+        probe_system(path=path)
+        probe_system(path=path, refresh=True)
+        assert len(fake_probe) == 2
+
+
+class TestConsumers:
+    """Testa os consumidores da sonda."""
+
+    def test_hardware_analyzer_uses_probe(self, fake_probe, tmp_path):
+        """Testa HardwareAnalyzer.detect_hardware sobre a sonda."""
+        with patch.object(system_probe, "_snapshot_path", return_value=tmp_path / "probe.json"):
+            hw = HardwareAnalyzer().detect_hardware()
+        assert hw.cpu_model == "Fake CPU"
+        assert hw.ram_gb == pytest.approx(4.0)
+        assert hw.has_audio_device
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
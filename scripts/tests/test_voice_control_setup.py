@@ -79,6 +79,20 @@ class TestVoiceControlSetup:
         result = setup.download_vosk_model()
         assert result is True
     
+    def test_download_vosk_model_passes_digest(self, tmp_path):
+        """Testa que o SHA-256 fixado do modelo é conferido pelo Downloader."""
+        config = VoiceControlConfig(language='pt-BR', models_dir=tmp_path)
+        setup = VoiceControlSetup(config=config, logger=Mock(), user='root')
+        digest = 'ab' * 32
+        model = {'url': 'https://example.com/vosk-model-x.zip', 'sha256': digest}
+        with patch.dict(VoiceControlSetup.VOSK_MODELS['pt-BR'], {'small': model}), \
+                patch('voice_control_setup.Downloader') as downloader, \
+                patch.object(setup, '_run', return_value=(0, '', '')), \
+                patch.object(Path, 'symlink_to'):
+            assert setup.download_vosk_model()
+        downloader.return_value.download.assert_called_once_with(
+            'https://example.com/vosk-model-x.zip', Path('/tmp/vosk-model-x.zip'), sha256=digest)
+    
     def test_install_whisper_dry_run(self, setup_whisper):
         """Testa instalação de Whisper em dry-run."""
         result = setup_whisper.install_whisper()
@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para o runtime do YouTube Music Bridge
+(fila de reprodução, broadcaster, cache da API e prefetch)
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'installer'))
+
+from ytmusic_runtime import Broadcaster, CachedYTMusic, DiskCache, Prefetcher, QueueEngine, QueueEntry, TTLCache
+from ytmusic_runtime.prefetch import resize_thumbnail_url
+
+
+def _ids(queue: QueueEngine):
+    return [entry.video_id for entry in queue]
+
+
+class TestQueueEngine:
+    """Testes para QueueEngine."""
+
+    @pytest.fixture
+    def queue(self):
+        queue = QueueEngine()
+        for video_id in ('a', 'b', 'c'):
+            queue.add(QueueEntry(video_id=video_id, entry_id=video_id))
+        return queue
+
+    def test_add_appends_in_order(self, queue):
+        """Testa que itens são adicionados ao fim."""
+        assert _ids(queue) == ['a', 'b', 'c']
+        assert len(queue) == 3
+
+    def test_add_front_and_after(self, queue):
+        """Testa inserção no início e após um item."""
+        queue.add(QueueEntry(video_id='x', entry_id='x'), front=True)
+        queue.add(QueueEntry(video_id='y', entry_id='y'), after='b')
+
+        assert _ids(queue) == ['x', 'a', 'b', 'y', 'c']
+
+    def test_remove_returns_delta(self, queue):
+        """Testa remoção por entry_id e delta gerado."""
+        version = queue.version
+        delta = queue.remove('b')
+
+        assert _ids(queue) == ['a', 'c']
+        assert delta == {'op': 'remove', 'version': version + 1, 'entry_id': 'b'}
+
+    def test_remove_unknown_raises(self, queue):
+        """Testa remoção de item inexistente."""
+        with pytest.raises(KeyError):
+            queue.remove('nope')
+
+    def test_move(self, queue):
+        """Testa mover para o início e para depois de outro item."""
+        queue.move('c')
+        assert _ids(queue) == ['c', 'a', 'b']
+
+        queue.move('c', after='b')
+        assert _ids(queue) == ['a', 'b', 'c']
+
+    def test_move_after_itself_rejected(self, queue):
+        """Testa que mover após si mesmo é rejeitado."""
+        with pytest.raises(ValueError):
+            queue.move('a', after='a')
+
+    def test_advance_sets_now_playing(self, queue):
+        """Testa avanço para o próximo item."""
+        delta = queue.advance()
+
+        assert delta['op'] == 'advance'
+        assert delta['entry_id'] == 'a'
+        assert queue.now_playing.track['video_id'] == 'a'
+        assert queue.now_playing.is_playing is True
+        assert _ids(queue) == ['b', 'c']
+
+    def test_advance_empty_queue(self):
+        """Testa avanço com fila vazia."""
+        queue = QueueEngine()
+        delta = queue.advance()
+
+        assert delta['entry_id'] is None
+        assert queue.now_playing.is_playing is False
+
+    def test_set_playback_delta_only_changed_fields(self, queue):
+        """Testa que o delta de playback contém só o que mudou."""
+        queue.set_now_playing({'video_id': 'a'})
+        delta = queue.set_playback(is_playing=True)
+
+        assert 'is_playing' not in delta['changes']
+
+    def test_clear(self, queue):
+        """Testa limpeza da fila."""
+        queue.clear()
+
+        assert len(queue) == 0
+        assert list(queue) == []
+        queue.add(QueueEntry(video_id='z'))
+        assert _ids(queue) == ['z']
+
+    def test_peek(self, queue):
+        """Testa leitura dos próximos itens."""
+        assert [e.video_id for e in queue.peek(2)] == ['a', 'b']
+        assert len(queue.peek(10)) == 3
+
+    def test_persistence_roundtrip(self, tmp_path):
+        """Testa gravação e leitura do estado."""
+        path = tmp_path / 'queue.json'
+        queue = QueueEngine(path)
+        queue.add(QueueEntry(video_id='a', title='Song A'))
+        queue.add(QueueEntry(video_id='b'))
+        queue.set_now_playing({'video_id': 'z'})
+
+        assert queue.save() is True
+        assert queue.save() is False  # nada mudou
+
+        restored = QueueEngine(path)
+        assert _ids(restored) == ['a', 'b']
+        assert restored.get(next(iter(restored)).entry_id).title == 'Song A'
+        assert restored.now_playing.track == {'video_id': 'z'}
+        assert restored.now_playing.is_playing is False
+        assert restored.version == queue.version
+
+    def test_corrupt_file_is_ignored(self, tmp_path):
+        """Testa que arquivo corrompido não impede a inicialização."""
+        path = tmp_path / 'queue.json'
+        path.write_text('{not json')
+
+        assert len(QueueEngine(path)) == 0
+
+
+class FakeWebSocket:
+    """WebSocket falso que registra mensagens enviadas."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.sent = []
+        self.remote_address = ('127.0.0.1', 0)
+
+    async def send(self, data):
+        if self.fail:
+            raise ConnectionError("closed")
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(json.loads(data))
+
+
+class TestBroadcaster:
+    """Testes para Broadcaster."""
+
+    def test_new_client_receives_snapshot_then_deltas(self):
+        """Testa snapshot inicial seguido de deltas."""
+        async def scenario():
+            queue = QueueEngine()
+            broadcaster = Broadcaster(queue.snapshot)
+            ws = FakeWebSocket()
+            broadcaster.register(ws)
+            await asyncio.sleep(0)
+
+            broadcaster.publish({'type': 'queue', **queue.add(QueueEntry(video_id='a'))})
+            await asyncio.sleep(0.01)
+            await broadcaster.close()
+            return ws.sent
+
+        sent = asyncio.run(scenario())
+        assert sent[0]['type'] == 'state'
+        assert sent[1]['type'] == 'queue'
+        assert sent[1]['op'] == 'add'
+
+    def test_slow_client_does_not_block_others(self):
+        """Testa que um cliente lento não atrasa os demais."""
+        async def scenario():
+            broadcaster = Broadcaster(lambda: {'version': 0}, max_pending=4, send_timeout=5)
+            fast, slow = FakeWebSocket(), FakeWebSocket(delay=1.0)
+            broadcaster.register(fast)
+            slow_channel = broadcaster.register(slow)
+            await asyncio.sleep(0)
+
+            for i in range(20):
+                broadcaster.publish({'type': 'tick', 'n': i})
+                await asyncio.sleep(0.001)
+            await asyncio.sleep(0.05)
+            result = (len(fast.sent), slow_channel.dropped, slow_channel.pending.qsize())
+            await broadcaster.close()
+            return result
+
+        fast_count, dropped, pending = asyncio.run(scenario())
+        assert fast_count == 21  # snapshot + 20 eventos
+        assert dropped > 0
+        assert pending <= 4
+
+    def test_failed_client_is_removed(self):
+        """Testa que cliente com erro de envio é removido."""
+        async def scenario():
+            broadcaster = Broadcaster(lambda: {})
+            ok, broken = FakeWebSocket(), FakeWebSocket(fail=True)
+            broadcaster.register(ok)
+            broadcaster.register(broken)
+            await asyncio.sleep(0.01)
+            broadcaster.publish({'type': 'tick'})
+            await asyncio.sleep(0.01)
+            remaining = list(broadcaster.channels)
+            await broadcaster.close()
+            return remaining, ok.sent
+
+        remaining, sent = asyncio.run(scenario())
+        assert len(remaining) == 1
+        assert sent[-1] == {'type': 'tick'}
+
+    def test_overflow_resends_snapshot(self):
+        """Testa que descarte de mensagens força novo snapshot."""
+        async def scenario():
+            counter = {'n': 0}
+
+            def snapshot():
+                counter['n'] += 1
+                return {'version': counter['n']}
+
+            broadcaster = Broadcaster(snapshot, max_pending=2)
+            ws = FakeWebSocket(delay=0.01)
+            broadcaster.register(ws)
+            await asyncio.sleep(0)
+            for i in range(10):
+                broadcaster.publish({'type': 'tick', 'n': i})
+            await asyncio.sleep(0.1)
+            await broadcaster.close()
+            return ws.sent
+
+        sent = asyncio.run(scenario())
+        states = [m for m in sent if m['type'] == 'state']
+        assert len(states) >= 2
+
+
+class FakeYTMusic:
+    """Cliente ytmusicapi falso que conta chamadas."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _record(self, name, *args):
+        with self._lock:
+            self.calls.append((name,) + args)
+        if self.delay:
+            time.sleep(self.delay)
+
+    def search(self, query, filter=None, limit=20):
+        self._record('search', query)
+        return [{'videoId': f'{query}-1'}]
+
+    def get_liked_songs(self, limit=100):
+        self._record('get_liked_songs')
+        return {'tracks': []}
+
+    def rate_song(self, video_id, rating):
+        self._record('rate_song', video_id)
+        return {}
+
+
+class TestTTLCache:
+    """Testes para TTLCache."""
+
+    def test_expiry(self):
+        """Testa expiração por TTL."""
+        now = [0.0]
+        cache = TTLCache(clock=lambda: now[0])
+        cache.set('k', 1, ttl=10)
+
+        assert cache.get('k') == (True, 1)
+        now[0] = 11
+        assert cache.get('k') == (False, None)
+
+    def test_lru_eviction(self):
+        """Testa descarte do item menos usado."""
+        cache = TTLCache(max_entries=2)
+        cache.set('a', 1, ttl=60)
+        cache.set('b', 2, ttl=60)
+        cache.get('a')
+        cache.set('c', 3, ttl=60)
+
+        assert cache.get('a')[0] is True
+        assert cache.get('b')[0] is False
+        assert len(cache) == 2
+
+
+class TestCachedYTMusic:
+    """Testes para CachedYTMusic."""
+
+    def test_identical_inflight_requests_are_coalesced(self):
+        """Testa que buscas idênticas simultâneas geram uma chamada."""
+        client = FakeYTMusic(delay=0.05)
+        api = CachedYTMusic(client)
+
+        async def scenario():
+            return await asyncio.gather(*[api.call('search', 'rock', limit=20) for _ in range(5)])
+
+        results = asyncio.run(scenario())
+        api.close()
+
+        assert len(client.calls) == 1
+        assert all(r == results[0] for r in results)
+        assert api.stats['coalesced'] == 4
+
+    def test_repeated_request_served_from_memory(self):
+        """Testa resposta do cache em memória."""
+        client = FakeYTMusic()
+        api = CachedYTMusic(client)
+
+        async def scenario():
+            await api.call('search', 'jazz')
+            await api.call('search', 'jazz')
+            await api.call('search', 'blues')
+
+        asyncio.run(scenario())
+        api.close()
+
+        assert [c[1] for c in client.calls] == ['jazz', 'blues']
+        assert api.stats['hits'] == 1
+
+    def test_persisted_cache_survives_restart(self, tmp_path):
+        """Testa cache em SQLite entre instâncias."""
+        path = tmp_path / 'api-cache.sqlite'
+        first = FakeYTMusic()
+        api = CachedYTMusic(first, persist_path=path)
+        asyncio.run(api.call('search', 'samba'))
+        api.close()
+
+        second = FakeYTMusic()
+        api = CachedYTMusic(second, persist_path=path)
+        result = asyncio.run(api.call('search', 'samba'))
+        api.close()
+
+        assert second.calls == []
+        assert result == [{'videoId': 'samba-1'}]
+        assert api.stats['disk_hits'] == 1
+
+    def test_write_invalidates_dependent_reads(self):
+        """Testa que avaliar música invalida as curtidas em cache."""
+        client = FakeYTMusic()
+        api = CachedYTMusic(client)
+
+        async def scenario():
+            await api.call('get_liked_songs', limit=100)
+            await api.call('rate_song', 'abc', 'LIKE')
+            await api.call('rate_song', 'abc', 'LIKE')
+            await api.call('get_liked_songs', limit=100)
+
+        asyncio.run(scenario())
+        api.close()
+
+        names = [c[0] for c in client.calls]
+        assert names == ['get_liked_songs', 'rate_song', 'rate_song', 'get_liked_songs']
+
+
+class FakeSongAPI:
+    """API falsa para o prefetch (interface de CachedYTMusic.call)."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def call(self, method, *args, **kwargs):
+        self.calls.append((method,) + args)
+        if method == 'get_song':
+            return {'videoDetails': {'videoId': args[0], 'thumbnail': {'thumbnails': [
+                {'url': f'https://lh3.example/{args[0]}=w60-h60', 'width': 60},
+                {'url': f'https://lh3.example/{args[0]}=w226-h226', 'width': 226},
+            ]}}}
+        if method == 'get_watch_playlist':
+            return {'lyrics': f'MPLY{args[0]}' if args[0] != 'instrumental' else None}
+        if method == 'get_lyrics':
+            return {'lyrics': 'la la la'}
+        raise AssertionError(method)
+
+
+class TestDiskCache:
+    """Testes para DiskCache."""
+
+    def test_roundtrip_and_reload(self, tmp_path):
+        """Testa gravação e leitura após recriar o cache."""
+        cache = DiskCache(tmp_path, max_bytes=1024)
+        cache.put_json('song', 'abc', {'title': 'x'})
+
+        reloaded = DiskCache(tmp_path, max_bytes=1024)
+        assert reloaded.get_json('song', 'abc') == {'title': 'x'}
+        assert ('song', 'abc') in reloaded
+        assert reloaded.total_bytes == cache.total_bytes
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Testa descarte pelo limite de bytes."""
+        cache = DiskCache(tmp_path, max_bytes=250)
+        cache.put_bytes('art', 'a', b'a' * 100)
+        cache.put_bytes('art', 'b', b'b' * 100)
+        cache.get_bytes('art', 'a')
+        cache.put_bytes('art', 'c', b'c' * 100)
+
+        assert cache.get_bytes('art', 'a') is not None
+        assert cache.get_bytes('art', 'b') is None
+        assert cache.total_bytes == 200
+
+    def test_overwrite_updates_size(self, tmp_path):
+        """Testa que regravar a mesma chave não duplica o tamanho."""
+        cache = DiskCache(tmp_path)
+        cache.put_bytes('art', 'a', b'x' * 10)
+        cache.put_bytes('art', 'a', b'x' * 30)
+
+        assert cache.total_bytes == 30
+
+    def test_json_expires_after_ttl(self, tmp_path):
+        """Testa expiração de valores JSON, inclusive após recriar o cache."""
+        now = [1000.0]
+        cache = DiskCache(tmp_path, clock=lambda: now[0])
+        cache.put_json('song', 'abc', {'title': 'x'}, ttl=60)
+        cache.put_json('song', 'forever', {'title': 'y'})
+
+        now[0] += 59
+        assert DiskCache(tmp_path, clock=lambda: now[0]).get_json('song', 'abc') == {'title': 'x'}
+        now[0] += 1
+        assert cache.get_json('song', 'abc') is None
+        assert ('song', 'abc') not in cache
+        assert cache.get_json('song', 'forever') == {'title': 'y'}
+
+
+class TestPrefetcher:
+    """Testes para Prefetcher."""
+
+    def test_resize_thumbnail_url(self):
+        """Testa escolha e redimensionamento da thumbnail."""
+        thumbs = [{'url': 'https://x/a=w60-h60', 'width': 60}, {'url': 'https://x/a=w120-h120', 'width': 120}]
+
+        assert resize_thumbnail_url(thumbs, 544) == 'https://x/a=w544-h544'
+        assert resize_thumbnail_url([{'url': 'https://i.ytimg.com/hq.jpg', 'width': 480}], 544) == 'https://i.ytimg.com/hq.jpg'
+        assert resize_thumbnail_url([], 544) is None
+
+    def test_warm_then_served_from_disk(self, tmp_path):
+        """Testa que dados antecipados não voltam à rede."""
+        api = FakeSongAPI()
+        downloads = []
+
+        def download(url):
+            downloads.append(url)
+            return b'jpeg'
+
+        prefetcher = Prefetcher(api, DiskCache(tmp_path), artwork_size=300, download=download)
+
+        async def scenario():
+            await prefetcher.warm('abc')
+            calls_after_warm = len(api.calls)
+            song = await prefetcher.song('abc')
+            lyrics = await prefetcher.lyrics('abc')
+            art = await prefetcher.artwork('abc')
+            return calls_after_warm, song, lyrics, art
+
+        calls_after_warm, song, lyrics, art = asyncio.run(scenario())
+        assert len(api.calls) == calls_after_warm
+        assert song['videoDetails']['videoId'] == 'abc'
+        assert lyrics == {'lyrics': 'la la la'}
+        assert art == b'jpeg'
+        assert downloads == ['https://lh3.example/abc=w300-h300']
+
+    def test_song_refetched_after_api_ttl(self, tmp_path):
+        """Testa que o disco respeita o TTL de get_song da API."""
+        api = FakeSongAPI()
+        api.ttls = {'get_song': 3600}
+        now = [0.0]
+        prefetcher = Prefetcher(api, DiskCache(tmp_path, clock=lambda: now[0]), download=lambda url: b'')
+
+        async def scenario():
+            await prefetcher.song('abc')
+            now[0] = 3599
+            await prefetcher.song('abc')
+            now[0] = 3600
+            await prefetcher.song('abc')
+
+        asyncio.run(scenario())
+        assert api.calls == [('get_song', 'abc'), ('get_song', 'abc')]
+
+    def test_missing_lyrics_are_remembered(self, tmp_path):
+        """Testa cache negativo para faixas sem letra."""
+        api = FakeSongAPI()
+        prefetcher = Prefetcher(api, DiskCache(tmp_path), download=lambda url: b'')
+
+        async def scenario():
+            first = await prefetcher.lyrics('instrumental')
+            second = await prefetcher.lyrics('instrumental')
+            return first, second
+
+        assert asyncio.run(scenario()) == (None, None)
+        assert api.calls == [('get_watch_playlist', 'instrumental')]
+
+    def test_schedule_limits_depth_and_skips_duplicates(self, tmp_path):
+        """Testa agendamento das próximas faixas."""
+        api = FakeSongAPI()
+        prefetcher = Prefetcher(api, DiskCache(tmp_path), depth=2, download=lambda url: b'x')
+
+        async def scenario():
+            prefetcher.schedule([None, 'a', 'a', 'b', 'c'])
+            await prefetcher._task
+            prefetcher.schedule(['a', 'b'])  # inalterado: nada novo é agendado
+            return prefetcher._task.done()
+
+        assert asyncio.run(scenario()) is True
+        songs = {c[1] for c in api.calls if c[0] == 'get_song'}
+        assert songs == {'a', 'b'}
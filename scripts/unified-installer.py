@@ -33,6 +33,8 @@ FEATURES v8.0.0:
     ✅ Fish Shell: Configuração completa
     ✅ Nginx: Reverse proxy configurado
     ✅ UFW: Firewall com regras otimizadas
+    ✅ Fases em paralelo: grafo de dependências e recursos (--jobs)
+    ✅ Checkpoints: fases inalteradas são puladas; --resume após falha
 
 NOVIDADES v8.0.0:
     🆕 Código 100% funcional (sem seções comentadas)
@@ -50,26 +52,52 @@ import os
 import sys
 import pwd
 import grp
+import hashlib
+import inspect
 import json
 import shutil
 import argparse
 import subprocess
 import socket
+import tempfile
 import time
 import re
+import threading
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, List, Dict, Tuple, Any, Callable
+from typing import Optional, List, Dict, Tuple, Any, Callable, FrozenSet, Iterable, Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
+# Bundle offline (scripts/installer/offline_bundle.py). Indisponível quando o
+# instalador é executado via `curl | python`; nesse caso --bundle é recusado.
+try:
+    from installer.offline_bundle import BUNDLE_ENV, KIND_GIT_REPO, OfflineBundle, BundleError
+except ImportError:
+    OfflineBundle = None
+
+try:
+    from installer.utils.runner import CommandRunner as StreamingRunner
+except ImportError:
+    StreamingRunner = None
+
+# Sem o Downloader os scripts de instalação são lidos inteiros via urllib
+try:
+    from installer.utils.downloader import Downloader, DownloadError
+except ImportError:
+    Downloader = None
+    DownloadError = OSError
+
 # =============================================================================
 # CONSTANTES E CONFIGURAÇÃO
 # =============================================================================
 
 VERSION = "8.0.0"
 GITHUB_REPO = "https://github.com/B0yZ4kr14/TSiJUKEBOX.git"
+APP_BUNDLE_NAME = "tsijukebox"  # `git bundle` do repositório no bundle offline
 INSTALL_DIR = Path("/opt/tsijukebox")
 CONFIG_DIR = Path("/etc/tsijukebox")
 LOG_DIR = Path("/var/log/tsijukebox")
@@ -78,6 +106,8 @@ BACKUP_DIR = Path("/var/backups/tsijukebox")
 NGINX_SITES = Path("/etc/nginx/sites-available")
 NGINX_ENABLED = Path("/etc/nginx/sites-enabled")
 SYSTEMD_DIR = Path("/etc/systemd/system")
+NPM_CACHE_DIR = DATA_DIR / "npm-cache"
+SPICETIFY_INSTALL_URL = "https://raw.githubusercontent.com/spicetify/spicetify-cli/master/install.sh"
 
 TOTAL_PHASES = 26
 
@@ -110,6 +140,18 @@ class Icons:
 # LOGGER v8.0.0
 # =============================================================================
 
+# Saída do console por thread: fases rodando em paralelo gravam num buffer
+# próprio, despejado em bloco quando a fase termina.
+_output = threading.local()
+
+def _emit(text: str):
+    """Imprime ou, dentro de Logger.capture(), acumula a linha da thread atual."""
+    lines = getattr(_output, 'lines', None)
+    if lines is not None:
+        lines.append(text)
+    else:
+        print(text)
+
 class Logger:
     """Logger estruturado com Design System."""
     
@@ -137,7 +179,22 @@ class Logger:
 
     def _print(self, icon, color, message):
         if not self.quiet:
-            print(f"{icon} {AnsiRGB.color(*color, message)}")
+            _emit(f"{icon} {AnsiRGB.color(*color, message)}")
+
+    @contextmanager
+    def capture(self) -> Iterator[List[str]]:
+        """Acumula a saída do console da thread atual em vez de imprimir."""
+        previous = getattr(_output, 'lines', None)
+        _output.lines = []
+        try:
+            yield _output.lines
+        finally:
+            _output.lines = previous
+
+    def flush(self, lines: List[str]):
+        """Imprime de uma vez a saída acumulada por capture()."""
+        for line in lines:
+            _emit(line)
 
     def info(self, message: str):
         self._write_log("INFO", message)
@@ -159,13 +216,13 @@ class Logger:
         self._write_log("DEBUG", message)
         if self.verbose:
             if not self.quiet:
-                print(f"{Icons.DEBUG} {AnsiRGB.color(*Palette.GRAY, message)}")
+                _emit(f"{Icons.DEBUG} {AnsiRGB.color(*Palette.GRAY, message)}")
 
     def step(self, current: int, total: int, message: str):
         self._write_log("STEP", f"[{current}/{total}] {message}")
         if not self.quiet:
             step_str = f"[{current}/{total}]"
-            print(f"\n{Icons.STEP} {AnsiRGB.color(*Palette.MAGENTA, f'{message} {step_str}')}")
+            _emit(f"\n{Icons.STEP} {AnsiRGB.color(*Palette.MAGENTA, f'{message} {step_str}')}")
 
 # =============================================================================
 # CLASSES DE DADOS E UTILIDADES
@@ -233,6 +290,10 @@ class InstallConfig:
     verbose: bool = False
     quiet: bool = False
     auto: bool = False
+    jobs: int = 4
+    resume: bool = False
+    checkpoints: bool = True
+    bundle: str = ""
     timezone: str = "America/Sao_Paulo"
     supabase_url: str = ""
     supabase_anon_key: str = ""
@@ -260,14 +321,29 @@ def run_command(
     timeout: int = 300,
     env: Optional[Dict] = None,
     dry_run: bool = False,
-    cwd: Optional[Path] = None
+    cwd: Optional[Path] = None,
+    tail_lines: Optional[int] = None
 ) -> Tuple[int, str, str]:
-    """Executa comando shell com logging e dry-run."""
+    """
+    Executa comando shell com logging e dry-run.
+    
+    Com tail_lines (comandos verbosos: pacman, npm), a saída é lida em
+    streaming pelo runner compartilhado, só as últimas linhas ficam em
+    memória e o timeout encerra o grupo de processos inteiro.
+    """
     if dry_run:
         cmd_str = ' '.join(cmd)
-        print(f"{Icons.DEBUG} {AnsiRGB.color(*Palette.GRAY, f'[DRY-RUN] {cmd_str}')}")
+        _emit(f"{Icons.DEBUG} {AnsiRGB.color(*Palette.GRAY, f'[DRY-RUN] {cmd_str}')}")
         return 0, "", ""
     
+    if StreamingRunner is not None and capture and tail_lines:
+        result = StreamingRunner().run(cmd, cwd=cwd, env=env, timeout=timeout, tail_lines=tail_lines)
+        if result.timed_out:
+            return 1, result.stdout, "Timeout"
+        if result.returncode == 127 and result.stderr.startswith("Command not found"):
+            return 1, "", f"Comando não encontrado: {cmd[0]}"
+        return tuple(result)
+    
     full_env = os.environ.copy()
     if env:
         full_env.update(env)
@@ -290,10 +366,11 @@ def run_command(
     except Exception as e:
         return 1, "", str(e)
 
-def run_as_user(cmd: List[str], user: str, dry_run: bool = False, cwd: Optional[Path] = None) -> Tuple[int, str, str]:
+def run_as_user(cmd: List[str], user: str, dry_run: bool = False, cwd: Optional[Path] = None,
+                tail_lines: Optional[int] = None) -> Tuple[int, str, str]:
     """Executa comando como usuário específico."""
     full_cmd = ["sudo", "-u", user] + cmd
-    return run_command(full_cmd, dry_run=dry_run, cwd=cwd)
+    return run_command(full_cmd, dry_run=dry_run, cwd=cwd, tail_lines=tail_lines)
 
 # =============================================================================
 # VALIDATOR v8.0.0
@@ -304,6 +381,18 @@ class Validator:
     def __init__(self, logger: Logger, config: InstallConfig):
         self.logger = logger
         self.config = config
+        self.installed_packages: Optional[Dict[str, str]] = None
+
+    def load_installed_packages(self) -> Dict[str, str]:
+        """Lê todos os pacotes instalados (nome → versão) com um único `pacman -Q`."""
+        code, out, _ = run_command(["pacman", "-Q"], dry_run=self.config.dry_run)
+        if code != 0:
+            self.installed_packages = None
+            return {}
+        self.installed_packages = dict(
+            line.split(None, 1) for line in out.splitlines() if len(line.split()) == 2
+        )
+        return self.installed_packages
 
     def check_root(self) -> bool:
         """Verifica se o script está rodando como root."""
@@ -335,6 +424,8 @@ class Validator:
 
     def check_package(self, package: str) -> bool:
         """Verifica se um pacote está instalado."""
+        if self.installed_packages and package in self.installed_packages:
+            return True
         code, _, _ = run_command(["pacman", "-Q", package], dry_run=self.config.dry_run)
         return code == 0
 
@@ -370,6 +461,372 @@ class Validator:
         return True
 
 
+# =============================================================================
+# PLANO DE PACOTES v8.0.0
+# =============================================================================
+
+# Pacotes de cada fase: a mesma lista alimenta a transação única e a
+# instalação individual que a fase faz quando a transação não a cobriu
+NODEJS_PACKAGES = ["nodejs", "npm"]
+UFW_PACKAGES = ["ufw"]
+FONT_PACKAGES = ["ttf-dejavu", "ttf-liberation", "noto-fonts", "noto-fonts-emoji",
+                 "ttf-roboto", "ttf-ubuntu-font-family"]
+AUDIO_PACKAGES = {
+    "pipewire": ["pipewire", "pipewire-alsa", "pipewire-pulse", "pipewire-jack", "wireplumber"],
+    "pulseaudio": ["pulseaudio", "pulseaudio-alsa"],
+}
+NGINX_PACKAGES = ["nginx"]
+MONITORING_PACKAGES = ["prometheus", "grafana", "prometheus-node-exporter"]
+CLOUD_BACKUP_PACKAGES = ["rclone"]
+SPOTIFY_AUR_PACKAGES = ["spotify"]
+SPOTIFY_CLI_PACKAGES = ["spotifyd"]
+SPOTIFY_CLI_AUR_PACKAGES = ["spotify-tui"]
+KIOSK_PACKAGES = ["openbox", "chromium", "xorg-server", "xorg-xinit", "xorg-xset",
+                  "xorg-xrandr", "unclutter"]
+DEV_TOOLS_PACKAGES = ["git", "base-devel", "vim", "nano", "htop", "tmux", "curl", "wget"]
+GIT_PACKAGES = ["git"]
+SSL_PACKAGES = ["certbot", "certbot-nginx"]
+AVAHI_PACKAGES = ["avahi", "nss-mdns"]
+FISH_PACKAGES = ["fish"]
+GITHUB_CLI_PACKAGES = ["github-cli"]
+
+
+def phase_packages(config: InstallConfig) -> Dict[InstallPhase, Tuple[List[str], List[str]]]:
+    """Pacotes de cada fase habilitada: {fase: (repositórios oficiais, AUR)}."""
+    plan: Dict[InstallPhase, Tuple[List[str], List[str]]] = {}
+
+    def add(phase: InstallPhase, repo: List[str], aur: Optional[List[str]] = None):
+        plan[phase] = (list(repo), list(aur or []))
+
+    if config.install_nodejs:
+        add(InstallPhase.NODEJS, NODEJS_PACKAGES)
+    if config.install_ufw:
+        add(InstallPhase.UFW, UFW_PACKAGES)
+    if config.install_fonts:
+        add(InstallPhase.FONTS, FONT_PACKAGES)
+    if config.install_audio:
+        add(InstallPhase.AUDIO, AUDIO_PACKAGES.get(config.audio_backend, AUDIO_PACKAGES["pulseaudio"]))
+    if config.install_nginx:
+        add(InstallPhase.NGINX, NGINX_PACKAGES)
+    if config.install_monitoring:
+        add(InstallPhase.MONITORING, MONITORING_PACKAGES)
+    if config.install_cloud_backup:
+        add(InstallPhase.CLOUD_BACKUP, CLOUD_BACKUP_PACKAGES)
+    if config.install_spotify:
+        add(InstallPhase.SPOTIFY, [], SPOTIFY_AUR_PACKAGES)
+    if config.install_spotify_cli:
+        add(InstallPhase.SPOTIFY_CLI, SPOTIFY_CLI_PACKAGES, SPOTIFY_CLI_AUR_PACKAGES)
+    if config.install_kiosk:
+        add(InstallPhase.KIOSK, KIOSK_PACKAGES)
+    if config.install_dev_tools:
+        add(InstallPhase.DEV_TOOLS, DEV_TOOLS_PACKAGES)
+    add(InstallPhase.APP_CLONE, GIT_PACKAGES)
+    if config.install_ssl and config.ssl_mode == "letsencrypt":
+        add(InstallPhase.SSL_SETUP, SSL_PACKAGES)
+    if config.install_avahi:
+        add(InstallPhase.AVAHI_MDNS, AVAHI_PACKAGES)
+    if config.install_fish_shell:
+        add(InstallPhase.FISH_SHELL, FISH_PACKAGES)
+    if config.install_github_cli:
+        add(InstallPhase.GITHUB_CLI, GITHUB_CLI_PACKAGES)
+    return plan
+
+
+@dataclass
+class PackagePlan:
+    """
+    Pacotes das fases habilitadas e o que a transação única instalou.
+
+    `installed` guarda, por fase dona (a primeira que pediu o pacote), o
+    que não existia antes do lote. Cada fase registra o rollback
+    `pacman -Rns` desses pacotes ao rodar, como fazia quando ela mesma
+    os instalava; os das fases que nunca rodaram são registrados no abort.
+    """
+    phases: Dict[InstallPhase, Tuple[List[str], List[str]]] = field(default_factory=dict)
+    installed: Dict[InstallPhase, List[str]] = field(default_factory=dict)
+
+    @staticmethod
+    def _merge(groups) -> List[str]:
+        merged: List[str] = []
+        for packages in groups:
+            merged.extend(p for p in packages if p not in merged)
+        return merged
+
+    @property
+    def repo(self) -> List[str]:
+        return self._merge(repo for repo, _ in self.phases.values())
+
+    @property
+    def aur(self) -> List[str]:
+        return self._merge(aur for _, aur in self.phases.values())
+
+    def record_installed(self, before: Iterable[str], after: Iterable[str]) -> None:
+        """Atribui cada pacote novo (presente só depois do lote) à sua fase dona."""
+        new = set(after) - set(before)
+        owned: set = set()
+        for phase, (repo, aur) in self.phases.items():
+            packages = [p for p in repo + aur if p in new and p not in owned]
+            owned.update(packages)
+            if packages:
+                self.installed[phase] = packages
+
+
+def build_package_plan(config: InstallConfig) -> PackagePlan:
+    """
+    Reúne os pacotes de todas as fases habilitadas.
+
+    Instalados numa única transação `pacman -S --needed` (mais um lote AUR)
+    logo após a atualização do sistema; as fases continuam verificando cada
+    pacote e só chamam o pacman para o que a transação não cobriu.
+    """
+    return PackagePlan(phases=phase_packages(config))
+
+
+# =============================================================================
+# AGENDADOR DE FASES v8.0.0
+# =============================================================================
+
+# Recursos disputados pelas fases e quantas fases podem usá-los ao mesmo tempo.
+RESOURCE_PACMAN = "pacman"        # lock do banco do pacman (inclui paru/yay)
+RESOURCE_NETWORK = "network"      # downloads pesados (pacotes, git, npm)
+RESOURCE_USER_HOME = "user-home"  # arquivos e serviços --user do usuário alvo
+RESOURCE_NGINX = "nginx"          # configuração e reload do Nginx
+
+RESOURCE_LIMITS: Dict[str, int] = {
+    RESOURCE_PACMAN: 1,
+    RESOURCE_NETWORK: 3,
+    RESOURCE_USER_HOME: 1,
+    RESOURCE_NGINX: 1,
+}
+
+@dataclass(frozen=True)
+class PhaseSpec:
+    """Declaração de uma fase: método, dependências e recursos usados."""
+    phase: InstallPhase
+    method: str
+    depends: Tuple[InstallPhase, ...] = ()
+    resources: FrozenSet[str] = frozenset()
+    outputs: Tuple[Path, ...] = ()  # arquivos gerados, conferidos pelo checkpoint
+
+_PKG = frozenset({RESOURCE_PACMAN, RESOURCE_NETWORK})
+_PKG_HOME = _PKG | {RESOURCE_USER_HOME}
+_BASE = (InstallPhase.SYSTEM_CHECK,)
+
+# Ordem de declaração = ordem do log e numeração [n/26] das fases.
+PHASE_GRAPH: List[PhaseSpec] = [
+    PhaseSpec(InstallPhase.HARDWARE_ANALYSIS, "_phase_hardware_analysis"),
+    PhaseSpec(InstallPhase.SYSTEM_CHECK, "_phase_system_check", (), _PKG),
+    PhaseSpec(InstallPhase.NODEJS, "_phase_nodejs", _BASE, _PKG),
+    PhaseSpec(InstallPhase.UFW, "_phase_ufw", _BASE, _PKG),
+    PhaseSpec(InstallPhase.NTP, "_phase_ntp", _BASE),
+    PhaseSpec(InstallPhase.FONTS, "_phase_fonts", _BASE, _PKG),
+    PhaseSpec(InstallPhase.AUDIO, "_phase_audio", _BASE, _PKG_HOME),
+    PhaseSpec(InstallPhase.DATABASE, "_phase_database", (InstallPhase.NODEJS,), _PKG,
+              (CONFIG_DIR / "supabase.json",)),
+    PhaseSpec(InstallPhase.NGINX, "_phase_nginx", _BASE, _PKG | {RESOURCE_NGINX},
+              (NGINX_SITES / "tsijukebox",)),
+    PhaseSpec(InstallPhase.MONITORING, "_phase_monitoring", _BASE, _PKG),
+    PhaseSpec(InstallPhase.CLOUD_BACKUP, "_phase_cloud_backup", _BASE, _PKG),
+    PhaseSpec(InstallPhase.SPOTIFY, "_phase_spotify", _BASE, _PKG_HOME),
+    PhaseSpec(InstallPhase.SPICETIFY, "_phase_spicetify", (InstallPhase.SPOTIFY,),
+              frozenset({RESOURCE_NETWORK, RESOURCE_USER_HOME})),
+    PhaseSpec(InstallPhase.SPOTIFY_CLI, "_phase_spotify_cli", _BASE, _PKG_HOME),
+    PhaseSpec(InstallPhase.KIOSK, "_phase_kiosk", _BASE, _PKG_HOME),
+    PhaseSpec(InstallPhase.VOICE_CONTROL, "_phase_voice_control", (InstallPhase.AUDIO,)),
+    PhaseSpec(InstallPhase.DEV_TOOLS, "_phase_dev_tools", _BASE, _PKG),
+    PhaseSpec(InstallPhase.AUTOLOGIN, "_phase_autologin", _BASE),
+    PhaseSpec(InstallPhase.APP_CLONE, "_phase_app_clone", _BASE, _PKG, (INSTALL_DIR,)),
+    PhaseSpec(InstallPhase.FRONTEND_BUILD, "_phase_frontend_build",
+              (InstallPhase.APP_CLONE, InstallPhase.NODEJS),
+              frozenset({RESOURCE_NETWORK, RESOURCE_USER_HOME}),
+              (INSTALL_DIR / ".env", INSTALL_DIR / "dist")),
+    PhaseSpec(InstallPhase.SERVICES, "_phase_services", _BASE, frozenset(),
+              (SYSTEMD_DIR / "tsijukebox-dev.service",)),
+    PhaseSpec(InstallPhase.SSL_SETUP, "_phase_ssl", (InstallPhase.NGINX,), _PKG | {RESOURCE_NGINX},
+              (NGINX_SITES / "tsijukebox-ssl",)),
+    PhaseSpec(InstallPhase.AVAHI_MDNS, "_phase_avahi", _BASE, _PKG,
+              (Path("/etc/avahi/services/tsijukebox.service"),)),
+    PhaseSpec(InstallPhase.FISH_SHELL, "_phase_fish_shell", _BASE, _PKG_HOME),
+    PhaseSpec(InstallPhase.GITHUB_CLI, "_phase_github_cli", _BASE, _PKG),
+    PhaseSpec(InstallPhase.VERIFY, "_phase_verify",
+              tuple(p for p in InstallPhase if p is not InstallPhase.VERIFY)),
+]
+
+class PhaseScheduler:
+    """
+    Executa fases em paralelo respeitando dependências e recursos.
+
+    Uma fase começa quando todas as dependências terminaram com sucesso e
+    há vaga em todos os recursos que ela declara. Entre as prontas, vale a
+    ordem de declaração, então com jobs=1 a execução é sequencial. Após
+    uma falha nenhuma fase nova é iniciada; as que já rodam terminam.
+    """
+
+    def __init__(self, specs: List[PhaseSpec], jobs: int = 4,
+                 limits: Optional[Dict[str, int]] = None):
+        known = {spec.phase for spec in specs}
+        for spec in specs:
+            missing = [dep for dep in spec.depends if dep not in known]
+            if missing:
+                raise ValueError(f"{spec.phase.name} depende de fases ausentes: {missing}")
+        self.specs = specs
+        self.jobs = max(1, jobs)
+        self.limits = {**RESOURCE_LIMITS, **(limits or {})}
+
+    def _fits(self, spec: PhaseSpec, in_use: Dict[str, int]) -> bool:
+        return all(in_use.get(r, 0) < self.limits.get(r, 1) for r in spec.resources)
+
+    def run(
+        self,
+        execute: Callable[[PhaseSpec], bool],
+        on_complete: Optional[Callable[[PhaseSpec, bool], None]] = None,
+    ) -> Optional[PhaseSpec]:
+        """
+        Executa todas as fases. `execute` roda nas threads do pool;
+        `on_complete` roda na thread chamadora, na ordem de término.
+
+        Returns:
+            A primeira fase que falhou, ou None se todas passaram.
+        """
+        pending = list(self.specs)
+        running: Dict[Any, PhaseSpec] = {}
+        succeeded: set = set()
+        in_use: Dict[str, int] = {}
+        failed: Optional[PhaseSpec] = None
+
+        pool = ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="phase")
+        try:
+            while pending or running:
+                if failed is None:
+                    for spec in list(pending):
+                        if len(running) >= self.jobs:
+                            break
+                        if all(d in succeeded for d in spec.depends) and self._fits(spec, in_use):
+                            for r in spec.resources:
+                                in_use[r] = in_use.get(r, 0) + 1
+                            pending.remove(spec)
+                            running[pool.submit(execute, spec)] = spec
+
+                if not running:
+                    if failed is None and pending:
+                        raise RuntimeError(
+                            "Dependências impossíveis de satisfazer: "
+                            + ", ".join(s.phase.name for s in pending))
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    spec = running.pop(future)
+                    for r in spec.resources:
+                        in_use[r] -= 1
+                    try:
+                        ok = bool(future.result())
+                    except Exception:
+                        ok = False
+                    if ok:
+                        succeeded.add(spec.phase)
+                    elif failed is None:
+                        failed = spec
+                    if on_complete:
+                        on_complete(spec, ok)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        return failed
+
+
+# =============================================================================
+# CHECKPOINTS DE FASES v8.0.0
+# =============================================================================
+
+CHECKPOINT_FILE = DATA_DIR / "install-checkpoints.json"
+
+# Fases que sempre rodam: sem efeitos colaterais ou que precisam refletir o estado atual
+CHECKPOINT_EXEMPT = frozenset({InstallPhase.HARDWARE_ANALYSIS, InstallPhase.VERIFY})
+
+# Campos de InstallConfig que não mudam o resultado de uma fase
+VOLATILE_CONFIG = frozenset({"dry_run", "verbose", "quiet", "auto", "jobs", "resume", "checkpoints"})
+
+def hash_output(path: Path) -> Optional[str]:
+    """SHA-256 de um arquivo gerado; diretórios contam só pela existência."""
+    try:
+        if path.is_dir():
+            return "dir"
+        if not path.exists():
+            return None
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    except OSError:
+        return None
+
+class PhaseCheckpoints:
+    """
+    Registro persistente das fases concluídas.
+
+    Para cada fase guarda a impressão digital das entradas (ver
+    UnifiedInstaller._fingerprint) e o hash dos arquivos que ela gerou.
+    Numa nova execução a fase é pulada se a impressão digital bate e os
+    arquivos continuam intactos; com resume=True basta ter concluído.
+    """
+
+    def __init__(self, path: Path = CHECKPOINT_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == VERSION:
+                self.phases = data.get("phases", {})
+        except (OSError, ValueError):
+            self.phases = {}
+
+    def save(self):
+        data = {"version": VERSION, "phases": self.phases}
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, default=str)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def get(self, phase: InstallPhase) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self.phases.get(phase.name)
+
+    def fingerprint_of(self, phase: InstallPhase) -> Optional[str]:
+        record = self.get(phase)
+        return record["fingerprint"] if record and record["status"] == "done" else None
+
+    def is_current(self, phase: InstallPhase, fingerprint: str, resume: bool = False) -> bool:
+        """True se a fase pode ser pulada."""
+        record = self.get(phase)
+        if not record or record["status"] != "done":
+            return False
+        if not resume and record["fingerprint"] != fingerprint:
+            return False
+        return all(hash_output(Path(p)) == h for p, h in record["outputs"].items())
+
+    def record(self, phase: InstallPhase, fingerprint: Optional[str], outputs: Tuple[Path, ...],
+               ok: bool, state: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            self.phases[phase.name] = {
+                "status": "done" if ok else "failed",
+                "fingerprint": fingerprint,
+                "outputs": {str(p): hash_output(p) for p in outputs} if ok else {},
+                "state": state or {},
+                "finished_at": datetime.now().isoformat(),
+            }
+            self.save()
+
+
 # =============================================================================
 # UNIFIED INSTALLER v8.0.0
 # =============================================================================
@@ -385,22 +842,200 @@ class UnifiedInstaller:
         self.completed_phases: List[InstallPhase] = []
         self.rollback_actions: List[Callable] = []
         self.phase_counter = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._phase_output: Dict[InstallPhase, List[str]] = {}
+        self._flushed = 0
+        self._phase_rollbacks: Dict[InstallPhase, List[Callable]] = {}
+        self._failed_phases: List[InstallPhase] = []
+        self._sources: Dict[str, str] = {}
+        use_checkpoints = config.checkpoints and not config.dry_run
+        self.checkpoints: Optional[PhaseCheckpoints] = PhaseCheckpoints() if use_checkpoints else None
+        self.bundle = None
+        self._bundle_cachedir: Optional[Path] = None
+        self.package_plan = PackagePlan()
     
     def _next_phase(self) -> int:
         """Incrementa e retorna o contador de fases."""
-        self.phase_counter += 1
-        return self.phase_counter
+        with self._lock:
+            self.phase_counter += 1
+            counter = self.phase_counter
+        # Sob o agendador o número é a posição declarada, não a ordem de início
+        return getattr(self._local, 'phase_num', None) or counter
+    
+    def _add_rollback(self, action: Callable):
+        """Registra ação de rollback da fase em execução."""
+        pending = getattr(self._local, 'rollback', None)
+        if pending is not None:
+            pending.append(action)
+        else:
+            self.rollback_actions.append(action)
+    
+    def _add_package_rollback(self, phase: InstallPhase):
+        """Rollback dos pacotes que a transação única instalou para a fase."""
+        packages = self.package_plan.installed.get(phase)
+        if packages:
+            self._add_rollback(lambda: run_command(["pacman", "-Rns", "--noconfirm"] + packages,
+                                                   dry_run=self.config.dry_run))
+    
+    def _target_user(self) -> str:
+        """Usuário alvo, com a mesma regra da fase de verificação do sistema."""
+        return self.config.user or os.environ.get('SUDO_USER', 'root')
     
-    def _rollback(self):
-        """Executa rollback de todas as ações realizadas."""
+    def _fingerprint(self, spec: PhaseSpec) -> str:
+        """
+        Impressão digital das entradas de uma fase: código da fase (inclui os
+        templates), campos de config que ela lê, usuário alvo, versões dos
+        seus pacotes e as impressões digitais das dependências.
+        """
+        source = self._sources.get(spec.method)
+        if source is None:
+            source = inspect.getsource(getattr(type(self), spec.method))
+            self._sources[spec.method] = source
+        keys = sorted(set(re.findall(r'self\.config\.(\w+)', source)) - VOLATILE_CONFIG)
+        repo, aur = phase_packages(self.config).get(spec.phase, ([], []))
+        installed = self.validator.installed_packages or {}
+        payload = {
+            "version": VERSION,
+            "source": hashlib.sha256(source.encode()).hexdigest(),
+            "config": {key: getattr(self.config, key) for key in keys},
+            "user": self._target_user(),
+            "packages": {pkg: installed.get(pkg) for pkg in repo + aur},
+            "depends": {dep.name: self.checkpoints.fingerprint_of(dep) for dep in spec.depends},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+    
+    def _skip_from_checkpoint(self, spec: PhaseSpec) -> bool:
+        """Pula a fase se o checkpoint ainda vale, restaurando o estado salvo."""
+        if not self.checkpoints or spec.phase in CHECKPOINT_EXEMPT:
+            return False
+        if not self.checkpoints.is_current(spec.phase, self._fingerprint(spec), self.config.resume):
+            return False
+        self.logger.step(self._next_phase(), TOTAL_PHASES, spec.phase.value)
+        self.logger.info("Já concluída (checkpoint), pulando.")
+        state = self.checkpoints.get(spec.phase)["state"]
+        if state:
+            for key, value in state.items():
+                setattr(self.system_info, key, Path(value) if key == "home" else value)
+        with self._lock:
+            self.completed_phases.append(spec.phase)
+        return True
+    
+    def _save_checkpoint(self, spec: PhaseSpec, ok: bool):
+        """Grava o resultado da fase no registro persistente."""
+        if not self.checkpoints or spec.phase in CHECKPOINT_EXEMPT:
+            return
+        if not ok:
+            self.checkpoints.record(spec.phase, None, (), ok=False)
+            return
+        # Versões dos pacotes instalados pela própria fase entram na impressão digital
+        repo, aur = phase_packages(self.config).get(spec.phase, ([], []))
+        installed = self.validator.installed_packages or {}
+        if any(pkg not in installed for pkg in repo + aur):
+            self.validator.load_installed_packages()
+        state = None
+        if spec.phase == InstallPhase.SYSTEM_CHECK:
+            state = {"distro": self.system_info.distro, "distro_id": self.system_info.distro_id,
+                     "user": self.system_info.user, "home": str(self.system_info.home)}
+        self.checkpoints.record(spec.phase, self._fingerprint(spec), spec.outputs, ok=True, state=state)
+    
+    def _execute_phase(self, spec: PhaseSpec) -> bool:
+        """Roda uma fase numa thread do agendador, com log e rollback próprios."""
+        self._local.phase_num = PHASE_GRAPH.index(spec) + 1
+        self._local.rollback = []
+        ok = False
+        with self.logger.capture() as lines:
+            try:
+                if self._skip_from_checkpoint(spec):
+                    ok = True
+                else:
+                    self._add_package_rollback(spec.phase)
+                    ok = getattr(self, spec.method)()
+                    self._save_checkpoint(spec, ok)
+            except Exception as e:
+                self.logger.error(f"Erro na fase {spec.phase.value}: {e}")
+            finally:
+                # Rollback em ordem de término: a última fase concluída é desfeita primeiro
+                with self._lock:
+                    self.rollback_actions.extend(self._local.rollback)
+                    self._phase_rollbacks[spec.phase] = self._local.rollback
+                    if not ok:
+                        self._failed_phases.append(spec.phase)
+                self._local.rollback = None
+                self._local.phase_num = None
+        self._phase_output[spec.phase] = lines
+        return ok
+    
+    def _flush_phase_output(self, specs: List[PhaseSpec], final: bool = False):
+        """Imprime a saída das fases na ordem declarada, sem intercalar linhas."""
+        while self._flushed < len(specs):
+            lines = self._phase_output.pop(specs[self._flushed].phase, None)
+            if lines is None and not final:
+                break
+            self.logger.flush(lines or [])
+            self._flushed += 1
+    
+    def _rollback(self, phases: Optional[List[InstallPhase]] = None):
+        """Executa rollback de todas as ações realizadas (ou só das fases indicadas)."""
         self.logger.warning("Executando rollback...")
-        for action in reversed(self.rollback_actions):
+        if phases is None:
+            actions = self.rollback_actions
+        else:
+            actions = [a for a in self.rollback_actions
+                       if any(a in self._phase_rollbacks.get(p, []) for p in phases)]
+        for action in reversed(actions):
             try:
                 action()
             except Exception as e:
                 self.logger.debug(f"Erro no rollback: {e}")
         self.logger.info("Rollback concluído.")
     
+    def _abort(self):
+        """
+        Desfaz a instalação interrompida. Com checkpoints só as fases que
+        falharam são desfeitas; as concluídas ficam para o --resume.
+        """
+        if self.config.dry_run:
+            return
+        # Fases que nunca rodaram não registraram a remoção dos pacotes do lote
+        unexecuted = [phase for phase in self.package_plan.installed if phase not in self._phase_rollbacks]
+        for phase in unexecuted:
+            start = len(self.rollback_actions)
+            self._add_package_rollback(phase)
+            self._phase_rollbacks[phase] = self.rollback_actions[start:]
+        if self.checkpoints:
+            self._rollback(self._failed_phases + unexecuted)
+            self.logger.info("Corrija o problema e execute novamente com --resume.")
+        else:
+            self._rollback()
+    
+    def _open_bundle(self) -> bool:
+        """Abre o bundle offline de --bundle (diretório ou espelho HTTP)."""
+        if OfflineBundle is None:
+            self.logger.error("--bundle requer scripts/installer/offline_bundle.py; "
+                              "execute o instalador a partir do repositório.")
+            return False
+        try:
+            self.bundle = OfflineBundle(self.config.bundle, logger=self.logger)
+            self.logger.info(f"Bundle offline {self.bundle.version} "
+                             f"({len(self.bundle.manifest.artifacts)} artefatos)")
+        except BundleError as e:
+            self.logger.error(f"Bundle offline inválido: {e}")
+            return False
+        # Módulos de scripts/installer (docker, voz) leem o bundle daqui
+        os.environ[BUNDLE_ENV] = self.config.bundle
+        return True
+    
+    def _bundle_pacman_args(self) -> List[str]:
+        """--cachedir do bundle (mais o cache padrão) para o pacman instalar sem rede."""
+        if not self.bundle:
+            return []
+        if self._bundle_cachedir is None:
+            self._bundle_cachedir = self.bundle.package_cache() or Path()
+        if self._bundle_cachedir == Path():
+            return []
+        return ["--cachedir", str(self._bundle_cachedir), "--cachedir", "/var/cache/pacman/pkg"]
+    
     def run(self) -> bool:
         """Executa o instalador completo."""
         try:
@@ -410,60 +1045,45 @@ class UnifiedInstaller:
             # Validações iniciais
             if not self.validator.check_root():
                 return False
-            if not self.validator.check_internet():
+            if self.config.bundle and not self._open_bundle():
+                return False
+            # Sem o repositório no bundle, a fase de clone ainda precisa de rede
+            offline_app = self.bundle and self.bundle.find(KIND_GIT_REPO, APP_BUNDLE_NAME)
+            if not offline_app and not self.validator.check_internet():
                 return False
             if not self.validator.check_disk_space(10.0):
                 return False
             
-            # Executar fases
-            phases = [
-                self._phase_hardware_analysis,
-                self._phase_system_check,
-                self._phase_nodejs,
-                self._phase_ufw,
-                self._phase_ntp,
-                self._phase_fonts,
-                self._phase_audio,
-                self._phase_database,
-                self._phase_nginx,
-                self._phase_monitoring,
-                self._phase_cloud_backup,
-                self._phase_spotify,
-                self._phase_spicetify,
-                self._phase_spotify_cli,
-                self._phase_kiosk,
-                self._phase_voice_control,
-                self._phase_dev_tools,
-                self._phase_autologin,
-                self._phase_app_clone,
-                self._phase_frontend_build,
-                self._phase_services,
-                self._phase_ssl,
-                self._phase_avahi,
-                self._phase_fish_shell,
-                self._phase_github_cli,
-                self._phase_verify,
-            ]
+            # Versões dos pacotes para as impressões digitais dos checkpoints
+            if self.checkpoints:
+                self.validator.load_installed_packages()
             
-            for phase_func in phases:
-                if not phase_func():
-                    self.logger.error(f"Fase falhou: {phase_func.__name__}")
-                    if not self.config.dry_run:
-                        self._rollback()
-                    return False
+            # Executar fases (independentes em paralelo, ver PHASE_GRAPH)
+            scheduler = PhaseScheduler(PHASE_GRAPH, jobs=self.config.jobs)
+            self._flushed = 0
+            try:
+                failed = scheduler.run(
+                    self._execute_phase,
+                    lambda spec, ok: self._flush_phase_output(PHASE_GRAPH),
+                )
+            finally:
+                self._flush_phase_output(PHASE_GRAPH, final=True)
+            
+            if failed is not None:
+                self.logger.error(f"Fase falhou: {failed.method}")
+                self._abort()
+                return False
             
             self._print_success()
             return True
             
         except KeyboardInterrupt:
             self.logger.warning("\nInstalação interrompida pelo usuário.")
-            if not self.config.dry_run:
-                self._rollback()
+            self._abort()
             return False
         except Exception as e:
             self.logger.error(f"Erro inesperado: {e}")
-            if not self.config.dry_run:
-                self._rollback()
+            self._abort()
             return False
     
     def _print_banner(self):
@@ -581,15 +1201,67 @@ class UnifiedInstaller:
         self.logger.info(f"Usuário: {self.system_info.user}")
         self.logger.info(f"Home: {self.system_info.home}")
         
-        # Atualizar sistema
-        self.logger.info("Atualizando sistema...")
-        code, _, err = run_command(["pacman", "-Syu", "--noconfirm"], dry_run=self.config.dry_run)
-        if code != 0 and not self.config.dry_run:
-            self.logger.warning(f"Falha ao atualizar sistema: {err}")
+        # Atualizar sistema (com bundle: adotar os bancos de sincronização dele,
+        # para que as versões resolvidas sejam exatamente as empacotadas)
+        if self.bundle:
+            self.logger.info(f"Usando bancos de pacotes do bundle {self.bundle.version}...")
+            if not self.config.dry_run:
+                try:
+                    self.bundle.install_sync_dbs()
+                except (BundleError, OSError) as e:
+                    self.logger.warning(f"Falha ao copiar bancos do bundle: {e}")
+        else:
+            self.logger.info("Atualizando sistema...")
+            code, _, err = run_command(["pacman", "-Syu", "--noconfirm"], dry_run=self.config.dry_run)
+            if code != 0 and not self.config.dry_run:
+                self.logger.warning(f"Falha ao atualizar sistema: {err}")
+        
+        self._install_package_plan()
         
         self.completed_phases.append(InstallPhase.SYSTEM_CHECK)
         return True
     
+    def _install_package_plan(self):
+        """Instala os pacotes de todas as fases numa transação (+ um lote AUR)."""
+        self.package_plan = build_package_plan(self.config)
+        repo, aur = self.package_plan.repo, self.package_plan.aur
+        installed = self.validator.load_installed_packages()
+        baseline_known = self.validator.installed_packages is not None
+        
+        repo_missing = [p for p in repo if p not in installed]
+        if repo_missing:
+            self.logger.info(f"Instalando {len(repo_missing)} pacotes numa única transação...")
+            cmd = ["pacman", "-S", "--needed", "--noconfirm"] + self._bundle_pacman_args()
+            code, _, err = run_command(cmd + repo_missing, timeout=1800, dry_run=self.config.dry_run,
+                                       tail_lines=200)
+            if code != 0:
+                self.logger.warning(f"Transação de pacotes falhou, as fases instalarão individualmente: {err}")
+        
+        aur_missing = [p for p in aur if p not in installed]
+        bundled = self.bundle.aur_packages(aur_missing) if self.bundle else []
+        if bundled:
+            self.logger.info(f"Instalando {len(bundled)} pacotes AUR pré-compilados do bundle...")
+            code, _, err = run_command(["pacman", "-U", "--needed", "--noconfirm"] + [str(p) for p in bundled],
+                                       timeout=1800, dry_run=self.config.dry_run, tail_lines=200)
+            if code != 0:
+                self.logger.warning(f"Pacotes AUR do bundle falharam: {err}")
+            else:
+                names = {a.name for a in self.bundle.manifest.of_kind("aur-package")}
+                aur_missing = [p for p in aur_missing if p not in names]
+        helper = next((h for h in ("paru", "yay") if self.validator.check_command(h)), None)
+        if aur_missing and helper:
+            self.logger.info(f"Instalando pacotes AUR com {helper}: {', '.join(aur_missing)}")
+            code, _, err = run_as_user([helper, "-S", "--needed", "--noconfirm"] + aur_missing,
+                                       self.system_info.user, self.config.dry_run)
+            if code != 0:
+                self.logger.warning(f"Lote AUR falhou: {err}")
+        
+        # Sem o retrato anterior todo pacote pareceria novo e o rollback
+        # removeria pacotes que já existiam: nenhuma posse é registrada
+        if baseline_known and (repo_missing or aur_missing or bundled):
+            after = self.validator.load_installed_packages()
+            self.package_plan.record_installed(installed, after)
+    
     # =========================================================================
     # FASE 3: NODE.JS E NPM
     # =========================================================================
@@ -619,11 +1291,11 @@ class UnifiedInstaller:
         else:
             # Instalar Node.js
             self.logger.info("Instalando Node.js e npm...")
-            code, _, err = run_command(["pacman", "-S", "--noconfirm", "nodejs", "npm"], dry_run=self.config.dry_run)
+            code, _, err = run_command(["pacman", "-S", "--noconfirm"] + NODEJS_PACKAGES, dry_run=self.config.dry_run)
             if code != 0:
                 self.logger.error(f"Falha ao instalar Node.js: {err}")
                 return False
-            self.rollback_actions.append(lambda: run_command(["pacman", "-Rns", "--noconfirm", "nodejs", "npm"], dry_run=self.config.dry_run))
+            self._add_rollback(lambda: run_command(["pacman", "-Rns", "--noconfirm"] + NODEJS_PACKAGES, dry_run=self.config.dry_run))
         
         # Verificar instalação
         if not self.config.dry_run:
@@ -654,11 +1326,11 @@ class UnifiedInstaller:
         # Instalar UFW
         if not self.validator.check_package("ufw"):
             self.logger.info("Instalando UFW...")
-            code, _, err = run_command(["pacman", "-S", "--noconfirm", "ufw"], dry_run=self.config.dry_run)
+            code, _, err = run_command(["pacman", "-S", "--noconfirm"] + UFW_PACKAGES, dry_run=self.config.dry_run)
             if code != 0:
                 self.logger.error(f"Falha ao instalar UFW: {err}")
                 return False
-            self.rollback_actions.append(lambda: run_command(["pacman", "-Rns", "--noconfirm", "ufw"], dry_run=self.config.dry_run))
+            self._add_rollback(lambda: run_command(["pacman", "-Rns", "--noconfirm"] + UFW_PACKAGES, dry_run=self.config.dry_run))
         
         # Configurar regras
         rules = {
@@ -679,7 +1351,7 @@ class UnifiedInstaller:
         self.logger.info("Ativando UFW...")
         run_command(["ufw", "--force", "enable"], dry_run=self.config.dry_run)
         run_command(["systemctl", "enable", "--now", "ufw"], dry_run=self.config.dry_run)
-        self.rollback_actions.append(lambda: run_command(["ufw", "disable"], dry_run=self.config.dry_run))
+        self._add_rollback(lambda: run_command(["ufw", "disable"], dry_run=self.config.dry_run))
         
         self.logger.success("UFW configurado e ativado.")
         self.completed_phases.append(InstallPhase.UFW)
@@ -733,17 +1405,8 @@ class UnifiedInstaller:
             self.logger.info("Instalação de fontes pulada por configuração.")
             return True
         
-        fonts = [
-            "ttf-dejavu",
-            "ttf-liberation",
-            "noto-fonts",
-            "noto-fonts-emoji",
-            "ttf-roboto",
-            "ttf-ubuntu-font-family",
-        ]
-        
         self.logger.info("Instalando fontes...")
-        for font in fonts:
+        for font in FONT_PACKAGES:
             if not self.validator.check_package(font):
                 self.logger.debug(f"Instalando {font}...")
                 run_command(["pacman", "-S", "--noconfirm", font], dry_run=self.config.dry_run)
@@ -769,19 +1432,7 @@ class UnifiedInstaller:
             self.logger.info("Configuração de áudio pulada por configuração.")
             return True
         
-        if self.config.audio_backend == "pipewire":
-            packages = [
-                "pipewire",
-                "pipewire-alsa",
-                "pipewire-pulse",
-                "pipewire-jack",
-                "wireplumber",
-            ]
-        else:  # pulseaudio
-            packages = [
-                "pulseaudio",
-                "pulseaudio-alsa",
-            ]
+        packages = AUDIO_PACKAGES.get(self.config.audio_backend, AUDIO_PACKAGES["pulseaudio"])
         
         self.logger.info(f"Instalando {self.config.audio_backend}...")
         for pkg in packages:
@@ -791,9 +1442,8 @@ class UnifiedInstaller:
         # Ativar serviços para o usuário
         if self.config.audio_backend == "pipewire":
             self.logger.info("Ativando serviços do PipeWire...")
-            run_as_user(["systemctl", "--user", "enable", "--now", "pipewire"], self.system_info.user, self.config.dry_run)
-            run_as_user(["systemctl", "--user", "enable", "--now", "pipewire-pulse"], self.system_info.user, self.config.dry_run)
-            run_as_user(["systemctl", "--user", "enable", "--now", "wireplumber"], self.system_info.user, self.config.dry_run)
+            run_as_user(["systemctl", "--user", "enable", "--now", "pipewire", "pipewire-pulse", "wireplumber"],
+                        self.system_info.user, self.config.dry_run)
         
         self.logger.success(f"{self.config.audio_backend} configurado.")
         self.completed_phases.append(InstallPhase.AUDIO)
@@ -859,11 +1509,11 @@ class UnifiedInstaller:
         # Instalar Nginx
         if not self.validator.check_package("nginx"):
             self.logger.info("Instalando Nginx...")
-            code, _, err = run_command(["pacman", "-S", "--noconfirm", "nginx"], dry_run=self.config.dry_run)
+            code, _, err = run_command(["pacman", "-S", "--noconfirm"] + NGINX_PACKAGES, dry_run=self.config.dry_run)
             if code != 0:
                 self.logger.error(f"Falha ao instalar Nginx: {err}")
                 return False
-            self.rollback_actions.append(lambda: run_command(["pacman", "-Rns", "--noconfirm", "nginx"], dry_run=self.config.dry_run))
+            self._add_rollback(lambda: run_command(["pacman", "-Rns", "--noconfirm"] + NGINX_PACKAGES, dry_run=self.config.dry_run))
         
         # Criar configuração do site
         nginx_config = f"""server {{
@@ -954,28 +1604,16 @@ class UnifiedInstaller:
             self.logger.info("Configuração de monitoramento pulada por configuração.")
             return True
         
-        # Instalar Prometheus
-        if not self.validator.check_package("prometheus"):
-            self.logger.info("Instalando Prometheus...")
-            run_command(["pacman", "-S", "--noconfirm", "prometheus"], dry_run=self.config.dry_run)
-        
-        # Instalar Grafana
-        if not self.validator.check_package("grafana"):
-            self.logger.info("Instalando Grafana...")
-            run_command(["pacman", "-S", "--noconfirm", "grafana"], dry_run=self.config.dry_run)
-        
-        # Instalar exporters
-        exporters = ["prometheus-node-exporter"]
-        for exporter in exporters:
-            if not self.validator.check_package(exporter):
-                self.logger.debug(f"Instalando {exporter}...")
-                run_command(["pacman", "-S", "--noconfirm", exporter], dry_run=self.config.dry_run)
+        # Instalar Prometheus, Grafana e exporters
+        for pkg in MONITORING_PACKAGES:
+            if not self.validator.check_package(pkg):
+                self.logger.info(f"Instalando {pkg}...")
+                run_command(["pacman", "-S", "--noconfirm", pkg], dry_run=self.config.dry_run)
         
         # Ativar serviços
         services = ["prometheus", "grafana", "prometheus-node-exporter"]
-        for service in services:
-            self.logger.debug(f"Ativando {service}...")
-            run_command(["systemctl", "enable", "--now", service], dry_run=self.config.dry_run)
+        self.logger.debug(f"Ativando {', '.join(services)}...")
+        run_command(["systemctl", "enable", "--now"] + services, dry_run=self.config.dry_run)
         
         self.logger.success("Monitoramento configurado.")
         self.logger.info("Grafana: http://localhost:3000 (admin/admin)")
@@ -1001,7 +1639,7 @@ class UnifiedInstaller:
         # Instalar rclone
         if not self.validator.check_package("rclone"):
             self.logger.info("Instalando rclone...")
-            run_command(["pacman", "-S", "--noconfirm", "rclone"], dry_run=self.config.dry_run)
+            run_command(["pacman", "-S", "--noconfirm"] + CLOUD_BACKUP_PACKAGES, dry_run=self.config.dry_run)
         
         self.logger.info("rclone instalado. Configure manualmente com: rclone config")
         self.logger.info("Provedores suportados: Google Drive, OneDrive, Dropbox, MEGA, Storj")
@@ -1028,10 +1666,10 @@ class UnifiedInstaller:
             
             # Tentar com paru
             if self.validator.check_command("paru"):
-                code, _, err = run_as_user(["paru", "-S", "--noconfirm", "spotify"], self.system_info.user, self.config.dry_run)
+                code, _, err = run_as_user(["paru", "-S", "--noconfirm"] + SPOTIFY_AUR_PACKAGES, self.system_info.user, self.config.dry_run)
             # Tentar com yay
             elif self.validator.check_command("yay"):
-                code, _, err = run_as_user(["yay", "-S", "--noconfirm", "spotify"], self.system_info.user, self.config.dry_run)
+                code, _, err = run_as_user(["yay", "-S", "--noconfirm"] + SPOTIFY_AUR_PACKAGES, self.system_info.user, self.config.dry_run)
             else:
                 self.logger.warning("AUR helper (paru/yay) não encontrado.")
                 self.logger.info("Instale o Spotify manualmente: paru -S spotify")
@@ -1067,9 +1705,8 @@ class UnifiedInstaller:
         if not self.validator.check_command("spicetify"):
             self.logger.info("Instalando Spicetify...")
             
-            # Baixar e instalar
-            install_script = "curl -fsSL https://raw.githubusercontent.com/spicetify/spicetify-cli/master/install.sh | sh"
-            code, _, err = run_as_user(["sh", "-c", install_script], self.system_info.user, self.config.dry_run)
+            # Script oficial, baixado por completo antes de rodar
+            code, _, err = self._run_install_script(SPICETIFY_INSTALL_URL)
             
             if code != 0:
                 self.logger.warning(f"Falha ao instalar Spicetify: {err}")
@@ -1083,6 +1720,29 @@ class UnifiedInstaller:
         self.completed_phases.append(InstallPhase.SPICETIFY)
         return True
     
+    def _run_install_script(self, url: str) -> Tuple[int, str, str]:
+        """
+        Baixa um script de instalação e o executa com sh como o usuário alvo.
+        
+        Ao contrário de `curl | sh`, uma conexão interrompida nunca executa
+        um script truncado.
+        """
+        with tempfile.TemporaryDirectory(prefix="tsijukebox-script-") as tmp:
+            script = Path(tmp) / "install.sh"
+            if not self.config.dry_run:
+                try:
+                    if Downloader is not None:
+                        Downloader(logger=self.logger).download(url, script)
+                    else:
+                        with urllib.request.urlopen(url, timeout=60) as response:
+                            script.write_bytes(response.read())
+                except (DownloadError, OSError) as e:
+                    return 1, "", str(e)
+                # O usuário alvo precisa ler o script no diretório temporário do root
+                os.chmod(tmp, 0o755)
+                script.chmod(0o644)
+            return run_as_user(["sh", str(script)], self.system_info.user, self.config.dry_run)
+    
     # =========================================================================
     # FASE 14: SPOTIFY CLI
     # =========================================================================
@@ -1100,14 +1760,14 @@ class UnifiedInstaller:
         if not self.validator.check_package("spotify-tui"):
             self.logger.info("Instalando spotify-tui...")
             if self.validator.check_command("paru"):
-                run_as_user(["paru", "-S", "--noconfirm", "spotify-tui"], self.system_info.user, self.config.dry_run)
+                run_as_user(["paru", "-S", "--noconfirm"] + SPOTIFY_CLI_AUR_PACKAGES, self.system_info.user, self.config.dry_run)
             elif self.validator.check_command("yay"):
-                run_as_user(["yay", "-S", "--noconfirm", "spotify-tui"], self.system_info.user, self.config.dry_run)
+                run_as_user(["yay", "-S", "--noconfirm"] + SPOTIFY_CLI_AUR_PACKAGES, self.system_info.user, self.config.dry_run)
         
         # Instalar spotifyd
         if not self.validator.check_package("spotifyd"):
             self.logger.info("Instalando spotifyd...")
-            run_command(["pacman", "-S", "--noconfirm", "spotifyd"], dry_run=self.config.dry_run)
+            run_command(["pacman", "-S", "--noconfirm"] + SPOTIFY_CLI_PACKAGES, dry_run=self.config.dry_run)
         
         self.logger.success("Spotify CLI instalado.")
         self.completed_phases.append(InstallPhase.SPOTIFY_CLI)
@@ -1126,20 +1786,10 @@ class UnifiedInstaller:
             self.logger.info("Configuração de modo kiosk pulada por configuração.")
             return True
         
-        # Instalar Openbox
-        if not self.validator.check_package("openbox"):
-            self.logger.info("Instalando Openbox...")
-            run_command(["pacman", "-S", "--noconfirm", "openbox"], dry_run=self.config.dry_run)
-        
-        # Instalar Chromium
-        if not self.validator.check_package("chromium"):
-            self.logger.info("Instalando Chromium...")
-            run_command(["pacman", "-S", "--noconfirm", "chromium"], dry_run=self.config.dry_run)
-        
-        # Instalar X11
-        x11_packages = ["xorg-server", "xorg-xinit", "xorg-xset", "xorg-xrandr"]
-        for pkg in x11_packages:
+        # Instalar Openbox, Chromium, X11 e unclutter
+        for pkg in KIOSK_PACKAGES:
             if not self.validator.check_package(pkg):
+                self.logger.info(f"Instalando {pkg}...")
                 run_command(["pacman", "-S", "--noconfirm", pkg], dry_run=self.config.dry_run)
         
         # Criar configuração do Openbox
@@ -1174,10 +1824,6 @@ chromium --kiosk --noerrdialogs --disable-infobars --no-first-run --disable-sess
             os.chmod(xinitrc_file, 0o755)
             shutil.chown(xinitrc_file, self.system_info.user, self.system_info.user)
         
-        # Instalar unclutter
-        if not self.validator.check_package("unclutter"):
-            run_command(["pacman", "-S", "--noconfirm", "unclutter"], dry_run=self.config.dry_run)
-        
         self.logger.success("Modo Kiosk configurado.")
         self.logger.info("Inicie com: startx")
         self.completed_phases.append(InstallPhase.KIOSK)
@@ -1218,19 +1864,8 @@ chromium --kiosk --noerrdialogs --disable-infobars --no-first-run --disable-sess
             self.logger.info("Instalação de ferramentas de desenvolvimento pulada por configuração.")
             return True
         
-        dev_tools = [
-            "git",
-            "base-devel",
-            "vim",
-            "nano",
-            "htop",
-            "tmux",
-            "curl",
-            "wget",
-        ]
-        
         self.logger.info("Instalando ferramentas de desenvolvimento...")
-        for tool in dev_tools:
+        for tool in DEV_TOOLS_PACKAGES:
             if not self.validator.check_package(tool):
                 run_command(["pacman", "-S", "--noconfirm", tool], dry_run=self.config.dry_run)
         
@@ -1326,22 +1961,36 @@ AutomaticLogin={self.system_info.user}
         # Verificar se git está instalado
         if not self.validator.check_command("git"):
             self.logger.info("Instalando git...")
-            run_command(["pacman", "-S", "--noconfirm", "git"], dry_run=self.config.dry_run)
+            run_command(["pacman", "-S", "--noconfirm"] + GIT_PACKAGES, dry_run=self.config.dry_run)
+        
+        # Repositório do bundle offline tem precedência sobre o GitHub
+        bundled = None
+        if self.bundle:
+            try:
+                bundled = self.bundle.git_repo(APP_BUNDLE_NAME)
+            except BundleError as e:
+                self.logger.warning(f"Repositório do bundle indisponível: {e}")
         
         # Clonar repositório
         if INSTALL_DIR.exists():
             self.logger.warning(f"Diretório {INSTALL_DIR} já existe.")
             self.logger.info("Atualizando repositório...")
-            code, _, err = run_command(["git", "pull"], cwd=INSTALL_DIR, dry_run=self.config.dry_run)
+            cmd = ["git", "pull", str(bundled), "HEAD"] if bundled else ["git", "pull"]
+            code, _, err = run_command(cmd, cwd=INSTALL_DIR, dry_run=self.config.dry_run)
             if code != 0:
                 self.logger.warning(f"Falha ao atualizar: {err}")
         else:
-            self.logger.info(f"Clonando repositório de {GITHUB_REPO}...")
-            code, _, err = run_command(["git", "clone", GITHUB_REPO, str(INSTALL_DIR)], dry_run=self.config.dry_run)
+            source = str(bundled) if bundled else GITHUB_REPO
+            self.logger.info(f"Clonando repositório de {source}...")
+            code, _, err = run_command(["git", "clone", source, str(INSTALL_DIR)], dry_run=self.config.dry_run)
             if code != 0:
                 self.logger.error(f"Falha ao clonar repositório: {err}")
                 return False
-            self.rollback_actions.append(lambda: shutil.rmtree(INSTALL_DIR, ignore_errors=True))
+            self._add_rollback(lambda: shutil.rmtree(INSTALL_DIR, ignore_errors=True))
+            if bundled:
+                # Atualizações futuras (com rede) vêm do GitHub
+                run_command(["git", "remote", "set-url", "origin", GITHUB_REPO], cwd=INSTALL_DIR,
+                            dry_run=self.config.dry_run)
         
         # Ajustar permissões
         if not self.config.dry_run:
@@ -1390,7 +2039,18 @@ VITE_SUPABASE_ANON_KEY={self.config.supabase_anon_key}
         
         # Instalar dependências
         self.logger.info("Instalando dependências do frontend (pode demorar)...")
-        code, out, err = run_as_user(["npm", "install"], self.system_info.user, self.config.dry_run, cwd=INSTALL_DIR)
+        npm_install = ["npm", "install"]
+        if self.bundle and not self.config.dry_run:
+            try:
+                cache = self.bundle.extract_npm_cache(NPM_CACHE_DIR)
+            except (BundleError, OSError) as e:
+                self.logger.warning(f"Cache npm do bundle indisponível: {e}")
+                cache = None
+            if cache:
+                run_command(["chown", "-R", f"{self.system_info.user}:", str(cache)])
+                npm_install += ["--cache", str(cache), "--prefer-offline", "--no-audit", "--no-fund"]
+        code, out, err = run_as_user(npm_install, self.system_info.user, self.config.dry_run, cwd=INSTALL_DIR,
+                                     tail_lines=200)
         if code != 0:
             self.logger.error(f"Falha ao instalar dependências: {err}")
             return False
@@ -1541,7 +2201,7 @@ server {{
             # Instalar certbot
             if not self.validator.check_package("certbot"):
                 self.logger.info("Instalando certbot...")
-                run_command(["pacman", "-S", "--noconfirm", "certbot", "certbot-nginx"], dry_run=self.config.dry_run)
+                run_command(["pacman", "-S", "--noconfirm"] + SSL_PACKAGES, dry_run=self.config.dry_run)
             
             if not self.config.ssl_email:
                 self.logger.warning("Email não fornecido para Let's Encrypt.")
@@ -1582,7 +2242,7 @@ server {{
         # Instalar Avahi
         if not self.validator.check_package("avahi"):
             self.logger.info("Instalando Avahi...")
-            run_command(["pacman", "-S", "--noconfirm", "avahi", "nss-mdns"], dry_run=self.config.dry_run)
+            run_command(["pacman", "-S", "--noconfirm"] + AVAHI_PACKAGES, dry_run=self.config.dry_run)
         
         # Configurar hostname
         avahi_conf = f"""<?xml version="1.0" standalone='no'?>
@@ -1632,7 +2292,7 @@ server {{
         # Instalar Fish
         if not self.validator.check_package("fish"):
             self.logger.info("Instalando Fish Shell...")
-            run_command(["pacman", "-S", "--noconfirm", "fish"], dry_run=self.config.dry_run)
+            run_command(["pacman", "-S", "--noconfirm"] + FISH_PACKAGES, dry_run=self.config.dry_run)
         
         # Configurar Fish como shell padrão
         self.logger.info("Configurando Fish como shell padrão...")
@@ -1694,7 +2354,7 @@ end
         # Instalar GitHub CLI
         if not self.validator.check_package("github-cli"):
             self.logger.info("Instalando GitHub CLI...")
-            run_command(["pacman", "-S", "--noconfirm", "github-cli"], dry_run=self.config.dry_run)
+            run_command(["pacman", "-S", "--noconfirm"] + GITHUB_CLI_PACKAGES, dry_run=self.config.dry_run)
         
         self.logger.success("GitHub CLI instalado.")
         self.logger.info("Autentique com: gh auth login")
@@ -1750,6 +2410,8 @@ Exemplos:
   sudo python3 unified-installer.py --mode full
   sudo python3 unified-installer.py --mode kiosk --user pi
   sudo python3 unified-installer.py --dry-run --verbose
+  sudo python3 unified-installer.py --resume
+  sudo python3 unified-installer.py --mode kiosk --bundle /run/media/usb/tsijukebox-bundle
         """
     )
     
@@ -1760,6 +2422,14 @@ Exemplos:
     parser.add_argument("--verbose", "-v", action="store_true", help="Saída detalhada")
     parser.add_argument("--quiet", "-q", action="store_true", help="Saída mínima")
     parser.add_argument("--auto", "-y", action="store_true", help="Modo não-interativo")
+    parser.add_argument("--jobs", "-j", type=int, default=4,
+                        help="Fases executadas em paralelo (padrão: 4; 1 = sequencial)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continuar da fase que falhou, pulando as já concluídas")
+    parser.add_argument("--no-checkpoint", action="store_true",
+                        help="Ignorar checkpoints e refazer todas as fases (rollback completo em falha)")
+    parser.add_argument("--bundle", metavar="ORIGEM",
+                        help="Bundle offline: diretório (pendrive) ou URL do espelho na LAN")
     
     # Configurações específicas
     parser.add_argument("--no-nodejs", action="store_true", help="Não instalar Node.js")
@@ -1786,6 +2456,10 @@ Exemplos:
         verbose=args.verbose,
         quiet=args.quiet,
         auto=args.auto,
+        jobs=args.jobs,
+        resume=args.resume,
+        checkpoints=not args.no_checkpoint,
+        bundle=args.bundle or "",
         install_nodejs=not args.no_nodejs,
         install_ufw=not args.no_ufw,
         install_nginx=not args.no_nginx,